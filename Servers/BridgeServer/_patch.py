@@ -77,21 +77,10 @@ def patch_bridge():
         '    def log(self, msg: str, level: str = "INFO"):'
     ))
 
-    # 5. _dispatch handler registrations
-    replacements.append((
-        '            MsgType.MAIL_DELETE: self._on_mail_delete,\n        }',
-        '            MsgType.MAIL_DELETE: self._on_mail_delete,\n'
-        '            MsgType.SERVER_LIST_REQ: self._on_server_list_req,\n'
-        '            MsgType.CHARACTER_LIST_REQ: self._on_character_list_req,\n'
-        '            MsgType.CHARACTER_CREATE: self._on_character_create,\n'
-        '            MsgType.CHARACTER_DELETE: self._on_character_delete,\n'
-        '            MsgType.TUTORIAL_STEP_COMPLETE: self._on_tutorial_step_complete,\n'
-        '        }'
-    ))
-
-    # 6. Handler implementations
+    # 5. Handler implementations
     handler_code = r'''    # ━━━ 핸들러: 서버 선택 ━━━
 
+    @packet_handler(MsgType.SERVER_LIST_REQ)
     async def _on_server_list_req(self, session: PlayerSession, payload: bytes):
         count = len(SERVER_LIST_DATA)
         buf = struct.pack('<B', count)
@@ -104,6 +93,7 @@ def patch_bridge():
 
     # ━━━ 핸들러: 캐릭터 CRUD ━━━
 
+    @packet_handler(MsgType.CHARACTER_LIST_REQ)
     async def _on_character_list_req(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_LIST, struct.pack('<B', 0))
@@ -117,6 +107,7 @@ def patch_bridge():
         self._send(session, MsgType.CHARACTER_LIST, buf)
         self.log(f"CharacterList: {len(chars)} chars for account {session.account_id}", "GAME")
 
+    @packet_handler(MsgType.CHARACTER_CREATE)
     async def _on_character_create(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_CREATE_RESULT, struct.pack('<BI', 1, 0))
@@ -150,6 +141,7 @@ def patch_bridge():
         self.log(f"CharCreate: {char_name} class={char_class} (account={session.account_id})", "GAME")
         self._send(session, MsgType.CHARACTER_CREATE_RESULT, struct.pack('<BI', 0, char_id))
 
+    @packet_handler(MsgType.CHARACTER_DELETE)
     async def _on_character_delete(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_DELETE_RESULT, struct.pack('<BI', 2, 0))
@@ -169,6 +161,7 @@ def patch_bridge():
 
     # ━━━ 핸들러: 튜토리얼 ━━━
 
+    @packet_handler(MsgType.TUTORIAL_STEP_COMPLETE)
     async def _on_tutorial_step_complete(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             return
@@ -138,16 +138,7 @@ def patch_bridge():
         '        self.npcs: Dict[int, dict] = {}  # entity_id -> npc data\n'
     ))
 
-    # 6. _dispatch 핸들러 등록 (TUTORIAL 뒤에)
-    replacements.append((
-        '            MsgType.TUTORIAL_STEP_COMPLETE: self._on_tutorial_step_complete,\n        }',
-        '            MsgType.TUTORIAL_STEP_COMPLETE: self._on_tutorial_step_complete,\n'
-        '            MsgType.NPC_INTERACT: self._on_npc_interact,\n'
-        '            MsgType.ENHANCE_REQ: self._on_enhance_req,\n'
-        '        }'
-    ))
-
-    # 7. _spawn_monsters 앞에 NPC 스폰 + 핸들러 삽입
+    # 6. _spawn_monsters 앞에 NPC 스폰 + 핸들러 삽입
     # 기존: "    def _spawn_monsters(self):"
     # _spawn_monsters를 확장해서 NPC도 스폰하도록
     replacements.append((
@@ -169,6 +160,7 @@ def patch_bridge():
         '            }\n'
         '        self.log(f"Spawned {len(self.npcs)} NPCs", "GAME")\n\n'
         '    # ━━━ 핸들러: NPC 대화 (P1_S04_S01) ━━━\n\n'
+        '    @packet_handler(MsgType.NPC_INTERACT)\n'
         '    async def _on_npc_interact(self, session: PlayerSession, payload: bytes):\n'
         '        if not session.in_game or len(payload) < 4:\n'
         '            return\n'
@@ -204,6 +196,7 @@ def patch_bridge():
         '        self._send(session, MsgType.NPC_DIALOG, buf)\n'
         '        self.log(f"NPC Dialog: npc_id={npc_id} lines={line_count} ({session.char_name})", "GAME")\n\n'
         '    # ━━━ 핸들러: 강화 (P2_S02_S01) ━━━\n\n'
+        '    @packet_handler(MsgType.ENHANCE_REQ)\n'
         '    async def _on_enhance_req(self, session: PlayerSession, payload: bytes):\n'
         '        """ENHANCE_REQ: slot_index(u8). 해당 슬롯 장비를 강화."""\n'
         '        if not session.in_game or len(payload) < 1:\n'
@@ -240,13 +233,13 @@ def patch_bridge():
         '        for spawn in MONSTER_SPAWNS:'
     ))
 
-    # 8. _spawn_monsters 호출 직후에 _spawn_npcs 호출 추가
+    # 7. _spawn_monsters 호출 직후에 _spawn_npcs 호출 추가
     replacements.append((
         '        self._spawn_monsters()\n\n        # 게임 틱 루프 시작',
         '        self._spawn_monsters()\n        self._spawn_npcs()\n\n        # 게임 틱 루프 시작'
     ))
 
-    # 9. InventorySlot에 enhance_level 필드 추가 (있다면)
+    # 8. InventorySlot에 enhance_level 필드 추가 (있다면)
     # InventorySlot dataclass 찾기
     inv_slot_marker = '    item_id: int = 0\n    count: int = 0\n    equipped: bool = False'
     if inv_slot_marker in content:
@@ -112,25 +112,14 @@ def patch_bridge():
         '        self.match_queue: Dict[int, dict] = {}  # dungeon_id -> {players: [], created_at: float}\n'
     ))
 
-    # 5. _dispatch 핸들러 등록 (ENHANCE_REQ 뒤에)
-    replacements.append((
-        '            MsgType.ENHANCE_REQ: self._on_enhance_req,\n        }',
-        '            MsgType.ENHANCE_REQ: self._on_enhance_req,\n'
-        '            MsgType.MATCH_ENQUEUE: self._on_match_enqueue,\n'
-        '            MsgType.MATCH_DEQUEUE: self._on_match_dequeue,\n'
-        '            MsgType.MATCH_ACCEPT: self._on_match_accept,\n'
-        '            MsgType.INSTANCE_ENTER: self._on_instance_enter,\n'
-        '            MsgType.INSTANCE_LEAVE: self._on_instance_leave,\n'
-        '        }'
-    ))
-
-    # 6. 핸들러 구현 (_on_enhance_req 끝나는 곳 뒤에 삽입)
+    # 5. 핸들러 구현 (_on_enhance_req 끝나는 곳 뒤에 삽입)
     # _on_enhance_req 마지막 줄 뒤에 추가
     replacements.append((
         '            self._send(session, MsgType.ENHANCE_RESULT, struct.pack("<BBB", slot_idx, 5, current_level))  # 5=FAIL (level preserved)\n\n'
         '    # ━━━ 몬스터 시스템 ━━━',
         '            self._send(session, MsgType.ENHANCE_RESULT, struct.pack("<BBB", slot_idx, 5, current_level))  # 5=FAIL (level preserved)\n\n'
         '    # ━━━ 던전 매칭 시스템 (P2_S03_S01) ━━━\n\n'
+        '    @packet_handler(MsgType.MATCH_ENQUEUE)\n'
         '    async def _on_match_enqueue(self, session: PlayerSession, payload: bytes):\n'
         '        """MATCH_ENQUEUE: dungeon_id(u8) + difficulty(u8). 매칭 큐에 등록."""\n'
         '        if not session.in_game or len(payload) < 2:\n'
@@ -189,6 +178,7 @@ def patch_bridge():
         '        # MATCH_FOUND: instance_id(u32) + dungeon_id(u8) + difficulty(u8)\n'
         '        for s in instance["players"]:\n'
         '            self._send(s, MsgType.MATCH_FOUND, struct.pack("<IBB", inst_id, dungeon["id"], instance["difficulty"]))\n\n'
+        '    @packet_handler(MsgType.MATCH_DEQUEUE)\n'
         '    async def _on_match_dequeue(self, session: PlayerSession, payload: bytes):\n'
         '        """MATCH_DEQUEUE: dungeon_id(u8). 매칭 큐에서 이탈."""\n'
         '        if not session.in_game or len(payload) < 1:\n'
@@ -201,6 +191,7 @@ def patch_bridge():
         '                del self.match_queue[dungeon_id]\n'
         '        self.log(f"MatchQueue: {session.char_name} left dungeon={dungeon_id}", "GAME")\n'
         '        self._send(session, MsgType.MATCH_STATUS, struct.pack("<BBB", dungeon_id, 4, 0))  # 4=DEQUEUED\n\n'
+        '    @packet_handler(MsgType.MATCH_ACCEPT)\n'
         '    async def _on_match_accept(self, session: PlayerSession, payload: bytes):\n'
         '        """MATCH_ACCEPT: instance_id(u32). 매칭 수락 (현재는 자동 수락)."""\n'
         '        if not session.in_game or len(payload) < 4:\n'
@@ -220,6 +211,7 @@ def patch_bridge():
         '                           instance["boss_hp"], instance["boss_current_hp"])\n'
         '        buf += struct.pack("<B", len(instance["players"]))\n'
         '        self._send(session, MsgType.INSTANCE_INFO, buf)\n\n'
+        '    @packet_handler(MsgType.INSTANCE_ENTER)\n'
         '    async def _on_instance_enter(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_ENTER: instance_id(u32). 던전 인스턴스 입장."""\n'
         '        if not session.in_game or len(payload) < 4:\n'
@@ -240,6 +232,7 @@ def patch_bridge():
         '        session.pos.z = 50.0\n'
         '        self.log(f"InstanceEnter: {session.char_name} → Instance#{inst_id} zone={instance[\'zone_id\']}", "GAME")\n'
         '        await self._send_instance_info(session, instance)\n\n'
+        '    @packet_handler(MsgType.INSTANCE_LEAVE)\n'
         '    async def _on_instance_leave(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_LEAVE: instance_id(u32). 던전 퇴장."""\n'
         '        if not session.in_game or len(payload) < 4:\n'
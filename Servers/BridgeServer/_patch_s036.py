@@ -154,19 +154,7 @@ def patch_bridge():
         '        self.raid_instances: Dict[int, dict] = {}  # instance_id -> raid data\n'
     ))
 
-    # 5. _dispatch 핸들러 등록 — INSTANCE_LEAVE 뒤에 PvP + Raid 핸들러
-    replacements.append((
-        '            MsgType.INSTANCE_LEAVE: self._on_instance_leave,\n        }',
-        '            MsgType.INSTANCE_LEAVE: self._on_instance_leave,\n'
-        '            MsgType.PVP_QUEUE_REQ: self._on_pvp_queue_req,\n'
-        '            MsgType.PVP_QUEUE_CANCEL: self._on_pvp_queue_cancel,\n'
-        '            MsgType.PVP_MATCH_ACCEPT: self._on_pvp_match_accept,\n'
-        '            MsgType.PVP_ATTACK: self._on_pvp_attack,\n'
-        '            MsgType.RAID_ATTACK: self._on_raid_attack,\n'
-        '        }'
-    ))
-
-    # 6. PvP + Raid 핸들러 구현 — _on_instance_leave 끝 뒤에
+    # 5. PvP + Raid 핸들러 구현 — _on_instance_leave 끝 뒤에
     replacements.append((
         '        self._send(session, MsgType.INSTANCE_LEAVE_RESULT, struct.pack("<IB", inst_id, 0))  # 0=OK\n\n'
         '    # ━━━ 몬스터 시스템 ━━━',
@@ -193,6 +181,7 @@ def patch_bridge():
         '        new_w = max(0, int(winner_r + k * (1.0 - exp_w)))\n'
         '        new_l = max(0, int(loser_r + k * (0.0 - exp_l)))\n'
         '        return new_w, new_l\n\n'
+        '    @packet_handler(MsgType.PVP_QUEUE_REQ)\n'
         '    async def _on_pvp_queue_req(self, session: PlayerSession, payload: bytes):\n'
         '        """PVP_QUEUE_REQ: mode(u8). 아레나 매칭 큐 등록."""\n'
         '        if not session.in_game or len(payload) < 1:\n'
@@ -268,6 +257,7 @@ def patch_bridge():
         '            s = entry["session"]\n'
         '            team_id = 0 if s in match_data["team_a"] else 1\n'
         '            self._send(s, MsgType.PVP_MATCH_FOUND, struct.pack("<IBB", match_id, mode_id, team_id))\n\n'
+        '    @packet_handler(MsgType.PVP_QUEUE_CANCEL)\n'
         '    async def _on_pvp_queue_cancel(self, session: PlayerSession, payload: bytes):\n'
         '        """PVP_QUEUE_CANCEL: mode(u8). 큐에서 이탈."""\n'
         '        if not session.in_game or len(payload) < 1:\n'
@@ -277,6 +267,7 @@ def patch_bridge():
         '        self.pvp_queue[mode_id] = [e for e in queue if e["session"] is not session]\n'
         '        self.log(f"PvPQueue: {session.char_name} left mode={mode_id}", "PVP")\n'
         '        self._send(session, MsgType.PVP_QUEUE_STATUS, struct.pack("<BBH", mode_id, 4, 0))  # 4=CANCELLED\n\n'
+        '    @packet_handler(MsgType.PVP_MATCH_ACCEPT)\n'
         '    async def _on_pvp_match_accept(self, session: PlayerSession, payload: bytes):\n'
         '        """PVP_MATCH_ACCEPT: match_id(u32). 매치 수락 → 시작."""\n'
         '        if not session.in_game or len(payload) < 4:\n'
@@ -298,6 +289,7 @@ def patch_bridge():
         '                team_id = 0 if s in match["team_a"] else 1\n'
         '                self._send(s, MsgType.PVP_MATCH_START, struct.pack("<IBH", match_id, team_id, match["mode"]["time_limit"]))\n'
         '            self.log(f"PvP Match #{match_id} STARTED", "PVP")\n\n'
+        '    @packet_handler(MsgType.PVP_ATTACK)\n'
         '    async def _on_pvp_attack(self, session: PlayerSession, payload: bytes):\n'
         '        """PVP_ATTACK: match_id(u32) + target_team(u8) + target_idx(u8) + skill_id(u16) + damage(u16)."""\n'
         '        if not session.in_game or len(payload) < 10:\n'
@@ -408,6 +400,7 @@ def patch_bridge():
         '        for s in instance.get("players", []):\n'
         '            self._send(s, MsgType.RAID_BOSS_SPAWN, buf)\n'
         '        self.log(f"Raid Boss spawned: {raid_data[\'boss_name\']} ({diff_name}) in Instance#{instance_id}", "RAID")\n\n'
+        '    @packet_handler(MsgType.RAID_ATTACK)\n'
         '    async def _on_raid_attack(self, session: PlayerSession, payload: bytes):\n'
         '        """RAID_ATTACK: instance_id(u32) + skill_id(u16) + damage(u32)."""\n'
         '        if not session.in_game or len(payload) < 10:\n'
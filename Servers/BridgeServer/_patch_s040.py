@@ -23,16 +23,7 @@ def patch_bridge():
 
     replacements = []
 
-    # 1. 디스패치 테이블에 INSTANCE_CREATE 핸들러 추가
-    replacements.append((
-        '            MsgType.INSTANCE_ENTER: self._on_instance_enter,\n'
-        '            MsgType.INSTANCE_LEAVE: self._on_instance_leave,',
-        '            MsgType.INSTANCE_CREATE: self._on_instance_create,\n'
-        '            MsgType.INSTANCE_ENTER: self._on_instance_enter,\n'
-        '            MsgType.INSTANCE_LEAVE: self._on_instance_leave,'
-    ))
-
-    # 2. _on_match_enqueue 수정: 듀얼 포맷 지원 (<BB> 또는 <I>)
+    # 1. _on_match_enqueue 수정: 듀얼 포맷 지원 (<BB> 또는 <I>)
     # 기존: payload[0]=dungeon_id(u8), payload[1]=difficulty(u8), 최소 2바이트
     # 클라이언트: struct.pack('<I', dungeon_type), 4바이트
     # MATCH_STATUS 응답도 클라이언트 호환: <BI> (status u8 + queue_pos u32)
@@ -118,7 +109,7 @@ def patch_bridge():
         '            await self._match_found(queue_key, dungeon)\n'
     ))
 
-    # 3. _on_match_dequeue 수정: 빈 페이로드 지원
+    # 2. _on_match_dequeue 수정: 빈 페이로드 지원
     replacements.append((
         '    async def _on_match_dequeue(self, session: PlayerSession, payload: bytes):\n'
         '        """MATCH_DEQUEUE: dungeon_id(u8). 매칭 큐에서 이탈."""\n'
@@ -156,7 +147,7 @@ def patch_bridge():
         '            self.log(f"MatchQueue: {session.char_name} dequeued (all)", "GAME")\n'
     ))
 
-    # 4. _on_instance_leave 수정: 빈 페이로드 지원 + 응답 포맷 호환
+    # 3. _on_instance_leave 수정: 빈 페이로드 지원 + 응답 포맷 호환
     replacements.append((
         '    async def _on_instance_leave(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_LEAVE: instance_id(u32). 던전 퇴장."""\n'
@@ -223,11 +214,13 @@ def patch_bridge():
         '            self._send(session, MsgType.INSTANCE_LEAVE_RESULT, struct.pack("<IB", inst_id, 0))  # 0=OK\n'
     ))
 
-    # 5. INSTANCE_CREATE 핸들러 추가 (던전 매칭 시스템 섹션 앞)
+    # 4. INSTANCE_CREATE 핸들러 추가 (던전 매칭 시스템 섹션 앞)
     # _on_instance_enter 앞에 새 핸들러 삽입
     replacements.append((
+        '    @packet_handler(MsgType.INSTANCE_ENTER)\n'
         '    async def _on_instance_enter(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_ENTER: instance_id(u32). 던전 인스턴스 입장."""',
+        '    @packet_handler(MsgType.INSTANCE_CREATE)\n'
         '    async def _on_instance_create(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_CREATE: dungeon_type(u32). 즉시 인스턴스 생성 + 입장."""\n'
         '        if not session.in_game or len(payload) < 4:\n'
@@ -264,6 +257,7 @@ def patch_bridge():
         '        self.log(f"InstanceCreate: {session.char_name} -> Instance#{inst_id} dungeon={dungeon_type}", "GAME")\n'
         '        # INSTANCE_ENTER 응답: result(u8) + instance_id(u32) + dungeon_type(u32)\n'
         '        self._send(session, MsgType.INSTANCE_ENTER, struct.pack("<BII", 0, inst_id, dungeon_type))\n\n'
+        '    @packet_handler(MsgType.INSTANCE_ENTER)\n'
         '    async def _on_instance_enter(self, session: PlayerSession, payload: bytes):\n'
         '        """INSTANCE_ENTER: instance_id(u32). 던전 인스턴스 입장."""'
     ))
@@ -282,7 +276,7 @@ def patch_bridge():
     checks = [
         '_on_instance_create', 'INSTANCE_CREATE: dungeon_type',
         'is_client_format', '_match_queue_key', '_current_instance_id',
-        'MsgType.INSTANCE_CREATE: self._on_instance_create',
+        '@packet_handler(MsgType.INSTANCE_CREATE)',
     ]
     missing = [c for c in checks if c not in content]
     if missing:
@@ -62,21 +62,7 @@ def apply_s041():
             "self.instances = {}" + s041_fields,
         )
 
-    # 3. _dispatch 에 핸들러 등록
-    dispatch_anchor = "MsgType.RAID_ATTACK: self._on_raid_attack,"
-    dispatch_lines = "\n".join([
-        "",
-        "            # S041: Crafting",
-        "            MsgType.CRAFT_LIST_REQ: self._on_craft_list_req,",
-        "            MsgType.CRAFT_EXECUTE: self._on_craft_execute,",
-        "            MsgType.GATHER_START: self._on_gather_start,",
-        "            MsgType.COOK_EXECUTE: self._on_cook_execute,",
-        "            MsgType.ENCHANT_REQ: self._on_enchant_req,",
-    ])
-    if dispatch_anchor in code:
-        code = code.replace(dispatch_anchor, dispatch_anchor + dispatch_lines)
-
-    # 4. 핸들러 + 데이터 코드 (if __name__ 앞에 삽입)
+    # 3. 핸들러 + 데이터 코드 (if __name__ 앞에 삽입)
     handler_code = _build_handler_code()
     if "if __name__" in code:
         code = code.replace("if __name__", handler_code + "\n\nif __name__")
@@ -313,6 +299,11 @@ def _build_handler_code():
     lines.append("BridgeServer._on_gather_start = _s041_gather")
     lines.append("BridgeServer._on_cook_execute = _s041_cook")
     lines.append("BridgeServer._on_enchant_req = _s041_enchant")
+    lines.append("BridgeServer.register_handler(MsgType.CRAFT_LIST_REQ, '_on_craft_list_req')")
+    lines.append("BridgeServer.register_handler(MsgType.CRAFT_EXECUTE, '_on_craft_execute')")
+    lines.append("BridgeServer.register_handler(MsgType.GATHER_START, '_on_gather_start')")
+    lines.append("BridgeServer.register_handler(MsgType.COOK_EXECUTE, '_on_cook_execute')")
+    lines.append("BridgeServer.register_handler(MsgType.ENCHANT_REQ, '_on_enchant_req')")
     lines.append("")
 
     return "\n".join(lines)
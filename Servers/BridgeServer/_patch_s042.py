@@ -144,6 +144,7 @@ HANDLER_CODE = r'''
             session.energy = min(GATHER_ENERGY_MAX, session.energy + regen)
             session.energy_last_regen = now
 
+    @packet_handler(MsgType.CRAFT_LIST_REQ)
     async def _on_craft_list_req(self, session: PlayerSession, payload: bytes):
         """CRAFT_LIST_REQ(380): category(u8). proficiency_level filtered recipe list."""
         if not session.in_game:
@@ -171,6 +172,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.CRAFT_LIST, resp)
         self.log(f"CraftList: {session.char_name} got {len(recipes)} recipes (cat={category_filter})", "GAME")
 
+    @packet_handler(MsgType.CRAFT_EXECUTE)
     async def _on_craft_execute(self, session: PlayerSession, payload: bytes):
         """CRAFT_EXECUTE(382): recipe_id_len(u8) + recipe_id(str). Execute crafting."""
         if not session.in_game or len(payload) < 2:
@@ -213,6 +215,7 @@ HANDLER_CODE = r'''
         self.log(f"Craft: {session.char_name} SUCCESS {recipe_id} -> item={result_item_id}x{result_count} bonus={has_bonus}", "GAME")
         self._send(session, MsgType.CRAFT_RESULT, struct.pack("<BHBB", 0, result_item_id, result_count, has_bonus))
 
+    @packet_handler(MsgType.GATHER_START)
     async def _on_gather_start(self, session: PlayerSession, payload: bytes):
         """GATHER_START(384): gather_type(u8). Gather with energy cost + loot drop."""
         if not session.in_game or len(payload) < 1:
@@ -251,6 +254,7 @@ HANDLER_CODE = r'''
             parts.append(struct.pack("<H", item["item_id"]))
         self._send(session, MsgType.GATHER_RESULT, b"".join(parts))
 
+    @packet_handler(MsgType.COOK_EXECUTE)
     async def _on_cook_execute(self, session: PlayerSession, payload: bytes):
         """COOK_EXECUTE(386): recipe_id_len(u8) + recipe_id(str). Cook + apply buff."""
         if not session.in_game or len(payload) < 2:
@@ -280,6 +284,7 @@ HANDLER_CODE = r'''
         effects = recipe["effect"]
         self._send(session, MsgType.COOK_RESULT, struct.pack("<BHB", 0, recipe["duration"], len(effects)))
 
+    @packet_handler(MsgType.ENCHANT_REQ)
     async def _on_enchant_req(self, session: PlayerSession, payload: bytes):
         """ENCHANT_REQ(388): slot_index(u8) + element_id(u8) + target_level(u8). Weapon enchant."""
         if not session.in_game or len(payload) < 3:
@@ -390,25 +395,7 @@ def patch_bridge():
             changed = True
             print('[bridge] Added PlayerSession crafting fields')
 
-    # 4. Dispatch table -- check if already added
-    if 'self._on_craft_list_req' not in content:
-        old = '            MsgType.RAID_ATTACK: self._on_raid_attack,\n        }'
-        idx = content.find(old)
-        if idx >= 0:
-            insert_at = content.index('\n        }', idx)
-            insert = (
-                '\n'
-                '            MsgType.CRAFT_LIST_REQ: self._on_craft_list_req,\n'
-                '            MsgType.CRAFT_EXECUTE: self._on_craft_execute,\n'
-                '            MsgType.GATHER_START: self._on_gather_start,\n'
-                '            MsgType.COOK_EXECUTE: self._on_cook_execute,\n'
-                '            MsgType.ENCHANT_REQ: self._on_enchant_req,'
-            )
-            content = content[:insert_at] + insert + content[insert_at:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-
-    # 5. Handler implementations -- insert before monster system section
+    # 4. Handler implementations -- insert before monster system section
     if 'def _on_craft_list_req' not in content:
         # Find the monster system section marker
         marker = '    # ---- Monster System'
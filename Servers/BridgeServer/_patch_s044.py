@@ -72,18 +72,7 @@ SERVER_FIELDS = (
 )
 
 # ====================================================================
-# 5. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '\n'
-    '            MsgType.AUCTION_LIST_REQ: self._on_auction_list_req,\n'
-    '            MsgType.AUCTION_REGISTER: self._on_auction_register,\n'
-    '            MsgType.AUCTION_BUY: self._on_auction_buy,\n'
-    '            MsgType.AUCTION_BID: self._on_auction_bid,'
-)
-
-# ====================================================================
-# 6. Handler implementations
+# 5. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Auction House System (TASK 3: MsgType 390-397) ----
@@ -147,6 +136,7 @@ HANDLER_CODE = r'''
                 still_active.append(listing)
         self.auction_listings = still_active
 
+    @packet_handler(MsgType.AUCTION_LIST_REQ)
     async def _on_auction_list_req(self, session: PlayerSession, payload: bytes):
         """AUCTION_LIST_REQ(390): category(u8) + page(u8) + sort_by(u8).
         category: 0xFF=all, 0=weapon, 1=armor, 2=potion, 3=gem, 4=material, 5=etc
@@ -197,6 +187,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.AUCTION_LIST, b"".join(parts))
         self.log(f"AuctionList: {session.char_name} cat={category} page={page} sort={sort_by} -> {len(page_items)} items", "ECON")
 
+    @packet_handler(MsgType.AUCTION_REGISTER)
     async def _on_auction_register(self, session: PlayerSession, payload: bytes):
         """AUCTION_REGISTER(392): slot_index(u8) + count(u8) + buyout_price(u32) + category(u8).
         Result codes: 0=ok, 1=not_in_game, 2=no_item, 3=max_listings, 4=no_fee_gold, 5=invalid_price"""
@@ -261,6 +252,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.AUCTION_REGISTER_RESULT, struct.pack("<BI", 0, auction_id))
         self.log(f"AuctionReg: {session.char_name} listed item={item_id}x{item_count} buyout={buyout_price}g (id={auction_id})", "ECON")
 
+    @packet_handler(MsgType.AUCTION_BUY)
     async def _on_auction_buy(self, session: PlayerSession, payload: bytes):
         """AUCTION_BUY(394): auction_id(u32).
         Instant buyout. Result: 0=ok, 1=not_found, 2=self_buy, 3=no_gold"""
@@ -365,6 +357,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.AUCTION_BUY_RESULT, struct.pack("<BI", 0, auction_id))
         self.log(f"AuctionBuy: {session.char_name} bought #{auction_id} for {price}g (tax={tax}g, seller gets {proceeds}g)", "ECON")
 
+    @packet_handler(MsgType.AUCTION_BID)
     async def _on_auction_bid(self, session: PlayerSession, payload: bytes):
         """AUCTION_BID(396): auction_id(u32) + bid_amount(u32).
         Result: 0=ok, 1=not_found, 2=self_bid, 3=no_gold, 4=bid_too_low"""
@@ -467,7 +460,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 7. Test cases
+# 6. Test cases
 # ====================================================================
 TEST_CODE = r'''
     # ---- TASK 3: Auction House Tests (S044) ----
@@ -656,19 +649,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find self.next_mail_id')
 
-    # 5. Dispatch table
-    if 'self._on_auction_list_req' not in content:
-        marker = '            MsgType.ENCHANT_REQ: self._on_enchant_req,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find enchant dispatch entry')
-
-    # 6. Handler implementations -- before monster system or before crafting section
+    # 5. Handler implementations -- before monster system or before crafting section
     if 'def _on_auction_list_req' not in content:
         # Insert before the crafting handlers
         marker = '    # ---- Crafting/Gathering/Cooking/Enchanting System'
@@ -468,21 +468,12 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '\n'
-    '            MsgType.TRIPOD_LIST_REQ: self._on_tripod_list_req,\n'
-    '            MsgType.TRIPOD_EQUIP: self._on_tripod_equip,\n'
-    '            MsgType.SCROLL_DISCOVER: self._on_scroll_discover,'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Tripod & Scroll System (TASK 15: MsgType 520-524) ----
 
+    @packet_handler(MsgType.TRIPOD_LIST_REQ)
     async def _on_tripod_list_req(self, session: PlayerSession, payload: bytes):
         """TRIPOD_LIST_REQ(520): no payload needed.
         Returns all unlocked tripods + equipped selections for the character's class.
@@ -541,6 +532,7 @@ HANDLER_CODE = r'''
         )
         self.log(f"TripodList: {session.char_name} class={class_name} unlocked={total_unlocked}", "TRIPOD")
 
+    @packet_handler(MsgType.TRIPOD_EQUIP)
     async def _on_tripod_equip(self, session: PlayerSession, payload: bytes):
         """TRIPOD_EQUIP(522): skill_id(u16) + tier(u8) + option_idx(u8).
         Result codes: 0=ok, 1=not_in_game, 2=invalid_skill, 3=tier_locked, 4=not_unlocked, 5=need_lower_tier"""
@@ -593,6 +585,7 @@ HANDLER_CODE = r'''
         opt_name = options[option_idx]["name"]
         self.log(f"TripodEquip: {session.char_name} skill={skill_id} tier={tier} -> {opt_name}", "TRIPOD")
 
+    @packet_handler(MsgType.SCROLL_DISCOVER)
     async def _on_scroll_discover(self, session: PlayerSession, payload: bytes):
         """SCROLL_DISCOVER(524): scroll_item_slot(u8).
         Uses a scroll item from inventory to permanently unlock a tripod option.
@@ -730,7 +723,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases
+# 5. Test cases
 # ====================================================================
 TEST_CODE = r'''
     # ---- TASK 15: Tripod & Scroll Tests (S046) ----
@@ -904,19 +897,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession tripod fields (fallback)')
 
-    # 4. Dispatch table -- after auction_bid dispatch
-    if 'self._on_tripod_list_req' not in content:
-        marker = '            MsgType.AUCTION_BID: self._on_auction_bid,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find auction_bid dispatch entry')
-
-    # 5. Handler implementations -- before Auction House handlers
+    # 4. Handler implementations -- before Auction House handlers
     if 'def _on_tripod_list_req' not in content:
         marker = '    # ---- Auction House System (TASK 3: MsgType 390-397) ----'
         idx = content.find(marker)
@@ -108,17 +108,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.BOUNTY_LIST_REQ: self._on_bounty_list_req,\n'
-    '            MsgType.BOUNTY_ACCEPT: self._on_bounty_accept,\n'
-    '            MsgType.BOUNTY_COMPLETE: self._on_bounty_complete,\n'
-    '            MsgType.BOUNTY_RANKING_REQ: self._on_bounty_ranking_req,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Bounty System (TASK 16: MsgType 530-537) ----
@@ -185,6 +175,7 @@ HANDLER_CODE = r'''
             session.bounty_weekly_reset_date = last_wed
             session.bounty_score_weekly = 0
 
+    @packet_handler(MsgType.BOUNTY_LIST_REQ)
     async def _on_bounty_list_req(self, session, payload: bytes):
         """BOUNTY_LIST_REQ(530) -> BOUNTY_LIST(531)
         Response: daily_count(u8) + [bounty_id(u16) + monster_id(u16) + level(u8) + zone_len(u8) + zone(str) +
@@ -242,6 +233,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.BOUNTY_LIST, data)
 
+    @packet_handler(MsgType.BOUNTY_ACCEPT)
     async def _on_bounty_accept(self, session, payload: bytes):
         """BOUNTY_ACCEPT(532) -> BOUNTY_ACCEPT_RESULT(533)
         Payload: bounty_id(u16)
@@ -312,6 +304,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.BOUNTY_ACCEPT_RESULT, struct.pack('<BH', 0, bounty_id))
 
+    @packet_handler(MsgType.BOUNTY_COMPLETE)
     async def _on_bounty_complete(self, session, payload: bytes):
         """BOUNTY_COMPLETE(534) -- server checks on monster kill.
         Also callable by client with payload: bounty_id(u16)
@@ -392,6 +385,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.BOUNTY_COMPLETE,
                   struct.pack('<BHIIB', 0, bounty_id, gold, exp, token))
 
+    @packet_handler(MsgType.BOUNTY_RANKING_REQ)
     async def _on_bounty_ranking_req(self, session, payload: bytes):
         """BOUNTY_RANKING_REQ(535) -> BOUNTY_RANKING(536)
         Response: rank_count(u8) + [rank(u8) + name_len(u8) + name(str) + score(u16)]
@@ -468,7 +462,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (5 tests)
+# 5. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: BOUNTY_LIST_REQ — 현상금 목록 조회 ━━━
@@ -687,19 +681,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession bounty fields (fallback)')
 
-    # 4. Dispatch table -- after scroll_discover dispatch
-    if 'self._on_bounty_list_req' not in content:
-        marker = '            MsgType.SCROLL_DISCOVER: self._on_scroll_discover,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find scroll_discover dispatch entry')
-
-    # 5. Handler implementations -- before Tripod handlers
+    # 4. Handler implementations -- before Tripod handlers
     if 'def _on_bounty_list_req' not in content:
         marker = '    # ---- Tripod & Scroll System (TASK 15: MsgType 520-524) ----'
         idx = content.find(marker)
@@ -116,16 +116,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.DAILY_QUEST_LIST_REQ: self._on_daily_quest_list_req,\n'
-    '            MsgType.WEEKLY_QUEST_REQ: self._on_weekly_quest_req,\n'
-    '            MsgType.REPUTATION_QUERY: self._on_reputation_query,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Quest Enhancement (TASK 4: MsgType 400-405) ----
@@ -202,6 +193,7 @@ HANDLER_CODE = r'''
                 current_tier = tier
         return current_tier["name"], current_tier["min"]
 
+    @packet_handler(MsgType.DAILY_QUEST_LIST_REQ)
     async def _on_daily_quest_list_req(self, session, payload: bytes):
         """DAILY_QUEST_LIST_REQ(400) -> DAILY_QUEST_LIST(401)
         Response: quest_count(u8) + [dq_id(u16) + type_len(u8) + type(str) +
@@ -255,6 +247,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.DAILY_QUEST_LIST, data)
 
+    @packet_handler(MsgType.WEEKLY_QUEST_REQ)
     async def _on_weekly_quest_req(self, session, payload: bytes):
         """WEEKLY_QUEST_REQ(402) -> WEEKLY_QUEST(403)
         Response: has_quest(u8) + [wq_id(u16) + type_len(u8) + type(str) +
@@ -305,6 +298,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.WEEKLY_QUEST, data)
 
+    @packet_handler(MsgType.REPUTATION_QUERY)
     async def _on_reputation_query(self, session, payload: bytes):
         """REPUTATION_QUERY(404) -> REPUTATION_INFO(405)
         Response: faction_count(u8) + [faction_len(u8) + faction(str) +
@@ -373,7 +367,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (4 tests)
+# 5. Test cases (4 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: DAILY_QUEST_LIST — 일일 퀘스트 목록 조회 ━━━
@@ -533,19 +527,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession fields (fallback)')
 
-    # 4. Dispatch table -- after bounty_ranking_req dispatch
-    if 'self._on_daily_quest_list_req' not in content:
-        marker = '            MsgType.BOUNTY_RANKING_REQ: self._on_bounty_ranking_req,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find bounty_ranking_req dispatch entry')
-
-    # 5. Handler implementations -- before Bounty handlers
+    # 4. Handler implementations -- before Bounty handlers
     if 'def _on_daily_quest_list_req' not in content:
         marker = '    # ---- Bounty System (TASK 16: MsgType 530-537) ----'
         idx = content.find(marker)
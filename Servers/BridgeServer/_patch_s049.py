@@ -155,17 +155,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.TITLE_LIST_REQ: self._on_title_list_req,\n'
-    '            MsgType.TITLE_EQUIP: self._on_title_equip,\n'
-    '            MsgType.COLLECTION_QUERY: self._on_collection_query,\n'
-    '            MsgType.JOB_CHANGE_REQ: self._on_job_change_req,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Progression Deepening (TASK 7: MsgType 440-447) ----
@@ -197,6 +187,7 @@ HANDLER_CODE = r'''
                 newly_unlocked.append(tid)
         return newly_unlocked
 
+    @packet_handler(MsgType.TITLE_LIST_REQ)
     async def _on_title_list_req(self, session, payload: bytes):
         """TITLE_LIST_REQ(440) -> TITLE_LIST(441)
         Response: equipped_id(u16) + count(u8) + [title_id(u16) + name_len(u8) + name(str) +
@@ -219,6 +210,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<H B', title["bonus_value"], is_unlocked)
         self._send(session, MsgType.TITLE_LIST, data)
 
+    @packet_handler(MsgType.TITLE_EQUIP)
     async def _on_title_equip(self, session, payload: bytes):
         """TITLE_EQUIP(442) -> TITLE_EQUIP_RESULT(443)
         Request: title_id(u16) — 0 to unequip
@@ -252,6 +244,7 @@ HANDLER_CODE = r'''
         session.title_equipped = title_id
         self._send(session, MsgType.TITLE_EQUIP_RESULT, struct.pack('<B H', 0, title_id))
 
+    @packet_handler(MsgType.COLLECTION_QUERY)
     async def _on_collection_query(self, session, payload: bytes):
         """COLLECTION_QUERY(444) -> COLLECTION_INFO(445)
         Response: monster_cat_count(u8) + [cat_id(u8) + name_len(u8) + name(str) +
@@ -294,6 +287,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.COLLECTION_INFO, data)
 
+    @packet_handler(MsgType.JOB_CHANGE_REQ)
     async def _on_job_change_req(self, session, payload: bytes):
         """JOB_CHANGE_REQ(446) -> JOB_CHANGE_RESULT(447)
         Request: job_name_len(u8) + job_name(str) — e.g. "berserker", "guardian"
@@ -398,7 +392,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (5 tests)
+# 5. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: TITLE_LIST — 칭호 목록 조회 ━━━
@@ -573,19 +567,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession fields (fallback)')
 
-    # 4. Dispatch table -- after reputation_query dispatch
-    if 'self._on_title_list_req' not in content:
-        marker = '            MsgType.REPUTATION_QUERY: self._on_reputation_query,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find reputation_query dispatch entry')
-
-    # 5. Handler implementations -- before Quest Enhancement handlers
+    # 4. Handler implementations -- before Quest Enhancement handlers
     if 'def _on_title_list_req' not in content:
         marker = '    # ---- Quest Enhancement (TASK 4: MsgType 400-405) ----'
         idx = content.find(marker)
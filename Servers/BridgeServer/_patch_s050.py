@@ -101,22 +101,12 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.GEM_EQUIP: self._on_gem_equip,\n'
-    '            MsgType.GEM_FUSE: self._on_gem_fuse,\n'
-    '            MsgType.ENGRAVING_LIST_REQ: self._on_engraving_list_req,\n'
-    '            MsgType.ENGRAVING_EQUIP: self._on_engraving_equip,\n'
-    '            MsgType.TRANSCEND_REQ: self._on_transcend_req,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Enhancement Deepening (TASK 8: MsgType 450-459) ----
 
+    @packet_handler(MsgType.GEM_EQUIP)
     async def _on_gem_equip(self, session, payload: bytes):
         """GEM_EQUIP(450) -> GEM_EQUIP_RESULT(451)
         Request: action(u8) + gem_id(u16) + slot_len(u8) + slot(str)
@@ -188,6 +178,7 @@ HANDLER_CODE = r'''
             else:
                 _send_gem_result(1)  # GEM_NOT_FOUND (not in that slot)
 
+    @packet_handler(MsgType.GEM_FUSE)
     async def _on_gem_fuse(self, session, payload: bytes):
         """GEM_FUSE(452) -> GEM_FUSE_RESULT(453)
         Request: gem_type_len(u8) + gem_type(str) + tier(u8) — fuse 3 gems of this type+tier
@@ -258,6 +249,7 @@ HANDLER_CODE = r'''
 
         _send_fuse_result(0, new_gem["gem_id"], new_tier, gold_cost)
 
+    @packet_handler(MsgType.ENGRAVING_LIST_REQ)
     async def _on_engraving_list_req(self, session, payload: bytes):
         """ENGRAVING_LIST_REQ(454) -> ENGRAVING_LIST(455)
         Response: count(u8) + [name_len(u8) + name(str) + name_kr_len(u8) + name_kr(str) +
@@ -296,6 +288,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.ENGRAVING_LIST, data)
 
+    @packet_handler(MsgType.ENGRAVING_EQUIP)
     async def _on_engraving_equip(self, session, payload: bytes):
         """ENGRAVING_EQUIP(456) -> ENGRAVING_RESULT(457)
         Request: action(u8) + name_len(u8) + name(str)
@@ -342,6 +335,7 @@ HANDLER_CODE = r'''
             else:
                 _send_eng_result(3)  # NOT_ACTIVE
 
+    @packet_handler(MsgType.TRANSCEND_REQ)
     async def _on_transcend_req(self, session, payload: bytes):
         """TRANSCEND_REQ(458) -> TRANSCEND_RESULT(459)
         Request: slot_len(u8) + slot(str) — equipment slot to transcend (e.g. "weapon")
@@ -399,7 +393,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Enhancement Pity System — patch existing ENHANCE handler
+# 5. Enhancement Pity System — patch existing ENHANCE handler
 # ====================================================================
 PITY_PATCH_CODE = r'''
     def _apply_enhance_pity(self, session, slot, base_rate):
@@ -419,7 +413,7 @@ PITY_PATCH_CODE = r'''
 '''
 
 # ====================================================================
-# 7. Test cases (5 tests)
+# 6. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: GEM_EQUIP — 보석 장착/해제 ━━━
@@ -588,19 +582,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession fields (fallback)')
 
-    # 4. Dispatch table -- after job_change_req dispatch
-    if 'self._on_gem_equip' not in content:
-        marker = '            MsgType.JOB_CHANGE_REQ: self._on_job_change_req,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find job_change_req dispatch entry')
-
-    # 5. Handler implementations -- before Progression Deepening handlers
+    # 4. Handler implementations -- before Progression Deepening handlers
     if 'def _on_gem_equip' not in content:
         marker = '    # ---- Progression Deepening (TASK 7: MsgType 440-447) ----'
         idx = content.find(marker)
@@ -615,7 +597,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find handler insertion point')
 
-    # 6. Pity system helper methods -- after handlers
+    # 5. Pity system helper methods -- after handlers
     if '_apply_enhance_pity' not in content:
         # Insert after the HANDLER_CODE block we just added
         marker = '    # ---- Progression Deepening (TASK 7: MsgType 440-447) ----'
@@ -627,7 +609,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find pity insertion point')
 
-    # 7. Add enhance_levels field to PlayerSession if not present
+    # 6. Add enhance_levels field to PlayerSession if not present
     if 'enhance_levels: dict' not in content:
         marker = '    protection_scrolls: int = 0'
         idx = content.find(marker)
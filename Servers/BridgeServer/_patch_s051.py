@@ -88,21 +88,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.FRIEND_REQUEST: self._on_friend_request,\n'
-    '            MsgType.FRIEND_ACCEPT: self._on_friend_accept,\n'
-    '            MsgType.FRIEND_REJECT: self._on_friend_reject,\n'
-    '            MsgType.FRIEND_LIST_REQ: self._on_friend_list_req,\n'
-    '            MsgType.BLOCK_PLAYER: self._on_block_player,\n'
-    '            MsgType.BLOCK_LIST_REQ: self._on_block_list_req,\n'
-    '            MsgType.PARTY_FINDER_LIST_REQ: self._on_party_finder_list_req,\n'
-    '            MsgType.PARTY_FINDER_CREATE: self._on_party_finder_create,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Social Enhancement (TASK 5: MsgType 410-422) ----
@@ -114,6 +100,7 @@ HANDLER_CODE = r'''
                 return s
         return None
 
+    @packet_handler(MsgType.FRIEND_REQUEST)
     async def _on_friend_request(self, session, payload: bytes):
         """FRIEND_REQUEST(410) -> FRIEND_REQUEST_RESULT(411)
         Request: target_name_len(u8) + target_name(str)
@@ -182,6 +169,7 @@ HANDLER_CODE = r'''
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_ACCEPT)
     async def _on_friend_accept(self, session, payload: bytes):
         """FRIEND_ACCEPT(412) -> FRIEND_REQUEST_RESULT(411)
         Request: from_name_len(u8) + from_name(str)
@@ -228,6 +216,7 @@ HANDLER_CODE = r'''
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_REJECT)
     async def _on_friend_reject(self, session, payload: bytes):
         """FRIEND_REJECT(413) -> FRIEND_REQUEST_RESULT(411)
         Request: from_name_len(u8) + from_name(str)
@@ -261,6 +250,7 @@ HANDLER_CODE = r'''
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_LIST_REQ)
     async def _on_friend_list_req(self, session, payload: bytes):
         """FRIEND_LIST_REQ(414) -> FRIEND_LIST(415)
         Response: count(u8) + [name_len(u8) + name(str) + is_online(u8) + zone_id(u16)]"""
@@ -281,6 +271,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.FRIEND_LIST, data)
 
+    @packet_handler(MsgType.BLOCK_PLAYER)
     async def _on_block_player(self, session, payload: bytes):
         """BLOCK_PLAYER(416) -> BLOCK_RESULT(417)
         Request: action(u8) + name_len(u8) + name(str)
@@ -326,6 +317,7 @@ HANDLER_CODE = r'''
             session.blocked_players.remove(target_name)
             _send_result(0)
 
+    @packet_handler(MsgType.BLOCK_LIST_REQ)
     async def _on_block_list_req(self, session, payload: bytes):
         """BLOCK_LIST_REQ(418) -> BLOCK_LIST(419)
         Response: count(u8) + [name_len(u8) + name(str)]"""
@@ -341,6 +333,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.BLOCK_LIST, data)
 
+    @packet_handler(MsgType.PARTY_FINDER_LIST_REQ)
     async def _on_party_finder_list_req(self, session, payload: bytes):
         """PARTY_FINDER_LIST_REQ(420) -> PARTY_FINDER_LIST(421)
         Request: category(u8)  — 0xFF=all, 0~4=specific category
@@ -368,6 +361,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.PARTY_FINDER_LIST, data)
 
+    @packet_handler(MsgType.PARTY_FINDER_CREATE)
     async def _on_party_finder_create(self, session, payload: bytes):
         """PARTY_FINDER_CREATE(422) -> PARTY_FINDER_LIST(421) (echo back updated list)
         Request: title_len(u8) + title(str) + category(u8) + min_level(u8) + role(u8)
@@ -426,7 +420,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (5 tests)
+# 5. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: FRIEND_REQUEST — 친구 요청 ━━━
@@ -603,19 +597,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession social fields (fallback)')
 
-    # 4. Dispatch table -- after transcend_req dispatch
-    if 'self._on_friend_request' not in content:
-        marker = '            MsgType.TRANSCEND_REQ: self._on_transcend_req,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find transcend_req dispatch entry')
-
-    # 5. Handler implementations -- before Enhancement Deepening handlers
+    # 4. Handler implementations -- before Enhancement Deepening handlers
     if 'def _on_friend_request' not in content:
         marker = '    # ---- Enhancement Deepening (TASK 8: MsgType 450-459) ----'
         idx = content.find(marker)
@@ -630,7 +612,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find handler insertion point')
 
-    # 6. Add 'import time' if not present (needed for party finder timestamps)
+    # 5. Add 'import time' if not present (needed for party finder timestamps)
     if '\nimport time\n' not in content and '\nimport time ' not in content:
         # Add after 'import struct'
         idx = content.find('import struct')
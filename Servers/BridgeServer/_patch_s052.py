@@ -111,16 +111,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.REPAIR_REQ: self._on_repair_req,\n'
-    '            MsgType.REROLL_REQ: self._on_reroll_req,\n'
-    '            MsgType.DURABILITY_QUERY: self._on_durability_query,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations (inventory-based)
+# 4. Handler implementations (inventory-based)
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Durability / Repair / Reroll (TASK 9: MsgType 462-467) ----
@@ -188,6 +179,7 @@ HANDLER_CODE = r'''
         for inv_idx, dur, newly_broken in results:
             self._send_durability_notify(session, inv_idx, dur, dur <= 0)
 
+    @packet_handler(MsgType.REPAIR_REQ)
     async def _on_repair_req(self, session, payload: bytes):
         """REPAIR_REQ(462) -> REPAIR_RESULT(463)
         Request: mode(u8) + inv_slot(u8)
@@ -254,6 +246,7 @@ HANDLER_CODE = r'''
 
         _send_result(0, total_cost, len(repairs))
 
+    @packet_handler(MsgType.REROLL_REQ)
     async def _on_reroll_req(self, session, payload: bytes):
         """REROLL_REQ(464) -> REROLL_RESULT(465)
         Request: inv_slot(u8) + lock_count(u8) + [lock_idx(u8)]
@@ -352,6 +345,7 @@ HANDLER_CODE = r'''
         session.equipment_random_opts[inv_slot] = new_opts
         _send_result(0, new_opts)
 
+    @packet_handler(MsgType.DURABILITY_QUERY)
     async def _on_durability_query(self, session, payload: bytes):
         """DURABILITY_QUERY(467) -> DURABILITY_NOTIFY(466) per equipped slot
         Request: (empty)
@@ -367,7 +361,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Hook into STAT_TAKE_DMG for durability decrease on hit
+# 5. Hook into STAT_TAKE_DMG for durability decrease on hit
 # ====================================================================
 DURABILITY_HOOK_TAKE_DMG = (
     '        # ---- Durability hook: decrease on hit taken ----\n'
@@ -375,7 +369,7 @@ DURABILITY_HOOK_TAKE_DMG = (
 )
 
 # ====================================================================
-# 7. Test cases (5 tests)
+# 6. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: DURABILITY_QUERY — 내구도 조회 ━━━
@@ -536,14 +530,6 @@ def patch_bridge():
                 content = content.replace(line, '')
             print('[bridge] Removed old session fields')
 
-        # Remove old dispatch entries
-        for line in [
-            '            MsgType.REPAIR_REQ: self._on_repair_req,\n',
-            '            MsgType.REROLL_REQ: self._on_reroll_req,\n',
-            '            MsgType.DURABILITY_QUERY: self._on_durability_query,\n',
-        ]:
-            content = content.replace(line, '')
-
         # Remove old hooks
         content = content.replace(
             '        # ---- Durability hook: decrease on hit taken ----\n'
@@ -598,19 +584,7 @@ def patch_bridge():
                 changed = True
                 print('[bridge] Added PlayerSession durability fields (fallback)')
 
-    # 4. Dispatch table -- after party_finder_create dispatch
-    if 'self._on_repair_req' not in content:
-        marker = '            MsgType.PARTY_FINDER_CREATE: self._on_party_finder_create,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find party_finder_create dispatch entry')
-
-    # 5. Handler implementations -- before Social Enhancement handlers
+    # 4. Handler implementations -- before Social Enhancement handlers
     if 'def _on_repair_req' not in content:
         marker = '    # ---- Social Enhancement (TASK 5: MsgType 410-422) ----'
         idx = content.find(marker)
@@ -624,7 +598,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find handler insertion point')
 
-    # 6. Hook into STAT_TAKE_DMG handler — after HP decrease
+    # 5. Hook into STAT_TAKE_DMG handler — after HP decrease
     if '_on_durability_take_hit' not in content:
         hook_marker = 'session.stats.hp = max(0, session.stats.hp - actual)'
         idx = content.find(hook_marker)
@@ -636,7 +610,7 @@ def patch_bridge():
         else:
             print('[bridge] NOTE: Could not find STAT_TAKE_DMG HP decrease — hook skipped')
 
-    # 7. Add 'import random' if not present (needed for reroll)
+    # 6. Add 'import random' if not present (needed for reroll)
     if '\nimport random\n' not in content:
         idx = content.find('import struct')
         if idx >= 0:
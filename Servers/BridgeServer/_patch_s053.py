@@ -126,20 +126,12 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.BATTLEGROUND_QUEUE: self._on_battleground_queue,\n'
-    '            MsgType.BATTLEGROUND_SCORE: self._on_battleground_score,\n'
-    '            MsgType.GUILD_WAR_DECLARE: self._on_guild_war_declare,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Battleground / Guild War (TASK 6: MsgType 430-435) ----
 
+    @packet_handler(MsgType.BATTLEGROUND_QUEUE)
     async def _on_battleground_queue(self, session, payload: bytes):
         """BATTLEGROUND_QUEUE(430) -> BATTLEGROUND_STATUS(431)
         Request: action(u8) + mode(u8)
@@ -236,6 +228,7 @@ HANDLER_CODE = r'''
             # Still waiting
             _send_status(0, 0, mode, 0, len(q))  # QUEUED
 
+    @packet_handler(MsgType.BATTLEGROUND_SCORE)
     async def _on_battleground_score(self, session, payload: bytes):
         """BATTLEGROUND_SCORE(432) -> BATTLEGROUND_SCORE_UPDATE(433)
         Request: action(u8) + point_index(u8)
@@ -352,6 +345,7 @@ HANDLER_CODE = r'''
                     s.bg_team = 0
                     break
 
+    @packet_handler(MsgType.GUILD_WAR_DECLARE)
     async def _on_guild_war_declare(self, session, payload: bytes):
         """GUILD_WAR_DECLARE(434) -> GUILD_WAR_STATUS(435)
         Request: action(u8) + target_guild_id(u32)
@@ -471,7 +465,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (5 tests)
+# 5. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: BG_QUEUE — 전장 큐 등록/취소 ━━━
@@ -625,28 +619,7 @@ def patch_bridge():
             else:
                 print('[bridge] WARNING: Could not find session fields insertion point')
 
-    # 4. Dispatch table -- after durability_query dispatch
-    if 'self._on_battleground_queue' not in content:
-        marker = '            MsgType.DURABILITY_QUERY: self._on_durability_query,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            # Fallback: after party_finder_create dispatch
-            marker2 = '            MsgType.PARTY_FINDER_CREATE: self._on_party_finder_create,'
-            idx2 = content.find(marker2)
-            if idx2 >= 0:
-                end = content.index('\n', idx2) + 1
-                content = content[:end] + DISPATCH_ENTRIES + content[end:]
-                changed = True
-                print('[bridge] Added dispatch table entries (fallback)')
-            else:
-                print('[bridge] WARNING: Could not find dispatch table insertion point')
-
-    # 5. Handler implementations -- before Durability handlers
+    # 4. Handler implementations -- before Durability handlers
     if 'def _on_battleground_queue' not in content:
         marker = '    # ---- Durability / Repair / Reroll (TASK 9: MsgType 462-467) ----'
         idx = content.find(marker)
@@ -124,20 +124,12 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.CURRENCY_QUERY: self._on_currency_query,\n'
-    '            MsgType.TOKEN_SHOP_LIST: self._on_token_shop_list,\n'
-    '            MsgType.TOKEN_SHOP_BUY: self._on_token_shop_buy,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Sub-Currency / Token Shop (TASK 10: MsgType 468-473) ----
 
+    @packet_handler(MsgType.CURRENCY_QUERY)
     async def _on_currency_query(self, session, payload: bytes):
         """CURRENCY_QUERY(468) -> CURRENCY_INFO(469)
         Request: (empty or u8 currency_type — 0=all, 1=gold, 2=silver, 3=dungeon, 4=pvp, 5=guild)
@@ -154,6 +146,7 @@ HANDLER_CODE = r'''
                                min(session.pvp_token, CURRENCY_MAX["pvp_token"]),
                                min(session.guild_contribution, CURRENCY_MAX["guild_contribution"])))
 
+    @packet_handler(MsgType.TOKEN_SHOP_LIST)
     async def _on_token_shop_list(self, session, payload: bytes):
         """TOKEN_SHOP_LIST(470) -> TOKEN_SHOP(471)
         Request: shop_type(u8) — 0=dungeon, 1=pvp, 2=guild
@@ -182,6 +175,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.TOKEN_SHOP, data)
 
+    @packet_handler(MsgType.TOKEN_SHOP_BUY)
     async def _on_token_shop_buy(self, session, payload: bytes):
         """TOKEN_SHOP_BUY(472) -> TOKEN_SHOP_BUY_RESULT(473)
         Request: shop_id(u16) + quantity(u8)
@@ -235,7 +229,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Silver payment patch for SHOP_BUY handler
+# 5. Silver payment patch for SHOP_BUY handler
 # ====================================================================
 SILVER_PATCH_CODE = r'''
         # ---- Silver currency branch (TASK 10) ----
@@ -258,7 +252,7 @@ SILVER_PATCH_CODE = r'''
 '''
 
 # ====================================================================
-# 7. Dungeon/PvP token reward hooks
+# 6. Dungeon/PvP token reward hooks
 # ====================================================================
 DUNGEON_TOKEN_HOOK = r'''
             # ---- Dungeon token reward (TASK 10) ----
@@ -275,7 +269,7 @@ PVP_TOKEN_HOOK = r'''
 '''
 
 # ====================================================================
-# 8. Test cases (4 tests)
+# 7. Test cases (4 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: CURRENCY_QUERY — 전체 화폐 조회 ━━━
@@ -423,28 +417,7 @@ def patch_bridge():
             else:
                 print('[bridge] WARNING: Could not find session fields insertion point')
 
-    # 4. Dispatch table -- after guild_war_declare dispatch
-    if 'self._on_currency_query' not in content:
-        marker = '            MsgType.GUILD_WAR_DECLARE: self._on_guild_war_declare,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            # Fallback: after durability_query dispatch
-            marker2 = '            MsgType.DURABILITY_QUERY: self._on_durability_query,'
-            idx2 = content.find(marker2)
-            if idx2 >= 0:
-                end = content.index('\n', idx2) + 1
-                content = content[:end] + DISPATCH_ENTRIES + content[end:]
-                changed = True
-                print('[bridge] Added dispatch table entries (fallback)')
-            else:
-                print('[bridge] WARNING: Could not find dispatch table insertion point')
-
-    # 5. Handler implementations -- before Battleground handlers or at end of handlers
+    # 4. Handler implementations -- before Battleground handlers or at end of handlers
     if 'def _on_currency_query' not in content:
         marker = '    # ---- Battleground / Guild War (TASK 6: MsgType 430-435) ----'
         idx = content.find(marker)
@@ -459,7 +432,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find handler insertion point')
 
-    # 6. Silver payment patch — inject into SHOP_BUY handler
+    # 5. Silver payment patch — inject into SHOP_BUY handler
     # We need to add the silver branch right after the shop_buy handler processes item_id
     # Look for the pattern where SHOP_BUY processes gold payment
     if 'Silver currency branch' not in content:
@@ -503,7 +476,7 @@ def patch_bridge():
         else:
             print('[bridge] NOTE: SHOP_BUY handler not found -- silver branch skipped (may be a simplified handler)')
 
-    # 7. Dungeon token hook — after raid clear gold award
+    # 6. Dungeon token hook — after raid clear gold award
     if 'Dungeon token reward (TASK 10)' not in content:
         # Target: _raid_clear method, specifically "s.gold += rewards["gold"]" line
         raid_fn_marker = "async def _raid_clear(self, inst_id: int):"
@@ -523,7 +496,7 @@ def patch_bridge():
         else:
             print('[bridge] NOTE: _raid_clear not found -- dungeon token hook skipped')
 
-    # 8. PvP token hook — after battleground end match (bg_end_match)
+    # 7. PvP token hook — after battleground end match (bg_end_match)
     if 'PvP token reward (TASK 10)' not in content:
         pvp_marker = "def _bg_end_match(self, match_id, winner_team):"
         pidx = content.find(pvp_marker)
@@ -140,16 +140,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.SECRET_REALM_ENTER: self._on_secret_realm_enter,\n'
-    '            MsgType.SECRET_REALM_COMPLETE: self._on_secret_realm_complete,\n'
-    '            MsgType.SECRET_REALM_FAIL: self._on_secret_realm_fail,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Secret Realm System (TASK 17: MsgType 540-544) ----
@@ -255,6 +246,7 @@ HANDLER_CODE = r'''
             if s.in_game and s.zone_id == zone_id:
                 self._send(s, MsgType.SECRET_REALM_SPAWN, data)
 
+    @packet_handler(MsgType.SECRET_REALM_ENTER)
     async def _on_secret_realm_enter(self, session, payload: bytes):
         """SECRET_REALM_ENTER(541) -> SECRET_REALM_ENTER_RESULT(542)
         Request: zone_id(u8) [+ auto_spawn(u8) — optional: 1=auto-create portal if none]
@@ -347,6 +339,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.SECRET_REALM_ENTER_RESULT,
                    struct.pack('<B H B H B H', 0, instance_id, rt_idx, time_limit, is_special, mult_u16))
 
+    @packet_handler(MsgType.SECRET_REALM_COMPLETE)
     async def _on_secret_realm_complete(self, session, payload: bytes):
         """SECRET_REALM_COMPLETE(543)
         Request: score_value(u16) + extra_data(u8) — interpretation depends on realm_type
@@ -403,6 +396,7 @@ HANDLER_CODE = r'''
         session.realm_instance_id = 0
         _REALM_INSTANCES.pop(instance_id, None)
 
+    @packet_handler(MsgType.SECRET_REALM_FAIL)
     async def _on_secret_realm_fail(self, session, payload: bytes):
         """SECRET_REALM_FAIL(544)
         Request: (empty)
@@ -429,7 +423,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (4 tests)
+# 5. Test cases (4 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ━━━ Test: SECRET_REALM_ENTER — 비경 입장 (레벨 부족) ━━━
@@ -594,28 +588,7 @@ def patch_bridge():
             else:
                 print('[bridge] WARNING: Could not find session fields insertion point')
 
-    # 4. Dispatch table -- after token_shop_buy dispatch
-    if 'self._on_secret_realm_enter' not in content:
-        marker = '            MsgType.TOKEN_SHOP_BUY: self._on_token_shop_buy,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            # Fallback: after currency_query dispatch
-            marker2 = '            MsgType.CURRENCY_QUERY: self._on_currency_query,'
-            idx2 = content.find(marker2)
-            if idx2 >= 0:
-                end = content.index('\n', idx2) + 1
-                content = content[:end] + DISPATCH_ENTRIES + content[end:]
-                changed = True
-                print('[bridge] Added dispatch table entries (fallback)')
-            else:
-                print('[bridge] WARNING: Could not find dispatch table insertion point')
-
-    # 5. Handler implementations -- before Sub-Currency handlers (or at end of handlers)
+    # 4. Handler implementations -- before Sub-Currency handlers (or at end of handlers)
     if 'def _on_secret_realm_enter' not in content:
         marker = '    # ---- Sub-Currency / Token Shop (TASK 10: MsgType 468-473) ----'
         idx = content.find(marker)
@@ -128,20 +128,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            MsgType.MENTOR_SEARCH: self._on_mentor_search,\n'
-    '            MsgType.MENTOR_REQUEST: self._on_mentor_request,\n'
-    '            MsgType.MENTOR_ACCEPT: self._on_mentor_accept,\n'
-    '            MsgType.MENTOR_QUEST_LIST: self._on_mentor_quest_list,\n'
-    '            MsgType.MENTOR_GRADUATE: self._on_mentor_graduate,\n'
-    '            MsgType.MENTOR_SHOP_LIST: self._on_mentor_shop_list,\n'
-    '            MsgType.MENTOR_SHOP_BUY: self._on_mentor_shop_buy,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ---- Mentorship System (TASK 18: MsgType 550-560) ----
@@ -195,6 +182,7 @@ HANDLER_CODE = r'''
                 s.stats.exp += bonus
                 break
 
+    @packet_handler(MsgType.MENTOR_SEARCH)
     async def _on_mentor_search(self, session, payload: bytes):
         """MENTOR_SEARCH(550) -> MENTOR_LIST(551)
         Request: search_type(u8) — 0=search_masters, 1=search_disciples
@@ -237,6 +225,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.MENTOR_LIST, data)
 
+    @packet_handler(MsgType.MENTOR_REQUEST)
     async def _on_mentor_request(self, session, payload: bytes):
         """MENTOR_REQUEST(552) -> MENTOR_REQUEST_RESULT(553)
         Request: target_eid(u32) + role(u8) — role: 0=I want to be disciple, 1=I want to be master
@@ -314,6 +303,7 @@ HANDLER_CODE = r'''
 
         _send_result(0)  # REQUEST_SENT
 
+    @packet_handler(MsgType.MENTOR_ACCEPT)
     async def _on_mentor_accept(self, session, payload: bytes):
         """MENTOR_ACCEPT(554) -> MENTOR_ACCEPT_RESULT(555)
         Request: accept(u8) — 0=reject, 1=accept
@@ -392,6 +382,7 @@ HANDLER_CODE = r'''
             self._send(from_s, MsgType.MENTOR_ACCEPT_RESULT,
                        struct.pack('<B I I', 0, master_eid, disciple_eid))
 
+    @packet_handler(MsgType.MENTOR_QUEST_LIST)
     async def _on_mentor_quest_list(self, session, payload: bytes):
         """MENTOR_QUEST_LIST(556) -> MENTOR_QUESTS(557)
         Request: (empty)
@@ -448,6 +439,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.MENTOR_QUESTS, data)
 
+    @packet_handler(MsgType.MENTOR_GRADUATE)
     async def _on_mentor_graduate(self, session, payload: bytes):
         """MENTOR_GRADUATE(558) — auto-triggered when disciple reaches Lv30.
         Can also be called explicitly to check & trigger graduation.
@@ -540,6 +532,7 @@ HANDLER_CODE = r'''
             if s.in_game:
                 self._send(s, MsgType.MENTOR_GRADUATE, broadcast_data)
 
+    @packet_handler(MsgType.MENTOR_SHOP_LIST)
     async def _on_mentor_shop_list(self, session, payload: bytes):
         """MENTOR_SHOP_LIST(559) -> MENTOR_SHOP(560 as list response reuse)
         Request: (empty)
@@ -555,6 +548,7 @@ HANDLER_CODE = r'''
             data += name_bytes
         self._send(session, MsgType.MENTOR_SHOP_LIST, data)
 
+    @packet_handler(MsgType.MENTOR_SHOP_BUY)
     async def _on_mentor_shop_buy(self, session, payload: bytes):
         """MENTOR_SHOP_BUY(560)
         Request: item_id(u8)
@@ -589,7 +583,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (5 tests)
+# 5. Test cases (5 tests)
 # ====================================================================
 TEST_CODE = r'''
     # Helper: login_and_enter with entity_id tracking
@@ -785,28 +779,7 @@ def patch_bridge():
             else:
                 print('[bridge] WARNING: Could not find session fields insertion point')
 
-    # 4. Dispatch table -- after secret_realm_fail dispatch
-    if 'self._on_mentor_search' not in content:
-        marker = '            MsgType.SECRET_REALM_FAIL: self._on_secret_realm_fail,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added dispatch table entries')
-        else:
-            # Fallback: after secret_realm_complete dispatch
-            marker2 = '            MsgType.SECRET_REALM_COMPLETE: self._on_secret_realm_complete,'
-            idx2 = content.find(marker2)
-            if idx2 >= 0:
-                end = content.index('\n', idx2) + 1
-                content = content[:end] + DISPATCH_ENTRIES + content[end:]
-                changed = True
-                print('[bridge] Added dispatch table entries (fallback)')
-            else:
-                print('[bridge] WARNING: Could not find dispatch table insertion point')
-
-    # 5. Handler implementations -- before Secret Realm handlers
+    # 4. Handler implementations -- before Secret Realm handlers
     if 'def _on_mentor_search' not in content:
         marker = '    # ---- Secret Realm System (TASK 17: MsgType 540-544) ----'
         idx = content.find(marker)
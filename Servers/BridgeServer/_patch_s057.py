@@ -349,38 +349,7 @@ SESSION_FIELDS = (
 )
 
 # ====================================================================
-# 4. Dispatch table entries
-# ====================================================================
-DISPATCH_ENTRIES = (
-    '            # TASK 11: Cash Shop / BP / Event\n'
-    '            MsgType.CASH_SHOP_LIST_REQ: self._on_cash_shop_list,\n'
-    '            MsgType.CASH_SHOP_BUY: self._on_cash_shop_buy,\n'
-    '            MsgType.BATTLEPASS_INFO_REQ: self._on_battlepass_info,\n'
-    '            MsgType.BATTLEPASS_CLAIM: self._on_battlepass_claim,\n'
-    '            MsgType.EVENT_LIST_REQ: self._on_event_list,\n'
-    '            MsgType.EVENT_CLAIM: self._on_event_claim,\n'
-    '            MsgType.SUBSCRIPTION_INFO: self._on_subscription_info,\n'
-    '            MsgType.SUBSCRIPTION_BUY: self._on_subscription_buy,\n'
-    '            # TASK 12: World System\n'
-    '            MsgType.WEATHER_INFO_REQ: self._on_weather_info,\n'
-    '            MsgType.TELEPORT_REQ: self._on_teleport_req,\n'
-    '            MsgType.WAYPOINT_DISCOVER: self._on_waypoint_discover,\n'
-    '            MsgType.DESTROY_OBJECT: self._on_destroy_object,\n'
-    '            MsgType.INTERACT_OBJECT: self._on_interact_object,\n'
-    '            MsgType.MOUNT_SUMMON: self._on_mount_summon,\n'
-    '            # TASK 13: Login Reward / Reset\n'
-    '            MsgType.LOGIN_REWARD_REQ: self._on_login_reward_req,\n'
-    '            MsgType.LOGIN_REWARD_CLAIM: self._on_login_reward_claim,\n'
-    '            MsgType.CONTENT_UNLOCK_QUERY: self._on_content_unlock_query,\n'
-    '            # TASK 14: Story / Dialog\n'
-    '            MsgType.DIALOG_CHOICE: self._on_dialog_choice,\n'
-    '            MsgType.CUTSCENE_TRIGGER: self._on_cutscene_trigger,\n'
-    '            MsgType.CHAPTER_PROGRESS_REQ: self._on_chapter_progress_req,\n'
-    '            MsgType.MAIN_QUEST_DATA_REQ: self._on_main_quest_data_req,\n'
-)
-
-# ====================================================================
-# 5. Handler implementations
+# 4. Handler implementations
 # ====================================================================
 HANDLER_CODE = r'''
     # ================================================================
@@ -388,6 +357,7 @@ HANDLER_CODE = r'''
     # MsgType 474-489
     # ================================================================
 
+    @packet_handler(MsgType.CASH_SHOP_LIST_REQ)
     async def _on_cash_shop_list(self, session, payload: bytes):
         """CASH_SHOP_LIST_REQ(474) -> CASH_SHOP_LIST(475)
         Request: category_len(u8) + category(utf8)  (empty = all)
@@ -416,6 +386,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<B', len(cat_b)) + cat_b
         self._send(session, MsgType.CASH_SHOP_LIST, data)
 
+    @packet_handler(MsgType.CASH_SHOP_BUY)
     async def _on_cash_shop_buy(self, session, payload: bytes):
         """CASH_SHOP_BUY(476) -> CASH_SHOP_BUY_RESULT(477)
         Request: item_id(u8)
@@ -449,6 +420,7 @@ HANDLER_CODE = r'''
         _CASH_SHOP_PURCHASES[eid][item_id] = bought + 1
         self._send(session, MsgType.CASH_SHOP_BUY_RESULT, struct.pack('<B I', 0, session.crystal))
 
+    @packet_handler(MsgType.BATTLEPASS_INFO_REQ)
     async def _on_battlepass_info(self, session, payload: bytes):
         """BATTLEPASS_INFO_REQ(478) -> BATTLEPASS_INFO(479)
         Response: level(u8) + exp(u16) + exp_needed(u16) + premium(u8) + claimed_free_bits(u64) + claimed_premium_bits(u64)
@@ -474,6 +446,7 @@ HANDLER_CODE = r'''
                            claimed_free_bits, claimed_prem_bits)
         self._send(session, MsgType.BATTLEPASS_INFO, data)
 
+    @packet_handler(MsgType.BATTLEPASS_CLAIM)
     async def _on_battlepass_claim(self, session, payload: bytes):
         """BATTLEPASS_CLAIM(480) -> BATTLEPASS_CLAIM_RESULT(481)
         Request: level(u8) + track(u8) — track: 0=free, 1=premium
@@ -542,6 +515,7 @@ HANDLER_CODE = r'''
         session.bp_level = state["level"]
         session.bp_exp = state["exp"]
 
+    @packet_handler(MsgType.EVENT_LIST_REQ)
     async def _on_event_list(self, session, payload: bytes):
         """EVENT_LIST_REQ(482) -> EVENT_LIST(483)
         Response: count(u8) + [id(u8) + type_len(u8) + type(utf8) + name_len(u8) + name(utf8) + active(u8)] * count
@@ -558,6 +532,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<B', 1)  # active
         self._send(session, MsgType.EVENT_LIST, data)
 
+    @packet_handler(MsgType.EVENT_CLAIM)
     async def _on_event_claim(self, session, payload: bytes):
         """EVENT_CLAIM(484) -> EVENT_CLAIM_RESULT(485)
         Request: event_id(u8) + day(u8) — day for login events
@@ -606,6 +581,7 @@ HANDLER_CODE = r'''
         session.gold = min(session.gold + gold_reward, 999999999)
         self._send(session, MsgType.EVENT_CLAIM_RESULT, struct.pack('<B B I', 0, event_id, gold_reward))
 
+    @packet_handler(MsgType.SUBSCRIPTION_INFO)
     async def _on_subscription_info(self, session, payload: bytes):
         """SUBSCRIPTION_INFO(486) -> SUBSCRIPTION_STATUS(487)
         Response: active(u8) + remaining_days(u16) + crystal(u32) + benefits_count(u8) + [key_len+key+value_f32]*count
@@ -627,6 +603,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<B', len(kb)) + kb + struct.pack('<f', float(v))
         self._send(session, MsgType.SUBSCRIPTION_STATUS, data)
 
+    @packet_handler(MsgType.SUBSCRIPTION_BUY)
     async def _on_subscription_buy(self, session, payload: bytes):
         """SUBSCRIPTION_BUY(488) -> SUBSCRIPTION_RESULT(489)
         Response: result(u8) + remaining_crystal(u32) + expires_days(u16)
@@ -655,6 +632,7 @@ HANDLER_CODE = r'''
     # MsgType 490-501
     # ================================================================
 
+    @packet_handler(MsgType.WEATHER_INFO_REQ)
     async def _on_weather_info(self, session, payload: bytes):
         """WEATHER_INFO_REQ(490) -> WEATHER_INFO(491)
         Response: weather_id(u8) + weather_name_len(u8) + weather_name(utf8) +
@@ -693,6 +671,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.WEATHER_INFO, data)
 
+    @packet_handler(MsgType.TELEPORT_REQ)
     async def _on_teleport_req(self, session, payload: bytes):
         """TELEPORT_REQ(492) -> TELEPORT_RESULT(493)
         Request: waypoint_id(u16)
@@ -731,6 +710,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.TELEPORT_RESULT, struct.pack('<B H I', 0, wp_id, cost))
 
+    @packet_handler(MsgType.WAYPOINT_DISCOVER)
     async def _on_waypoint_discover(self, session, payload: bytes):
         """WAYPOINT_DISCOVER(494) -> WAYPOINT_LIST(495)
         Request: waypoint_id(u16)
@@ -752,6 +732,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<H', wid)
         self._send(session, MsgType.WAYPOINT_LIST, data)
 
+    @packet_handler(MsgType.DESTROY_OBJECT)
     async def _on_destroy_object(self, session, payload: bytes):
         """DESTROY_OBJECT(496) -> DESTROY_OBJECT_RESULT(497)
         Request: object_type_len(u8) + object_type(utf8) + object_id(u32)
@@ -800,6 +781,7 @@ HANDLER_CODE = r'''
         self._send(session, MsgType.DESTROY_OBJECT_RESULT,
                    struct.pack('<B I B', 0, loot_gold, len(loot_b)) + loot_b)
 
+    @packet_handler(MsgType.INTERACT_OBJECT)
     async def _on_interact_object(self, session, payload: bytes):
         """INTERACT_OBJECT(498) -> INTERACT_RESULT(499)
         Request: object_id(u32) + interact_type(u8) — 0=open_chest, 1=activate
@@ -825,6 +807,7 @@ HANDLER_CODE = r'''
         session.gold = min(session.gold + gold, 999999999)
         self._send(session, MsgType.INTERACT_RESULT, struct.pack('<B I B', 0, gold, trapped))
 
+    @packet_handler(MsgType.MOUNT_SUMMON)
     async def _on_mount_summon(self, session, payload: bytes):
         """MOUNT_SUMMON(500) -> MOUNT_RESULT(501)
         Request: action(u8) — 0=dismiss, 1=summon, mount_id(u8)
@@ -866,6 +849,7 @@ HANDLER_CODE = r'''
     # MsgType 502-509
     # ================================================================
 
+    @packet_handler(MsgType.LOGIN_REWARD_REQ)
     async def _on_login_reward_req(self, session, payload: bytes):
         """LOGIN_REWARD_REQ(502) -> LOGIN_REWARD_INFO(503)
         Response: total_days(u16) + cycle_day(u8) + claimed_today(u8) +
@@ -899,6 +883,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.LOGIN_REWARD_INFO, data)
 
+    @packet_handler(MsgType.LOGIN_REWARD_CLAIM)
     async def _on_login_reward_claim(self, session, payload: bytes):
         """LOGIN_REWARD_CLAIM(504) -> LOGIN_REWARD_CLAIM_RESULT(505)
         Response: result(u8) + day(u8) + gold_reward(u32) + new_total_days(u16)
@@ -980,6 +965,7 @@ HANDLER_CODE = r'''
             s.weekly_quests_done = 0
             self._send(s, MsgType.WEEKLY_RESET_NOTIFY, struct.pack('<B', 1))
 
+    @packet_handler(MsgType.CONTENT_UNLOCK_QUERY)
     async def _on_content_unlock_query(self, session, payload: bytes):
         """CONTENT_UNLOCK_QUERY(509) -> CONTENT_UNLOCK_NOTIFY(508)
         Response: count(u8) + [level(u8) + content_count(u8) + [name_len(u8)+name(utf8)]*count] * count
@@ -1006,6 +992,7 @@ HANDLER_CODE = r'''
     # MsgType 510-517
     # ================================================================
 
+    @packet_handler(MsgType.DIALOG_CHOICE)
     async def _on_dialog_choice(self, session, payload: bytes):
         """DIALOG_CHOICE(510) -> DIALOG_CHOICE_RESULT(511)
         Request: npc_id_len(u8) + npc_id(utf8) + choice_id(u8)
@@ -1084,6 +1071,7 @@ HANDLER_CODE = r'''
         data += struct.pack('<B', len(action_b)) + action_b
         self._send(session, MsgType.DIALOG_CHOICE_RESULT, data)
 
+    @packet_handler(MsgType.CUTSCENE_TRIGGER)
     async def _on_cutscene_trigger(self, session, payload: bytes):
         """CUTSCENE_TRIGGER(512) -> CUTSCENE_DATA(513)
         Request: cutscene_id_len(u8) + cutscene_id(utf8)
@@ -1131,6 +1119,7 @@ HANDLER_CODE = r'''
             data += struct.pack('<B', len(sb)) + sb
         self._send(session, MsgType.CUTSCENE_DATA, data)
 
+    @packet_handler(MsgType.CHAPTER_PROGRESS_REQ)
     async def _on_chapter_progress_req(self, session, payload: bytes):
         """CHAPTER_PROGRESS_REQ(514) -> CHAPTER_PROGRESS(515)
         Response: current_chapter(u8) + total_chapters(u8) + seal_fragments(u8) + total_needed(u8) +
@@ -1168,6 +1157,7 @@ HANDLER_CODE = r'''
 
         self._send(session, MsgType.CHAPTER_PROGRESS, data)
 
+    @packet_handler(MsgType.MAIN_QUEST_DATA_REQ)
     async def _on_main_quest_data_req(self, session, payload: bytes):
         """MAIN_QUEST_DATA_REQ(516) -> MAIN_QUEST_DATA(517)
         Request: quest_id_len(u8) + quest_id(utf8)  (empty = get current available)
@@ -1211,7 +1201,7 @@ HANDLER_CODE = r'''
 '''
 
 # ====================================================================
-# 6. Test cases (20 tests)
+# 5. Test cases (20 tests)
 # ====================================================================
 TEST_CODE = r'''
     # ================================================================
@@ -1624,19 +1614,7 @@ def patch_bridge():
         else:
             print('[bridge] WARNING: Could not find session fields insertion point')
 
-    # 4. Dispatch table -- after mentor_shop_buy dispatch
-    if 'self._on_cash_shop_list' not in content:
-        marker = '            MsgType.MENTOR_SHOP_BUY: self._on_mentor_shop_buy,'
-        idx = content.find(marker)
-        if idx >= 0:
-            end = content.index('\n', idx) + 1
-            content = content[:end] + DISPATCH_ENTRIES + content[end:]
-            changed = True
-            print('[bridge] Added TASK 11-14 dispatch table entries')
-        else:
-            print('[bridge] WARNING: Could not find dispatch table insertion point')
-
-    # 5. Handler implementations -- before Mentorship handlers
+    # 4. Handler implementations -- before Mentorship handlers
     if 'def _on_cash_shop_list' not in content:
         marker = '    # ---- Mentorship System (TASK 18: MsgType 550-560) ----'
         idx = content.find(marker)
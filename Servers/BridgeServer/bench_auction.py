@@ -0,0 +1,96 @@
+"""
+경매장 목록 조회 마이크로벤치마크
+=================================
+활성 listing 1k / 10k / 100k에서 AUCTION_LIST_REQ 한 페이지(20개) 만드는 데 걸리는 시간 비교.
+카테고리 6종 + 전체, 정렬 3종, 앞쪽 페이지 무작위.
+
+  legacy : 요청마다 전체 필터 + 정렬 + 슬라이스 (기존 _on_auction_list_req)
+  book   : AuctionBook.page (카테고리/정렬별 인덱스에서 20개만 잘라 옴)
+
+등록/구매(삭제) 비용도 같이 잰다 (legacy: list.append / id 선형 검색 + pop).
+
+사용법:
+  python bench_auction.py
+  python bench_auction.py --queries 200
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import AuctionBook, AUCTION_PAGE_SIZE
+
+CATEGORIES = (0, 1, 2, 3, 4, 5)
+
+
+def make_listings(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [{"id": i + 1, "seller_name": "seller", "item_id": rng.randint(1, 500), "item_count": 1,
+             "buyout_price": rng.randint(1, 1_000_000), "bid_price": 0,
+             "listed_at": 1_700_000_000.0 + i, "category": rng.choice(CATEGORIES)}
+            for i in range(n)]
+
+
+def legacy_page(listings, category, sort_by, page):
+    """기존 _on_auction_list_req의 필터/정렬/페이지 그대로"""
+    filtered = []
+    for listing in listings:
+        if category != 0xFF and listing.get("category", 0xFF) != category:
+            continue
+        filtered.append(listing)
+    if sort_by == 0:
+        filtered.sort(key=lambda x: x["buyout_price"])
+    elif sort_by == 1:
+        filtered.sort(key=lambda x: x["buyout_price"], reverse=True)
+    elif sort_by == 2:
+        filtered.sort(key=lambda x: x["listed_at"], reverse=True)
+    start = page * AUCTION_PAGE_SIZE
+    return len(filtered), filtered[start:start + AUCTION_PAGE_SIZE]
+
+
+def book_page(book, category, sort_by, page):
+    return book.page(category, sort_by, page * AUCTION_PAGE_SIZE, AUCTION_PAGE_SIZE)
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auction house listing microbenchmark")
+    parser.add_argument('--queries', type=int, default=50, help='list requests per case')
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    queries = [(rng.choice(CATEGORIES + (0xFF,)), rng.randint(0, 2), rng.randint(0, 10))
+               for _ in range(args.queries)]
+
+    print("=" * 78)
+    print(f"  Auction house microbenchmark ({args.queries} list requests, page size {AUCTION_PAGE_SIZE})")
+    print("=" * 78)
+    print(f"  {'listings':>9}  {'legacy us/page':>15}  {'book us/page':>13}  {'speedup':>8}"
+          f"  {'add us':>7}  {'remove us':>9}  {'same':>5}")
+    for n in (1_000, 10_000, 100_000):
+        listings = make_listings(n)
+        book = AuctionBook()
+        t_add = timed(lambda: [book.add(l) for l in listings]) / n
+
+        same = all(
+            [l["id"] for l in legacy_page(listings, *q)[1]] == [l["id"] for l in book_page(book, *q)[1]]
+            for q in queries[:10])
+        legacy = timed(lambda: [legacy_page(listings, *q) for q in queries]) / len(queries)
+        fast = timed(lambda: [book_page(book, *q) for q in queries]) / len(queries)
+
+        victims = rng.sample(range(1, n + 1), min(1000, n))
+        t_remove = timed(lambda: [book.remove(aid) for aid in victims]) / len(victims)
+        print(f"  {n:>9,}  {legacy * 1e6:>15,.0f}  {fast * 1e6:>13,.1f}  {legacy / fast:>7.0f}x"
+              f"  {t_add * 1e6:>7.1f}  {t_remove * 1e6:>9.1f}  {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+메시지 버스 벤치마크
+====================
+  in-process : MessageBus.publish() 한 번 (us) — 핸들러 구독자 S개 / 큐 구독자 S개(루프 한 바퀴에 묶어서 전달)
+  tcp        : tcp_bridge.py --role bus를 띄우고 구독 연결 S개 + 발행 연결 P개. 발행자는 BUS_PUBLISH를
+               window개씩 몰아 보내고, 처리량은 버스 STATS의 published / fanout 증가분
+
+사용법:
+  python bench_bus.py
+  python bench_bus.py --subscribers 1,8,32 --publishers 4 --seconds 5
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BusPriority, MessageBus, MsgType, PacketFramer, Schema, build_packet
+
+BRIDGE_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tcp_bridge.py")
+HOST = '127.0.0.1'
+TOPIC = "bench"
+DATA = bytes(64)  # 월드 공지 한 개 정도
+
+
+def bench_inprocess(subscribers: int, n: int, queued: bool) -> float:
+    """publish() 한 번 (us). 큐 구독자는 flush까지 포함"""
+    bus = MessageBus(queue_limit=n + 1)
+    sink = []
+    for i in range(subscribers):
+        if queued:
+            bus.subscribe(bus.attach(f"q{i}", deliver=sink.append), TOPIC)
+        else:
+            bus.on(TOPIC, lambda topic, data, origin: None)
+
+    async def run():
+        publish = bus.publish
+        t0 = time.perf_counter()
+        for _ in range(n):
+            publish(TOPIC, DATA, BusPriority.NORMAL)
+        await asyncio.sleep(0)  # 큐 구독자 flush
+        return time.perf_counter() - t0
+    return asyncio.run(run()) / n * 1e6
+
+
+def bus_stats(port: int) -> dict:
+    with socket.create_connection((HOST, port), timeout=3) as s:
+        s.sendall(build_packet(MsgType.STATS))
+        framer = PacketFramer()
+        while True:
+            data = s.recv(65536)
+            if not data:
+                return {}
+            framer.feed(data)
+            for _, payload in framer.packets():
+                return dict(kv.split('=', 1) for kv in bytes(payload).decode().split('|') if '=' in kv)
+
+
+async def subscriber(port: int, until: float, received: list):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(Schema.BUS_REGISTER.packet("bench-sub") + Schema.BUS_SUBSCRIBE.packet(TOPIC))
+    while time.time() < until:
+        try:
+            data = await asyncio.wait_for(reader.read(1 << 20), max(0.01, until - time.time()))
+        except asyncio.TimeoutError:
+            break
+        if not data:
+            break
+        received[0] += len(data)
+    writer.close()
+
+
+async def publisher(port: int, until: float, window: int):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(Schema.BUS_REGISTER.packet("bench-pub"))
+    await reader.read(64)  # BUS_REGISTER_ACK
+    batch = Schema.BUS_PUBLISH.packet(BusPriority.NORMAL, TOPIC, DATA) * window
+    while time.time() < until:
+        writer.write(batch)
+        await writer.drain()
+        await asyncio.sleep(0)
+    writer.close()
+
+
+def load_process(port: int, role: str, count: int, window: int, until: float, out):
+    async def run():
+        received = [0]
+        if role == "sub":
+            jobs = [subscriber(port, until, received) for _ in range(count)]
+        else:
+            jobs = [publisher(port, until, window) for _ in range(count)]
+        await asyncio.gather(*jobs, return_exceptions=True)
+        out.put(received[0])
+    asyncio.run(run())
+
+
+def run_tcp(subscribers: int, args) -> dict:
+    port = args.port
+    bus = subprocess.Popen([sys.executable, BRIDGE_PY, '--role', 'bus', '--port', str(port)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(1.0)
+        until = time.time() + args.seconds + 1.0
+        out = multiprocessing.Queue()
+        subs = multiprocessing.Process(target=load_process, args=(port, "sub", subscribers, 0, until, out))
+        subs.start()
+        time.sleep(0.5)
+        pubs = multiprocessing.Process(target=load_process,
+                                       args=(port, "pub", args.publishers, args.window, until, out))
+        pubs.start()
+        time.sleep(0.3)
+        before = bus_stats(port)
+        t0 = time.time()
+        time.sleep(args.seconds - 0.5)
+        after = bus_stats(port)
+        elapsed = time.time() - t0
+        received = sum(out.get(timeout=args.seconds + 30) for _ in range(2))
+        subs.join()
+        pubs.join()
+    finally:
+        bus.terminate()
+        bus.wait(timeout=5)
+        time.sleep(0.3)
+
+    def delta(key):
+        return (int(after[key]) - int(before[key])) / elapsed
+    batches = int(after['batches']) - int(before['batches'])
+    return {"published": delta('published'), "fanout": delta('fanout'), "dropped": delta('dropped'),
+            "per_batch": (int(after['batched']) - int(before['batched'])) / max(1, batches),
+            "recv_mb": received / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message bus benchmark")
+    parser.add_argument('--subscribers', default='1,8,32', help='comma-separated subscriber counts')
+    parser.add_argument('--publishers', type=int, default=2, help='publishing connections (tcp mode)')
+    parser.add_argument('--window', type=int, default=64, help='BUS_PUBLISH packets per write')
+    parser.add_argument('--seconds', type=float, default=4.0, help='load duration per tcp run')
+    parser.add_argument('--messages', type=int, default=100_000, help='publish() calls per in-process run')
+    parser.add_argument('--port', type=int, default=19900)
+    args = parser.parse_args()
+    counts = [int(n) for n in args.subscribers.split(',')]
+
+    print("=" * 86)
+    print(f"  Message bus benchmark ({len(DATA)}-byte messages, {args.publishers} publishers, {os.cpu_count()} CPUs)")
+    print("=" * 86)
+    print(f"  {'subs':>5}  {'handler us':>10}  {'queued us':>10}  {'tcp pub/s':>10}  {'fanout/s':>10}"
+          f"  {'msgs/batch':>10}  {'dropped/s':>9}  {'recv MB':>8}")
+    for subscribers in counts:
+        handler = bench_inprocess(subscribers, args.messages, queued=False)
+        queued = bench_inprocess(subscribers, args.messages, queued=True)
+        r = run_tcp(subscribers, args)
+        print(f"  {subscribers:>5}  {handler:>10.2f}  {queued:>10.2f}  {r['published']:>10,.0f}  {r['fanout']:>10,.0f}"
+              f"  {r['per_batch']:>10.1f}  {r['dropped']:>9,.0f}  {r['recv_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Framing 마이크로벤치마크
+========================
+한 번의 read()에 MOVE 패킷이 1 / 10 / 100개 붙어 올 때 초당 처리 패킷 수.
+
+  legacy : 패킷마다 recv_buf = recv_buf[pkt_len:] + bytes(...) 복사 (기존 _read_loop)
+  framer : PacketFramer (오프셋 전진 + memoryview payload + 가끔 compact)
+
+사용법:
+  python bench_framing.py
+  python bench_framing.py --seconds 2.0
+"""
+
+import argparse
+import struct
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import (
+    MsgType, PacketFramer, build_packet, parse_header,
+    PACKET_HEADER_SIZE,
+)
+
+
+def legacy_frame(chunk: bytes, recv_buf: bytearray, sink) -> bytearray:
+    """기존 _read_loop의 어셈블링 로직 그대로"""
+    recv_buf.extend(chunk)
+    while len(recv_buf) >= PACKET_HEADER_SIZE:
+        pkt_len = struct.unpack_from('<I', recv_buf, 0)[0]
+        if len(recv_buf) < pkt_len:
+            break
+        packet = bytes(recv_buf[:pkt_len])
+        recv_buf = recv_buf[pkt_len:]
+        _, msg_type = parse_header(packet)
+        sink(msg_type, packet[PACKET_HEADER_SIZE:])
+    return recv_buf
+
+
+def bench_legacy(chunk: bytes, per_read: int, seconds: float) -> float:
+    recv_buf = bytearray()
+    unpack = struct.Struct('<fff').unpack_from
+    sink = lambda mt, pl: unpack(pl, 0)
+    n = 0
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            recv_buf = legacy_frame(chunk, recv_buf, sink)
+        n += 100 * per_read
+    return n / (time.perf_counter() - t0)
+
+
+def bench_framer(chunk: bytes, per_read: int, seconds: float) -> float:
+    framer = PacketFramer()
+    unpack = struct.Struct('<fff').unpack_from
+    n = 0
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            framer.feed(chunk)
+            for msg_type, payload in framer.packets():
+                unpack(payload, 0)
+        n += 100 * per_read
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PacketFramer microbenchmark")
+    parser.add_argument('--seconds', type=float, default=1.0, help='seconds per case')
+    args = parser.parse_args()
+
+    move = build_packet(MsgType.MOVE, struct.pack('<fffI', 100.0, 0.0, 100.0, 0))
+
+    print("=" * 60)
+    print("  Framing microbenchmark (MOVE, 22 bytes/packet)")
+    print("=" * 60)
+    print(f"  {'pkts/read':>9}  {'legacy pkt/s':>14}  {'framer pkt/s':>14}  {'speedup':>8}")
+    for per_read in (1, 10, 100):
+        chunk = move * per_read
+        legacy = bench_legacy(chunk, per_read, args.seconds)
+        framed = bench_framer(chunk, per_read, args.seconds)
+        print(f"  {per_read:>9}  {legacy:>14,.0f}  {framed:>14,.0f}  {framed / legacy:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+게이트 라우팅 벤치마크
+======================
+tcp_bridge.py --role gate를 띄우고 가짜 필드 F개를 등록(FIELD_REGISTER + 하트비트)한 뒤,
+부하 생성 프로세스들이 GATE_ROUTE_REQ를 최대한 빨리 보낸다. 처리량은 게이트 STATS의 routes 증가분.
+
+  route()   : 프로세스 안에서 GateServer.route()만 (필드 수에 따른 선택 비용)
+  connect   : 요청마다 새 TCP 연결 (실제 로그인 흐름 — accept/close 비용 포함)
+  pipelined : 연결 하나에 요청 window개씩 몰아 보냄 (응답도 write 한 번으로 묶여 나간다)
+
+사용법:
+  python bench_gate.py
+  python bench_gate.py --fields 2,16 --clients 64 --seconds 5
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import (GATE_HEARTBEAT_INTERVAL, GateServer, HEARTBEAT_LOAD, MsgType, PacketFramer, Schema,
+                        build_packet)
+
+BRIDGE_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tcp_bridge.py")
+HOST = '127.0.0.1'
+ROUTE_REQ = build_packet(MsgType.GATE_ROUTE_REQ)
+FIELD_PORT_BASE = 27000
+
+
+def bench_route(fields: int, n: int) -> float:
+    """GateServer.route() 한 번 (us)"""
+    gate = GateServer(port=0)
+    gate.log = lambda *a, **k: None
+    for i in range(fields):
+        idx = gate.register(HOST, FIELD_PORT_BASE + i, max_ccu=10 ** 9)
+        gate.heartbeat(idx, ccu=i * 10, max_ccu=10 ** 9, ticks=60, tick_overruns=i % 3, out_bytes=i * 1000)
+    route = gate.route
+    t0 = time.perf_counter()
+    for _ in range(n):
+        route()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def request(port: int, pkt: bytes) -> bytes:
+    with socket.create_connection((HOST, port), timeout=3) as s:
+        s.sendall(pkt)
+        framer = PacketFramer()
+        while True:
+            data = s.recv(65536)
+            if not data:
+                return b''
+            framer.feed(data)
+            for _, payload in framer.packets():
+                return bytes(payload)
+
+
+def gate_stats(port: int) -> dict:
+    raw = request(port, build_packet(MsgType.STATS)).decode()
+    return dict(kv.split('=', 1) for kv in raw.split('|') if '=' in kv)
+
+
+def fake_fields(port: int, count: int, stop: threading.Event):
+    """가짜 필드: 등록하고 stop까지 하트비트 (연결을 열어 둬야 게이트가 TIMEOUT으로 빼지 않는다)"""
+    links = []
+    for i in range(count):
+        s = socket.create_connection((HOST, port))
+        s.sendall(Schema.FIELD_REGISTER.packet(FIELD_PORT_BASE + i, 10 ** 9, f"bench-{i}"))
+        s.recv(64)  # FIELD_REGISTER_ACK
+        links.append(s)
+    while True:
+        for i, s in enumerate(links):
+            s.sendall(build_packet(MsgType.FIELD_HEARTBEAT,
+                                   Schema.FIELD_HEARTBEAT.encode(FIELD_PORT_BASE + i, 0, 10 ** 9)
+                                   + HEARTBEAT_LOAD.encode(60, 0, 0)))
+        if stop.wait(GATE_HEARTBEAT_INTERVAL):
+            break
+    for s in links:
+        s.close()
+
+
+async def connect_client(port: int, until: float, counts: Counter):
+    while time.time() < until:
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(ROUTE_REQ)
+        header = await reader.readexactly(6)
+        payload = await reader.readexactly(int.from_bytes(header[:4], 'little') - 6)
+        counts[int.from_bytes(payload[1:3], 'little')] += 1
+        writer.close()
+
+
+async def pipelined_client(port: int, until: float, counts: Counter, window: int):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    framer = PacketFramer()
+    batch = ROUTE_REQ * window
+    while time.time() < until:
+        writer.write(batch)
+        got = 0
+        while got < window:
+            framer.feed(await reader.read(65536))
+            for _, payload in framer.packets():
+                counts[int.from_bytes(payload[1:3], 'little')] += 1
+                got += 1
+    writer.close()
+
+
+def load_process(port: int, mode: str, clients: int, window: int, until: float, out):
+    async def run():
+        counts = Counter()
+        if mode == "connect":
+            jobs = [connect_client(port, until, counts) for _ in range(clients)]
+        else:
+            jobs = [pipelined_client(port, until, counts, window) for _ in range(clients)]
+        await asyncio.gather(*jobs, return_exceptions=True)
+        out.put(dict(counts))
+    asyncio.run(run())
+
+
+def run(mode: str, fields: int, args) -> dict:
+    port = args.port
+    gate = subprocess.Popen([sys.executable, BRIDGE_PY, '--role', 'gate', '--port', str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(1.0)
+        stop = threading.Event()
+        heartbeats = threading.Thread(target=fake_fields, args=(port, fields, stop), daemon=True)
+        heartbeats.start()
+        time.sleep(0.5)
+        until = time.time() + args.seconds
+        out = multiprocessing.Queue()
+        per_proc = max(1, args.clients // args.procs)
+        before = int(gate_stats(port)['routes'])
+        t0 = time.time()
+        procs = [multiprocessing.Process(target=load_process,
+                                         args=(port, mode, per_proc, args.window, until, out))
+                 for _ in range(args.procs)]
+        for p in procs:
+            p.start()
+        counts = Counter()
+        for _ in procs:
+            counts.update(out.get(timeout=args.seconds + 30))
+        for p in procs:
+            p.join()
+        elapsed = time.time() - t0
+        after = int(gate_stats(port)['routes'])
+        stop.set()
+        heartbeats.join()
+    finally:
+        gate.terminate()
+        gate.wait(timeout=5)
+        time.sleep(0.3)
+    spread = (max(counts.values()) - min(counts.values())) / max(1, sum(counts.values()) / fields) if counts else 0.0
+    return {"routes_per_sec": (after - before) / elapsed, "spread": spread, "used": len(counts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gate routing benchmark")
+    parser.add_argument('--fields', default='2,8', help='comma-separated registered field counts')
+    parser.add_argument('--clients', type=int, default=32, help='concurrent client connections')
+    parser.add_argument('--window', type=int, default=16, help='requests in flight per pipelined connection')
+    parser.add_argument('--seconds', type=float, default=4.0, help='load duration per run')
+    parser.add_argument('--procs', type=int, default=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                        help='load generator processes')
+    parser.add_argument('--routes', type=int, default=200_000, help='route() calls for the in-process run')
+    parser.add_argument('--port', type=int, default=18900)
+    args = parser.parse_args()
+    counts = [int(n) for n in args.fields.split(',')]
+
+    print("=" * 66)
+    print(f"  Gate routing benchmark ({args.clients} clients, {os.cpu_count()} CPUs)")
+    print("=" * 66)
+    print(f"  {'fields':>6}  {'route() us':>10}  {'connect/s':>10}  {'pipelined/s':>12}  {'max-min / mean':>15}")
+    for fields in counts:
+        us = bench_route(fields, args.routes)
+        conn = run("connect", fields, args)
+        pipe = run("pipelined", fields, args)
+        print(f"  {fields:>6}  {us:>10.2f}  {conn['routes_per_sec']:>10,.0f}  {pipe['routes_per_sec']:>12,.0f}"
+              f"  {pipe['spread']:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+몬스터 AI 틱 마이크로벤치마크
+==============================
+--monster-scale로 몬스터 수를 늘려 _update_monster_ai 한 번에 걸리는 시간 비교.
+필드 존 1에만 플레이어가 있고 (나머지 존은 비어 있음), 일부 몬스터는 추격/귀환 중.
+
+  legacy : 몬스터마다 순서대로 어그로 → 상태 → 이동 → 패킷 (기존 _update_monster_ai)
+  batch  : BridgeServer._update_monster_ai(dt=3.0) (상태별로 모아 이동 일괄 계산, 빈 존 IDLE 패트롤 생략)
+
+사용법:
+  python bench_monster_ai.py
+  python bench_monster_ai.py --ticks 20 --players 200
+"""
+
+import argparse
+import math
+import random
+import struct
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import (
+    BridgeServer, MsgType, PlayerSession, Position, MONSTER_SPAWNS, ZONE_BOUNDS,
+)
+
+
+class NullWriter:
+    def write(self, data):
+        pass
+
+    def is_closing(self):
+        return False
+
+
+def legacy_update_monster_ai(self):
+    """기존 _update_monster_ai 그대로"""
+    for mid, m in self.monsters.items():
+        if m["ai"].state == 5:  # DEAD
+            continue
+
+        ai = m["ai"]
+        in_zone = self.zone_players.get(m["zone"], ())
+
+        best_target = 0
+        best_aggro = 0.0
+        for eid, aggro in list(ai.aggro_table.items()):
+            if eid in in_zone and self.sessions[eid].stats.is_alive():
+                if aggro > best_aggro:
+                    best_aggro = aggro
+                    best_target = eid
+            else:
+                del ai.aggro_table[eid]
+
+        if best_target and ai.state in (0, 1):
+            ai.state = 2
+            ai.target_entity = best_target
+
+        if ai.state == 2:
+            if not best_target:
+                ai.state = 4
+                ai.target_entity = 0
+            else:
+                target = self.sessions.get(best_target)
+                if target:
+                    dx = target.pos.x - m["pos"].x
+                    dz = target.pos.z - m["pos"].z
+                    dist = math.sqrt(dx*dx + dz*dz)
+                    sdx = m["pos"].x - ai.spawn_x
+                    sdz = m["pos"].z - ai.spawn_z
+                    spawn_dist = math.sqrt(sdx*sdx + sdz*sdz)
+                    if spawn_dist > ai.leash_range:
+                        ai.state = 4
+                        ai.target_entity = 0
+                        ai.aggro_table.clear()
+                    elif dist <= 200.0:
+                        ai.state = 3
+                    else:
+                        speed = 80.0 * 1.3
+                        move_dist = min(speed * 3.0, dist)
+                        if dist > 0:
+                            nx = m["pos"].x + (dx / dist) * move_dist
+                            nz = m["pos"].z + (dz / dist) * move_dist
+                            m["pos"].x = nx
+                            m["pos"].z = nz
+                            self._aoi_update_monster(mid, m)
+                            move_pkt = struct.pack('<Qfff', mid, nx, m["pos"].y, nz)
+                            self._broadcast_nearby(m["zone"], nx, nz, 0, MsgType.MONSTER_MOVE, move_pkt)
+
+        elif ai.state == 3:
+            if not best_target or best_target not in self.sessions:
+                ai.state = 4
+                ai.target_entity = 0
+            else:
+                target = self.sessions[best_target]
+                damage = max(1, m["atk"] - target.stats.defense)
+                target.stats.hp = max(0, target.stats.hp - damage)
+                result = struct.pack('<BQQiII', 1, mid, best_target,
+                                      damage, target.stats.hp, target.stats.max_hp)
+                self._broadcast_nearby(m["zone"], m["pos"].x, m["pos"].z, 0,
+                                       MsgType.ATTACK_RESULT, result)
+                if target.stats.hp <= 0:
+                    died = struct.pack('<QQ', best_target, mid)
+                    self._broadcast_nearby(m["zone"], m["pos"].x, m["pos"].z, 0,
+                                           MsgType.COMBAT_DIED, died)
+                    ai.aggro_table.pop(best_target, None)
+                    ai.state = 0 if not ai.aggro_table else 2
+                self._send_stat_sync(target)
+
+        elif ai.state == 4:
+            dx = ai.spawn_x - m["pos"].x
+            dz = ai.spawn_z - m["pos"].z
+            dist = math.sqrt(dx*dx + dz*dz)
+            if dist < 10.0:
+                ai.state = 0
+                m["hp"] = m["max_hp"]
+            else:
+                speed = 80.0
+                move_dist = min(speed * 3.0, dist)
+                if dist > 0:
+                    m["pos"].x += (dx / dist) * move_dist
+                    m["pos"].z += (dz / dist) * move_dist
+                    self._aoi_update_monster(mid, m)
+                    move_pkt = struct.pack('<Qfff', mid, m["pos"].x, m["pos"].y, m["pos"].z)
+                    self._broadcast_nearby(m["zone"], m["pos"].x, m["pos"].z, 0,
+                                           MsgType.MONSTER_MOVE, move_pkt)
+
+        elif ai.state == 0:
+            if random.random() < 0.3:
+                ai.state = 1
+                angle = random.uniform(0, 2 * math.pi)
+                dist = random.uniform(20, ai.patrol_radius)
+                target_x = ai.spawn_x + math.cos(angle) * dist
+                target_z = ai.spawn_z + math.sin(angle) * dist
+                m["pos"].x = target_x
+                m["pos"].z = target_z
+                self._aoi_update_monster(mid, m)
+                move_pkt = struct.pack('<Qfff', mid, m["pos"].x, m["pos"].y, m["pos"].z)
+                self._broadcast_nearby(m["zone"], target_x, target_z, 0,
+                                       MsgType.MONSTER_MOVE, move_pkt)
+                ai.state = 0
+
+
+def build_server(scale: int, players: int, seed: int = 1) -> BridgeServer:
+    random.seed(seed)
+    srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", monster_scale=scale)
+    srv.log = lambda *a, **k: None
+    srv.channel_capacity = 10 ** 9  # 전원을 채널 하나에
+    srv._spawn_monsters()
+    bounds = ZONE_BOUNDS[1]
+    for i in range(players):
+        sess = PlayerSession(writer=NullWriter())
+        sess.entity_id = 1_000_000_000 + i
+        sess.in_game = True
+        sess.zone_id = 1
+        sess.pos = Position(random.uniform(bounds["min_x"], bounds["max_x"]), 0.0,
+                            random.uniform(bounds["min_z"], bounds["max_z"]))
+        sess.stats.max_hp = sess.stats.hp = 10 ** 9  # 벤치 도중 죽지 않게
+        srv.sessions[sess.entity_id] = sess
+        srv._aoi_update(sess)
+    # 존 1 몬스터 5%가 가까운 플레이어를 어그로
+    pids = list(srv.zone_players.get(1, ()))
+    for mid in list(srv.zone_monsters.get(1, ()))[::20]:
+        if pids:
+            srv.monsters[mid]["ai"].aggro_table[random.choice(pids)] = 1.0
+    return srv
+
+
+def bench(update, scale: int, players: int, ticks: int) -> float:
+    srv = build_server(scale, players)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        update(srv)
+    return (time.perf_counter() - t0) / ticks * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monster AI tick microbenchmark")
+    parser.add_argument('--ticks', type=int, default=10, help='AI ticks per case')
+    parser.add_argument('--players', type=int, default=10, help='players in field zone 1')
+    args = parser.parse_args()
+
+    per_scale = len(MONSTER_SPAWNS)
+    print("=" * 60)
+    print(f"  Monster AI tick microbenchmark ({args.players} players in zone 1)")
+    print("=" * 60)
+    print(f"  {'monsters':>9}  {'legacy ms':>10}  {'batch ms':>10}  {'speedup':>8}")
+    for monsters in (1_000, 10_000, 50_000):
+        scale = max(1, monsters // per_scale)
+        legacy = bench(legacy_update_monster_ai, scale, args.players, args.ticks)
+        batch = bench(lambda srv: srv._update_monster_ai(3.0), scale, args.players, args.ticks)
+        print(f"  {scale * per_scale:>9,}  {legacy:>10.1f}  {batch:>10.1f}  {legacy / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
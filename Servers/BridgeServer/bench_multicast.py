@@ -0,0 +1,81 @@
+"""
+존 브로드캐스트 마이크로벤치마크
+================================
+한 존에 N명이 있을 때 MOVE_BROADCAST 한 개를 존 전체에 뿌리는 시간 비교.
+
+  per-send  : 수신자마다 _send (build_packet = struct.pack + bytes 연결을 N번)
+  multicast : _multicast (헤더 한 번, 같은 bytes 객체를 N개 transport에)
+
+사용법:
+  python bench_multicast.py
+  python bench_multicast.py --rounds 500
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BridgeServer, MsgType, PlayerSession
+
+PAYLOAD = struct.pack('<Qfff', 1, 100.0, 0.0, 200.0)
+
+
+class NullWriter:
+    def write(self, data):
+        pass
+
+    def is_closing(self):
+        return False
+
+
+def make_zone(n: int):
+    srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+    srv.channel_capacity = 10 ** 9  # 전원을 채널 하나에
+    targets = []
+    for i in range(n):
+        s = PlayerSession(writer=NullWriter(), logged_in=True, in_game=True)
+        s.entity_id = 1_000_000 + i
+        s.zone_id = 1
+        srv.sessions[s.entity_id] = s
+        srv._aoi_update(s)
+        targets.append(s)
+    return srv, targets
+
+
+def per_send(srv, targets, rounds: int) -> float:
+    send = srv._send
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for s in targets:
+            send(s, MsgType.MOVE_BROADCAST, PAYLOAD)
+    return (time.perf_counter() - t0) / rounds
+
+
+def multicast(srv, targets, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        srv._broadcast_to_zone(1, 0, MsgType.MOVE_BROADCAST, PAYLOAD)
+    return (time.perf_counter() - t0) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zone broadcast multicast microbenchmark")
+    parser.add_argument('--rounds', type=int, default=200, help='broadcasts per zone size')
+    args = parser.parse_args()
+
+    print("=" * 62)
+    print(f"  Zone broadcast microbenchmark ({args.rounds} broadcasts, {len(PAYLOAD)}-byte payload)")
+    print("=" * 62)
+    print(f"  {'players':>8}  {'per-send us':>12}  {'multicast us':>13}  {'speedup':>8}")
+    for n in (10, 100, 1_000, 5_000):
+        srv, targets = make_zone(n)
+        old = per_send(srv, targets, args.rounds)
+        new = multicast(srv, targets, args.rounds)
+        print(f"  {n:>8,}  {old * 1e6:>12.1f}  {new * 1e6:>13.1f}  {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+정적 응답 캐시 마이크로벤치마크
+================================
+로그인 폭주 때 몰리는 데이터 테이블 조회(캐릭터 목록/상점/토큰 상점/이벤트/캐시 상점/멘토 상점/
+제작 목록/NPC 대화)를 _dispatch로 N번 처리하는 시간 비교.
+
+  build  : 캐시 비활성 (max_entries=0 → 요청마다 테이블에서 인코딩, 예전 핸들러와 같은 일)
+  cached : ResponseCache (첫 요청 한 번만 인코딩, 이후 dict 조회 + 같은 bytes 전송)
+
+사용법:
+  python bench_response_cache.py
+  python bench_response_cache.py --requests 50000
+"""
+
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BridgeServer, MsgType, PlayerSession, SHOPS
+
+REQUESTS = [
+    ("CHAR_LIST", MsgType.CHAR_LIST_REQ, b''),
+    ("SHOP_OPEN", MsgType.SHOP_OPEN, struct.pack('<I', next(iter(SHOPS)))),
+    ("TOKEN_SHOP", MsgType.TOKEN_SHOP_LIST, struct.pack('<B', 0)),
+    ("EVENT_LIST", MsgType.EVENT_LIST_REQ, b''),
+    ("CASH_SHOP", MsgType.CASH_SHOP_LIST_REQ, b'\x00'),
+    ("MENTOR_SHOP", MsgType.MENTOR_SHOP_LIST, b''),
+    ("CRAFT_LIST", MsgType.CRAFT_LIST_REQ, b'\xff'),
+    ("MAIN_QUEST", MsgType.MAIN_QUEST_DATA_REQ, b'\x00'),
+]
+
+
+class NullWriter:
+    def write(self, data):
+        pass
+
+    def is_closing(self):
+        return False
+
+
+async def run(cached: bool, msg_type: int, payload: bytes, n: int) -> float:
+    srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+    srv.log = lambda *a, **k: None
+    if not cached:
+        srv.response_cache.max_entries = 0
+    sess = PlayerSession(writer=NullWriter(), logged_in=True, in_game=True, char_name="bench")
+    dispatch = srv._dispatch
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await dispatch(sess.writer, sess, msg_type, payload)
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static response cache microbenchmark")
+    parser.add_argument('--requests', type=int, default=20_000, help='requests per message type')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"  Static response cache microbenchmark ({args.requests:,} requests each)")
+    print("=" * 60)
+    print(f"  {'request':>12}  {'build us':>9}  {'cached us':>10}  {'speedup':>8}")
+    for name, msg_type, payload in REQUESTS:
+        build = asyncio.run(run(False, msg_type, payload, args.requests))
+        cached = asyncio.run(run(True, msg_type, payload, args.requests))
+        print(f"  {name:>12}  {build * 1e6:>9.2f}  {cached * 1e6:>10.2f}  {build / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
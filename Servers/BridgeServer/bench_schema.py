@@ -0,0 +1,107 @@
+"""
+메시지 스키마 인코딩 마이크로벤치마크
+=====================================
+리스트형 응답 하나를 만드는 비용 비교 (헤더 포함 패킷까지).
+
+  legacy : 필드마다 struct.pack('<..') + buf += 누적 후 build_packet (기존 핸들러 방식)
+  schema : Schema.<MSG>.packet(...) — 미리 컴파일한 Struct로 bytearray 하나에 pack_into
+
+사용법:
+  python bench_schema.py
+  python bench_schema.py --reps 20000
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import MsgType, Schema, build_packet
+
+
+def legacy_guild_list(guilds):
+    buf = struct.pack('<B', len(guilds))
+    for gid, name, members, level in guilds:
+        buf += struct.pack('<I', gid)
+        buf += name.encode('utf-8')[:32].ljust(32, b'\x00')
+        buf += struct.pack('<BB', members, level)
+    return build_packet(MsgType.GUILD_LIST, buf)
+
+
+def legacy_skill_list(skills):
+    buf = struct.pack('<B', len(skills))
+    for sid, name, cd, dmg, mp, rng, typ, level, effect, min_level in skills:
+        buf += struct.pack('<I', sid)
+        buf += name.encode('utf-8')[:16].ljust(16, b'\x00')
+        buf += struct.pack('<IIIIB', cd, dmg, mp, rng, typ)
+        buf += struct.pack('<BBI', level, effect, min_level)
+    return build_packet(MsgType.SKILL_LIST_RESP, buf)
+
+
+def legacy_bounty_ranking(ranks, my_rank, my_score):
+    data = struct.pack('<B', len(ranks))
+    for rank, name, score in ranks:
+        name_bytes = name.encode('utf-8')
+        data += struct.pack('<B B', rank, len(name_bytes))
+        data += name_bytes
+        data += struct.pack('<H', score)
+    data += struct.pack('<BH', my_rank, my_score)
+    return build_packet(MsgType.BOUNTY_RANKING, data)
+
+
+def legacy_stat_sync(*stats):
+    return build_packet(MsgType.STAT_SYNC, struct.pack('<IiiiiIIII', *stats))
+
+
+CASES = {
+    "STAT_SYNC": (
+        legacy_stat_sync,
+        lambda *stats: Schema.STAT_SYNC.packet(*stats),
+        (5, 180, 180, 70, 70, 22, 13, 40, 500)),
+    "GUILD_LIST x255": (
+        legacy_guild_list,
+        lambda guilds: Schema.GUILD_LIST.packet(guilds),
+        ([(i, f"Guild{i}", i % 50, 1 + i % 10) for i in range(255)],)),
+    "GUILD_LIST x10": (
+        legacy_guild_list,
+        lambda guilds: Schema.GUILD_LIST.packet(guilds),
+        ([(i, f"Guild{i}", i % 50, 1 + i % 10) for i in range(10)],)),
+    "SKILL_LIST x21": (
+        legacy_skill_list,
+        lambda skills: Schema.SKILL_LIST_RESP.packet(skills),
+        ([(i, f"Skill{i}", 1000, 50, 10, 200, 1, 1, 0, 1) for i in range(21)],)),
+    "BOUNTY_RANKING": (
+        legacy_bounty_ranking,
+        lambda ranks, my_rank, my_score: Schema.BOUNTY_RANKING.packet(ranks, my_rank, my_score),
+        ([(i + 1, f"Hunter{i}", 1000 - i) for i in range(10)], 3, 998)),
+}
+
+
+def timed(fn, args, reps: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn(*args)
+    return (time.perf_counter() - t0) / reps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message schema encode microbenchmark")
+    parser.add_argument('--reps', type=int, default=5_000, help='encodes per case')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"  Message schema encode microbenchmark ({args.reps:,} packets per case)")
+    print("=" * 70)
+    print(f"  {'message':>16}  {'bytes':>6}  {'legacy us':>10}  {'schema us':>10}  {'speedup':>8}  {'same':>5}")
+    for name, (legacy, schema, values) in CASES.items():
+        same = bytes(schema(*values)) == legacy(*values)
+        t_legacy = timed(legacy, values, args.reps)
+        t_schema = timed(schema, values, args.reps)
+        print(f"  {name:>16}  {len(legacy(*values)):>6,}  {t_legacy * 1e6:>10.2f}  {t_schema * 1e6:>10.2f}"
+              f"  {t_legacy / t_schema:>7.1f}x  {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
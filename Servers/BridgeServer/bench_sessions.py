@@ -0,0 +1,109 @@
+"""
+세션 메모리 마이크로벤치마크
+============================
+세션 N개(기본 10k)를 만들어 상태별 세션당 바이트를 tracemalloc으로 잰다.
+
+  idle    : 접속만 함 (PlayerSession 생성)
+  lobby   : + LOGIN (username/account_id/logged_in)
+  in-game : + CHAR_SELECT가 세션에 쓰는 것 (entity/pos/stats/skills) + 인벤토리 2칸 + 퀘스트/버프 하나
+
+  legacy  : 예전 @dataclass PlayerSession과 같은 모양 (모든 필드 __dict__, 컨테이너/인벤토리 20칸 즉시 생성)
+  compact : __slots__ 세션 + 배열 인벤토리 + 기능별 하위 상태 지연 생성
+
+사용법:
+  python bench_sessions.py
+  python bench_sessions.py --sessions 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import field, make_dataclass
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import InventorySlot, PlayerSession, Position, SESSION_FEATURES, INVENTORY_SIZE
+
+
+def legacy_class():
+    """예전 dataclass 세션 재현: 필드/기본값은 PlayerSession.CORE/LAZY + SESSION_FEATURES 그대로"""
+    specs = PlayerSession.CORE + PlayerSession.LAZY + tuple(
+        spec for feature in SESSION_FEATURES.values() for spec in feature.DEFAULTS)
+    fields = []
+    for name, default in specs:
+        if name == "inventory":
+            default = lambda: [InventorySlot() for _ in range(INVENTORY_SIZE)]
+        if callable(default):
+            fields.append((name.lstrip('_'), object, field(default_factory=default)))
+        else:
+            fields.append((name.lstrip('_'), object, field(default=default)))
+    return make_dataclass("LegacySession", fields)
+
+
+def login(sess, i: int):
+    sess.account_id = 1000 + i
+    sess.username = f"user{i}"
+    sess.logged_in = True
+
+
+def enter_game(sess, i: int):
+    """_on_char_select가 세션에 쓰는 필드 + 흔한 첫 플레이 상태"""
+    sess.entity_id = 1 + i
+    sess.char_name = f"Char{i}"
+    sess.in_game = True
+    sess.zone_id = 1
+    sess.pos = Position(100.0, 0.0, 100.0)
+    sess.stats.level = 10
+    sess.stats.max_hp = sess.stats.hp = 280
+    sess.skills = {1: 1, 2: 1, 6: 1}
+    sess.inventory[0].item_id, sess.inventory[0].count = 201, 3
+    sess.inventory[1].item_id, sess.inventory[1].count = 301, 1
+    sess.quests.append({"quest_id": 1, "progress": 0})
+    sess.buffs.append({"buff_id": 1, "expires": 0.0, "stacks": 1})
+
+
+def measure(cls, n: int):
+    """상태별 세션당 누적 바이트"""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    sessions = [cls(writer=None) for _ in range(n)]
+    idle = tracemalloc.get_traced_memory()[0] - base
+    for i, s in enumerate(sessions):
+        login(s, i)
+    lobby = tracemalloc.get_traced_memory()[0] - base
+    for i, s in enumerate(sessions):
+        enter_game(s, i)
+    ingame = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return idle / n, lobby / n, ingame / n
+
+
+def construct_us(cls, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        cls(writer=None)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PlayerSession memory microbenchmark")
+    parser.add_argument('--sessions', type=int, default=10_000, help='sessions per case')
+    args = parser.parse_args()
+
+    legacy = legacy_class()
+    print("=" * 72)
+    print(f"  PlayerSession memory ({args.sessions:,} sessions, bytes/session)")
+    print("=" * 72)
+    print(f"  {'model':>8}  {'idle':>8}  {'lobby':>8}  {'in-game':>8}  {'new us':>7}")
+    results = {}
+    for name, cls in (("legacy", legacy), ("compact", PlayerSession)):
+        results[name] = measure(cls, args.sessions)
+        idle, lobby, ingame = results[name]
+        print(f"  {name:>8}  {idle:>8,.0f}  {lobby:>8,.0f}  {ingame:>8,.0f}  {construct_us(cls, args.sessions):>7.2f}")
+    ratio = [l / c for l, c in zip(results["legacy"], results["compact"])]
+    print(f"  {'ratio':>8}  {ratio[0]:>7.1f}x  {ratio[1]:>7.1f}x  {ratio[2]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+존 샤딩 처리량 벤치마크
+========================
+tcp_bridge.py를 --shards N으로 띄우고, 부하 생성 프로세스들이 클라이언트 C개를 존 1/2에 반씩
+넣어 MOVE를 초당 rate번씩 보낸다 (--view-radius 0이면 이동 하나가 존 전체로 브로드캐스트).
+서버가 실제로 처리한 양은 샤드별 STATS의 dispatched / out_packets 증가분으로 잰다.
+
+  shards 1 : 한 프로세스가 두 존을 다 처리
+  shards 2 : 존 1 / 존 2를 다른 프로세스(코어)가 처리 — 코어가 2개 이상이어야 처리량이 는다
+
+사용법:
+  python bench_shards.py
+  python bench_shards.py --shards 1,2,4 --clients 400 --rate 20 --seconds 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import MsgType, PacketFramer, build_packet
+
+BRIDGE_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tcp_bridge.py")
+HOST = '127.0.0.1'
+# 존 -> 클라이언트가 돌아다니는 x/z 범위 (GHOST_BOUNDARY 300 안쪽/바깥쪽)
+FAR_FROM_BORDER = {1: (50.0, 250.0), 2: (400.0, 600.0)}
+
+
+def query_stats(port: int) -> dict:
+    """STATS 한 번 (접속을 받은 샤드의 값)"""
+    with socket.create_connection((HOST, port), timeout=3) as s:
+        s.sendall(build_packet(MsgType.STATS))
+        framer = PacketFramer()
+        while True:
+            data = s.recv(65536)
+            if not data:
+                return {}
+            framer.feed(data)
+            for msg_type, payload in framer.packets():
+                if msg_type == MsgType.STATS:
+                    return dict(kv.split('=', 1) for kv in bytes(payload).decode().split('|') if '=' in kv)
+
+
+def shard_stats(port: int, shards: int) -> dict:
+    """샤드 번호 -> STATS (모든 샤드가 답할 때까지 여러 번 접속)"""
+    found = {}
+    for _ in range(shards * 20):
+        st = query_stats(port)
+        found[int(st.get('shard', 0))] = st
+        if len(found) >= shards:
+            break
+    return found
+
+
+async def client(port: int, zone: int, rate: float, until: float, counters: list):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    name = b"bench"
+    writer.write(build_packet(MsgType.LOGIN, bytes([len(name)]) + name + b'\x02pw')
+                 + build_packet(MsgType.CHAR_SELECT, struct.pack('<I', 1)))
+    if zone != 1:
+        writer.write(build_packet(MsgType.ZONE_ENTER, struct.pack('<I', zone)))
+
+    async def drain_reads():
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            counters[1] += len(data)
+
+    reading = asyncio.ensure_future(drain_reads())
+    # 존 경계 고스트가 안 생기는 구역에서만 움직인다 (샤드 수와 상관없이 브로드캐스트 수가 같게)
+    lo, hi = FAR_FROM_BORDER[zone]
+    x = z = 100.0  # 캐릭터 선택 위치 — 존 2는 속도 검증에 안 걸리게 조금씩 걸어 들어간다
+    interval = 1.0 / rate
+    await asyncio.sleep(random.uniform(0, interval) + 0.5)  # 핸드오프가 끝나고 나서
+    while time.time() < until and not reading.done():
+        x = min(x + 40.0, lo) if x < lo else min(hi, max(lo, x + random.uniform(-5, 5)))
+        z = min(z + 40.0, lo) if z < lo else min(hi, max(lo, z + random.uniform(-5, 5)))
+        writer.write(build_packet(MsgType.MOVE, struct.pack('<fff', x, 0.0, z)))
+        counters[0] += 1
+        await asyncio.sleep(interval)
+    reading.cancel()
+    writer.close()
+
+
+def load_process(port: int, zones: list, rate: float, until: float, out):
+    async def run():
+        counters = [0, 0]  # moves sent, bytes received
+        await asyncio.gather(*(client(port, zone, rate, until, counters) for zone in zones),
+                             return_exceptions=True)
+        out.put(counters)
+    asyncio.run(run())
+
+
+def run(shards: int, args) -> dict:
+    port = args.port
+    cmd = [sys.executable, BRIDGE_PY, '--port', str(port), '--view-radius', str(args.view_radius),
+           '--shards', str(shards), '--monster-scale', '0']
+    server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(1.5 + 0.3 * shards)
+        zones = [1 + i % 2 for i in range(args.clients)]
+        until = time.time() + 1.5 + args.seconds
+        out = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=load_process,
+                                         args=(port, zones[i::args.procs], args.rate, until, out))
+                 for i in range(args.procs)]
+        for p in procs:
+            p.start()
+        time.sleep(2.0)  # 접속 + 핸드오프 + 존 2 안쪽으로 이동
+        before = shard_stats(port, shards)
+        t0 = time.time()
+        time.sleep(args.seconds - 0.5)
+        after = shard_stats(port, shards)
+        elapsed = time.time() - t0
+        sent = received = 0
+        for _ in procs:
+            moves, nbytes = out.get(timeout=30)
+            sent += moves
+            received += nbytes
+        for p in procs:
+            p.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=5)
+        time.sleep(0.5)
+
+    def delta(key):
+        return [(int(after[i][key]) - int(before[i][key])) / elapsed if i in after and i in before else 0.0
+                for i in range(shards)]
+    return {"dispatched": delta('dispatched'), "out_packets": delta('out_packets'),
+            "offered": sent / (args.seconds + 1.5), "recv_mb": received / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zone shard throughput benchmark")
+    parser.add_argument('--shards', default='1,2', help='comma-separated shard counts to compare')
+    parser.add_argument('--clients', type=int, default=200, help='bot connections (half in zone 1, half in zone 2)')
+    parser.add_argument('--rate', type=float, default=10.0, help='MOVE per second per client')
+    parser.add_argument('--seconds', type=float, default=6.0, help='measurement window')
+    parser.add_argument('--procs', type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help='load generator processes')
+    parser.add_argument('--view-radius', type=float, default=0.0, help='server AOI radius (0 = whole zone)')
+    parser.add_argument('--port', type=int, default=17900)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"  Zone shard benchmark ({args.clients} clients x {args.rate:g} moves/s, {os.cpu_count()} CPUs,"
+          f" view radius {args.view_radius:g})")
+    print("=" * 78)
+    print(f"  {'shards':>6}  {'offered/s':>10}  {'moves/s':>9}  {'bcast pkts/s':>13}  {'recv MB':>8}  per-shard moves/s")
+    base = None
+    for shards in (int(n) for n in args.shards.split(',')):
+        r = run(shards, args)
+        moves = sum(r["dispatched"])
+        base = base or moves
+        split = " / ".join(f"{m:,.0f}" for m in r["dispatched"])
+        print(f"  {shards:>6}  {r['offered']:>10,.0f}  {moves:>9,.0f}  {sum(r['out_packets']):>13,.0f}"
+              f"  {r['recv_mb']:>8.1f}  {split}  ({moves / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Spatial query 마이크로벤치마크
+==============================
+존 하나에 엔티티 1k / 10k / 100k를 흩뿌려 놓고 SPATIAL_QUERY_REQ 응답 생성 속도 비교.
+
+  legacy : 존 전체를 돌며 math.sqrt 거리 + 정렬 + buf += 로 응답 조립 (기존 _on_spatial_query)
+  grid   : BridgeServer._query_radius (AOI 그리드 후보 셀 + 제곱 거리 + 한 번의 pack)
+
+사용법:
+  python bench_spatial.py
+  python bench_spatial.py --seconds 2.0 --radius 300 --extent 20000
+"""
+
+import argparse
+import math
+import random
+import struct
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BridgeServer, PlayerSession, Position, GRID_CELL_SIZE
+
+
+def build_server(n: int, extent: float, seed: int = 1) -> BridgeServer:
+    rng = random.Random(seed)
+    srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+    srv.channel_capacity = 10 ** 9  # 전원을 채널 하나에
+    for i in range(n):
+        sess = PlayerSession(writer=None)
+        sess.entity_id = 1 + i
+        sess.in_game = True
+        sess.zone_id = 1
+        sess.pos = Position(rng.uniform(0, extent), 0.0, rng.uniform(0, extent))
+        srv.sessions[sess.entity_id] = sess
+        srv._aoi_update(sess)
+    return srv
+
+
+def legacy_query(srv: BridgeServer, x: float, z: float, radius: float) -> bytes:
+    """기존 _on_spatial_query의 플레이어 검색 + 응답 조립 그대로"""
+    results = []
+    for eid in srv.zone_players.get(1, ()):
+        s = srv.sessions[eid]
+        dx = s.pos.x - x
+        dz = s.pos.z - z
+        dist = math.sqrt(dx*dx + dz*dz)
+        if dist <= radius:
+            results.append((eid, dist))
+    results.sort(key=lambda r: r[1])
+    buf = struct.pack('<B', min(len(results), 255))
+    for eid, dist in results[:255]:
+        buf += struct.pack('<Qf', eid, dist)
+    return buf
+
+
+def grid_query(srv: BridgeServer, x: float, z: float, radius: float) -> bytes:
+    hits = srv._query_radius(1, x, z, radius, monsters=False, limit=255)
+    flat = []
+    for d2, eid in hits:
+        flat.append(eid)
+        flat.append(math.sqrt(d2))
+    return struct.pack('<B' + 'Qf' * len(hits), len(hits), *flat)
+
+
+def bench(fn, srv, points, radius, seconds) -> float:
+    n = 0
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    while time.perf_counter() < deadline:
+        for x, z in points:
+            fn(srv, x, z, radius)
+        n += len(points)
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spatial query microbenchmark")
+    parser.add_argument('--seconds', type=float, default=1.0, help='seconds per case')
+    parser.add_argument('--radius', type=float, default=GRID_CELL_SIZE, help='query radius')
+    parser.add_argument('--extent', type=float, default=20000.0, help='zone width/height')
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    points = [(rng.uniform(0, args.extent), rng.uniform(0, args.extent)) for _ in range(64)]
+
+    print("=" * 64)
+    print(f"  Spatial query microbenchmark (radius={args.radius:g}, zone={args.extent:g}^2)")
+    print("=" * 64)
+    print(f"  {'entities':>9}  {'legacy q/s':>12}  {'grid q/s':>12}  {'speedup':>8}  {'same':>5}")
+    for n in (1_000, 10_000, 100_000):
+        srv = build_server(n, args.extent)
+        same = all(legacy_query(srv, x, z, args.radius) == grid_query(srv, x, z, args.radius)
+                   for x, z in points[:8])
+        legacy = bench(legacy_query, srv, points, args.radius, args.seconds)
+        grid = bench(grid_query, srv, points, args.radius, args.seconds)
+        print(f"  {n:>9,}  {legacy:>12,.0f}  {grid:>12,.0f}  {grid / legacy:>7.1f}x  {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
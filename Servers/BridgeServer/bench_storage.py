@@ -0,0 +1,125 @@
+"""
+영속화 write-behind 마이크로벤치마크
+=====================================
+핸들러가 저장소에 변경을 알릴 때 드는 비용(= _dispatch에 더해지는 지연)과
+틱 flush / writer 스레드 커밋 처리량을 잰다.
+
+  memory : db_path 없음 (repo.save는 no-op)
+  sqlite : db_path 있음 (repo.save = dirty dict 쓰기 한 번, 직렬화/디스크는 writer 스레드)
+
+기동 시간도 비교한다 (계정 N개 = 계정/인벤토리/캐릭터/우편 행 4N개):
+
+  sqlite   : 스냅샷 없이 SQLite 전 테이블 SELECT
+  snapshot : 스냅샷 + 저널 꼬리 재생
+  server   : snapshot + BridgeServer._load_world (프로필/인벤토리는 로그인 때 디코드)
+
+사용법:
+  python bench_storage.py
+  python bench_storage.py --ops 200000 --per-tick 2000
+  python bench_storage.py --boot 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BridgeServer, Storage
+
+
+def make_mail(i: int) -> dict:
+    return {"id": i, "sender_name": "Auction House", "sender_account": 0, "subject": "Item Sold",
+            "body": "Your item sold.", "gold": i % 1000, "item_id": 0, "item_count": 0,
+            "read": False, "claimed": False, "sent_time": 1_700_000_000.0, "expires": 1_700_604_800.0}
+
+
+def run(store: Storage, ops: int, per_tick: int):
+    mails = [make_mail(i) for i in range(ops)]
+    save = store.mail.save
+    handler = 0.0
+    flush = 0.0
+    for start in range(0, ops, per_tick):
+        t0 = time.perf_counter()
+        for mail in mails[start:start + per_tick]:
+            save(mail["id"], mail, 1000 + mail["id"] % 100)
+        t1 = time.perf_counter()
+        store.flush()
+        handler += t1 - t0
+        flush += time.perf_counter() - t1
+    t0 = time.perf_counter()
+    store.close()
+    drain = time.perf_counter() - t0
+    return handler / ops * 1e9, flush / max(1, ops // per_tick) * 1e3, drain
+
+
+def populate(path: str, accounts: int, tail: int):
+    """계정 N개 저장 후 스냅샷 종료, 이어서 tail개 변경은 저널에만 남긴 채 종료"""
+    store = Storage(path)
+    slot = {"item_id": 0, "count": 0, "equipped": False, "enhance_level": 0}
+    for i in range(accounts):
+        aid = 1000 + i
+        store.accounts.save(f"user{i}", {"gold": i, "silver": 0, "crystal": 0, "dungeon_token": 0, "pvp_token": 0,
+                                         "bounty_tokens": 0, "guild_contribution": 0, "friends": [],
+                                         "blocked_players": []}, aid)
+        store.inventory.save(aid, [dict(slot, item_id=201, count=3)] + [slot] * 19, aid)
+        store.characters.save(aid, [{"id": i + 1, "name": f"Char{i}", "class": 1, "level": 1, "zone": 1}], aid)
+        store.mail.save(i + 1, dict(make_mail(i + 1), expires=time.time() + 86400), aid)
+        if i % 10_000 == 9_999:
+            store.flush()
+    store.close()
+    store = Storage(path)
+    for i in range(tail):
+        store.accounts.save(f"user{i}", {"gold": -i}, 1000 + i)
+        store.flush()
+    store.close(snapshot=False)
+
+
+def boot(path: str, accounts: int, tail: int):
+    print()
+    print(f"  Boot time ({accounts:,} accounts = {accounts * 4:,} rows, {tail} journal batches)")
+    print(f"  {'source':>9}  {'load s':>7}  {'rows':>8}  {'journal':>8}")
+    t0 = time.perf_counter()
+    populate(path, accounts, tail)
+    print(f"  (populate {time.perf_counter() - t0:.1f} s, snapshot {os.path.getsize(path + '.snapshot') / 1e6:.1f} MB)")
+    for source in ("snapshot", "sqlite"):
+        if source == "sqlite":
+            os.rename(path + ".snapshot", path + ".snapshot.bak")
+        store = Storage(path)
+        report = store.load_report
+        store.close(snapshot=False)
+        print(f"  {report['source']:>9}  {report['seconds']:>7.2f}  {report['rows']:>8,}  {report['journal_batches']:>8}")
+    os.rename(path + ".snapshot.bak", path + ".snapshot")
+    t0 = time.perf_counter()
+    srv = BridgeServer(port=0, verbose=False, db_path=path)
+    print(f"  {'server':>9}  {time.perf_counter() - t0:>7.2f}  {len(srv.accounts):>8,}  {'-':>8}")
+    srv.store.close(snapshot=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage write-behind microbenchmark")
+    parser.add_argument('--ops', type=int, default=100_000, help='mail saves')
+    parser.add_argument('--per-tick', type=int, default=1_000, help='saves between flushes (one tick)')
+    parser.add_argument('--boot', type=int, default=20_000, help='accounts for the boot-time comparison')
+    parser.add_argument('--tail', type=int, default=100, help='journal batches after the last snapshot')
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"  Storage write-behind microbenchmark ({args.ops:,} saves, {args.per_tick:,}/tick)")
+    print("=" * 72)
+    print(f"  {'mode':>7}  {'save ns/op':>11}  {'flush ms/tick':>14}  {'drain s':>8}  {'commits':>8}  {'rows':>8}")
+    mem = Storage(None)
+    save_ns, flush_ms, drain = run(mem, args.ops, args.per_tick)
+    print(f"  {'memory':>7}  {save_ns:>11.0f}  {flush_ms:>14.2f}  {drain:>8.2f}  {'-':>8}  {'-':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Storage(os.path.join(tmp, "bench.db"))
+        save_ns, flush_ms, drain = run(store, args.ops, args.per_tick)
+        print(f"  {'sqlite':>7}  {save_ns:>11.0f}  {flush_ms:>14.2f}  {drain:>8.2f}"
+              f"  {store.stats['commits']:>8,}  {store.stats['rows']:>8,}")
+        if args.boot:
+            boot(os.path.join(tmp, "boot.db"), args.boot, args.tail)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+만료 타이머 마이크로벤치마크
+============================
+세션 N개가 버프를 3개씩 들고 있을 때 "만료 처리 1초치" 비용 비교.
+
+  legacy : 1초마다 전 세션 버프 리스트를 다시 만드는 스캔 (기존 _cleanup_expired_buffs)
+  wheel  : TimerWheel을 기본 틱(30Hz)마다 advance — 도래한 슬롯만 꺼낸다
+
+사용법:
+  python bench_timers.py
+  python bench_timers.py --seconds 30
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import TimerWheel, DEFAULT_TICK_RATE
+
+
+def legacy_scan(buff_lists, now):
+    """기존 _cleanup_expired_buffs 그대로 (세션 -> 버프 리스트)"""
+    for i, buffs in enumerate(buff_lists):
+        buff_lists[i] = [b for b in buffs if b["expires"] > now]
+
+
+def build(n: int, start: float, seed: int = 1):
+    rng = random.Random(seed)
+    buff_lists = []
+    wheel = TimerWheel(start)
+    for i in range(n):
+        buffs = [{"buff_id": k, "expires": start + rng.uniform(1, 600), "stacks": 1} for k in range(3)]
+        buff_lists.append(buffs)
+        for b in buffs:
+            wheel.schedule("buff", (i, b["buff_id"]), b["expires"], None)
+    return buff_lists, wheel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expiry timer microbenchmark")
+    parser.add_argument('--seconds', type=int, default=10, help='simulated seconds')
+    args = parser.parse_args()
+
+    print("=" * 64)
+    print(f"  Expiry timer microbenchmark ({args.seconds}s simulated, buffs 3/session)")
+    print("=" * 64)
+    print(f"  {'sessions':>9}  {'legacy ms/s':>12}  {'wheel ms/s':>11}  {'speedup':>8}  {'fired':>6}")
+    start = 1_700_000_000.0
+    for n in (1_000, 10_000, 100_000):
+        buff_lists, wheel = build(n, start)
+        t0 = time.perf_counter()
+        for sec in range(1, args.seconds + 1):
+            legacy_scan(buff_lists, start + sec)
+        legacy = (time.perf_counter() - t0) / args.seconds * 1000.0
+
+        fired = 0
+        ticks = int(args.seconds * DEFAULT_TICK_RATE)
+        t0 = time.perf_counter()
+        for t in range(1, ticks + 1):
+            fired += len(wheel.advance(start + t / DEFAULT_TICK_RATE))
+        wheel_ms = (time.perf_counter() - t0) / args.seconds * 1000.0
+        print(f"  {n:>9,}  {legacy:>12.2f}  {wheel_ms:>11.2f}  {legacy / wheel_ms:>7.1f}x  {fired:>6,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,19 +12,38 @@ Unity 클라이언트가 실제 TCP 소켓으로 접속하여 게임 기능을 
   python tcp_bridge.py              # 기본 포트 7777
   python tcp_bridge.py --port 8888  # 커스텀 포트
   python tcp_bridge.py --verbose    # 상세 로그
+  python tcp_bridge.py --transport protocol  # asyncio.Protocol 전송 (연결당 Task 없음)
+  python tcp_bridge.py --shards 2   # 필드 존을 워커 프로세스 2개에 나눠 실행 (Linux/macOS)
+  python tcp_bridge.py --role gate  # 게이트 (기본 포트 8888): 로그인을 가장 한가한 필드로 라우팅
+  python tcp_bridge.py --port 7778 --gate 127.0.0.1:8888  # 필드로 게이트에 등록 + 하트비트
+  python tcp_bridge.py --role bus   # 메시지 버스 (기본 포트 9999): 브릿지 프로세스 사이 토픽 pub/sub
+  python tcp_bridge.py --port 7778 --bus 127.0.0.1:9999   # 월드 공지/귓속말/우편을 다른 브릿지와 공유
 """
 
 import asyncio
+import bisect
+import csv
+import heapq
 import struct
 import json
 import time
 import math
 import random
 import argparse
+import multiprocessing
 import os
+import pickle
+import queue
+import signal
+import socket
+import sqlite3
 import sys
+import threading
+import zlib
+from array import array
+from collections import deque, namedtuple
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Callable, Dict, List, Optional, Tuple, Set
 from enum import IntEnum
 
 # ━━━ 프로토콜 정의 (PacketComponents.h 미러) ━━━
@@ -98,8 +117,14 @@ class MsgType(IntEnum):
     FIELD_REGISTER = 130
     FIELD_HEARTBEAT = 131
     FIELD_REGISTER_ACK = 132
+    GATE_SERVER_LIST = 133
+    GATE_SERVER_LIST_RESP = 134
 
     BUS_REGISTER = 140
+    BUS_REGISTER_ACK = 141
+    BUS_SUBSCRIBE = 142
+    BUS_SUB_ACK = 143
+    BUS_UNSUBSCRIBE = 144
     BUS_PUBLISH = 145
     BUS_MESSAGE = 146
 
@@ -461,6 +486,517 @@ def parse_header(data: bytes) -> Tuple[int, int]:
     length, msg_type = struct.unpack('<IH', data[:6])
     return length, msg_type
 
+def _msg_name(msg_type: int) -> str:
+    """로그용 메시지 이름"""
+    try:
+        return MsgType(msg_type).name
+    except ValueError:
+        return f"UNKNOWN({msg_type})"
+
+
+_HEADER = struct.Struct('<IH')
+_MONSTER_MOVE = struct.Struct('<Qfff')  # entity_id, x, y, z
+
+
+class FramingError(ValueError):
+    """패킷 길이 필드가 잘못됨 — 스트림 동기가 깨졌으므로 연결을 끊어야 한다."""
+
+
+class PacketFramer:
+    """TCP 스트림 → (msg_type, payload) 프레이밍.
+
+    수신 버퍼는 재사용하고 읽기 오프셋만 전진시킨다. 소비한 앞부분은
+    compact_threshold를 넘었을 때만 한 번에 잘라낸다 (패킷마다 잘라내면
+    한 번의 read에 N개 패킷이 오면 O(N^2) 복사).
+    payload는 버퍼를 가리키는 memoryview — 소비자가 다음 패킷을 요청하는 순간
+    release()되므로 보관하려면 bytes()로 복사해야 한다.
+    """
+    __slots__ = ('_buf', '_pos', 'compact_threshold', 'max_packet')
+
+    def __init__(self, compact_threshold: int = 64 * 1024, max_packet: int = MAX_PACKET_SIZE):
+        self._buf = bytearray()
+        self._pos = 0
+        self.compact_threshold = compact_threshold
+        self.max_packet = max_packet
+
+    def __len__(self) -> int:
+        """아직 처리하지 않은 바이트 수"""
+        return len(self._buf) - self._pos
+
+    def feed(self, data) -> None:
+        try:
+            self._buf += data
+        except BufferError:
+            # 핸들러가 이전 payload 뷰를 아직 잡고 있음 → 남은 부분만 새 버퍼로
+            self._buf = self._buf[self._pos:] + data
+            self._pos = 0
+
+    def packets(self):
+        """완성된 패킷을 (msg_type, memoryview payload)로 yield.
+
+        길이 필드가 잘못되면 FramingError.
+        """
+        buf = self._buf
+        end = len(buf)
+        if end - self._pos < PACKET_HEADER_SIZE:
+            return
+        view = memoryview(buf)
+        max_packet = self.max_packet
+        try:
+            while end - self._pos >= PACKET_HEADER_SIZE:
+                pos = self._pos
+                pkt_len, msg_type = _HEADER.unpack_from(buf, pos)
+                if pkt_len < PACKET_HEADER_SIZE or pkt_len > max_packet:
+                    raise FramingError(f"Invalid packet length: {pkt_len}")
+                if end - pos < pkt_len:
+                    break  # 아직 다 안 옴
+                self._pos = pos + pkt_len
+                payload = view[pos + PACKET_HEADER_SIZE:pos + pkt_len]
+                try:
+                    yield msg_type, payload
+                finally:
+                    payload.release()
+                if buf is not self._buf:
+                    return  # feed()가 버퍼를 교체함 — 다음 호출에서 이어서
+        finally:
+            view.release()
+        self._compact()
+
+    def take_rest(self) -> bytes:
+        """아직 처리하지 않은 바이트를 꺼내고 버퍼를 비운다 (샤드 핸드오프 때 연결과 같이 넘김)"""
+        rest = bytes(self._buf[self._pos:])
+        self._buf = bytearray()
+        self._pos = 0
+        return rest
+
+    def _compact(self):
+        pos = self._pos
+        if not pos:
+            return
+        if pos < len(self._buf) and pos < self.compact_threshold:
+            return
+        try:
+            del self._buf[:pos]
+            self._pos = 0
+        except BufferError:
+            pass  # 남아 있는 payload 뷰가 풀리면 다음 번에 정리
+
+
+def _write_buffer_size(writer) -> int:
+    """StreamWriter / Transport 공통: 커널로 아직 못 넘긴 송신 바이트"""
+    transport = getattr(writer, 'transport', writer)
+    try:
+        return transport.get_write_buffer_size()
+    except AttributeError:
+        return 0
+
+
+# ━━━ 메시지 스키마 (미리 컴파일한 struct 코덱) ━━━
+#
+# 메시지 = 필드 목록 [(이름, 타입)]. 타입:
+#   'u8' 'u16' 'u32' 'u64' 'i8' 'i16' 'i32' 'i64' 'f32' 'bool'   스칼라
+#   Fixed(n)               n바이트 고정 문자열 (utf-8, 넘치면 자르고 모자라면 \0)
+#   Text('u8')             길이 접두 문자열
+#   Array('u8', fields)    개수 접두 리스트 (원소 = fields 레코드)
+# 값은 필드 순서대로 위치 인자 (Array 값은 원소 튜플들의 시퀀스, 문자열은 str 또는 bytes).
+#
+# 인코더는 스키마마다 한 번 생성하는 전용 함수 (dataclasses가 __init__을 만드는 것과 같은 방식):
+# 포맷 문자열 + 인자 리스트를 한 번에 모아 struct.pack 한 번 — 헤더 포함 패킷이 할당 1회.
+# 전부 고정 폭인 메시지는 헤더까지 합친 struct.Struct를 미리 컴파일해 둔다.
+# decode: 필드 이름으로 읽는 namedtuple (Fixed는 \0 앞까지 str, Array는 namedtuple 리스트).
+
+_SCALAR_CODES = {'u8': 'B', 'u16': 'H', 'u32': 'I', 'u64': 'Q', 'i8': 'b', 'i16': 'h', 'i32': 'i',
+                 'i64': 'q', 'f32': 'f', 'bool': '?'}
+_STRUCT_CACHE: Dict[str, struct.Struct] = {}  # 가변 길이 메시지 포맷 -> Struct
+
+
+def _struct_for(fmt: str) -> struct.Struct:
+    st = _STRUCT_CACHE.get(fmt)
+    if st is None:
+        if len(_STRUCT_CACHE) >= 1024:
+            _STRUCT_CACHE.clear()
+        st = _STRUCT_CACHE[fmt] = struct.Struct(fmt)
+    return st
+
+
+def _to_bytes(value) -> bytes:
+    return value.encode('utf-8') if value.__class__ is str else value
+
+
+class Fixed:
+    __slots__ = ('size',)
+
+    def __init__(self, size: int):
+        self.size = size
+
+
+class Text:
+    __slots__ = ('prefix',)
+
+    def __init__(self, prefix: str = 'u8'):
+        self.prefix = _SCALAR_CODES[prefix]
+
+
+class Array:
+    __slots__ = ('prefix', 'record')
+
+    def __init__(self, prefix: str, fields):
+        self.prefix = _SCALAR_CODES[prefix]
+        self.record = Record(fields)
+
+
+class Record:
+    """필드 목록 코덱. fmt = 전부 고정 폭일 때의 struct 포맷 ('<' 제외, 아니면 None)"""
+    __slots__ = ('fields', 'fmt', 'size', 'tuple', 'strings', '_flat')
+
+    def __init__(self, fields, name: str = 'Entry'):
+        self.fields = tuple(fields)
+        self.tuple = namedtuple(name, [field_name for field_name, _ in self.fields])
+        self.strings = tuple(i for i, (_, kind) in enumerate(self.fields) if isinstance(kind, Fixed))
+        fmt = ''
+        for _, kind in self.fields:
+            if isinstance(kind, (Text, Array)):
+                fmt = None
+                break
+            fmt += f'{kind.size}s' if isinstance(kind, Fixed) else _SCALAR_CODES[kind]
+        self.fmt = fmt
+        self.size = struct.calcsize('<' + fmt) if fmt is not None else None
+        self._flat = self._compile()
+
+    # ---- 인코더 생성 ----
+
+    def _emit(self, values: List[str], lines: List[str], indent: str, pending: list, depth: int):
+        """values(식)를 fmt/args에 쌓는 코드. pending = [포맷 템플릿, 인자식들, Text 길이식들] — 루프 전에 flush"""
+        def flush():
+            if pending[0]:
+                if pending[2]:
+                    lines.append(f"{indent}fmt.append({pending[0]!r} % ({', '.join(pending[2])},))")
+                else:
+                    lines.append(f"{indent}fmt.append({pending[0]!r})")
+            if pending[1]:
+                lines.append(f"{indent}args += ({', '.join(pending[1])},)")
+            pending[:] = ['', [], []]
+
+        for i, ((_, kind), expr) in enumerate(zip(self.fields, values)):
+            if isinstance(kind, Fixed):
+                pending[0] += f'{kind.size}s'
+                pending[1].append(f"_b({expr})")
+            elif isinstance(kind, Text):
+                text = f"t{depth}_{i}"
+                lines.append(f"{indent}{text} = {expr}.encode('utf-8') if {expr}.__class__ is str else {expr}")
+                lines.append(f"{indent}n{text} = len({text})")
+                pending[0] += kind.prefix + '%ds'
+                pending[1] += [f"n{text}", text]
+                pending[2].append(f"n{text}")
+            elif isinstance(kind, Array):
+                rec = kind.record
+                pending[0] += kind.prefix
+                pending[1].append(f"len({expr})")
+                flush()
+                names = [f"e{depth}_{j}" for j in range(len(rec.fields))]
+                if rec.fmt is not None:
+                    # 고정 폭 원소: 포맷은 원소 포맷 * 개수, 인자만 원소마다 이어 붙임
+                    lines.append(f"{indent}fmt.append({rec.fmt!r} * len({expr}))")
+                    if not rec.strings:
+                        lines.append(f"{indent}for item in {expr}:")
+                        lines.append(f"{indent}    args += item")
+                        continue
+                    lines.append(f"{indent}for {', '.join(names)}, in {expr}:")
+                    exprs = [f"_b({n})" if j in rec.strings else n for j, n in enumerate(names)]
+                    lines.append(f"{indent}    args += ({', '.join(exprs)},)")
+                    continue
+                lines.append(f"{indent}for {', '.join(names)}, in {expr}:")
+                rec._emit(names, lines, indent + '    ', ['', [], []], depth + 1)
+            else:
+                pending[0] += _SCALAR_CODES[kind]
+                pending[1].append(expr)
+        flush()
+
+    def _compile(self):
+        """_flat(fmt, args, v0, v1, ...) — 포맷 조각/인자를 이어 붙이는 전용 함수"""
+        values = [f"v{i}" for i in range(len(self.fields))]
+        lines = [f"def _flat(fmt, args, {', '.join(values)}):"]
+        self._emit(values, lines, '    ', ['', [], []], 0)
+        lines.append("    return fmt, args")
+        ns = {'_b': _to_bytes}
+        exec('\n'.join(lines), ns)
+        return ns['_flat']
+
+    # ---- 인코드/디코드 ----
+
+    def encode(self, *values) -> bytes:
+        fmt, args = self._flat(['<'], [], *values)
+        return _struct_for(''.join(fmt)).pack(*args)
+
+    def pack_into(self, buf, off: int, *values) -> int:
+        """buf[off:]에 인코딩, 끝 오프셋 반환"""
+        fmt, args = self._flat(['<'], [], *values)
+        st = _struct_for(''.join(fmt))
+        st.pack_into(buf, off, *args)
+        return off + st.size
+
+    def decode_from(self, buf, off: int = 0):
+        """(namedtuple, 끝 오프셋). 버퍼가 짧으면 struct.error"""
+        out = []
+        fmt = ''
+        for _, kind in self.fields:
+            if isinstance(kind, (Text, Array)):
+                if fmt:
+                    st = _struct_for('<' + fmt)
+                    out.extend(st.unpack_from(buf, off))
+                    off += st.size
+                    fmt = ''
+                (n,) = struct.unpack_from('<' + kind.prefix, buf, off)
+                off += struct.calcsize(kind.prefix)
+                if isinstance(kind, Text):
+                    if off + n > len(buf):
+                        raise struct.error(f"text needs {n} bytes at offset {off}")
+                    out.append(bytes(buf[off:off + n]).decode('utf-8', errors='replace'))
+                    off += n
+                else:
+                    items = []
+                    for _ in range(n):
+                        item, off = kind.record.decode_from(buf, off)
+                        items.append(item)
+                    out.append(items)
+            else:
+                fmt += f'{kind.size}s' if isinstance(kind, Fixed) else _SCALAR_CODES[kind]
+        if fmt:
+            st = _struct_for('<' + fmt)
+            out.extend(st.unpack_from(buf, off))
+            off += st.size
+        for i in self.strings:
+            out[i] = out[i].split(b'\x00', 1)[0].decode('utf-8', errors='replace')
+        return self.tuple._make(out), off
+
+    def decode(self, buf):
+        return self.decode_from(buf, 0)[0]
+
+    def layout(self) -> tuple:
+        """와이어 배치만 (필드 바이트 수 / ('text', 접두) / ('array', 접두, 원소 배치)) — 스키마 비교용"""
+        out = []
+        for _, kind in self.fields:
+            if isinstance(kind, Fixed):
+                out.append(kind.size)
+            elif isinstance(kind, Text):
+                out.append(('text', struct.calcsize(kind.prefix)))
+            elif isinstance(kind, Array):
+                out.append(('array', struct.calcsize(kind.prefix), kind.record.layout()))
+            else:
+                out.append(struct.calcsize(_SCALAR_CODES[kind]))
+        return tuple(out)
+
+
+class Message(Record):
+    """MsgType 하나의 페이로드 스키마"""
+    __slots__ = ('msg_type', 'packet')
+
+    def __init__(self, msg_type: int, fields, name: Optional[str] = None):
+        super().__init__(fields, name or MsgType(msg_type).name)
+        self.msg_type = msg_type
+        if self.fmt is not None and not self.strings:
+            # 고정 폭: 헤더까지 합친 Struct 하나로 pack 한 번
+            st = struct.Struct('<IH' + self.fmt)
+            head = (st.size, msg_type)
+            self.packet = lambda *values: st.pack(*head, *values)
+        else:
+            self.packet = self._packet
+
+    def _packet(self, *values) -> bytes:
+        """헤더 + 페이로드 (build_packet(msg_type, encode(...))와 같은 바이트)"""
+        fmt, args = self._flat(['<IH'], [0, self.msg_type], *values)
+        st = _struct_for(''.join(fmt))
+        args[0] = st.size
+        return st.pack(*args)
+
+
+PROTOCOL_JSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                  '_comms', 'tools', 'parsed_protocol.json')
+_PROTOCOL_TYPES = {'u8': 'u8', 'u16': 'u16', 'u32': 'u32', 'u64': 'u64', 'int': 'i32'}
+
+
+def _protocol_field(spec: dict):
+    kind = spec["type"]
+    if kind.startswith("string_fixed("):
+        return Fixed(int(kind[len("string_fixed("):-1]))
+    return _PROTOCOL_TYPES[kind]
+
+
+def load_protocol_schemas(path: str = PROTOCOL_JSON_PATH) -> Dict[str, Message]:
+    """parse_packet_components.py 출력(C++ PacketComponents.h)에서 메시지 스키마 생성.
+
+    길이 필드 + 가변 문자열은 Text로, 개수 필드 + 배열은 Array로 합친다. 헤더 주석에는 float/부호가
+    없으므로 (x/y/z도 u32) 배치만 믿을 수 있다 — 실제 타입은 Schema 쪽 선언이 기준.
+    표현할 수 없는 메시지(개수 필드가 배열 바로 앞이 아님 등)는 건너뛴다. 파일이 없으면 빈 dict.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            messages = json.load(f)["messages"]
+    except (OSError, ValueError, KeyError):
+        return {}
+    schemas = {}
+    for msg in messages:
+        fields = []
+        try:
+            for spec in msg["payload"]:
+                if spec["type"] == "string":
+                    name, prefix = fields.pop()
+                    fields.append((spec["name"], Text(prefix)))
+                elif spec["type"] == "array":
+                    count_name, prefix = fields.pop()
+                    if count_name != spec["count_field"]:
+                        raise ValueError(spec["count_field"])
+                    fields.append((spec["name"], Array(prefix, [(e["name"], _protocol_field(e))
+                                                                for e in spec["entry_fields"]])))
+                else:
+                    fields.append((spec["name"], _protocol_field(spec)))
+            if not fields and msg.get("payload_size"):
+                continue  # 주석에 크기만 있고 필드 목록이 없음
+            schemas[msg["name"]] = Message(msg["id"], fields, msg["name"])
+        except (KeyError, ValueError, IndexError, TypeError):
+            continue
+    return schemas
+
+
+class Schema:
+    """서버/테스트 클라이언트가 같이 쓰는 메시지 스키마 (MsgType 이름과 같은 속성 이름)"""
+    CHAR_LIST_RESP = Message(MsgType.CHAR_LIST_RESP, [
+        ("chars", Array('u8', [("id", 'u32'), ("name", Fixed(32)), ("level", 'u32'), ("job", 'u32')])),
+    ])
+    STAT_SYNC = Message(MsgType.STAT_SYNC, [
+        ("level", 'u32'), ("hp", 'i32'), ("max_hp", 'i32'), ("mp", 'i32'), ("max_mp", 'i32'),
+        ("atk", 'u32'), ("defense", 'u32'), ("exp", 'u32'), ("exp_next", 'u32'),
+    ])
+    SKILL_LIST_RESP = Message(MsgType.SKILL_LIST_RESP, [
+        ("skills", Array('u8', [("id", 'u32'), ("name", Fixed(16)), ("cd_ms", 'u32'), ("dmg", 'u32'),
+                                ("mp", 'u32'), ("range", 'u32'), ("type", 'u8'),
+                                ("level", 'u8'), ("effect", 'u8'), ("min_level", 'u32')])),
+    ])
+    PARTY_INFO = Message(MsgType.PARTY_INFO, [
+        ("result", 'u8'), ("party_id", 'u32'), ("leader", 'u64'),
+        ("members", Array('u8', [("entity", 'u64'), ("level", 'u32')])),
+    ])
+    INVENTORY_RESP = Message(MsgType.INVENTORY_RESP, [
+        ("slots", Array('u8', [("slot", 'u8'), ("item_id", 'u32'), ("count", 'u16'), ("equipped", 'u8')])),
+    ])
+    GUILD_INFO = Message(MsgType.GUILD_INFO, [
+        ("result", 'u8'), ("guild_id", 'u32'), ("name", Fixed(32)), ("master", 'u64'),
+        ("member_count", 'u8'), ("level", 'u8'),
+    ])
+    GUILD_LIST = Message(MsgType.GUILD_LIST, [
+        ("guilds", Array('u8', [("id", 'u32'), ("name", Fixed(32)), ("member_count", 'u8'), ("level", 'u8')])),
+    ])
+    BOUNTY_RANKING = Message(MsgType.BOUNTY_RANKING, [
+        ("ranks", Array('u8', [("rank", 'u8'), ("name", Text('u8')), ("score", 'u16')])),
+        ("my_rank", 'u8'), ("my_score", 'u16'),
+    ])
+    # 게이트 (GateServer/main.cpp, FieldServer/main.cpp와 같은 배치)
+    GATE_ROUTE_RESP = Message(MsgType.GATE_ROUTE_RESP, [("result", 'u8'), ("port", 'u16'), ("ip", Text('u8'))])
+    FIELD_REGISTER = Message(MsgType.FIELD_REGISTER, [("port", 'u16'), ("max_ccu", 'u32'), ("name", Text('u8'))])
+    FIELD_HEARTBEAT = Message(MsgType.FIELD_HEARTBEAT, [("port", 'u16'), ("ccu", 'u32'), ("max_ccu", 'u32')])
+    FIELD_REGISTER_ACK = Message(MsgType.FIELD_REGISTER_ACK, [("result", 'u8'), ("server_index", 'u32')])
+    GATE_SERVER_LIST_RESP = Message(MsgType.GATE_SERVER_LIST_RESP, [
+        ("servers", Array('u8', [("port", 'u16'), ("ccu", 'u32'), ("max_ccu", 'u32'), ("status", 'u8')])),
+    ])
+    # 메시지 버스 (BusServer/main.cpp). data는 바이너리라 디코드는 bus_unpack으로
+    BUS_REGISTER = Message(MsgType.BUS_REGISTER, [("name", Text('u8'))])
+    BUS_REGISTER_ACK = Message(MsgType.BUS_REGISTER_ACK, [("result", 'u8'), ("server_id", 'u32')])
+    BUS_SUBSCRIBE = Message(MsgType.BUS_SUBSCRIBE, [("topic", Text('u8'))])
+    BUS_SUB_ACK = Message(MsgType.BUS_SUB_ACK, [("result", 'u8'), ("topic", Text('u8'))])
+    BUS_UNSUBSCRIBE = Message(MsgType.BUS_UNSUBSCRIBE, [("topic", Text('u8'))])
+    BUS_PUBLISH = Message(MsgType.BUS_PUBLISH, [("priority", 'u8'), ("topic", Text('u8')), ("data", Text('u16'))])
+    BUS_MESSAGE = Message(MsgType.BUS_MESSAGE, [
+        ("priority", 'u8'), ("sender_id", 'u32'), ("topic", Text('u8')), ("data", Text('u16')),
+    ])
+
+
+# ━━━ 응답 캐시 (정적 데이터 테이블 응답) ━━━
+#
+# 캐릭터 템플릿/상점/이벤트/레시피/대화처럼 상수 테이블로만 만드는 응답은
+# (msg_type, 파라미터...) 키로 한 번만 인코딩해 두고 같은 bytes를 계속 보낸다 (hit = dict 조회 한 번).
+# 세션 값이 앞에 붙는 응답(재화 잔액 + 목록)은 정적인 뒷부분만 payload()로 캐시한다.
+# 키 파라미터는 테이블에 실제로 있는 값만 쓴다 — 클라이언트 입력을 그대로 키로 쓰면 끝없이 커진다.
+# 데이터 테이블을 다시 읽으면 invalidate()로 비운다.
+
+RESPONSE_CACHE_MAX = 4096
+
+
+class ResponseCache:
+    """(msg_type, *params) -> 미리 인코딩한 패킷/payload bytes"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX):
+        self.max_entries = max_entries
+        self._entries: Dict[tuple, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def packet(self, key: tuple, build) -> bytes:
+        """헤더까지 만든 패킷. key[0] = msg_type, build() -> payload"""
+        pkt = self._entries.get(key)
+        if pkt is not None:
+            self.hits += 1
+            return pkt
+        self.misses += 1
+        pkt = build_packet(key[0], build())
+        self._put(key, pkt)
+        return pkt
+
+    def payload(self, key: tuple, build) -> bytes:
+        """헤더 없는 payload 조각 (세션 값을 앞에 붙여 보낼 때). packet()과 키를 섞어 쓰지 않는다"""
+        data = self._entries.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = bytes(build())
+        self._put(key, data)
+        return data
+
+    def _put(self, key: tuple, data: bytes):
+        # 꽉 차면 더 넣지 않는다 (정적 테이블이라 정상이면 닿지 않음)
+        if len(self._entries) < self.max_entries:
+            self._entries[key] = data
+
+    def invalidate(self, msg_type: Optional[int] = None) -> int:
+        """캐시 비우기 (msg_type 지정 시 그 응답만). 지운 개수 반환"""
+        if msg_type is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            stale = [k for k in self._entries if k[0] == msg_type]
+            for k in stale:
+                del self._entries[k]
+            dropped = len(stale)
+        self.invalidations += 1
+        return dropped
+
+    def report(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0, "invalidations": self.invalidations}
+
+
+# ━━━ 핸들러 등록 ━━━
+
+def packet_handler(*msg_types: int, zero_copy: bool = False):
+    """BridgeServer 메서드를 MsgType 핸들러로 표시하는 데코레이터.
+
+    디스패치 테이블(BridgeServer.HANDLERS)은 클래스 정의 시점에 한 번만 만들어진다.
+    zero_copy=True: payload를 수신 버퍼 memoryview 그대로 받는다. 핸들러는
+    struct.unpack/인덱싱만 하고 payload를 보관하거나 .decode() 하지 않아야 한다.
+    나머지 핸들러는 bytes 사본을 받는다.
+    """
+    def decorate(fn):
+        fn._msg_types = getattr(fn, '_msg_types', ()) + msg_types
+        if zero_copy:
+            fn._zero_copy = True
+        return fn
+    return decorate
+
 
 # ━━━ ECS 엔티티/컴포넌트 (Python 축소판) ━━━
 
@@ -472,6 +1008,11 @@ def new_entity() -> int:
     next_entity_id += 1
     return eid
 
+def reserve_entity_ids(start: int):
+    """이후 new_entity()가 start 이상만 내주게 (샤드별 id 구간)"""
+    global next_entity_id
+    next_entity_id = max(next_entity_id, start)
+
 @dataclass
 class Position:
     x: float = 0.0
@@ -528,137 +1069,1371 @@ class MonsterAI:
     patrol_radius: float = 100.0
     leash_range: float = 500.0
     aggro_table: Dict[int, float] = field(default_factory=dict)
+    next_attack_at: float = 0.0  # time.monotonic() 기준, AI_ATTACK_INTERVAL 간격
+
+
+# ━━━ 세션 상태 (슬롯 기반) ━━━
+#
+# 접속만 한 세션(로그인 전/로비)도 많으므로 세션은 __slots__ 객체이고, 자주 쓰는 필드만 바로 슬롯에 둔다.
+#   - 컨테이너(pos/stats/inventory/skills/buffs/quests ...)는 처음 접근할 때 만든다 (_Lazy).
+#   - 기능별 상태(거래/제작/현상금/사제/배틀패스/내구도 ...)는 하위 상태 객체 하나로 묶어
+#     그 기능의 필드에 처음 "쓰거나" 가변 필드를 처음 읽을 때 만든다 (_FeatureField).
+#     만들어지기 전에는 스칼라 필드를 읽으면 기본값이 나온다.
+# 핸들러 입장에서는 예전 dataclass와 똑같이 session.bounty_tokens, session.inventory[i].count로 쓴다.
+
+INVENTORY_SIZE = 20
+_INV_ITEM, _INV_COUNT, _INV_ENHANCE, _INV_EQUIPPED, _INV_STRIDE = range(5)
+
+
+class InventorySlotView:
+    """Inventory 한 칸을 InventorySlot처럼 읽고 쓰는 뷰 (값은 Inventory 배열에 있음)"""
+    __slots__ = ('_data', '_base')
+
+    def __init__(self, data: array, base: int):
+        self._data = data
+        self._base = base
+
+    @property
+    def item_id(self) -> int:
+        return self._data[self._base + _INV_ITEM]
+
+    @item_id.setter
+    def item_id(self, value: int):
+        self._data[self._base + _INV_ITEM] = value
+
+    @property
+    def count(self) -> int:
+        return self._data[self._base + _INV_COUNT]
+
+    @count.setter
+    def count(self, value: int):
+        self._data[self._base + _INV_COUNT] = value
+
+    @property
+    def enhance_level(self) -> int:
+        return self._data[self._base + _INV_ENHANCE]
+
+    @enhance_level.setter
+    def enhance_level(self, value: int):
+        self._data[self._base + _INV_ENHANCE] = value
+
+    @property
+    def equipped(self) -> bool:
+        return bool(self._data[self._base + _INV_EQUIPPED])
+
+    @equipped.setter
+    def equipped(self, value: bool):
+        self._data[self._base + _INV_EQUIPPED] = 1 if value else 0
+
+    def __repr__(self):
+        return (f"InventorySlot(item_id={self.item_id}, count={self.count}, "
+                f"equipped={self.equipped}, enhance_level={self.enhance_level})")
+
+
+class Inventory:
+    """인벤토리 칸들을 int64 배열 하나에 (item_id, count, enhance_level, equipped) 순으로 저장.
+
+    inv[i]는 InventorySlotView, inv[i] = InventorySlot()은 값 복사 (빈 칸으로 만들기 포함).
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, size: int = INVENTORY_SIZE):
+        self._data = array('q', bytes(8 * _INV_STRIDE * size))
+
+    def __len__(self):
+        return len(self._data) // _INV_STRIDE
+
+    def _base(self, index: int) -> int:
+        n = len(self._data) // _INV_STRIDE
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("inventory index out of range")
+        return index * _INV_STRIDE
+
+    def __getitem__(self, index: int) -> InventorySlotView:
+        return InventorySlotView(self._data, self._base(index))
+
+    def __setitem__(self, index: int, slot):
+        base = self._base(index)
+        self._data[base:base + _INV_STRIDE] = array('q', (slot.item_id, slot.count, slot.enhance_level,
+                                                          1 if slot.equipped else 0))
+
+    def __iter__(self):
+        data = self._data
+        for base in range(0, len(data), _INV_STRIDE):
+            yield InventorySlotView(data, base)
+
+    def find_empty(self) -> int:
+        """item_id == 0인 첫 칸 (없으면 -1)"""
+        try:
+            return self._data[_INV_ITEM::_INV_STRIDE].index(0)
+        except ValueError:
+            return -1
+
+    def dump(self) -> List[dict]:
+        """저장용 [{item_id, count, equipped, enhance_level}] (예전 asdict(InventorySlot) 형식)"""
+        return [{"item_id": s.item_id, "count": s.count, "equipped": s.equipped, "enhance_level": s.enhance_level}
+                for s in self]
+
+    @classmethod
+    def load(cls, slots: List[dict]) -> "Inventory":
+        inv = cls(max(INVENTORY_SIZE, len(slots)))
+        for i, slot in enumerate(slots):
+            inv[i] = InventorySlot(**slot)
+        return inv
+
+
+class _Lazy:
+    """처음 읽을 때 factory()로 만드는 세션 필드 (값은 '_' + 이름 슬롯에 저장)"""
+    __slots__ = ('factory', 'member')
+
+    def __init__(self, factory: Callable[[], object]):
+        self.factory = factory
+        self.member = None
+
+    def __set_name__(self, owner, name):
+        self.member = owner.__dict__['_' + name]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.member.__get__(obj, owner)
+        if value is None:
+            value = self.factory()
+            self.member.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.member.__set__(obj, value)
+
+
+class SessionFeature:
+    """기능 하나의 세션 하위 상태. DEFAULTS = ((필드, 기본값 | 팩토리), ...) — callable이면 세션마다 새로 만든다."""
+    __slots__ = ()
+    DEFAULTS: Tuple[Tuple[str, object], ...] = ()
+
+    def __init__(self):
+        for name, default in self.DEFAULTS:
+            setattr(self, name, default() if callable(default) else default)
+
+
+class _FeatureField:
+    """PlayerSession.<필드> -> 하위 상태.<필드> 위임. 하위 상태는 첫 쓰기(또는 가변 필드 첫 읽기) 때 생성."""
+    __slots__ = ('feature', 'state', 'attr', 'default', 'mutable')
+
+    def __init__(self, feature: type, state, name: str, default):
+        self.feature = feature
+        self.state = state                  # PlayerSession의 하위 상태 슬롯
+        self.attr = feature.__dict__[name]  # 하위 상태 클래스의 필드 슬롯
+        self.default = default
+        self.mutable = callable(default)
+
+    def _create(self, obj):
+        st = self.feature()
+        self.state.__set__(obj, st)
+        return st
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        st = self.state.__get__(obj, owner)
+        if st is None:
+            if not self.mutable:
+                return self.default
+            st = self._create(obj)
+        return self.attr.__get__(st, None)
+
+    def __set__(self, obj, value):
+        st = self.state.__get__(obj, None)
+        if st is None:
+            st = self._create(obj)
+        self.attr.__set__(st, value)
+
+
+class TradeState(SessionFeature):
+    DEFAULTS = (
+        ("trade_partner", 0),       # entity_id of trade partner, 0=not trading
+        ("trade_items", list),      # items offered
+        ("trade_gold", 0),
+        ("trade_confirmed", False),
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class CraftingState(SessionFeature):
+    DEFAULTS = (
+        ("crafting_level", 1),        # crafting proficiency
+        ("crafting_exp", 0),          # crafting exp
+        ("gathering_level", 1),       # gathering proficiency
+        ("gathering_exp", 0),         # gathering exp
+        ("cooking_level", 1),         # cooking proficiency
+        ("energy", 200),              # gathering energy (max:200)
+        ("energy_last_regen", 0.0),   # last energy regen time
+        ("food_buff", dict),          # current food buff
+        ("weapon_enchant", dict),     # {slot: {element, level}}
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class EconomyState(SessionFeature):
+    """Auction House & Economy (TASK 3)"""
+    DEFAULTS = (
+        ("auction_listings", 0),      # current listing count
+        ("daily_gold_earned", lambda: {"monster": 0, "dungeon": 0, "quest": 0, "total": 0}),  # daily gold tracking
+        ("daily_gold_reset_date", ""),  # last reset date (YYYY-MM-DD)
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class TripodState(SessionFeature):
+    """Tripod & Scroll System (TASK 15)"""
+    DEFAULTS = (
+        ("tripod_unlocked", dict),    # {skill_id: {tier: [unlocked_option_ids]}}
+        ("tripod_equipped", dict),    # {skill_id: {tier: option_id}}
+        ("scroll_collection", set),   # set of discovered scroll_ids
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class BountyState(SessionFeature):
+    """Bounty System (TASK 16)"""
+    DEFAULTS = (
+        ("bounty_accepted", list),          # [{bounty_id, monster_id, type:"daily"/"weekly"}]
+        ("bounty_completed_today", list),   # completed bounty_ids today
+        ("bounty_completed_weekly", list),  # completed weekly bounty_ids
+        ("bounty_tokens", 0),
+        ("bounty_reset_date", ""),          # YYYY-MM-DD for daily reset
+        ("bounty_weekly_reset_date", ""),   # YYYY-MM-DD for weekly reset
+        ("bounty_score_weekly", 0),         # weekly ranking score
+        ("pvp_kill_streak", 0),             # current PvP kill streak
+        ("pvp_bounty_tier", 0),             # current PvP bounty tier (0=none)
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class QuestState(SessionFeature):
+    """Quest Enhancement (TASK 4)"""
+    DEFAULTS = (
+        ("daily_quests", list),             # [{dq_id, type, target_id, count, progress, completed}]
+        ("daily_quest_reset_date", ""),     # YYYY-MM-DD
+        ("daily_quests_done", 0),
+        ("weekly_quest", dict),             # {wq_id, type, target_id, count, progress, completed}
+        ("weekly_quest_reset_date", ""),    # YYYY-MM-DD (last wednesday)
+        ("weekly_quests_done", 0),
+        ("reputation", lambda: {"village_guard": 0, "merchant_guild": 0}),  # faction -> points
+        ("reputation_daily_gained", lambda: {"village_guard": 0, "merchant_guild": 0}),
+        ("reputation_daily_reset_date", ""),  # YYYY-MM-DD
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class ProgressionState(SessionFeature):
+    """Tutorial + Progression Deepening (TASK 7)"""
+    DEFAULTS = (
+        ("tutorial_steps", set),            # completed step IDs
+        ("titles_unlocked", list),          # [title_id, ...]
+        ("title_equipped", 0),              # currently equipped title_id (0=none)
+        ("collection_monsters", list),      # [monster_name, ...] killed at least once
+        ("collection_equip_tiers", list),   # [tier, ...] obtained at least once
+        ("second_job", ""),                 # "" = not yet, "berserker"/"guardian"/etc
+        ("second_job_class", ""),           # original class when job changed
+        ("milestones_claimed", list),       # [level, ...] already claimed
+        ("dungeon_clears", 0),              # total dungeon clears (for title condition)
+        ("boss_kills", 0),                  # total boss kills (for title condition)
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class EnhanceState(SessionFeature):
+    """Enhancement Deepening (TASK 8)"""
+    DEFAULTS = (
+        ("gem_inventory", list),        # [{gem_type, tier, gem_id}, ...]
+        ("gem_equipped", dict),         # {slot_key: [gem_id, ...]} e.g. "weapon_0": gem_id
+        ("gem_next_id", 1),             # auto-increment gem id
+        ("engraving_points", dict),     # {engraving_name: points}
+        ("engravings_active", list),    # [engraving_name, ...] max 6
+        ("transcend_levels", dict),     # {equip_slot: transcend_level}
+        ("enhance_pity", dict),         # {equip_slot: fail_count}
+        ("protection_scrolls", 0),      # 축복의 보호권 수량
+        ("enhance_levels", dict),       # {equip_slot: enhance_level}
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class SocialState(SessionFeature):
+    """Social Enhancement (TASK 5)"""
+    DEFAULTS = (
+        ("friends", list),                  # [player_name, ...]
+        ("friend_requests_sent", list),     # [target_name, ...]
+        ("friend_requests_recv", list),     # [from_name, ...]
+        ("blocked_players", list),          # [player_name, ...]
+        ("party_finder_listing", dict),     # current listing or {}
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class DurabilityState(SessionFeature):
+    """Durability / Repair / Reroll (TASK 9)"""
+    DEFAULTS = (
+        ("equipment_durability", dict),     # {inv_slot_idx: durability_float}
+        ("equipment_random_opts", dict),    # {inv_slot_idx: [{stat, value}, ...]}
+        ("reappraisal_scrolls", 0),         # 재감정서 수량
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class PvPState(SessionFeature):
+    """Battleground / Guild War (TASK 6) + 매칭/인스턴스 진행 상태"""
+    DEFAULTS = (
+        ("bg_queue_mode", -1),          # -1=not queued, 0=capture, 1=payload
+        ("bg_match_id", 0),             # active match id
+        ("bg_team", 0),                 # 0=red, 1=blue
+        ("gw_war_id", 0),               # active guild war id
+        ("pvp_season_rating", 1000),    # season rating (initial 1000)
+        ("pvp_season_matches", 0),      # matches played this season
+        ("pvp_season_wins", 0),         # wins this season
+        ("_match_queue_key", None),     # 던전 매칭 대기열 키
+        ("_match_client_format", False),
+        ("_current_instance_id", None),  # 입장 중인 던전 인스턴스
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class CurrencyState(SessionFeature):
+    """Sub-Currency (TASK 10) + 캐시 화폐"""
+    DEFAULTS = (
+        ("silver", 5000),               # 실버 (NPC 전용 보조화폐)
+        ("dungeon_token", 0),           # 던전 토큰
+        ("pvp_token", 0),               # PvP 토큰
+        ("guild_contribution", 0),      # 길드 기여도
+        ("crystal", 0),                 # 캐시 화폐 (크리스탈)
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class RealmState(SessionFeature):
+    """Secret Realm (TASK 17)"""
+    DEFAULTS = (
+        ("realm_daily_count", 0),       # 오늘 비경 입장 횟수
+        ("realm_instance_id", 0),       # 현재 비경 인스턴스 (0=없음)
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class MentorState(SessionFeature):
+    """Mentorship (TASK 18)"""
+    DEFAULTS = (
+        ("mentor_master_eid", 0),           # 내 사부 entity_id (0=없음)
+        ("mentor_contribution", 0),         # 사문 기여도
+        ("mentor_graduation_count", 0),     # 졸업시킨 제자 수
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class BattlePassState(SessionFeature):
+    """Cash Shop / BP / Event / Sub (TASK 11)"""
+    DEFAULTS = (
+        ("bp_level", 0),                # 배틀패스 레벨
+        ("bp_exp", 0),                  # 배틀패스 경험치
+        ("bp_premium", False),          # 프리미엄 구매 여부
+        ("subscription_active", False),  # 월정액 활성화
+        ("subscription_expires", 0.0),  # 월정액 만료 시간
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+class WorldState(SessionFeature):
+    """World System (TASK 12) / Login Reward (TASK 13) / Story (TASK 14)"""
+    DEFAULTS = (
+        ("mounted", False),             # 탈것 탑승 여부
+        ("mount_id", 0),                # 탈것 ID
+        ("login_total_days", 0),        # 누적 출석일
+        ("login_cycle_day", 0),         # 현재 주기 내 일수 (1~14)
+        ("login_last_claim", ""),       # 마지막 수령 날짜 (YYYY-MM-DD)
+        ("current_chapter", 1),         # 현재 스토리 챕터
+        ("seal_fragments", 0),          # 봉인석 파편 수
+    )
+    __slots__ = tuple(name for name, _ in DEFAULTS)
+
+
+# 세션 슬롯 이름 -> 하위 상태 클래스
+SESSION_FEATURES: Dict[str, type] = {
+    "_trade": TradeState, "_crafting": CraftingState, "_economy": EconomyState, "_tripod": TripodState,
+    "_bounty": BountyState, "_quest": QuestState, "_progression": ProgressionState, "_enhance": EnhanceState,
+    "_social": SocialState, "_durability": DurabilityState, "_pvp": PvPState, "_currency": CurrencyState,
+    "_realm": RealmState, "_mentor": MentorState, "_battlepass": BattlePassState, "_world": WorldState,
+}
+
 
-@dataclass
 class PlayerSession:
-    """TCP 클라이언트 한 명의 전체 상태"""
-    writer: asyncio.StreamWriter = None
-    entity_id: int = 0
-    account_id: int = 0
-    username: str = ""
-    char_name: str = ""
-    logged_in: bool = False
-    in_game: bool = False
-    zone_id: int = 1
-    channel_id: int = 1
-    pos: Position = field(default_factory=Position)
-    stats: Stats = field(default_factory=Stats)
-    inventory: List[InventorySlot] = field(default_factory=lambda: [InventorySlot() for _ in range(20)])
-    gold: int = 1000
-    skills: Dict[int, int] = field(default_factory=dict)  # skill_id -> level
-    party_id: int = 0
-    buffs: List[dict] = field(default_factory=list)
-    quests: List[dict] = field(default_factory=list)
-    violation_count: int = 0  # 이동 검증 위반 횟수
-    last_move_time: float = 0.0
-    guild_id: int = 0
-    trade_partner: int = 0  # entity_id of trade partner, 0=not trading
-    trade_items: List[dict] = field(default_factory=list)  # items offered
-    trade_gold: int = 0
-    trade_confirmed: bool = False
-    tutorial_steps: Set[int] = field(default_factory=set)  # completed step IDs
-    crafting_level: int = 1           # crafting proficiency
-    crafting_exp: int = 0             # crafting exp
-    gathering_level: int = 1          # gathering proficiency
-    gathering_exp: int = 0            # gathering exp
-    cooking_level: int = 1            # cooking proficiency
-    energy: int = 200                 # gathering energy (max:200)
-    energy_last_regen: float = 0.0    # last energy regen time
-    food_buff: dict = field(default_factory=dict)  # current food buff
-    weapon_enchant: dict = field(default_factory=dict)  # {slot: {element, level}}
-    # Auction House & Economy (TASK 3)
-    auction_listings: int = 0             # current listing count
-    daily_gold_earned: dict = field(default_factory=lambda: {"monster": 0, "dungeon": 0, "quest": 0, "total": 0})  # daily gold tracking
-    daily_gold_reset_date: str = ""       # last reset date (YYYY-MM-DD)
-    # Tripod & Scroll System (TASK 15)
-    tripod_unlocked: dict = field(default_factory=dict)  # {skill_id: {tier: [unlocked_option_ids]}}
-    tripod_equipped: dict = field(default_factory=dict)  # {skill_id: {tier: option_id}}
-    scroll_collection: set = field(default_factory=set)  # set of discovered scroll_ids
-    # ---- Bounty System (TASK 16) ----
-    bounty_accepted: list = field(default_factory=list)    # [{bounty_id, monster_id, type:"daily"/"weekly"}]
-    bounty_completed_today: list = field(default_factory=list)  # completed bounty_ids today
-    bounty_completed_weekly: list = field(default_factory=list)  # completed weekly bounty_ids
-    bounty_tokens: int = 0
-    bounty_reset_date: str = ""          # YYYY-MM-DD for daily reset
-    bounty_weekly_reset_date: str = ""   # YYYY-MM-DD for weekly reset
-    bounty_score_weekly: int = 0         # weekly ranking score
-    pvp_kill_streak: int = 0             # current PvP kill streak
-    pvp_bounty_tier: int = 0             # current PvP bounty tier (0=none)
-    # ---- Quest Enhancement (TASK 4) ----
-    daily_quests: list = field(default_factory=list)        # [{dq_id, type, target_id, count, progress, completed}]
-    daily_quest_reset_date: str = ""                        # YYYY-MM-DD
-    weekly_quest: dict = field(default_factory=dict)        # {wq_id, type, target_id, count, progress, completed}
-    weekly_quest_reset_date: str = ""                       # YYYY-MM-DD (last wednesday)
-    reputation: dict = field(default_factory=lambda: {"village_guard": 0, "merchant_guild": 0})  # faction -> points
-    reputation_daily_gained: dict = field(default_factory=lambda: {"village_guard": 0, "merchant_guild": 0})
-    reputation_daily_reset_date: str = ""                   # YYYY-MM-DD
-    # ---- Progression Deepening (TASK 7) ----
-    titles_unlocked: list = field(default_factory=list)   # [title_id, ...]
-    title_equipped: int = 0                                # currently equipped title_id (0=none)
-    collection_monsters: list = field(default_factory=list)  # [monster_name, ...] killed at least once
-    collection_equip_tiers: list = field(default_factory=list)  # [tier, ...] obtained at least once
-    second_job: str = ""                                   # "" = not yet, "berserker"/"guardian"/etc
-    second_job_class: str = ""                             # original class when job changed
-    milestones_claimed: list = field(default_factory=list)  # [level, ...] already claimed
-    dungeon_clears: int = 0                                # total dungeon clears (for title condition)
-    boss_kills: int = 0                                    # total boss kills (for title condition)
-    # ---- Enhancement Deepening (TASK 8) ----
-    gem_inventory: list = field(default_factory=list)       # [{gem_type, tier, gem_id}, ...]
-    gem_equipped: dict = field(default_factory=dict)        # {slot_key: [gem_id, ...]} e.g. "weapon_0": gem_id
-    gem_next_id: int = 1                                    # auto-increment gem id
-    engraving_points: dict = field(default_factory=dict)    # {engraving_name: points}
-    engravings_active: list = field(default_factory=list)   # [engraving_name, ...] max 6
-    transcend_levels: dict = field(default_factory=dict)    # {equip_slot: transcend_level}
-    enhance_pity: dict = field(default_factory=dict)        # {equip_slot: fail_count}
-    protection_scrolls: int = 0                             # 축복의 보호권 수량
-    enhance_levels: dict = field(default_factory=dict)      # {equip_slot: enhance_level}
-    # ---- Social Enhancement (TASK 5) ----
-    friends: list = field(default_factory=list)              # [player_name, ...]
-    friend_requests_sent: list = field(default_factory=list) # [target_name, ...]
-    friend_requests_recv: list = field(default_factory=list) # [from_name, ...]
-    blocked_players: list = field(default_factory=list)      # [player_name, ...]
-    party_finder_listing: dict = field(default_factory=dict) # current listing or {}
-    # ---- Durability / Repair / Reroll (TASK 9) ----
-    equipment_durability: dict = field(default_factory=dict)  # {inv_slot_idx: durability_float}
-    equipment_random_opts: dict = field(default_factory=dict) # {inv_slot_idx: [{stat, value}, ...]}
-    reappraisal_scrolls: int = 0                              # 재감정서 수량
-    # ---- Battleground / Guild War (TASK 6) ----
-    bg_queue_mode: int = -1                   # -1=not queued, 0=capture, 1=payload
-    bg_match_id: int = 0                      # active match id
-    bg_team: int = 0                          # 0=red, 1=blue
-    gw_war_id: int = 0                        # active guild war id
-    pvp_season_rating: int = 1000             # season rating (initial 1000)
-    pvp_season_matches: int = 0               # matches played this season
-    pvp_season_wins: int = 0                  # wins this season
-    # ---- Sub-Currency (TASK 10) ----
-    silver: int = 5000                       # 실버 (NPC 전용 보조화폐)
-    dungeon_token: int = 0                   # 던전 토큰
-    pvp_token: int = 0                       # PvP 토큰
-    guild_contribution: int = 0              # 길드 기여도
-    # ---- Secret Realm (TASK 17) ----
-    realm_daily_count: int = 0                  # 오늘 비경 입장 횟수
-    realm_instance_id: int = 0                  # 현재 비경 인스턴스 (0=없음)
-    # ---- Mentorship (TASK 18) ----
-    mentor_master_eid: int = 0                # 내 사부 entity_id (0=없음)
-    mentor_contribution: int = 0              # 사문 기여도
-    mentor_graduation_count: int = 0          # 졸업시킨 제자 수
-    # ---- Cash Shop / BP / Event / Sub (TASK 11) ----
-    crystal: int = 0                       # 캐시 화폐 (크리스탈)
-    bp_level: int = 0                      # 배틀패스 레벨
-    bp_exp: int = 0                        # 배틀패스 경험치
-    bp_premium: bool = False               # 프리미엄 구매 여부
-    subscription_active: bool = False      # 월정액 활성화
-    subscription_expires: float = 0.0      # 월정액 만료 시간
-    # ---- World System (TASK 12) ----
-    mounted: bool = False                  # 탈것 탑승 여부
-    mount_id: int = 0                      # 탈것 ID
-    # ---- Login Reward (TASK 13) ----
-    login_total_days: int = 0              # 누적 출석일
-    login_cycle_day: int = 0               # 현재 주기 내 일수 (1~14)
-    login_last_claim: str = ""             # 마지막 수령 날짜 (YYYY-MM-DD)
-    # ---- Story (TASK 14) ----
-    current_chapter: int = 1               # 현재 스토리 챕터
-    seal_fragments: int = 0                # 봉인석 파편 수
+    """TCP 클라이언트 한 명의 전체 상태 (필드 목록: CORE + LAZY + SESSION_FEATURES)"""
+    CORE = (
+        ("writer", None),
+        ("out_queue", list),        # flush 대기 중인 패킷 (flush_policy != immediate)
+        ("out_bytes", 0),           # out_queue 바이트 합
+        ("congested", False),       # 송신 버퍼 soft limit 초과 상태
+        ("out_shed", 0),            # 혼잡 중 버리거나 합친 패킷 수
+        ("space", None),            # 이 세션이 들어가 있는 존 인덱스/AOI 그리드 키 channel_space(zone_id, channel_id)
+        ("handoff", None),          # 다른 샤드로 옮겨 가는 중: (zone_id, 도착 위치 | None, 도착 동작)
+        ("ghost_zone", 0),          # 인접 존에 고스트로 비치는 중이면 그 존의 channel_space (0=없음)
+        ("entity_id", 0),
+        ("account_id", 0),
+        ("username", ""),
+        ("char_name", ""),
+        ("logged_in", False),
+        ("in_game", False),
+        ("zone_id", 1),
+        ("channel_id", 1),
+        ("gold", 1000),
+        ("party_id", 0),
+        ("violation_count", 0),     # 이동 검증 위반 횟수
+        ("last_move_time", 0.0),
+        ("guild_id", 0),
+    )
+    LAZY = (
+        ("out_held", dict),         # 혼잡 중 (msg_type, entity_id) -> 최신 이동 패킷
+        ("pos", Position),
+        ("stats", Stats),
+        ("inventory", Inventory),
+        ("skills", dict),           # skill_id -> level
+        ("buffs", list),
+        ("quests", list),
+    )
+    __slots__ = (tuple(name for name, _ in CORE) + tuple('_' + name for name, _ in LAZY)
+                 + tuple(SESSION_FEATURES))
+
+    out_held = _Lazy(dict)
+    pos = _Lazy(Position)
+    stats = _Lazy(Stats)
+    inventory = _Lazy(Inventory)
+    skills = _Lazy(dict)
+    buffs = _Lazy(list)
+    quests = _Lazy(list)
+
+    # 핸드오프로 넘기지 않는 필드 (연결/송신 버퍼 — 도착한 프로세스에서 새로 만든다)
+    TRANSIENT = frozenset(("writer", "out_queue", "out_bytes", "congested", "out_shed", "space",
+                           "handoff", "out_held"))
+
+    def __init__(self, **fields):
+        for name, default in self.CORE:
+            setattr(self, name, default() if callable(default) else default)
+        for name, _ in self.LAZY:
+            setattr(self, '_' + name, None)
+        for slot in SESSION_FEATURES:
+            setattr(self, slot, None)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def features(self) -> List[str]:
+        """만들어진 하위 상태 슬롯 이름들 (디버그/벤치용)"""
+        return [slot for slot in SESSION_FEATURES if getattr(self, slot) is not None]
+
+    def export_state(self) -> dict:
+        """샤드 핸드오프용 상태 (pickle 가능). TRANSIENT와 아직 안 만든 하위 상태는 뺀다"""
+        state = {name: getattr(self, name) for name, _ in self.CORE if name not in self.TRANSIENT}
+        for name, _ in self.LAZY:
+            value = getattr(self, '_' + name)
+            if value is not None and name not in self.TRANSIENT:
+                state['_' + name] = value
+        for slot in SESSION_FEATURES:
+            value = getattr(self, slot)
+            if value is not None:
+                state[slot] = value
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict, writer=None) -> 'PlayerSession':
+        """export_state 결과로 세션 복원 (송신 버퍼는 빈 상태)"""
+        session = cls(writer=writer)
+        for name, value in state.items():
+            setattr(session, name, value)
+        return session
+
+    def __repr__(self):
+        return (f"PlayerSession(entity_id={self.entity_id}, account_id={self.account_id}, "
+                f"char_name={self.char_name!r}, zone_id={self.zone_id}, in_game={self.in_game})")
+
+
+for _slot, _feature in SESSION_FEATURES.items():
+    for _name, _default in _feature.DEFAULTS:
+        setattr(PlayerSession, _name, _FeatureField(_feature, PlayerSession.__dict__[_slot], _name, _default))
+del _slot, _feature, _name, _default
+
+
+# ━━━ AOI 그리드 (SpatialComponents.h / InterestSystem 미러) ━━━
+#
+# 존마다 정사각형 셀 그리드 하나. 같은 셀 + 인접 8셀(3x3) 안의 엔티티만 서로 보인다.
+# 셀 크기 = 시야 반경이라 반경 안은 항상 보이고, 셀 경계를 넘을 때만 APPEAR/DISAPPEAR.
+# 좌표는 x/z 평면 (ZONE_BOUNDS와 동일).
+
+GRID_CELL_SIZE = 500.0  # C++ GRID_CELL_SIZE와 동일
+
+_VIEW_OFFSETS = tuple((dx, dz) for dx in (-1, 0, 1) for dz in (-1, 0, 1))
+
+
+class AOIGrid:
+    """존 하나의 균일 그리드: 셀 -> entity_id 집합.
+
+    cell_size가 None이면 존 전체가 한 셀 (AOI 끔, 존 전체 브로드캐스트).
+    """
+    __slots__ = ('cell_size', 'cells', 'where')
+
+    def __init__(self, cell_size: Optional[float] = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.where: Dict[int, Tuple[int, int]] = {}  # entity_id -> cell
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self.where
+
+    def cell_of(self, x: float, z: float) -> Tuple[int, int]:
+        cs = self.cell_size
+        if not cs:
+            return (0, 0)
+        return (math.floor(x / cs), math.floor(z / cs))
+
+    def add(self, entity_id: int, cell: Tuple[int, int]):
+        self.where[entity_id] = cell
+        members = self.cells.get(cell)
+        if members is None:
+            self.cells[cell] = {entity_id}
+        else:
+            members.add(entity_id)
+
+    def remove(self, entity_id: int) -> Optional[Tuple[int, int]]:
+        cell = self.where.pop(entity_id, None)
+        if cell is not None:
+            members = self.cells[cell]
+            members.discard(entity_id)
+            if not members:
+                del self.cells[cell]
+        return cell
+
+    def move(self, entity_id: int, cell: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """셀이 바뀌었으면 이전 셀 반환, 아니면 None"""
+        old = self.where.get(entity_id)
+        if old == cell:
+            return None
+        if old is not None:
+            self.remove(entity_id)
+        self.add(entity_id, cell)
+        return old
+
+    @staticmethod
+    def view_cells(cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        cx, cz = cell
+        return [(cx + dx, cz + dz) for dx, dz in _VIEW_OFFSETS]
+
+    def nearby(self, cell: Tuple[int, int]):
+        """cell의 3x3 시야 안 entity_id들"""
+        cells = self.cells
+        for c in self.view_cells(cell):
+            members = cells.get(c)
+            if members:
+                yield from members
+
+    def within(self, x: float, z: float, radius: float):
+        """(x, z) 중심 반경 radius 원의 바운딩 박스와 겹치는 셀의 entity_id들.
+
+        후보만 추리고 거리 필터는 호출자 몫. 박스가 점유 셀 수보다 넓으면
+        박스를 도는 대신 점유 셀을 훑는다 (반경이 아주 크거나 inf인 경우 포함).
+        """
+        cs = self.cell_size
+        cells = self.cells
+        if not cs or not math.isfinite(radius):
+            for members in cells.values():
+                yield from members
+            return
+        x0 = math.floor((x - radius) / cs)
+        x1 = math.floor((x + radius) / cs)
+        z0 = math.floor((z - radius) / cs)
+        z1 = math.floor((z + radius) / cs)
+        if (x1 - x0 + 1) * (z1 - z0 + 1) > len(cells):
+            for (cx, cz), members in cells.items():
+                if x0 <= cx <= x1 and z0 <= cz <= z1:
+                    yield from members
+            return
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                members = cells.get((cx, cz))
+                if members:
+                    yield from members
+
+
+# ━━━ 존 채널 (ChannelComponents.h 미러) ━━━
+#
+# (존, 채널)마다 존 인덱스/AOI 그리드/몬스터가 따로 있다 — 채널이 다르면 서로 안 보이고 브로드캐스트도
+# 안 간다. 인덱스 키는 channel_space(zone_id, channel_id): 채널 1은 존 id 그대로라 채널을 모르는 코드도 그대로.
+# 자동 배정(캐릭터 선택/존 이동/CHANNEL_JOIN 0): 원래 채널 번호 -> 번호 낮은 순으로 정원(channel_capacity)
+# 미만인 채널. 전부 차면 새 채널을 열고 그 존 몬스터를 스폰, 빈 채널(2번 이상)은 CHANNEL_COLLAPSE_DELAY 뒤 닫는다.
+
+CHANNEL_CAPACITY = 100          # 채널당 정원 (data/server.json channel_capacity)
+CHANNEL_MAX = 16                # 존당 채널 수 상한 (max_channels). 다 차면 가장 한가한 채널에 정원 초과로
+CHANNEL_COLLAPSE_DELAY = 30.0   # 빈 채널을 닫기까지 (s) — 잠깐 비었다 다시 차는 채널을 매번 스폰하지 않게
+CHANNEL_SPACE_SHIFT = 32
+_SPACE_ZONE_MASK = (1 << CHANNEL_SPACE_SHIFT) - 1
+# CHANNEL_INFO 확장: [channel_id i32] 뒤에 그 존 채널별 인원 (4바이트만 읽는 클라이언트는 무시)
+CHANNEL_LOAD = Record([("zone_id", 'u32'), ("capacity", 'u16'),
+                       ("channels", Array('u8', [("channel_id", 'u16'), ("players", 'u16')]))], 'ChannelLoad')
+
+
+def channel_space(zone_id: int, channel_id: int) -> int:
+    """(존, 채널) -> 존 인덱스/AOI 그리드 키"""
+    return zone_id | (channel_id - 1) << CHANNEL_SPACE_SHIFT
+
+
+def space_zone(space: int) -> int:
+    return space & _SPACE_ZONE_MASK
+
+
+def space_channel(space: int) -> int:
+    return (space >> CHANNEL_SPACE_SHIFT) + 1
+
+
+# ━━━ 게임 틱 스케줄러 ━━━
+#
+# 기본 틱(tick_rate Hz) 경계마다 주기가 된 시스템만 돌린다. 시스템마다 자기 주기(hz)를 가진다.
+# 다음 실행 시각 = 이전 예정 시각 + 주기 (처리 시간만큼 밀리지 않음 = 드리프트 보정).
+# 처리가 주기를 넘기면 밀린 틱을 몰아서 돌리지 않고 건너뛴다 (overrun/skipped로 집계).
+
+SERVER_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'server.json')
+DEFAULT_TICK_RATE = 30.0
+TICK_STATS_WINDOW = 1024  # 시스템별 p50/p99 계산에 쓰는 최근 실행 수
+
+
+def load_server_config(path: str = SERVER_CONFIG_PATH) -> dict:
+    """data/server.json (없거나 깨졌으면 빈 dict)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+@dataclass
+class TickSystem:
+    """스케줄러에 등록된 시스템 하나. fn(dt)는 직전 실행 이후 경과 초를 받는다."""
+    name: str
+    fn: Callable[[float], None]
+    period: float
+    next_due: float = 0.0
+    last_run: float = 0.0
+    runs: int = 0
+    overruns: int = 0  # 한 번 실행이 기본 틱 주기를 넘긴 횟수
+    errors: int = 0    # fn이 예외를 던진 횟수 (틱 루프는 계속 돈다)
+    durations: deque = field(default_factory=lambda: deque(maxlen=TICK_STATS_WINDOW))
+
+
+class TickScheduler:
+    """고정 주기 + 드리프트 보정 틱 루프"""
+
+    def __init__(self, tick_rate: float = DEFAULT_TICK_RATE, clock: Callable[[], float] = time.perf_counter,
+                 log: Optional[Callable[[str, str], None]] = None):
+        if not tick_rate > 0:
+            raise ValueError(f"tick_rate must be > 0 (got {tick_rate!r})")
+        self.tick_rate = tick_rate
+        self.log = log  # log(msg, level) — 시스템 예외 보고
+        self.period = 1.0 / tick_rate
+        self.clock = clock
+        self.systems: List[TickSystem] = []
+        self.ticks = 0
+        self.overruns = 0  # 기본 틱 처리가 주기를 넘긴 횟수
+        self.skipped = 0   # overrun 때문에 건너뛴 기본 틱 수
+        self.errors = 0    # 시스템 예외 수 (한 시스템이 죽어도 다른 시스템과 틱 루프는 계속)
+        self.durations: deque = deque(maxlen=TICK_STATS_WINDOW)
+
+    def add(self, name: str, fn: Callable[[float], None], hz: Optional[float] = None) -> TickSystem:
+        """시스템 등록. hz가 None이거나 tick_rate보다 크면 매 기본 틱."""
+        period = self.period if hz is None or hz >= self.tick_rate else 1.0 / hz
+        now = self.clock()
+        system = TickSystem(name=name, fn=fn, period=period, next_due=now + period, last_run=now)
+        self.systems.append(system)
+        return system
+
+    def run_due(self, now: float) -> None:
+        """now 시점에 주기가 된 시스템 실행 (기본 틱 한 번)"""
+        clock = self.clock
+        tick_start = clock()
+        for system in self.systems:
+            if now < system.next_due:
+                continue
+            t0 = clock()
+            try:
+                system.fn(t0 - system.last_run)
+            except Exception as e:
+                system.errors += 1
+                self.errors += 1
+                if self.log is not None:
+                    self.log(f"Tick system {system.name} failed: {type(e).__name__}: {e}", "ERR")
+            t1 = clock()
+            elapsed = t1 - t0
+            system.last_run = t0
+            system.runs += 1
+            system.durations.append(elapsed)
+            if elapsed > self.period:
+                system.overruns += 1
+            system.next_due += system.period
+            if system.next_due <= now:  # 밀렸으면 따라잡지 않고 다음 주기로
+                system.next_due = now + system.period
+        self.ticks += 1
+        self.durations.append(clock() - tick_start)
+
+    async def run(self, running: Callable[[], bool]) -> None:
+        clock = self.clock
+        next_tick = clock() + self.period
+        while running():
+            delay = next_tick - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.run_due(clock())
+            next_tick += self.period
+            late = clock() - next_tick
+            if late > 0:
+                missed = int(late / self.period) + 1
+                self.overruns += 1
+                self.skipped += missed
+                next_tick += missed * self.period
+
+    def report(self) -> dict:
+        """틱/시스템별 통계 (시간 단위 us)"""
+        tick = sorted(self.durations)
+        systems = []
+        for system in self.systems:
+            d = sorted(system.durations)
+            systems.append({
+                "name": system.name,
+                "hz": 1.0 / system.period,
+                "runs": system.runs,
+                "overruns": system.overruns,
+                "errors": system.errors,
+                "p50_us": _percentile(d, 0.50) * 1e6,
+                "p99_us": _percentile(d, 0.99) * 1e6,
+                "max_us": (d[-1] if d else 0.0) * 1e6,
+            })
+        return {
+            "tick_rate": self.tick_rate,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "p50_us": _percentile(tick, 0.50) * 1e6,
+            "p99_us": _percentile(tick, 0.99) * 1e6,
+            "systems": systems,
+        }
+
+
+# ━━━ 타이머 휠 ━━━
+#
+# 버프/리스폰/경매/우편/월정액 만료처럼 "언젠가 한 번" 실행할 이벤트를 한 곳에서 관리한다.
+# 계층형 타이머 휠: 레벨 L의 슬롯 하나 = TIMER_RESOLUTION * 256^L 초 (4레벨 ≈ 13년).
+# 등록/취소 O(1) (슬롯 = set), 틱마다 도래한 슬롯만 꺼내 한 번에 실행한다.
+# 상위 레벨 슬롯은 하위 레벨 인덱스가 0으로 돌아올 때 아래 레벨로 내려보낸다 (cascade).
+# 비어 있는 구간은 다음 cascade 경계까지 건너뛰므로 오래 멈췄다 advance해도 빈 슬롯을 돌지 않는다.
+
+TIMER_RESOLUTION = 0.1   # 초. 만료는 이 단위로 올림 (절대 일찍 실행하지 않음)
+TIMER_WHEEL_BITS = 8
+TIMER_WHEEL_LEVELS = 4
+_TIMER_SLOTS = 1 << TIMER_WHEEL_BITS
+_TIMER_MASK = _TIMER_SLOTS - 1
+_TIMER_SPAN = 1 << (TIMER_WHEEL_BITS * TIMER_WHEEL_LEVELS)  # 휠이 표현할 수 있는 최대 틱 수
+
+
+class Timer:
+    """휠에 걸린 이벤트 하나. (category, key)로 식별 — 같은 키로 다시 걸면 교체된다."""
+    __slots__ = ('when', 'tick', 'category', 'key', 'fn', 'args', 'level', 'slot')
+
+    def __init__(self, when: float, tick: int, category: str, key, fn: Callable, args: tuple):
+        self.when = when
+        self.tick = tick
+        self.category = category
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.level = 0
+        self.slot: Optional[set] = None
+
+
+class TimerWheel:
+    """계층형 타이머 휠. 시각은 time.time() 기준 초."""
+
+    def __init__(self, now: float, resolution: float = TIMER_RESOLUTION):
+        self.resolution = resolution
+        self.current = int(now / resolution)  # 다음에 처리할 틱 (이전 틱은 모두 처리됨)
+        self.wheels = [[set() for _ in range(_TIMER_SLOTS)] for _ in range(TIMER_WHEEL_LEVELS)]
+        self.level_counts = [0] * TIMER_WHEEL_LEVELS
+        self.timers: Dict[Tuple[str, object], Timer] = {}
+        self.pending: Dict[str, int] = {}  # category -> 대기 중인 타이머 수
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def get(self, category: str, key) -> Optional[Timer]:
+        return self.timers.get((category, key))
+
+    def schedule(self, category: str, key, when: float, fn: Callable, *args) -> Timer:
+        """when(초)에 fn(*args) 실행. 같은 (category, key)가 걸려 있으면 취소하고 교체."""
+        self.cancel(category, key)
+        tick = -int(-when // self.resolution)  # 올림
+        timer = Timer(when, tick, category, key, fn, args)
+        self.timers[(category, key)] = timer
+        self.pending[category] = self.pending.get(category, 0) + 1
+        self._place(timer)
+        return timer
+
+    def cancel(self, category: str, key) -> bool:
+        timer = self.timers.pop((category, key), None)
+        if timer is None:
+            return False
+        timer.slot.discard(timer)
+        self.level_counts[timer.level] -= 1
+        self.pending[category] -= 1
+        return True
+
+    def _place(self, timer: Timer) -> None:
+        delta = timer.tick - self.current
+        if delta < 0:
+            delta = 0
+        elif delta >= _TIMER_SPAN:
+            delta = _TIMER_SPAN - 1  # 범위 밖은 최대 지연으로 잘라 둔다 (~13년)
+        tick = self.current + delta
+        level = 0
+        while delta >= _TIMER_SLOTS and level < TIMER_WHEEL_LEVELS - 1:
+            delta >>= TIMER_WHEEL_BITS
+            level += 1
+        slot = self.wheels[level][(tick >> (TIMER_WHEEL_BITS * level)) & _TIMER_MASK]
+        slot.add(timer)
+        timer.level = level
+        timer.slot = slot
+        self.level_counts[level] += 1
+
+    def _cascade(self, tick: int) -> None:
+        for level in range(1, TIMER_WHEEL_LEVELS):
+            idx = (tick >> (TIMER_WHEEL_BITS * level)) & _TIMER_MASK
+            slot = self.wheels[level][idx]
+            if slot:
+                self.wheels[level][idx] = set()
+                self.level_counts[level] -= len(slot)
+                for timer in slot:
+                    self._place(timer)
+            if idx:
+                break
+
+    def advance(self, now: float) -> List[Timer]:
+        """now까지 도래한 타이머를 휠에서 빼서 만료 순서(틱 단위)대로 반환. 실행은 호출자가 한다."""
+        target = int(now / self.resolution)
+        due: List[Timer] = []
+        wheel0 = self.wheels[0]
+        counts = self.level_counts
+        while self.current <= target:
+            tick = self.current
+            idx = tick & _TIMER_MASK
+            if idx == 0:
+                self._cascade(tick)
+            slot = wheel0[idx]
+            if slot:
+                wheel0[idx] = set()
+                counts[0] -= len(slot)
+                for timer in slot:
+                    del self.timers[(timer.category, timer.key)]
+                    self.pending[timer.category] -= 1
+                    due.append(timer)
+            if counts[0]:
+                self.current = tick + 1
+                continue
+            # 레벨 0이 비었으면 가장 낮은 비어 있지 않은 레벨의 다음 cascade 경계로 건너뛴다
+            level = next((lv for lv in range(1, TIMER_WHEEL_LEVELS) if counts[lv]), 0)
+            if not level:
+                self.current = target + 1
+                break
+            shift = TIMER_WHEEL_BITS * level
+            self.current = min(((tick >> shift) + 1) << shift, target + 1)
+        self.fired += len(due)
+        return due
+
+    def report(self) -> Dict[str, int]:
+        """카테고리별 대기 중인 타이머 수 (0인 카테고리 제외)"""
+        return {category: n for category, n in sorted(self.pending.items()) if n}
+
+
+# ━━━ 경매장 주문장 ━━━
+#
+# 목록 요청마다 전체 필터 + 정렬하던 것을, 카테고리별로 정렬 상태를 유지하는 인덱스로 바꾼다.
+# 인덱스 = 버킷으로 나눈 정렬 리스트: 등록/삭제는 bisect 두 번 + 버킷 하나(<= 2*LOAD) 이동.
+# 페이지 조회는 버킷 길이만 건너뛰고 필요한 20개만 잘라 온다 (재정렬 없음).
+# 만료는 타이머 휠("auction" 타이머)이 맡는다.
+
+AUCTION_CATEGORY_ALL = 0xFF
+# sort_by -> 정렬 키. 같은 값이면 먼저 등록된(id가 작은) 순 = 예전 stable sort 결과와 같다.
+# 마지막 칸은 알 수 없는 sort_by용 등록 순서.
+_AUCTION_SORT_KEYS = (
+    lambda l: (l["buyout_price"], l["id"]),   # 0: price asc
+    lambda l: (-l["buyout_price"], l["id"]),  # 1: price desc
+    lambda l: (-l["listed_at"], l["id"]),     # 2: newest
+    lambda l: (l["id"],),                     # 등록 순
+)
+
+
+class SortedKeyList:
+    """버킷 분할 정렬 리스트 (키 중복 없음)"""
+    LOAD = 512
+
+    def __init__(self):
+        self._buckets: List[list] = []
+        self._maxes: list = []  # 버킷별 마지막 키
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([key])
+            maxes.append(key)
+            return
+        i = bisect.bisect_left(maxes, key)
+        if i == len(buckets):
+            i -= 1
+            bucket = buckets[i]
+            bucket.append(key)
+            maxes[i] = key
+        else:
+            bucket = buckets[i]
+            bisect.insort(bucket, key)
+        if len(bucket) > 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            buckets.insert(i + 1, half)
+            maxes[i] = bucket[-1]
+            maxes.insert(i + 1, half[-1])
+
+    def remove(self, key) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect.bisect_left(maxes, key)
+        if i == len(buckets):
+            raise KeyError(key)
+        bucket = buckets[i]
+        j = bisect.bisect_left(bucket, key)
+        if bucket[j] != key:
+            raise KeyError(key)
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del buckets[i]
+            del maxes[i]
+        elif j == len(bucket):
+            maxes[i] = bucket[-1]
+
+    def slice(self, start: int, stop: int) -> list:
+        """정렬 순서로 [start, stop) 구간"""
+        out = []
+        for bucket in self._buckets:
+            if stop <= 0:
+                break
+            n = len(bucket)
+            if start < n:
+                out.extend(bucket[start:stop])
+                start = 0
+            else:
+                start -= n
+            stop -= n
+        return out
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            yield from bucket
+
+
+class AuctionBook:
+    """경매장 주문장: id -> listing + 카테고리별(AUCTION_CATEGORY_ALL = 전체) 정렬 인덱스"""
+
+    def __init__(self):
+        self.listings: Dict[int, dict] = {}
+        self.indexes: Dict[int, List[SortedKeyList]] = {}  # category -> sort_by별 인덱스
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    def __iter__(self):
+        return iter(self.listings.values())
+
+    def get(self, auction_id: int) -> Optional[dict]:
+        return self.listings.get(auction_id)
+
+    def _categories(self, listing: dict) -> Tuple[int, ...]:
+        category = listing.get("category", AUCTION_CATEGORY_ALL)
+        if category == AUCTION_CATEGORY_ALL:
+            return (AUCTION_CATEGORY_ALL,)
+        return (AUCTION_CATEGORY_ALL, category)
+
+    def add(self, listing: dict) -> None:
+        """등록. 정렬 키(buyout_price, listed_at)는 등록 후 바뀌지 않는다고 가정 (입찰은 bid_price만 바꿈)"""
+        self.listings[listing["id"]] = listing
+        for category in self._categories(listing):
+            index = self.indexes.get(category)
+            if index is None:
+                index = self.indexes[category] = [SortedKeyList() for _ in _AUCTION_SORT_KEYS]
+            for sorted_keys, key_fn in zip(index, _AUCTION_SORT_KEYS):
+                sorted_keys.add(key_fn(listing))
+
+    def remove(self, auction_id: int) -> Optional[dict]:
+        """구매/만료/취소. 없으면 None"""
+        listing = self.listings.pop(auction_id, None)
+        if listing is None:
+            return None
+        for category in self._categories(listing):
+            index = self.indexes[category]
+            for sorted_keys, key_fn in zip(index, _AUCTION_SORT_KEYS):
+                sorted_keys.remove(key_fn(listing))
+        return listing
+
+    def page(self, category: int, sort_by: int, start: int, count: int) -> Tuple[int, List[dict]]:
+        """(카테고리 전체 수, 정렬 순서 [start, start+count) listing 목록)"""
+        index = self.indexes.get(category)
+        if index is None:
+            return 0, []
+        sorted_keys = index[sort_by if sort_by < len(_AUCTION_SORT_KEYS) - 1 else -1]
+        listings = self.listings
+        return len(sorted_keys), [listings[key[-1]] for key in sorted_keys.slice(start, start + count)]
+
+
+# ━━━ 영속화 (SQLite WAL + write-behind + 스냅샷/저널) ━━━
+#
+# 도메인(테이블)마다 Repository 하나: (key, owner, data=JSON). owner는 보통 account_id.
+# 핸들러는 repo.save/delete로 "바뀌었다"고만 적는다 (dict 쓰기 한 번 — 디스크/직렬화 없음).
+# 틱마다 flush(): (테이블, key)별 최신 값만 남긴 변경을 writer 스레드에 넘긴다. 우편/경매/길드처럼
+# 이벤트 루프가 계속 고치는 공유 doc은 flush 때 JSON으로 굳히고 (배치 = 그 틱까지의 상태),
+# 저장할 때마다 새로 만드는 계정 프로필/인벤토리(WRITER_ENCODED_TABLES)는 writer 스레드가 직렬화한다.
+# writer 스레드는 배치마다 (1) 저널에 append (2) 메모리 미러 갱신 (3) SQLite 트랜잭션 하나로 커밋.
+# 주기적으로(그리고 종료 시) 미러 전체를 바이너리 스냅샷으로 쓰고 저널을 비운다 — 전부 writer 스레드에서.
+# 기동: 스냅샷(없거나 깨졌으면 SQLite) + 저널 꼬리 재생. 재생한 꼬리는 SQLite에도 반영해 맞춘다.
+#
+#   스냅샷 = SNAPSHOT_HEADER(magic, seq) + [u32 len, u32 crc32, pickle(행 SNAPSHOT_CHUNK개)]*
+#   저널   = [JOURNAL_RECORD(u32 len, u32 crc32, u64 seq) + pickle(배치)]*  (깨진 꼬리는 잘라냄)
+
+STORAGE_TABLES = ("accounts", "characters", "inventory", "mail", "auction", "guild", "ratings")
+# save마다 새 doc을 넘기는 테이블 — 직렬화를 writer 스레드로 미뤄도 나중 틱 상태가 섞이지 않는다
+WRITER_ENCODED_TABLES = frozenset(("accounts", "inventory"))
+SNAPSHOT_HEADER = struct.Struct('<8sQ')
+SNAPSHOT_MAGIC = b'BRSNAP01'
+SNAPSHOT_FRAME = struct.Struct('<II')
+SNAPSHOT_CHUNK = 4096  # 청크 하나 pickle 동안만 GIL을 잡는다
+JOURNAL_RECORD = struct.Struct('<IIQ')
+_SNAPSHOT = object()  # writer 큐 마커
+
+
+class Repository:
+    """테이블 하나의 write-behind 핸들"""
+
+    def __init__(self, storage: "Storage", table: str):
+        self.storage = storage
+        self.table = table
+        self.enabled = storage.enabled
+
+    def save(self, key, doc, owner: int = 0) -> None:
+        """doc은 flush 때 (WRITER_ENCODED_TABLES는 writer 스레드에서) 직렬화된다 — 그 사이 바뀐 내용도 같이 저장됨"""
+        if self.enabled:
+            self.storage.dirty[(self.table, key)] = (owner, doc)
+
+    def delete(self, key) -> None:
+        if self.enabled:
+            self.storage.dirty[(self.table, key)] = None
+
+    def load(self) -> List[Tuple[object, int, object]]:
+        """[(key, owner, doc)] — 기동 시 복구용"""
+        return [(key, owner, json.loads(data)) for key, owner, data in self.load_raw()]
+
+    def load_raw(self) -> List[Tuple[object, int, str]]:
+        """[(key, owner, JSON 문자열)] — 필요할 때 디코드하는 도메인용"""
+        return self.storage.load(self.table)
+
+
+class Storage:
+    """SQLite(WAL) + 스냅샷/저널 저장소. path가 None이면 메모리 전용 (save/delete/flush 모두 no-op).
+
+    journal_fsync: 배치마다 저널을 fsync (전원/커널 장애에도 커밋된 배치 유지).
+    False면 flush만 — 프로세스가 죽는 것까지만 안전하다.
+    """
+
+    def __init__(self, path: Optional[str] = None, journal_fsync: bool = True):
+        self.path = path
+        self.enabled = path is not None
+        self.journal_fsync = journal_fsync
+        self.snapshot_path = f"{path}.snapshot" if path else None
+        self.journal_path = f"{path}.journal" if path else None
+        self.dirty: Dict[Tuple[str, object], Optional[tuple]] = {}  # (table, key) -> (owner, doc) | None(삭제)
+        self.stats = {"flushes": 0, "rows": 0, "commits": 0, "errors": 0, "commit_ms_max": 0.0,
+                      "snapshots": 0, "snapshot_ms": 0.0, "journal_bytes": 0}
+        self.load_report: dict = {}
+        self.last_error = ""
+        self.seq = 0  # 마지막으로 저널에 쓴 배치 번호 (기동 후에는 writer 스레드 소유)
+        self.world: Dict[str, Dict[object, Tuple[int, str]]] = {t: {} for t in STORAGE_TABLES}  # 커밋된 상태 미러
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._journal = None
+        for table in STORAGE_TABLES:
+            setattr(self, table, Repository(self, table))
+        if not self.enabled:
+            return
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for table in STORAGE_TABLES:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                             f"(key PRIMARY KEY, owner INTEGER NOT NULL DEFAULT 0, data TEXT NOT NULL)")
+            conn.commit()
+        finally:
+            conn.close()
+        self._recover()
+        self._journal = open(self.journal_path, "ab")
+        self._thread = threading.Thread(target=self._writer, name="storage-writer", daemon=True)
+        self._thread.start()
+
+    # ---- 기동 복구 ----
+
+    def _recover(self) -> None:
+        t0 = time.perf_counter()
+        source = "snapshot"
+        snapshot_seq = 0
+        try:
+            snapshot_seq = self._read_snapshot()
+        except FileNotFoundError:
+            source = "sqlite"
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+            source = "sqlite"
+            self.last_error = f"snapshot: {type(e).__name__}: {e}"
+        if source == "sqlite":
+            self.world = {t: {} for t in STORAGE_TABLES}
+            self._read_sqlite()
+        records, torn = self._read_journal()
+        tail = [(seq, batch) for seq, batch in records if seq > snapshot_seq]
+        for _, batch in tail:
+            self._apply(batch)
+        if tail:
+            self.seq = tail[-1][0]
+            self._commit([row for _, batch in tail for row in batch])  # SQLite가 저널보다 뒤처졌을 수 있음
+        self.seq = max(self.seq, snapshot_seq)
+        self.load_report = {
+            "source": source,
+            "rows": sum(map(len, self.world.values())),
+            "snapshot_seq": snapshot_seq,
+            "journal_batches": len(tail),
+            "journal_torn_bytes": torn,
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def _read_sqlite(self) -> None:
+        conn = sqlite3.connect(self.path)
+        try:
+            for table in STORAGE_TABLES:
+                self.world[table] = {key: (owner, data) for key, owner, data
+                                     in conn.execute(f"SELECT key, owner, data FROM {table}")}
+        finally:
+            conn.close()
+
+    def _read_snapshot(self) -> int:
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("truncated snapshot header")
+        magic, seq = SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"bad snapshot magic {magic!r}")
+        world = {t: {} for t in STORAGE_TABLES}
+        off = SNAPSHOT_HEADER.size
+        view = memoryview(data)
+        while off < len(data):
+            n, crc = SNAPSHOT_FRAME.unpack_from(data, off)
+            off += SNAPSHOT_FRAME.size
+            chunk = view[off:off + n]
+            if len(chunk) < n or zlib.crc32(chunk) != crc:
+                raise ValueError(f"corrupt snapshot chunk at {off}")
+            for table, key, owner, doc in pickle.loads(chunk):
+                world[table][key] = (owner, doc)
+            off += n
+        self.world = world
+        return seq
+
+    def _read_journal(self) -> Tuple[List[Tuple[int, list]], int]:
+        """([(seq, batch)], 버린 바이트 수). 마지막 레코드가 덜 써졌으면 그 앞까지만 쓰고 파일을 잘라낸다."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        records = []
+        off = 0
+        while off + JOURNAL_RECORD.size <= len(data):
+            n, crc, seq = JOURNAL_RECORD.unpack_from(data, off)
+            payload = data[off + JOURNAL_RECORD.size:off + JOURNAL_RECORD.size + n]
+            if len(payload) < n or zlib.crc32(payload) != crc:
+                break
+            records.append((seq, pickle.loads(payload)))
+            off += JOURNAL_RECORD.size + n
+        if off < len(data):
+            os.truncate(self.journal_path, off)
+        self.stats["journal_bytes"] = off
+        return records, len(data) - off
+
+    def load(self, table: str) -> List[Tuple[object, int, str]]:
+        """기동 시(첫 flush 전) 복구된 테이블 [(key, owner, JSON)]"""
+        return [(key, owner, data) for key, (owner, data) in self.world[table].items()]
+
+    # ---- write-behind ----
+
+    @property
+    def backlog(self) -> int:
+        """아직 커밋 안 된 배치 수 (flush 대기 dirty 제외)"""
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        """쌓인 변경을 배치 하나로 writer 스레드에 넘긴다. 넘긴 행 수 반환."""
+        if not self.dirty:
+            return 0
+        dirty, self.dirty = self.dirty, {}
+        dumps = json.dumps
+        for (table, key), row in dirty.items():
+            if row is not None and table not in WRITER_ENCODED_TABLES:
+                dirty[table, key] = (row[0], dumps(row[1], default=list, separators=(',', ':')))
+        self._queue.put(dirty)
+        self.stats["flushes"] += 1
+        return len(dirty)
+
+    def request_snapshot(self) -> None:
+        """지금까지 flush한 변경까지 포함한 스냅샷을 writer 스레드에서 쓴다"""
+        if self._thread is not None:
+            self.flush()
+            self._queue.put(_SNAPSHOT)
+
+    def close(self, snapshot: bool = True) -> None:
+        """남은 변경을 넘기고 (스냅샷을 쓴 뒤) writer가 모두 끝낼 때까지 기다린다"""
+        if self._thread is None:
+            return
+        self.flush()
+        if snapshot:
+            self._queue.put(_SNAPSHOT)
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._journal.close()
+
+    @staticmethod
+    def _encode(dirty: dict) -> list:
+        """flush한 {(table, key): (owner, doc | JSON) | None} -> 배치 [(table, key, (owner, JSON) | None)]"""
+        dumps = json.dumps
+        return [(table, key, row if row is None or table not in WRITER_ENCODED_TABLES
+                 else (row[0], dumps(row[1], default=list, separators=(',', ':'))))
+                for (table, key), row in dirty.items()]
+
+    def _apply(self, batch: list) -> None:
+        world = self.world
+        for table, key, row in batch:
+            if row is None:
+                world[table].pop(key, None)
+            else:
+                world[table][key] = row
+
+    def _commit(self, batch: list, conn: Optional[sqlite3.Connection] = None) -> None:
+        """배치 하나 = SQLite 트랜잭션 하나"""
+        # 배치 안에서 (table, key)는 한 번씩만 나오므로 테이블별 삭제/갱신으로 묶어도 순서 무관
+        # (기동 시 저널 꼬리 여러 배치를 합칠 때는 같은 key가 반복될 수 있어 마지막 값만 남긴다)
+        last = {(table, key): row for table, key, row in batch}
+        deletes: Dict[str, list] = {}
+        upserts: Dict[str, list] = {}
+        for (table, key), row in last.items():
+            if row is None:
+                deletes.setdefault(table, []).append((key,))
+            else:
+                upserts.setdefault(table, []).append((key, row[0], row[1]))
+        own = conn is None
+        if own:
+            conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                for table, keys in deletes.items():
+                    conn.executemany(f"DELETE FROM {table} WHERE key = ?", keys)
+                for table, rows in upserts.items():
+                    conn.executemany(f"INSERT OR REPLACE INTO {table} (key, owner, data) VALUES (?, ?, ?)", rows)
+        finally:
+            if own:
+                conn.close()
+
+    def _append_journal(self, batch: list) -> None:
+        self.seq += 1
+        payload = pickle.dumps(batch, pickle.HIGHEST_PROTOCOL)
+        self._journal.write(JOURNAL_RECORD.pack(len(payload), zlib.crc32(payload), self.seq) + payload)
+        self._journal.flush()
+        if self.journal_fsync:
+            os.fsync(self._journal.fileno())
+        self.stats["journal_bytes"] += JOURNAL_RECORD.size + len(payload)
+
+    def _write_snapshot(self) -> None:
+        """미러 전체를 임시 파일에 쓰고 교체한 뒤 저널을 비운다 (교체 전에 죽으면 이전 스냅샷+저널 그대로)"""
+        t0 = time.perf_counter()
+        tmp = f"{self.snapshot_path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, self.seq))
+            chunk = []
+            for table, rows in self.world.items():
+                for key, (owner, data) in rows.items():
+                    chunk.append((table, key, owner, data))
+                    if len(chunk) >= SNAPSHOT_CHUNK:
+                        self._write_chunk(f, chunk)
+                        chunk = []
+            if chunk:
+                self._write_chunk(f, chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self._journal.close()
+        self._journal = open(self.journal_path, "wb")
+        self.stats["journal_bytes"] = 0
+        self.stats["snapshots"] += 1
+        self.stats["snapshot_ms"] = (time.perf_counter() - t0) * 1000.0
+
+    @staticmethod
+    def _write_chunk(f, chunk: list) -> None:
+        payload = pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)
+        f.write(SNAPSHOT_FRAME.pack(len(payload), zlib.crc32(payload)))
+        f.write(payload)
+
+    def _writer(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL + NORMAL: 프로세스가 죽어도 커밋된 배치는 남는다
+        stats = self.stats
+        while True:
+            dirty = self._queue.get()
+            if dirty is None:
+                break
+            try:
+                if dirty is _SNAPSHOT:
+                    self._write_snapshot()
+                    continue
+                t0 = time.perf_counter()
+                batch = self._encode(dirty)
+                self._append_journal(batch)
+                self._apply(batch)
+                self._commit(batch, conn)
+            except (OSError, sqlite3.Error, TypeError, ValueError) as e:
+                stats["errors"] += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                continue
+            stats["commits"] += 1
+            stats["rows"] += len(batch)
+            stats["commit_ms_max"] = max(stats["commit_ms_max"], (time.perf_counter() - t0) * 1000.0)
+        conn.close()
 
 
 # ━━━ 게임 데이터 정의 ━━━
@@ -2356,19 +4131,1321 @@ MOVEMENT = {
 }
 
 
+# ━━━ 데이터 테이블 (data/*.csv, data/*.json — ADMIN_RELOAD로 핫리로드) ━━━
+#
+# FieldServer ConfigLoader와 같은 파일을 읽는다. 파일 하나 = 테이블 하나 (이름 = 파일 이름, 확장자 제외).
+#   CSV  : rows (숫자 칸은 int/float) + 컬럼별 인덱스 (id/zone/category 계열 컬럼은 자동, 나머지는 DATA_TABLE_INDEXES)
+#   JSON : settings dict (ADMIN_GET_CONFIG가 조회)
+# 리로드는 파일 읽기/파싱/인덱스 생성을 워커 스레드에서 끝낸 새 테이블 dict를 만들고,
+# 루프 스레드에서 참조 하나를 바꾸는 것으로 교체한다 (틱은 멈추지 않고, 읽는 쪽은 옛 것 아니면 새 것만 본다).
+# 게임 상수(MOVEMENT/ZONE_BOUNDS/몬스터 AI)는 교체 직후 BridgeServer._apply_tables가 다시 만든다.
+# 파일에 없는 값은 위 코드 기본값 그대로 (zone_bounds.csv에 없는 마을/던전 존 등).
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data')
+DATA_INDEX_COLUMNS = ("id", "zone_id", "zone", "category")
+DATA_TABLE_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "monster_spawns": ("name", "loot_table_id"),
+}
+# movement_rules.json 키 -> MOVEMENT 키
+MOVEMENT_RULE_KEYS = (("base_speed", "base_speed"), ("sprint_multiplier", "sprint_mult"),
+                      ("mount_multiplier", "mount_mult"), ("tolerance", "tolerance"),
+                      ("max_violations", "max_violations"))
+# 코드 기본값 (리로드마다 여기에 파일 값을 덮어서 새로 만든다)
+_BUILTIN_MOVEMENT = MOVEMENT
+_BUILTIN_ZONE_BOUNDS = ZONE_BOUNDS
+
+
+class DataTableError(ValueError):
+    """없는 테이블이거나 파일을 읽을 수 없음 — 리로드 실패, 기존 테이블 유지."""
+
+
+def _cell(value: str):
+    """CSV 칸: int -> float -> 문자열 순으로 해석"""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class DataTable:
+    """파일 하나에서 읽은 테이블. 만든 뒤에는 바꾸지 않는다 (리로드는 새 객체로 교체)"""
+    __slots__ = ("name", "path", "rows", "settings", "indexes")
+
+    def __init__(self, name: str, path: str, rows: Optional[List[dict]] = None,
+                 settings: Optional[dict] = None, index_columns: Tuple[str, ...] = ()):
+        self.name = name
+        self.path = path
+        self.rows = rows or []
+        self.settings = settings or {}
+        self.indexes: Dict[str, Dict[object, List[dict]]] = {}
+        for column in index_columns:
+            index: Dict[object, List[dict]] = {}
+            for row in self.rows:
+                if column in row:
+                    index.setdefault(row[column], []).append(row)
+            self.indexes[column] = index
+
+    @classmethod
+    def load(cls, name: str, path: str) -> "DataTable":
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                if path.endswith('.json'):
+                    settings = json.load(f)
+                    if not isinstance(settings, dict):
+                        raise DataTableError(f"{path}: top level must be an object")
+                    return cls(name, path, settings=settings)
+                rows = [{k.strip(): _cell(v.strip()) for k, v in row.items() if k}
+                        for row in csv.DictReader(f)]
+        except (OSError, ValueError, csv.Error) as e:
+            raise DataTableError(f"{path}: {e}") from e
+        columns = rows[0].keys() if rows else ()
+        indexed = [c for c in DATA_INDEX_COLUMNS if c in columns]
+        indexed += [c for c in DATA_TABLE_INDEXES.get(name, ()) if c in columns and c not in indexed]
+        return cls(name, path, rows=rows, index_columns=tuple(indexed))
+
+    def __len__(self):
+        return len(self.rows) if self.rows else len(self.settings)
+
+    def index(self, column: str) -> Dict[object, List[dict]]:
+        return self.indexes[column]
+
+    def find(self, column: str, value) -> Optional[dict]:
+        """인덱스에서 첫 행 (인덱스 없는 컬럼은 선형 검색)"""
+        index = self.indexes.get(column)
+        if index is not None:
+            rows = index.get(value)
+            return rows[0] if rows else None
+        return next((row for row in self.rows if row.get(column) == value), None)
+
+    @property
+    def by_id(self) -> Dict[object, List[dict]]:
+        return self.indexes.get("id", {})
+
+    def get(self, key: str, default=None):
+        return self.settings.get(key, default)
+
+
+class DataTables:
+    """data/ 디렉터리의 테이블 묶음. tables는 교체만 한다 (dict 내용을 고치지 않음)"""
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self.tables: Dict[str, DataTable] = {}
+        self.version = 0        # 교체할 때마다 +1 (첫 로드 = 1)
+        self.reload_count = 0   # ADMIN_RELOAD로 교체한 횟수
+
+    def discover(self) -> Dict[str, str]:
+        """이름 -> 경로 (*.csv, *.json)"""
+        try:
+            files = sorted(os.listdir(self.data_dir))
+        except OSError:
+            return {}
+        return {os.path.splitext(f)[0]: os.path.join(self.data_dir, f)
+                for f in files if f.endswith(('.csv', '.json'))}
+
+    def build(self, names: Optional[List[str]] = None) -> Dict[str, DataTable]:
+        """파일을 읽어 새 테이블을 만든다 (워커 스레드에서 호출해도 됨). names=None이면 전체"""
+        paths = self.discover()
+        if names is None:
+            names = list(paths)
+        missing = [n for n in names if n not in paths]
+        if missing:
+            raise DataTableError(f"unknown table(s): {', '.join(missing)}")
+        return {name: DataTable.load(name, paths[name]) for name in names}
+
+    def swap(self, built: Dict[str, DataTable], reload: bool = False):
+        """루프 스레드에서: 새로 만든 테이블로 교체 (나머지는 그대로)"""
+        tables = dict(self.tables)
+        tables.update(built)
+        self.tables = tables
+        self.version += 1
+        if reload:
+            self.reload_count += 1
+
+    def get(self, name: str) -> Optional[DataTable]:
+        return self.tables.get(name)
+
+    def report(self) -> Dict[str, int]:
+        return {name: len(t) for name, t in self.tables.items()}
+
+
+# ━━━ 정적 테이블 인덱스 ━━━
+#
+# 코드 상수 테이블(CHARACTER_TEMPLATES, DUNGEON_LIST_DATA, 상점 목록 ...)에서 레코드 하나를 찾으려고
+# 요청마다 next(...)/for 선형 검색하던 것을 키 -> 행 dict로 바꾼다.
+# 로드/리로드(_apply_tables) 때 한 번 만들고, 핸들러는 StaticIndex.get/group만 쓴다.
+#   STATIC_INDEXES : 이름 -> (행을 돌려주는 함수, 키). 같은 키가 여럿이면 첫 행 (예전 next(...) 결과와 같음)
+#   STATIC_GROUPS  : 이름 -> (행을 돌려주는 함수, 키, 정렬 키). 키별 행 목록 (보조 키)
+# 키 = 컬럼 이름, 또는 None이면 함수가 (키, 값) 쌍을 돌려준다 (복합 키/역방향 맵).
+
+
+def _scroll_entries():
+    """스크롤 item_id <-> (skill_id, tier, option_idx, option_id).
+    item_id = 9000 + (정렬한 TRIPOD_TABLE 키에서 스킬 위치) * 100 + tier * 10 + option_idx"""
+    for pos, skill_id in enumerate(sorted(TRIPOD_TABLE)):
+        for tier in (1, 2, 3):
+            for option_idx, option in enumerate(TRIPOD_TABLE[skill_id].get(tier, ())[:10]):
+                yield 9000 + pos * 100 + tier * 10 + option_idx, (skill_id, tier, option_idx, option["id"])
+
+
+STATIC_INDEXES = {
+    "character_template": (lambda: CHARACTER_TEMPLATES, "id"),
+    "dungeon": (lambda: DUNGEON_LIST_DATA, "id"),
+    "shop_item": (lambda: (((npc_id, item["item_id"]), item)
+                           for npc_id, shop in SHOPS.items() for item in shop["items"]), None),
+    "token_shop_item": (lambda: (item for items in TOKEN_SHOPS.values() for item in items), "shop_id"),
+    "cash_shop_item": (lambda: CASH_SHOP_ITEMS, "id"),
+    "mentor_shop_item": (lambda: MENTOR_SHOP_ITEMS, "id"),
+    "event": (lambda: EVENT_LIST_DATA, "id"),
+    "daily_quest": (lambda: DAILY_QUEST_POOL, "dq_id"),
+    "second_job_class": (lambda: ((job, cls) for cls, jobs in SECOND_JOB_TABLE.items() for job in jobs), None),
+    "scroll": (_scroll_entries, None),
+    "scroll_item_id": (lambda: ((info[:3], item_id) for item_id, info in _scroll_entries()), None),
+}
+
+STATIC_GROUPS = {
+    # 칭호 조건 검사: 조건 종류별, 조건 값 오름차순
+    "titles_by_condition": (lambda: TITLE_LIST_DATA, "condition_type", lambda t: t["condition_value"]),
+}
+
+
+class StaticIndex:
+    """STATIC_INDEXES/STATIC_GROUPS로 만든 조회용 dict 묶음. rebuild()는 새 dict로 통째로 교체"""
+
+    def __init__(self):
+        self._unique: Dict[str, dict] = {}
+        self._groups: Dict[str, Dict[object, list]] = {}
+
+    def rebuild(self) -> Dict[str, int]:
+        """이름 -> 키 수"""
+        unique = {}
+        for name, (source, key) in STATIC_INDEXES.items():
+            pairs = source() if key is None else ((row[key], row) for row in source())
+            index = {}
+            for k, row in pairs:
+                index.setdefault(k, row)
+            unique[name] = index
+        groups = {}
+        for name, (source, key, order) in STATIC_GROUPS.items():
+            index = {}
+            for row in source():
+                index.setdefault(row[key], []).append(row)
+            for rows in index.values():
+                rows.sort(key=order)
+            groups[name] = index
+        self._unique, self._groups = unique, groups
+        return {name: len(index) for name, index in list(unique.items()) + list(groups.items())}
+
+    def get(self, name: str, key, default=None):
+        return self._unique[name].get(key, default)
+
+    def group(self, name: str, key) -> list:
+        return self._groups[name].get(key, ())
+
+
+# ━━━ 존 샤딩 (--shards, 멀티 프로세스) ━━━
+#
+# 필드 존을 워커 프로세스(샤드)에 나눠 맡긴다. 리슨 소켓은 모든 샤드가 공유하고 (fork 상속),
+# 클라이언트가 다른 샤드 소유 존으로 가면 세션 상태(pickle)와 소켓 fd를 그 샤드로 넘긴다
+# (HANDOFF_DATA). 클라이언트 입장에서는 같은 TCP 연결이 그대로 이어진다.
+# 존 경계 근처 플레이어는 인접 존 소유 샤드에 고스트로 비춘다 (GHOST_INFO, GhostComponents.h 미러).
+# 인스턴스/PvP/레이드 존(id >= SHARD_ZONE_LIMIT)은 들어간 프로세스에서 그대로 진행한다.
+
+SHARD_ZONE_LIMIT = 100            # 이 아래 id의 존(튜토리얼 0 제외)만 샤드에 나눠 준다
+SHARD_ID_STRIDE = 10_000_000      # 샤드별 entity/account id 시작 = 1000 + index * STRIDE
+SHARD_MAX_PACKET = 16 * 1024 * 1024   # 샤드 간 패킷 상한 (세션 상태가 클라이언트 패킷보다 큼)
+
+# 고스트: 경계에서 이 거리 안이면 인접 존에 비춘다 (GHOST_BOUNDARY_THRESHOLD)
+GHOST_BOUNDARY = 300.0
+# 존 -> (인접 존, 방향): +1이면 x 또는 z가 경계값보다 클 때, -1이면 작을 때 경계 근처 (IsNearBoundary)
+GHOST_BORDERS: Dict[int, Tuple[int, int]] = {1: (2, 1), 2: (1, -1)}
+GHOST_HZ = 10.0
+# GHOST_INFO 레코드: entity_id, 고스트를 둘 존의 channel_space (같은 채널 번호), 원래 존 (0 = 고스트 제거), x, y, z
+_GHOST_RECORD = struct.Struct('<QQIfff')
+
+
+def ghost_zone_for(zone_id: int, x: float, z: float) -> int:
+    """(x, z)가 경계 근처면 고스트를 둘 인접 존, 아니면 0"""
+    border = GHOST_BORDERS.get(zone_id)
+    if border is None:
+        return 0
+    adjacent, side = border
+    if side > 0:
+        near = x > GHOST_BOUNDARY or z > GHOST_BOUNDARY
+    else:
+        near = x < GHOST_BOUNDARY or z < GHOST_BOUNDARY
+    return adjacent if near else 0
+
+
+def shard_zone_map(zone_ids, count: int) -> Dict[int, int]:
+    """필드 존 -> 샤드 번호 (id 순서대로 돌아가며)"""
+    fields = sorted(z for z in zone_ids if 0 < z < SHARD_ZONE_LIMIT)
+    return {zone: i % count for i, zone in enumerate(fields)}
+
+
+class ShardLink:
+    """샤드끼리 잇는 AF_UNIX 스트림 소켓 (샤드 쌍마다 하나).
+
+    메시지는 게임 패킷 형식 그대로 ([len][type][payload], PacketFramer로 자름).
+    HANDOFF_DATA는 넘길 클라이언트 소켓 fd를 패킷 첫 바이트에 SCM_RIGHTS로 붙인다.
+    받는 쪽은 fd를 도착 순서대로 쌓아 두고 HANDOFF_DATA 패킷마다 하나씩 꺼낸다
+    (fd는 패킷 첫 바이트와 같이 오므로 패킷이 완성될 때는 항상 도착해 있다).
+    """
+    RECV_SIZE = 256 * 1024
+    MAX_FDS = 16
+
+    def __init__(self, index: int, count: int, peers: Dict[int, socket.socket]):
+        self.index = index
+        self.count = count
+        self.peers = peers                  # 샤드 번호 -> 소켓
+        self.zone_owner: Dict[int, int] = {}
+        self._out: Dict[int, deque] = {i: deque() for i in peers}   # [남은 바이트 view, fd]
+        self._framers = {i: PacketFramer(max_packet=SHARD_MAX_PACKET) for i in peers}
+        self._fds: Dict[int, deque] = {i: deque() for i in peers}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_packet: Optional[Callable] = None
+        self.stats = {"sent": 0, "received": 0, "bytes_out": 0, "bytes_in": 0, "errors": 0}
+
+    def assign(self, zone_ids):
+        """기동 시 한 번: 모든 샤드가 같은 데이터로 같은 배정을 계산한다 (리로드해도 안 바뀜)"""
+        self.zone_owner = shard_zone_map(zone_ids, self.count)
+
+    def owner(self, zone_id: int) -> int:
+        return self.zone_owner.get(zone_id, self.index)
+
+    def owns(self, zone_id: int) -> bool:
+        return self.zone_owner.get(zone_id, self.index) == self.index
+
+    def start(self, on_packet: Callable):
+        """on_packet(peer, msg_type, payload bytes, fd) — fd는 HANDOFF_DATA일 때만 (아니면 -1)"""
+        self._loop = asyncio.get_running_loop()
+        self._on_packet = on_packet
+        for i, sock in self.peers.items():
+            sock.setblocking(False)
+            self._loop.add_reader(sock.fileno(), self._read, i)
+
+    def close(self):
+        """링크 소켓 정리 (이벤트 루프 등록부터 빼야 fd 번호가 재사용돼도 안 섞인다)"""
+        for i, sock in self.peers.items():
+            if self._loop is not None and sock.fileno() >= 0:
+                self._loop.remove_reader(sock.fileno())
+                self._loop.remove_writer(sock.fileno())
+            for _, fd in self._out[i]:
+                if fd >= 0:
+                    os.close(fd)
+            self._out[i].clear()
+            for fd in self._fds[i]:
+                os.close(fd)
+            self._fds[i].clear()
+            sock.close()
+
+    def send(self, peer: int, pkt: bytes, fd: int = -1):
+        """패킷 전송 (못 보낸 건 큐에 두고 쓰기 가능해지면 이어서). fd 소유권은 넘겨받는다"""
+        q = self._out[peer]
+        q.append([memoryview(pkt), fd])
+        self.stats["sent"] += 1
+        if len(q) == 1:
+            self._write(peer)
+
+    def _write(self, peer: int):
+        sock = self.peers[peer]
+        q = self._out[peer]
+        while q:
+            item = q[0]
+            view, fd = item
+            ancdata = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array('i', (fd,)))] if fd >= 0 else []
+            try:
+                n = sock.sendmsg((view,), ancdata)
+            except (BlockingIOError, InterruptedError):
+                self._loop.add_writer(sock.fileno(), self._write, peer)
+                return
+            except OSError:
+                # 상대 샤드가 죽음: 넘기려던 연결은 닫힌다
+                self.stats["errors"] += len(q)
+                for _, pending_fd in q:
+                    if pending_fd >= 0:
+                        os.close(pending_fd)
+                q.clear()
+                break
+            self.stats["bytes_out"] += n
+            if fd >= 0:
+                os.close(fd)        # 상대가 받았다 (첫 바이트와 같이 감)
+                item[1] = -1
+            if n < len(view):
+                item[0] = view[n:]
+                self._loop.add_writer(sock.fileno(), self._write, peer)
+                return
+            q.popleft()
+        self._loop.remove_writer(sock.fileno())
+
+    def _read(self, peer: int):
+        sock = self.peers[peer]
+        try:
+            data, ancdata, _, _ = sock.recvmsg(self.RECV_SIZE, socket.CMSG_SPACE(self.MAX_FDS * 4))
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data, ancdata = b'', ()
+        if not data:
+            self._loop.remove_reader(sock.fileno())   # 상대 샤드 종료
+            return
+        self.stats["bytes_in"] += len(data)
+        fds = self._fds[peer]
+        for level, kind, raw in ancdata:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                received = array('i')
+                received.frombytes(raw[:len(raw) - len(raw) % received.itemsize])
+                fds.extend(received)
+        framer = self._framers[peer]
+        framer.feed(data)
+        for msg_type, payload in framer.packets():
+            fd = fds.popleft() if msg_type == MsgType.HANDOFF_DATA else -1
+            self.stats["received"] += 1
+            self._on_packet(peer, msg_type, bytes(payload), fd)
+
+
+def pack_ghost_records(records) -> List[bytes]:
+    """GHOST_INFO 패킷들 (MAX_PACKET_SIZE 안에 들어가게 나눔)"""
+    per_packet = (MAX_PACKET_SIZE - PACKET_HEADER_SIZE) // _GHOST_RECORD.size
+    pack = _GHOST_RECORD.pack
+    return [build_packet(MsgType.GHOST_INFO, b''.join(pack(*r) for r in records[i:i + per_packet]))
+            for i in range(0, len(records), per_packet)]
+
+
+# ━━━ Protocol 전송 (--transport protocol) ━━━
+
+class BridgeProtocol(asyncio.Protocol):
+    """연결당 Task/StreamReader 없이 data_received에서 바로 디스패치하는 전송.
+
+    핸들러는 stream 모드와 같은 BridgeServer._dispatch를 탄다. session.writer는
+    transport 자체라서 _send의 write()/is_closing()이 그대로 transport로 간다.
+
+    핸들러 코루틴은 data_received 안에서 coro.send(None)으로 직접 돌린다.
+    중간에 await로 멈추면 그 패킷부터 Task(_resume)로 넘기고, 끝날 때까지
+    뒤 패킷은 framer에 쌓아 두어 패킷 순서를 지킨다. 이 경로에는 현재 Task가
+    없으므로 핸들러는 asyncio.current_task()/asyncio.timeout()에 기대면 안 된다.
+
+    handoff가 있으면 다른 샤드에서 넘어온 연결: (세션, 도착 동작, 못 읽은 바이트).
+    """
+
+    # Task 처리 중 framer에 이만큼 쌓이면 소켓 읽기를 멈춘다
+    PAUSE_READING_BYTES = 256 * 1024
+
+    def __init__(self, server: 'BridgeServer', handoff: Optional[tuple] = None):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.session: Optional[PlayerSession] = None
+        self.framer = PacketFramer()
+        self._task: Optional[asyncio.Task] = None
+        self._paused = False
+        self._handoff = handoff
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self._handoff is None:
+            self.server.log(f"Client connected: {transport.get_extra_info('peername')}", "INFO")
+            self.session = PlayerSession(writer=transport)
+            self.server.writers[transport] = self.session
+            return
+        session, arrival, rest = self._handoff
+        self._handoff = None
+        session.writer = transport
+        self.session = session
+        self.server.writers[transport] = session
+        self.server._arrive(session, arrival)
+        if rest:
+            self.data_received(rest)
+
+    def connection_lost(self, exc):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.server._on_client_disconnected(self.transport, self.session)
+
+    def data_received(self, data):
+        self.framer.feed(data)
+        if self._task is not None:
+            # 앞 패킷 핸들러가 아직 실행 중 → 도착 순서대로 _resume이 이어서 처리
+            if not self._paused and len(self.framer) >= self.PAUSE_READING_BYTES:
+                self._paused = True
+                self.transport.pause_reading()
+            return
+        try:
+            self._process()
+        except FramingError as e:
+            self.server.log(str(e), "ERR")
+            self.transport.close()
+        except Exception as e:
+            self.server.log(f"Client error: {e}", "ERR")
+            self.transport.close()
+
+    def _process(self):
+        """버퍼에 완성된 패킷을 동기로 디스패치. 핸들러가 멈추면 Task로 넘긴다."""
+        server = self.server
+        for msg_type, payload in self.framer.packets():
+            if server.verbose:
+                server._log_recv(msg_type, payload)
+
+            coro = server._dispatch(self.transport, self.session, msg_type, payload)
+            try:
+                yielded = coro.send(None)
+            except StopIteration:
+                if self.session.handoff is not None:
+                    break
+                continue
+            except BaseException:
+                coro.close()
+                raise
+            self._task = asyncio.ensure_future(self._resume(coro, yielded))
+            return
+        if self.session.handoff is not None:
+            self._detach()
+
+    def _detach(self):
+        """세션이 다른 샤드로 감: 읽기를 멈추고 남은 바이트와 함께 _migrate로 넘긴다"""
+        self.transport.pause_reading()
+        self._paused = False  # _resume이 끝나며 읽기를 다시 켜지 않게
+        self._task = asyncio.ensure_future(
+            self.server._migrate(self.session, self.transport, self.framer.take_rest()))
+
+    async def _resume(self, coro, yielded):
+        try:
+            # Task가 하는 일을 그대로: 핸들러가 기다리는 future가 끝나면 다시 send
+            while True:
+                try:
+                    if yielded is None:
+                        await asyncio.sleep(0)
+                    else:
+                        await asyncio.wait((yielded,))
+                except asyncio.CancelledError:
+                    if yielded is not None:
+                        yielded.cancel()
+                    coro.close()
+                    raise
+                try:
+                    yielded = coro.send(None)
+                except StopIteration:
+                    break
+
+            # 멈춰 있는 동안 쌓인 패킷: 이 Task 안에서 순서대로 처리
+            server = self.server
+            session = self.session
+            while session.handoff is None:
+                n = 0
+                for msg_type, payload in self.framer.packets():
+                    n += 1
+                    if server.verbose:
+                        server._log_recv(msg_type, payload)
+                    await server._dispatch(self.transport, session, msg_type, payload)
+                    if session.handoff is not None:
+                        break
+                if not n:
+                    break
+            if session.handoff is not None:
+                self._detach()
+        except asyncio.CancelledError:
+            raise
+        except FramingError as e:
+            self.server.log(str(e), "ERR")
+            self.transport.close()
+        except Exception as e:
+            self.server.log(f"Client error: {e}", "ERR")
+            self.transport.close()
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+            if self._paused and not self.transport.is_closing():
+                self._paused = False
+                self.transport.resume_reading()
+
+
+# ━━━ 게이트 (--role gate: 필드 등록/하트비트 + 로그인 라우팅) ━━━
+#
+# GateServer/main.cpp 미러. 필드(BridgeServer --gate)가 FIELD_REGISTER로 등록하고 하트비트로 부하를
+# 보고하면, GATE_ROUTE_REQ마다 가장 한가한 정상 필드의 주소를 돌려준다.
+# 하트비트 뒤에 붙는 부하 확장(틱 수/overrun/송신 대기 바이트)은 C++ 필드가 안 보내면 0으로 본다.
+# 하트비트가 GATE_HEARTBEAT_TIMEOUT 넘게 없거나 등록 연결이 끊긴 필드는 라우팅에서 뺀다 (TIMEOUT).
+
+GATE_PORT = 8888
+GATE_HEARTBEAT_INTERVAL = 2.0   # FieldServer HEARTBEAT_INTERVAL
+GATE_HEARTBEAT_TIMEOUT = 6.0    # GateServer HEARTBEAT_TIMEOUT
+GATE_RECONNECT_DELAY = 2.0      # 필드 -> 게이트 재접속 간격
+# 부하 점수 = (ccu + 예측 ccu) / max_ccu + 가중치 * 틱 overrun 비율 + 송신 대기 / GATE_QUEUE_BYTES
+GATE_OVERRUN_WEIGHT = 0.5       # 틱이 매번 밀리면 정원 50%만큼 더 찬 것으로 친다
+GATE_QUEUE_BYTES = 4 * 1024 * 1024  # 필드 전체 송신 대기가 이만큼이면 정원 100%만큼
+# FIELD_HEARTBEAT 확장 (Schema.FIELD_HEARTBEAT 10바이트 뒤): 직전 하트비트 이후 틱 수 / overrun 수, 송신 대기 바이트
+HEARTBEAT_LOAD = Record([("ticks", 'u32'), ("tick_overruns", 'u32'), ("out_bytes", 'u32')], 'HeartbeatLoad')
+
+
+class GateStatus(IntEnum):
+    UNKNOWN = 0
+    ALIVE = 1
+    TIMEOUT = 2
+    FULL = 3
+
+
+@dataclass
+class GateField:
+    """게이트에 등록된 필드 서버 하나 (등록 순서 = server_index)"""
+    host: str
+    port: int
+    max_ccu: int
+    name: str = ""
+    status: int = GateStatus.ALIVE
+    ccu: int = 0
+    routed: int = 0              # 마지막 하트비트 이후 이 필드로 보낸 로그인 (예측 ccu)
+    overrun_ratio: float = 0.0   # 직전 하트비트 구간의 틱 overrun 비율
+    out_bytes: int = 0
+    last_heartbeat: float = 0.0
+    routes: int = 0              # 누적 라우팅 수
+    route_resp: bytes = b''      # 미리 인코딩한 GATE_ROUTE_RESP 패킷
+
+    def load(self) -> float:
+        return ((self.ccu + self.routed) / max(1, self.max_ccu) + GATE_OVERRUN_WEIGHT * self.overrun_ratio
+                + self.out_bytes / GATE_QUEUE_BYTES)
+
+
+class GateServer:
+    """필드 레지스트리 + 라우터. 연결은 GateProtocol, 상태 변경은 전부 이 클래스 메서드로."""
+    ROUTE_FAIL = build_packet(MsgType.GATE_ROUTE_RESP, b'\x01')
+    SWEEP_INTERVAL = 1.0
+
+    def __init__(self, port: int = GATE_PORT, verbose: bool = False,
+                 heartbeat_timeout: float = GATE_HEARTBEAT_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        self.port = port
+        self.verbose = verbose
+        self.heartbeat_timeout = heartbeat_timeout
+        self.clock = clock
+        self.fields: List[GateField] = []
+        self._by_addr: Dict[Tuple[str, int], int] = {}   # (host, port) -> index
+        self._links: Dict[object, int] = {}               # 필드 등록 연결(transport) -> index
+        self.stats = {"routes": 0, "route_fails": 0, "registers": 0, "heartbeats": 0, "evictions": 0}
+        self._handlers = {
+            MsgType.GATE_ROUTE_REQ: self._on_route_req,
+            MsgType.FIELD_REGISTER: self._on_field_register,
+            MsgType.FIELD_HEARTBEAT: self._on_field_heartbeat,
+            MsgType.GATE_SERVER_LIST: self._on_server_list,
+            MsgType.STATS: self._on_stats,
+        }
+
+    def log(self, msg: str, level: str = "INFO"):
+        ts = time.strftime("%H:%M:%S")
+        prefix = {"INFO": "  ", "ERR": "!!"}.get(level, "  ")
+        print(f"[{ts}] {prefix} [Gate] {msg}")
+
+    # ---- 레지스트리 ----
+
+    def register(self, host: str, port: int, max_ccu: int, name: str = "") -> int:
+        """등록/재등록 (같은 host:port면 같은 index). 반환: server_index"""
+        idx = self._by_addr.get((host, port))
+        if idx is None:
+            idx = len(self.fields)
+            self.fields.append(GateField(host=host, port=port, max_ccu=max_ccu))
+            self._by_addr[(host, port)] = idx
+        f = self.fields[idx]
+        f.max_ccu = max_ccu
+        f.name = name
+        f.status = GateStatus.ALIVE
+        f.ccu = f.routed = f.out_bytes = 0
+        f.overrun_ratio = 0.0
+        f.last_heartbeat = self.clock()
+        f.route_resp = Schema.GATE_ROUTE_RESP.packet(0, port, host)
+        self.stats["registers"] += 1
+        return idx
+
+    def heartbeat(self, idx: int, ccu: int, max_ccu: int, ticks: int = 0, tick_overruns: int = 0,
+                  out_bytes: int = 0):
+        f = self.fields[idx]
+        f.ccu = ccu
+        f.max_ccu = max_ccu
+        f.routed = 0
+        f.overrun_ratio = min(1.0, tick_overruns / ticks) if ticks else 0.0
+        f.out_bytes = out_bytes
+        f.last_heartbeat = self.clock()
+        if f.status == GateStatus.TIMEOUT:
+            self.log(f"Field {f.host}:{f.port} is back")
+        f.status = GateStatus.FULL if ccu >= max_ccu else GateStatus.ALIVE
+        self.stats["heartbeats"] += 1
+
+    def route(self) -> Optional[GateField]:
+        """가장 한가한 정상 필드 (없으면 None). 고른 필드는 다음 하트비트까지 예측 ccu +1"""
+        stale = self.clock() - self.heartbeat_timeout
+        best = None
+        best_load = 0.0
+        for f in self.fields:
+            if f.status != GateStatus.ALIVE or f.last_heartbeat < stale or f.ccu + f.routed >= f.max_ccu:
+                continue
+            load = f.load()
+            if best is None or load < best_load:
+                best, best_load = f, load
+        if best is None:
+            self.stats["route_fails"] += 1
+            return None
+        best.routed += 1
+        best.routes += 1
+        self.stats["routes"] += 1
+        return best
+
+    def evict(self, f: GateField, reason: str):
+        if f.status in (GateStatus.ALIVE, GateStatus.FULL):
+            f.status = GateStatus.TIMEOUT
+            f.ccu = f.routed = 0
+            self.stats["evictions"] += 1
+            self.log(f"TIMEOUT: {f.host}:{f.port} ({reason})")
+
+    def evict_stale(self) -> int:
+        """하트비트가 끊긴 필드를 라우팅에서 뺀다. 반환: 이번에 뺀 수"""
+        now = self.clock()
+        before = self.stats["evictions"]
+        for f in self.fields:
+            if f.status != GateStatus.TIMEOUT and now - f.last_heartbeat > self.heartbeat_timeout:
+                self.evict(f, f"{now - f.last_heartbeat:.1f}s since last heartbeat")
+        return self.stats["evictions"] - before
+
+    # ---- 패킷 ----
+
+    def handle(self, transport, msg_type: int, payload) -> Optional[bytes]:
+        """패킷 하나 처리. 반환: 보낼 응답 패킷 (없으면 None)"""
+        handler = self._handlers.get(msg_type)
+        if handler is None:
+            return None
+        try:
+            return handler(transport, payload)
+        except struct.error:
+            return None   # 짧은 페이로드는 C++ 게이트처럼 무시
+
+    def _on_route_req(self, transport, payload) -> bytes:
+        f = self.route()
+        return self.ROUTE_FAIL if f is None else f.route_resp
+
+    def _on_field_register(self, transport, payload) -> bytes:
+        reg = Schema.FIELD_REGISTER.decode(payload)
+        # 필드가 게이트에 접속한 주소 = 클라이언트가 접속할 주소 (C++ 게이트는 127.0.0.1 고정)
+        peer = transport.get_extra_info('peername')
+        host = peer[0] if peer else '127.0.0.1'
+        idx = self.register(host, reg.port, reg.max_ccu, reg.name)
+        self._links[transport] = idx
+        self.log(f"Field registered: {host}:{reg.port} (idx={idx}, max_ccu={reg.max_ccu}, name={reg.name})")
+        return Schema.FIELD_REGISTER_ACK.packet(0, idx)
+
+    def _on_field_heartbeat(self, transport, payload) -> None:
+        hb, off = Schema.FIELD_HEARTBEAT.decode_from(payload)
+        idx = self._links.get(transport)
+        if idx is None:
+            return None
+        load = HEARTBEAT_LOAD.decode_from(payload, off)[0] if len(payload) >= off + HEARTBEAT_LOAD.size else None
+        if load is None:
+            self.heartbeat(idx, hb.ccu, hb.max_ccu)
+        else:
+            self.heartbeat(idx, hb.ccu, hb.max_ccu, load.ticks, load.tick_overruns, load.out_bytes)
+        return None
+
+    def _on_server_list(self, transport, payload) -> bytes:
+        return Schema.GATE_SERVER_LIST_RESP.packet(
+            [(f.port, f.ccu + f.routed, f.max_ccu, f.status) for f in self.fields[:255]])
+
+    def _on_stats(self, transport, payload) -> bytes:
+        return build_packet(MsgType.STATS, self.stats_report().encode('utf-8'))
+
+    def stats_report(self) -> str:
+        st = self.stats
+        alive = sum(1 for f in self.fields if f.status == GateStatus.ALIVE)
+        routes = ",".join(f"{f.port}:{f.routes}" for f in self.fields)
+        return (f"fields={len(self.fields)}|alive={alive}|routes={st['routes']}|route_fails={st['route_fails']}"
+                f"|registers={st['registers']}|heartbeats={st['heartbeats']}|evictions={st['evictions']}"
+                f"|field_routes={routes}")
+
+    def on_disconnect(self, transport):
+        """필드의 등록 연결이 끊기면 하트비트를 기다리지 않고 바로 뺀다"""
+        idx = self._links.pop(transport, None)
+        if idx is not None:
+            self.evict(self.fields[idx], "gate link closed")
+
+    # ---- 네트워크 ----
+
+    async def listen(self, host: str = '0.0.0.0', port: Optional[int] = None) -> asyncio.AbstractServer:
+        loop = asyncio.get_running_loop()
+        return await loop.create_server(lambda: GateProtocol(self), host, self.port if port is None else port)
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            self.evict_stale()
+
+    async def start(self):
+        server = await self.listen()
+        self.log(f"Listening on port {self.port} (heartbeat timeout {self.heartbeat_timeout:g}s)")
+        sweep = asyncio.ensure_future(self._sweep_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweep.cancel()
+
+
+class GateProtocol(asyncio.Protocol):
+    """게이트 연결 (클라이언트/필드 공용). 한 번에 받은 요청들의 응답은 write 한 번으로"""
+
+    def __init__(self, gate: GateServer):
+        self.gate = gate
+        self.transport: Optional[asyncio.Transport] = None
+        self.framer = PacketFramer()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.gate.on_disconnect(self.transport)
+
+    def data_received(self, data):
+        self.framer.feed(data)
+        handle = self.gate.handle
+        out = []
+        try:
+            for msg_type, payload in self.framer.packets():
+                resp = handle(self.transport, msg_type, payload)
+                if resp is not None:
+                    out.append(resp)
+        except FramingError as e:
+            self.gate.log(str(e), "ERR")
+            self.transport.close()
+            return
+        if out:
+            self.transport.write(out[0] if len(out) == 1 else b''.join(out))
+
+
+# ━━━ 메시지 버스 (--role bus / --bus, Core/EventBus.h + BusServer/main.cpp 미러) ━━━
+#
+# 토픽 pub/sub. BridgeServer마다 프로세스 안 MessageBus가 하나 있고, --bus로 버스 서비스(--role bus)에
+# 붙으면 공유 토픽(월드 공지/접속 목록/귓속말/우편)을 다른 브릿지 프로세스와 주고받는다.
+# 구독자는 두 종류:
+#   핸들러 구독자: publish 안에서 바로 호출 (발행한 data 객체 그대로 — 복사/재인코딩 없음)
+#   큐 구독자: 구독자별 유한 큐에 쌓았다가 이벤트 루프 한 바퀴에 한 번 우선순위 순으로 묶어서 넘긴다
+#              (버스 서비스의 TCP 연결, 브릿지의 버스 링크). 큐가 차면 가장 낮은 우선순위 중 오래된 메시지부터
+#              버린다. CRITICAL(우편처럼 재화가 실린 것)은 버리지 않고 상한을 넘겨서라도 넣는다.
+
+BUS_PORT = 9999
+BUS_QUEUE_LIMIT = 4096          # 큐 구독자당 대기 메시지 상한
+BUS_MAX_DATA = 0xFFFF           # data_len(u16)
+BUS_MAX_PACKET = PACKET_HEADER_SIZE + 1 + 4 + 1 + 255 + 2 + BUS_MAX_DATA
+BUS_RECONNECT_DELAY = 2.0
+# 브릿지끼리 나누는 토픽
+BUS_TOPIC_WORLD = "world"        # 전체 공지: [msg_type u16][payload] — 받은 프로세스가 자기 접속자에게
+BUS_TOPIC_PRESENCE = "presence"  # 접속 목록: BUS_PRESENCE (state 1=접속 0=종료 2=전체 다시 보내 달라)
+BUS_TOPIC_WHISPER = "whisper"    # 다른 프로세스 접속자 앞 귓속말: BUS_WHISPER
+BUS_TOPIC_MAIL = "mail"          # 다른 프로세스 접속자 앞 우편: [server_id u32][account u32][mail JSON]
+BUS_TOPIC_LEFT = "bus.left"      # 버스 서비스 -> 모두: 연결이 끊긴 server_id [u32]
+BUS_SHARED_TOPICS = (BUS_TOPIC_WORLD, BUS_TOPIC_PRESENCE, BUS_TOPIC_WHISPER, BUS_TOPIC_MAIL)
+BUS_PRESENCE = Record([("state", 'u8'), ("account_id", 'u32'), ("name", Text('u8'))], 'Presence')
+BUS_WHISPER = Record([("target", Text('u8')), ("sender", Text('u8')), ("message", Text('u8'))], 'Whisper')
+_BUS_WORLD = struct.Struct('<H')
+_BUS_MAIL = struct.Struct('<II')
+
+
+class BusPriority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    CRITICAL = 3
+
+
+class BusMessage:
+    """큐 구독자에게 가는 메시지 하나 (구독자 사이에 공유). packet은 BUS_MESSAGE 인코딩 캐시"""
+    __slots__ = ('priority', 'origin', 'topic', 'data', 'packet')
+
+    def __init__(self, priority: int, origin: int, topic: str, data: bytes):
+        self.priority = priority
+        self.origin = origin    # 발행한 서버 id (버스 서비스 기준, 0 = 이 프로세스)
+        self.topic = topic
+        self.data = data
+        self.packet: Optional[bytes] = None
+
+    def message_packet(self) -> bytes:
+        if self.packet is None:
+            self.packet = Schema.BUS_MESSAGE.packet(self.priority, self.origin, self.topic, self.data)
+        return self.packet
+
+
+class BusSubscriber:
+    """버스 구독자. handler(topic, data, origin)가 있으면 바로 호출, 아니면 deliver(batch)로 묶어서"""
+    __slots__ = ('id', 'name', 'topics', 'handler', 'deliver', 'queue', 'levels', 'paused', 'pending',
+                 'delivered', 'dropped')
+
+    def __init__(self, sub_id: int, name: str, handler: Optional[Callable] = None,
+                 deliver: Optional[Callable] = None):
+        self.id = sub_id
+        self.name = name
+        self.topics: Set[str] = set()
+        self.handler = handler
+        self.deliver = deliver
+        self.queue: deque = deque()
+        self.levels = [0] * (BusPriority.CRITICAL + 1)  # 큐에 있는 우선순위별 개수 (CRITICAL 이상은 CRITICAL 칸)
+        self.paused = False     # 받는 쪽이 밀림 (TCP 쓰기 버퍼) — 풀릴 때까지 큐에만 쌓는다
+        self.pending = False    # flush 대기 목록에 있음
+        self.delivered = 0
+        self.dropped = 0
+
+
+def bus_unpack(payload, sender: bool = False):
+    """BUS_PUBLISH / BUS_MESSAGE(sender=True) -> (priority, sender_id, topic, data memoryview)"""
+    view = memoryview(payload)
+    off = 5 if sender else 1
+    sender_id = struct.unpack_from('<I', view, 1)[0] if sender else 0
+    topic_len = view[off]
+    topic = bytes(view[off + 1:off + 1 + topic_len]).decode('utf-8', errors='replace')
+    off += 1 + topic_len
+    (data_len,) = struct.unpack_from('<H', view, off)
+    off += 2
+    if off + data_len > len(view):
+        raise struct.error(f"bus data needs {data_len} bytes at offset {off}")
+    return view[0], sender_id, topic, view[off:off + data_len]
+
+
+class MessageBus:
+    """토픽 -> 구독자. 핸들러 구독자는 publish 안에서, 큐 구독자는 루프 한 바퀴마다 묶어서 전달"""
+
+    def __init__(self, queue_limit: int = BUS_QUEUE_LIMIT):
+        self.queue_limit = queue_limit
+        self.topics: Dict[str, List[BusSubscriber]] = {}
+        self.subscribers: Dict[int, BusSubscriber] = {}
+        self.next_id = 1
+        self._pending: List[BusSubscriber] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        # topic -> [발행 수, 팬아웃(구독자 전달) 수, 큐 넘쳐 버린 수, 발행 바이트]
+        self.topic_stats: Dict[str, List[int]] = {}
+        self.stats = {"published": 0, "fanout": 0, "dropped": 0, "batches": 0, "batched": 0}
+
+    def attach(self, name: str = "", handler: Optional[Callable] = None,
+               deliver: Optional[Callable] = None) -> BusSubscriber:
+        if (handler is None) == (deliver is None):
+            raise ValueError("bus subscriber needs exactly one of handler / deliver")
+        sub = BusSubscriber(self.next_id, name, handler, deliver)
+        self.next_id += 1
+        self.subscribers[sub.id] = sub
+        return sub
+
+    def detach(self, sub: BusSubscriber):
+        for topic in list(sub.topics):
+            self.unsubscribe(sub, topic)
+        sub.queue.clear()
+        sub.levels = [0] * len(sub.levels)
+        self.subscribers.pop(sub.id, None)
+
+    def subscribe(self, sub: BusSubscriber, topic: str):
+        if topic not in sub.topics:
+            sub.topics.add(topic)
+            self.topics.setdefault(topic, []).append(sub)
+
+    def unsubscribe(self, sub: BusSubscriber, topic: str):
+        if topic in sub.topics:
+            sub.topics.discard(topic)
+            subs = self.topics[topic]
+            subs.remove(sub)
+            if not subs:
+                del self.topics[topic]
+
+    def on(self, topic: str, handler: Callable, name: str = "") -> BusSubscriber:
+        """핸들러 구독 한 줄짜리: handler(topic, data, origin)"""
+        sub = self.attach(name or getattr(handler, '__name__', ''), handler=handler)
+        self.subscribe(sub, topic)
+        return sub
+
+    def publish(self, topic: str, data, priority: int = BusPriority.NORMAL, origin: int = 0,
+                sender: Optional[BusSubscriber] = None) -> int:
+        """topic 구독자에게 전달 (sender 자신은 제외). 반환: 전달/대기열에 넣은 구독자 수"""
+        if len(data) > BUS_MAX_DATA:
+            raise ValueError(f"bus message too large ({len(data)} > {BUS_MAX_DATA} bytes)")
+        st = self.topic_stats.get(topic)
+        if st is None:
+            st = self.topic_stats[topic] = [0, 0, 0, 0]
+        st[0] += 1
+        st[3] += len(data)
+        self.stats["published"] += 1
+        subs = self.topics.get(topic)
+        if not subs:
+            return 0
+        msg = None
+        level = min(priority, BusPriority.CRITICAL)
+        n = 0
+        for sub in tuple(subs):  # 핸들러가 구독을 바꿔도 이번 발행은 지금 목록대로
+            if sub is sender:
+                continue
+            n += 1
+            if sub.handler is not None:
+                sub.handler(topic, data, origin)
+                sub.delivered += 1
+                continue
+            if msg is None:
+                msg = BusMessage(priority, origin, topic, data if data.__class__ is bytes else bytes(data))
+            q = sub.queue
+            levels = sub.levels
+            if len(q) >= self.queue_limit:
+                low = 0
+                while not levels[low]:  # 큐에 있는 가장 낮은 우선순위
+                    low += 1
+                if low > level or low < BusPriority.CRITICAL:
+                    sub.dropped += 1
+                    st[2] += 1
+                    self.stats["dropped"] += 1
+                    if low > level:
+                        continue    # 새 메시지가 제일 낮음 — 새 것을 버린다
+                    if q[0].priority == low:
+                        q.popleft()
+                    else:           # 그 우선순위 중 가장 오래된 것
+                        del q[next(i for i, m in enumerate(q) if m.priority == low)]
+                    levels[low] -= 1
+            q.append(msg)
+            levels[level] += 1
+            if not sub.pending:
+                sub.pending = True
+                self._pending.append(sub)
+        st[1] += n
+        self.stats["fanout"] += n
+        if msg is not None and self._flush_handle is None:
+            self._schedule_flush()
+        return n
+
+    def resume(self, sub: BusSubscriber):
+        """밀렸던 큐 구독자가 다시 받을 수 있음 — 쌓인 큐를 다음 flush에 넘긴다"""
+        sub.paused = False
+        if sub.queue and not sub.pending:
+            sub.pending = True
+            self._pending.append(sub)
+            if self._flush_handle is None:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()     # 루프 밖(동기 코드/테스트): 바로 전달
+            return
+        self._flush_handle = loop.call_soon(self.flush)
+
+    def flush(self):
+        """큐 구독자마다 쌓인 메시지를 우선순위 순(같으면 발행 순)으로 deliver 한 번에"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for sub in pending:
+            sub.pending = False
+            if sub.paused or not sub.queue or sub.id not in self.subscribers:
+                continue
+            batch = list(sub.queue)
+            sub.queue.clear()
+            sub.levels = [0] * len(sub.levels)
+            if len(batch) > 1:
+                batch.sort(key=lambda m: m.priority, reverse=True)
+            sub.delivered += len(batch)
+            self.stats["batches"] += 1
+            self.stats["batched"] += len(batch)
+            sub.deliver(batch)
+
+    def report(self, top: int = 5) -> dict:
+        """STATS용: 전체 카운터 + 팬아웃 많은 토픽 top개 (topic, 발행, 팬아웃, 버림)"""
+        hot = sorted(self.topic_stats.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        return dict(self.stats, subscribers=len(self.subscribers), topics=len(self.topics),
+                    queued=sum(len(s.queue) for s in self.subscribers.values()),
+                    hot=[(topic, st[0], st[1], st[2]) for topic, st in hot])
+
+
+class BusServer:
+    """버스 서비스 (--role bus): 브릿지 프로세스들이 BUS_REGISTER로 붙어 토픽을 주고받는다"""
+
+    def __init__(self, port: int = BUS_PORT, verbose: bool = False, queue_limit: int = BUS_QUEUE_LIMIT):
+        self.port = port
+        self.verbose = verbose
+        self.bus = MessageBus(queue_limit)
+        self.stats = {"registers": 0, "publishes": 0, "bytes_in": 0}
+        self._handlers = {
+            MsgType.BUS_REGISTER: self._on_register,
+            MsgType.BUS_SUBSCRIBE: self._on_subscribe,
+            MsgType.BUS_UNSUBSCRIBE: self._on_unsubscribe,
+            MsgType.BUS_PUBLISH: self._on_publish,
+            MsgType.STATS: self._on_stats,
+        }
+
+    def log(self, msg: str, level: str = "INFO"):
+        ts = time.strftime("%H:%M:%S")
+        prefix = {"INFO": "  ", "ERR": "!!"}.get(level, "  ")
+        print(f"[{ts}] {prefix} [Bus] {msg}")
+
+    def handle(self, conn: 'BusProtocol', msg_type: int, payload) -> Optional[bytes]:
+        handler = self._handlers.get(msg_type)
+        if handler is None:
+            return None
+        try:
+            return handler(conn, payload)
+        except struct.error:
+            return None
+
+    def _on_register(self, conn: 'BusProtocol', payload) -> bytes:
+        if conn.sub is None:
+            name = Schema.BUS_REGISTER.decode(payload).name
+            conn.sub = self.bus.attach(name, deliver=conn.deliver)
+            self.stats["registers"] += 1
+            self.log(f"Server registered: '{name}' (id={conn.sub.id})")
+        return Schema.BUS_REGISTER_ACK.packet(0, conn.sub.id)
+
+    def _on_subscribe(self, conn: 'BusProtocol', payload) -> Optional[bytes]:
+        topic = Schema.BUS_SUBSCRIBE.decode(payload).topic
+        if conn.sub is None or not topic:
+            return None
+        self.bus.subscribe(conn.sub, topic)
+        if self.verbose:
+            self.log(f"Server {conn.sub.id} subscribed to '{topic}'")
+        return Schema.BUS_SUB_ACK.packet(0, topic)
+
+    def _on_unsubscribe(self, conn: 'BusProtocol', payload) -> None:
+        if conn.sub is not None:
+            self.bus.unsubscribe(conn.sub, Schema.BUS_UNSUBSCRIBE.decode(payload).topic)
+        return None
+
+    def _on_publish(self, conn: 'BusProtocol', payload) -> None:
+        if conn.sub is None:
+            return None
+        priority, _, topic, data = bus_unpack(payload)
+        self.stats["publishes"] += 1
+        self.stats["bytes_in"] += len(data)
+        self.bus.publish(topic, data, priority, origin=conn.sub.id, sender=conn.sub)
+        return None
+
+    def _on_stats(self, conn: 'BusProtocol', payload) -> bytes:
+        return build_packet(MsgType.STATS, self.stats_report().encode('utf-8'))
+
+    def stats_report(self) -> str:
+        r = self.bus.report()
+        hot = ",".join(f"{topic}:{pub}:{fan}:{drop}" for topic, pub, fan, drop in r["hot"])
+        return (f"servers={r['subscribers']}|topics={r['topics']}|published={r['published']}"
+                f"|fanout={r['fanout']}|dropped={r['dropped']}|queued={r['queued']}|batches={r['batches']}"
+                f"|batched={r['batched']}|bytes_in={self.stats['bytes_in']}|hot_topics={hot}")
+
+    def on_disconnect(self, conn: 'BusProtocol'):
+        sub, conn.sub = conn.sub, None
+        if sub is not None:
+            self.bus.detach(sub)
+            self.log(f"Server disconnected: '{sub.name}' (id={sub.id})")
+            self.bus.publish(BUS_TOPIC_LEFT, struct.pack('<I', sub.id), BusPriority.CRITICAL)
+
+    async def listen(self, host: str = '0.0.0.0', port: Optional[int] = None) -> asyncio.AbstractServer:
+        loop = asyncio.get_running_loop()
+        return await loop.create_server(lambda: BusProtocol(self), host, self.port if port is None else port)
+
+    async def start(self):
+        server = await self.listen()
+        self.log(f"Listening on port {self.port} (queue limit {self.bus.queue_limit} per server)")
+        async with server:
+            await server.serve_forever()
+
+
+class BusProtocol(asyncio.Protocol):
+    """버스 서비스 연결 하나. 쓰기 버퍼가 차면(pause_writing) 이 구독자 큐에만 쌓는다"""
+
+    def __init__(self, server: BusServer):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.framer = PacketFramer(max_packet=BUS_MAX_PACKET)
+        self.sub: Optional[BusSubscriber] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.server.on_disconnect(self)
+
+    def pause_writing(self):
+        if self.sub is not None:
+            self.sub.paused = True
+
+    def resume_writing(self):
+        if self.sub is not None:
+            self.server.bus.resume(self.sub)
+
+    def deliver(self, batch: List[BusMessage]):
+        if not self.transport.is_closing():
+            self.transport.write(b''.join([m.message_packet() for m in batch]))
+
+    def data_received(self, data):
+        self.framer.feed(data)
+        handle = self.server.handle
+        out = []
+        try:
+            for msg_type, payload in self.framer.packets():
+                resp = handle(self, msg_type, payload)
+                if resp is not None:
+                    out.append(resp)
+        except FramingError as e:
+            self.server.log(str(e), "ERR")
+            self.transport.close()
+            return
+        if out:
+            self.transport.write(b''.join(out))
+
+
 # ━━━ 브릿지 서버 ━━━
 
 class BridgeServer:
-    def __init__(self, port: int = 7777, verbose: bool = False):
+    # MsgType -> 핸들러 메서드 이름. @packet_handler / register_handler()로 채워진다.
+    HANDLERS: Dict[int, str] = {}
+    # memoryview payload를 그대로 받는 MsgType (zero_copy=True)
+    ZERO_COPY_HANDLERS: Set[int] = set()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.HANDLERS = dict(cls.HANDLERS)
+        cls.ZERO_COPY_HANDLERS = set(cls.ZERO_COPY_HANDLERS)
+        cls._collect_handlers()
+
+    @classmethod
+    def _collect_handlers(cls):
+        for name, fn in list(vars(cls).items()):
+            for msg_type in getattr(fn, '_msg_types', ()):
+                cls.register_handler(msg_type, name, replace=True,
+                                     zero_copy=getattr(fn, '_zero_copy', False))
+
+    @classmethod
+    def register_handler(cls, msg_type: int, handler, replace: bool = False,
+                         zero_copy: bool = False) -> None:
+        """MsgType 핸들러 등록 (클래스 정의/서버 기동 시점용).
+
+        handler: 메서드 이름, 또는 async def fn(self, session, payload) 함수.
+        함수를 넘기면 같은 이름의 메서드로 클래스에 붙인다.
+        """
+        if callable(handler):
+            if getattr(cls, handler.__name__, None) is not handler:
+                setattr(cls, handler.__name__, handler)
+            handler = handler.__name__
+        if not hasattr(cls, handler):
+            raise AttributeError(f"{cls.__name__} has no handler method {handler!r}")
+        prev = cls.HANDLERS.get(msg_type)
+        if prev is not None and prev != handler and not replace:
+            raise ValueError(f"MsgType {msg_type} already handled by {prev}")
+        cls.HANDLERS[msg_type] = handler
+        if zero_copy:
+            cls.ZERO_COPY_HANDLERS.add(msg_type)
+        else:
+            cls.ZERO_COPY_HANDLERS.discard(msg_type)
+
+    TRANSPORTS = ("stream", "protocol")
+    # immediate: _send마다 write / dispatch: 핸들러 하나 끝날 때 / loop: 이벤트 루프 한 바퀴 끝날 때
+    # tick: 게임 틱(TickScheduler) 끝날 때 — 틱 루프가 돌지 않을 때는 loop와 같다
+    FLUSH_POLICIES = ("immediate", "dispatch", "loop", "tick")
+    TCPIP_HEADER_BYTES = 40  # write 한 번 = 세그먼트 하나 (TCP_NODELAY) 로 보고 절약량 추정
+    # 느린 클라이언트 보호. 세션 송신 버퍼 = transport 쓰기 버퍼 + out_queue
+    OUT_LOW_WATERMARK = 64 * 1024     # 이 아래로 내려오면 혼잡 해제
+    OUT_HIGH_WATERMARK = 256 * 1024   # soft limit: 이동 패킷은 엔티티별 최신값만 남긴다
+    OUT_HARD_LIMIT = 1024 * 1024      # transport 쓰기 버퍼(클라이언트가 못 읽은 양)가 넘으면 끊는다
+    # 혼잡 시 엔티티별 최신값으로 합쳐도 되는 패킷 (payload 앞 8바이트 = entity_id)
+    SHEDDABLE_MSG_TYPES = frozenset({MsgType.MOVE_BROADCAST, MsgType.MONSTER_MOVE})
+    # 보류한 이동 패킷이 앞지르면 안 되는 엔티티 패킷 (payload 앞 8바이트 = entity_id).
+    # DISAPPEAR면 그 엔티티의 보류분은 버리고, 나머지는 보류분을 먼저 큐에 넣는다.
+    ENTITY_ORDERED_MSG_TYPES = frozenset({MsgType.APPEAR, MsgType.DISAPPEAR, MsgType.COMBAT_DIED,
+                                          MsgType.MONSTER_SPAWN, MsgType.MONSTER_RESPAWN})
+    CONGESTION_CHECK_INTERVAL = 0.05
+    # 샤드 핸드오프: 소켓을 넘기기 전에 송신 버퍼가 커널로 다 빠지길 기다리는 최대 시간
+    HANDOFF_DRAIN_TIMEOUT = 2.0
+    # 게임 틱 시스템별 주기 (Hz). 기본 틱은 tick_rate (data/server.json)
+    AI_HZ = 10.0
+    # 시한 이벤트 (self.timers)
+    MONSTER_RESPAWN_DELAY = 10.0
+    BUFF_DURATION = 30.0
+    MAIL_EXPIRE_SEC = 7 * 86400
+    # 영속화: 접속 중 세션(재화/인벤토리/친구)은 이 주기로 저장 (변경 즉시 저장하는 도메인은 매 틱 flush)
+    AUTOSAVE_HZ = 1.0 / 60.0
+    # 스냅샷 주기 (사이 변경은 저널에 쌓이고 기동 시 재생)
+    SNAPSHOT_HZ = 1.0 / 300.0
+    # 계정 프로필로 저장하는 세션 필드 (인벤토리는 inventory 테이블)
+    ACCOUNT_FIELDS = ("gold", "silver", "crystal", "dungeon_token", "pvp_token", "bounty_tokens",
+                      "guild_contribution", "friends", "blocked_players")
+    # 캐릭터 진행도: 프로필 "characters"에 캐릭터 이름별 {Stats 필드, zone_id, pos} (CHAR_SELECT 때 복구)
+    CHARACTER_STAT_FIELDS = tuple(Stats.__dataclass_fields__)
+    # 몬스터 AI (초당 값 — 틱 주기와 무관)
+    AI_ATTACK_RANGE = 200.0
+    AI_ATTACK_INTERVAL = 3.0
+    AI_CHASE_SPEED = 80.0 * 1.3
+    AI_RETURN_SPEED = 80.0
+    AI_RETURN_ARRIVE = 10.0
+    AI_LEASH_RANGE = 500.0
+    AI_PATROL_RATE = 0.1  # 초당 패트롤 확률 (예전 3초 틱당 30%)
+
+    def __init__(self, port: int = 7777, verbose: bool = False, transport: str = "stream",
+                 flush_policy: str = "loop", view_radius: float = GRID_CELL_SIZE,
+                 monster_scale: int = 1, tick_rate: Optional[float] = None, db_path: Optional[str] = None,
+                 data_dir: str = DATA_DIR, shard: Optional[ShardLink] = None, ghosts: bool = False,
+                 gate: Optional[Tuple[str, int]] = None, bus: Optional[Tuple[str, int]] = None,
+                 journal_fsync: bool = True):
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f"unknown transport {transport!r} (expected one of {self.TRANSPORTS})")
+        if flush_policy not in self.FLUSH_POLICIES:
+            raise ValueError(f"unknown flush policy {flush_policy!r} (expected one of {self.FLUSH_POLICIES})")
         self.port = port
         self.verbose = verbose
+        self.transport = transport
+        self.monster_scale = max(1, monster_scale)  # MONSTER_SPAWNS 항목당 스폰 수 (부하 테스트용)
+        self.flush_policy = flush_policy
+        self._dirty_sessions: List[PlayerSession] = []  # out_queue가 비어 있지 않은 세션
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._tick_flush = False  # tick 정책 + 틱 루프 동작 중: flush는 틱 끝에서
+        self.outbound_stats = {"packets": 0, "bytes": 0, "writes": 0, "dropped": 0,
+                               "shed": 0, "slow_disconnects": 0}
+        self._congested_sessions: List[PlayerSession] = []
+        self._congestion_handle: Optional[asyncio.Handle] = None
+        # AOI: 시야 반경(= 그리드 셀 크기). 0이면 존 전체
+        self.view_radius = view_radius
+        # 키는 전부 channel_space(zone_id, channel_id) — 채널 1은 zone_id 그대로
+        self.player_grids: Dict[int, AOIGrid] = {}   # 공간 -> 플레이어 그리드
+        self.monster_grids: Dict[int, AOIGrid] = {}  # 공간 -> 몬스터 그리드
+        # 존 인덱스: 공간 -> entity_id 집합 (in_game 플레이어 / 몬스터)
+        self.zone_players: Dict[int, Set[int]] = {}
+        self.zone_monsters: Dict[int, Set[int]] = {}
+        self.aoi_stats = {"sent": 0, "skipped": 0, "bytes_saved": 0, "appear": 0, "disappear": 0}
+        # 디스패치 테이블: 인스턴스당 한 번만 바인딩
+        self._handlers = {mt: getattr(self, name) for mt, name in self.HANDLERS.items()}
+        self._zero_copy = frozenset(self.ZERO_COPY_HANDLERS)
+        self.handler_stats: Dict[int, List[float]] = {}  # msg_type -> [calls, total_sec, max_sec]
         self.sessions: Dict[int, PlayerSession] = {}  # entity_id -> session
         self.writers: Dict[asyncio.StreamWriter, PlayerSession] = {}
+        # 이름/계정 인덱스 (캐릭터 선택 ~ 접속 종료). 브릿지는 캐릭터 템플릿을 공유하므로
+        # 같은 이름이 여럿일 수 있음 -> 이름별로 선택 순서대로 보관하고 가장 먼저 들어온 세션을 쓴다
+        self.sessions_by_name: Dict[str, Dict[int, PlayerSession]] = {}
+        self.sessions_by_account: Dict[int, PlayerSession] = {}
         self.monsters: Dict[int, dict] = {}  # entity_id -> monster data
         self.parties: Dict[int, dict] = {}   # party_id -> party data
         self.next_party_id = 1
         self.next_account_id = 1000
-        self.tick_count = 0
+        config = load_server_config()
+        if tick_rate is None:
+            tick_rate = float(config.get("tick_rate", DEFAULT_TICK_RATE))
+        self.ticker = TickScheduler(tick_rate, log=lambda msg, level: self.log(msg, level))
+        # 존 채널: 채널 정원(channel_capacity)이 차면 새 채널을 연다
+        self.channel_capacity = max(1, int(config.get("channel_capacity", CHANNEL_CAPACITY)))
+        self.max_channels = min(255, max(1, int(config.get("max_channels", CHANNEL_MAX))))
+        self.zone_channels: Dict[int, Set[int]] = {}  # zone_id -> 열린 채널 번호 (2번 이상 — 1번은 항상 열림)
+        self.channel_stats = {"opened": 0, "collapsed": 0, "switches": 0, "refused": 0, "overflow": 0, "server_full": 0}
+        # 게이트 등록 (--gate HOST:PORT): 하트비트로 세션 수/틱 overrun/송신 대기 바이트를 보고
+        self.gate = gate
+        self.max_ccu = int(config.get("max_players", 200))  # 동시 접속 상한: 캐릭터 선택에서 막는다
+        self.server_name = str(config.get("server_name", "Field"))
+        self.gate_stats = {"registered": 0, "heartbeats": 0, "errors": 0}
+        self._gate_ticks = (0, 0)  # 직전 하트비트 때 (ticker.ticks, ticker.overruns)
+        # 메시지 버스: 월드 공지/귓속말/우편/접속 목록. --bus HOST:PORT면 다른 브릿지 프로세스와 공유
+        self.bus = MessageBus()
+        self.bus_addr = bus
+        self.bus_server_id = 0                       # 버스 서비스가 준 id (링크 없으면 0)
+        self._bus_link: Optional[BusSubscriber] = None
+        # 다른 프로세스 접속자 이름 -> (account_id, server_id). account_id는 프로세스마다 따로 매기니 server_id와 같이 쓴다
+        self.remote_players: Dict[str, Tuple[int, int]] = {}
+        self.bus.on(BUS_TOPIC_WORLD, self._on_bus_world)
+        self.bus.on(BUS_TOPIC_PRESENCE, self._on_bus_presence)
+        self.bus.on(BUS_TOPIC_WHISPER, self._on_bus_whisper)
+        self.bus.on(BUS_TOPIC_MAIL, self._on_bus_mail)
+        self.bus.on(BUS_TOPIC_LEFT, self._on_bus_left)
+        # 버프/리스폰/경매/우편/월정액 만료 타이머 (매 기본 틱마다 도래분 실행)
+        self.timers = TimerWheel(time.time())
         self.start_time = time.time()
         self._running = False
         self.guilds: Dict[int, dict] = {}  # guild_id -> guild data
@@ -2376,8 +5453,30 @@ class BridgeServer:
         self.trades: Dict[int, dict] = {}  # entity_id -> trade session
         self.mails: Dict[int, List[dict]] = {}  # account_id -> mail list
         self.next_mail_id = 1
-        self.auction_listings: list = []   # [{id, seller_account, seller_name, item_id, item_count, buyout_price, bid_price, highest_bidder, highest_bidder_name, bid_account, category, listed_at, expires_at}]
+        # 경매 listing: {id, seller_account, seller_name, item_id, item_count, buyout_price, bid_price, highest_bidder, highest_bidder_name, bid_account, category, listed_at, expires_at}
+        self.auction_book = AuctionBook()
         self.next_auction_id: int = 1
+        self.response_cache = ResponseCache()  # 정적 테이블 응답 (데이터 리로드 시 invalidate)
+        # 데이터 테이블 (data/). 못 읽으면 코드 기본값으로 동작
+        self.data = DataTables(data_dir)
+        self.index = StaticIndex()      # 상수 테이블 키 조회 (_apply_tables 때 다시 만듦)
+        self._bounty_board = None       # (date_seed, 오늘의 현상금 목록, bounty_id -> 항목)
+        try:
+            self.data.swap(self.data.build())
+        except DataTableError as e:
+            self.log(f"Data tables: {e} (using built-in defaults)", "ERR")
+        self._apply_tables()
+        # 존 샤딩: 다른 샤드 소유 존으로 가는 세션은 핸드오프, 존 경계 근처 플레이어는 고스트
+        self.shard = shard
+        self.ghosts_enabled = ghosts or shard is not None
+        self.ghosts: Dict[int, Dict[int, tuple]] = {}   # channel_space -> entity_id -> (원래 존, x, y, z)
+        self._ghost_dirty: Dict[int, PlayerSession] = {}  # 다음 고스트 틱에 다시 볼 세션
+        self.shard_stats = {"handoffs_out": 0, "handoffs_in": 0, "handoffs_failed": 0, "ghost_updates": 0}
+        if shard is not None:
+            # 샤드마다 id 구간을 나눠 프로세스를 옮겨 다녀도 겹치지 않게
+            reserve_entity_ids(1000 + shard.index * SHARD_ID_STRIDE)
+            self.next_account_id = 1000 + shard.index * SHARD_ID_STRIDE
+            shard.assign(ZONE_BOUNDS)
         self.characters: Dict[int, List[dict]] = {}  # account_id -> character list
         self.next_char_id = 1
         self.npcs: Dict[int, dict] = {}  # entity_id -> npc data
@@ -2395,10 +5494,16 @@ class BridgeServer:
         self.enchantments = {}
         self.pvp_ratings: Dict[str, dict] = {}  # username -> {rating, wins, losses, matches}
         self.raid_instances: Dict[int, dict] = {}  # instance_id -> raid data
-        # S045: Auction House
-        self.auction_listings: Dict[int, dict] = {}  # listing_id -> listing data
-        self.next_auction_id = 1
         self.daily_gold_earned: Dict[int, dict] = {}  # account_id -> {monster:X, dungeon:X, ...}
+        # 영속화 (db_path 없으면 메모리 전용 — 로그인마다 새 account_id, 재시작하면 초기화)
+        self.store = Storage(db_path, journal_fsync=journal_fsync)
+        self.accounts: Dict[str, int] = {}             # username -> account_id
+        # 계정 프로필/인벤토리는 기동 시 JSON 문자열 그대로 두고 로그인할 때 디코드 (10만 계정 부팅 시간 절약)
+        self.login_sessions: Dict[int, PlayerSession] = {}  # account_id -> 로그인한 세션 (저장소 있을 때 중복 로그인 감지)
+        self.account_profiles: Dict[int, object] = {}  # account_id -> ACCOUNT_FIELDS + "characters" 마지막 저장값 (dict | JSON)
+        self.inventories: Dict[int, object] = {}       # account_id -> 인벤토리 마지막 저장값 (list | JSON)
+        if self.store.enabled:
+            self._load_world()
 
     def log(self, msg: str, level: str = "INFO"):
         ts = time.strftime("%H:%M:%S")
@@ -2407,12 +5512,32 @@ class BridgeServer:
 
     # ━━━ 네트워크 ━━━
 
-    async def start(self):
-        server = await asyncio.start_server(
-            self._on_client_connected, '0.0.0.0', self.port
-        )
+    async def listen(self, host: str = '0.0.0.0', port: Optional[int] = None,
+                     sock: Optional[socket.socket] = None) -> asyncio.AbstractServer:
+        """self.transport 모드로 리슨 소켓 생성 (stream: StreamReader 루프, protocol: BridgeProtocol).
+
+        sock이 있으면 이미 열린 리슨 소켓을 쓴다 (샤드 워커는 부모가 만든 소켓을 공유).
+        """
+        if port is None:
+            port = self.port
+        where = {"sock": sock} if sock is not None else {"host": host, "port": port}
+        if self.transport == "protocol":
+            loop = asyncio.get_running_loop()
+            return await loop.create_server(lambda: BridgeProtocol(self), **where)
+        return await asyncio.start_server(self._on_client_connected, **where)
+
+    async def start(self, sock: Optional[socket.socket] = None):
+        server = await self.listen(sock=sock)
         self._running = True
-        self.log(f"TCP Bridge Server started on port {self.port}", "INFO")
+        self.log(f"TCP Bridge Server started on port {self.port} ({self.transport} transport)", "INFO")
+        if self.shard is not None:
+            self.shard.start(self._on_shard_packet)
+            owned = sorted(z for z, i in self.shard.zone_owner.items() if i == self.shard.index)
+            self.log(f"Shard {self.shard.index}/{self.shard.count}: field zones {owned}", "INFO")
+        if self.gate is not None:
+            asyncio.create_task(self._gate_loop())
+        if self.bus_addr is not None:
+            asyncio.create_task(self._bus_loop())
         self.log(f"Waiting for Unity client connections...", "INFO")
 
         # 몬스터 스폰
@@ -2422,8 +5547,11 @@ class BridgeServer:
         # 게임 틱 루프 시작
         asyncio.create_task(self._game_tick_loop())
 
-        async with server:
-            await server.serve_forever()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close_storage()
 
     async def _on_client_connected(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         addr = writer.get_extra_info('peername')
@@ -2431,7 +5559,9 @@ class BridgeServer:
 
         session = PlayerSession(writer=writer)
         self.writers[writer] = session
+        await self._serve(reader, writer, session)
 
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, session: PlayerSession):
         try:
             await self._read_loop(reader, writer, session)
         except (asyncio.IncompleteReadError, ConnectionResetError, ConnectionAbortedError):
@@ -2441,10 +5571,395 @@ class BridgeServer:
         finally:
             self._on_client_disconnected(writer, session)
 
+    # ━━━ 게이트 등록 (--gate) ━━━
+
+    def _gate_heartbeat(self) -> bytes:
+        """FIELD_HEARTBEAT + 부하 확장 (직전 하트비트 이후 틱/overrun 수, 송신 대기 바이트)"""
+        ticker = self.ticker
+        last_ticks, last_overruns = self._gate_ticks
+        self._gate_ticks = (ticker.ticks, ticker.overruns)
+        buffered = min(self.outbound_buffer_report()["buffered"], 0xFFFFFFFF)
+        payload = (Schema.FIELD_HEARTBEAT.encode(self.port, len(self.writers), self.max_ccu)
+                   + HEARTBEAT_LOAD.encode(ticker.ticks - last_ticks, ticker.overruns - last_overruns, buffered))
+        return build_packet(MsgType.FIELD_HEARTBEAT, payload)
+
+    async def _gate_loop(self):
+        """게이트에 등록하고 GATE_HEARTBEAT_INTERVAL마다 하트비트. 연결이 끊기면 다시 등록"""
+        host, port = self.gate
+        connected = None
+        while self._running:
+            writer = None
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(Schema.FIELD_REGISTER.packet(self.port, self.max_ccu, self.server_name))
+                length, msg_type = parse_header(
+                    await asyncio.wait_for(reader.readexactly(PACKET_HEADER_SIZE), GATE_HEARTBEAT_TIMEOUT))
+                ack = Schema.FIELD_REGISTER_ACK.decode(await reader.readexactly(length - PACKET_HEADER_SIZE))
+                if msg_type != MsgType.FIELD_REGISTER_ACK or ack.result:
+                    raise ConnectionError(f"gate rejected registration ({_msg_name(msg_type)})")
+                self.gate_stats["registered"] += 1
+                self.log(f"Registered with gate {host}:{port} (index {ack.server_index}, max_ccu {self.max_ccu})")
+                connected = True
+                self._gate_ticks = (self.ticker.ticks, self.ticker.overruns)
+                while self._running and not reader.at_eof():
+                    writer.write(self._gate_heartbeat())
+                    await writer.drain()
+                    self.gate_stats["heartbeats"] += 1
+                    await asyncio.sleep(GATE_HEARTBEAT_INTERVAL)
+                raise ConnectionError("gate closed the connection")
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, struct.error) as e:
+                self.gate_stats["errors"] += 1
+                if connected is not False:  # 재접속 실패가 이어지는 동안은 한 번만 찍는다
+                    self.log(f"Gate {host}:{port}: {str(e) or type(e).__name__} (retrying)", "ERR")
+                connected = False
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(GATE_RECONNECT_DELAY)
+
+    # ━━━ 메시지 버스 (--bus) ━━━
+
+    async def _bus_loop(self):
+        """버스 서비스에 등록하고 공유 토픽을 중계. 연결이 끊기면 다시 등록"""
+        host, port = self.bus_addr
+        connected = None
+        while self._running:
+            writer = link = None
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(Schema.BUS_REGISTER.packet(f"{self.server_name}:{self.port}") + b''.join(
+                    Schema.BUS_SUBSCRIBE.packet(topic) for topic in BUS_SHARED_TOPICS + (BUS_TOPIC_LEFT,)))
+                framer = PacketFramer(max_packet=BUS_MAX_PACKET)
+                while not self.bus_server_id:
+                    data = await asyncio.wait_for(reader.read(65536), GATE_HEARTBEAT_TIMEOUT)
+                    if not data:
+                        raise ConnectionError("bus closed the connection")
+                    framer.feed(data)
+                    for msg_type, payload in framer.packets():
+                        if msg_type == MsgType.BUS_REGISTER_ACK:
+                            self.bus_server_id = Schema.BUS_REGISTER_ACK.decode(payload).server_id
+                self.log(f"Registered with bus {host}:{port} (server id {self.bus_server_id})")
+                connected = True
+                # 이 프로세스에서 발행한 공유 토픽 -> 버스 서비스 (루프 한 바퀴 분량을 write 한 번에)
+                link = self.bus.attach("bus-link", deliver=lambda batch: self._bus_forward(writer, link, batch))
+                for topic in BUS_SHARED_TOPICS:
+                    self.bus.subscribe(link, topic)
+                self._bus_link = link
+                # 접속 목록: 다른 프로세스에 다시 보내 달라고 하고 우리 것도 알린다
+                self.bus.publish(BUS_TOPIC_PRESENCE, BUS_PRESENCE.encode(2, 0, ""))
+                self._publish_presence_all()
+                while True:
+                    for msg_type, payload in framer.packets():
+                        if msg_type != MsgType.BUS_MESSAGE:
+                            continue
+                        priority, origin, topic, data = bus_unpack(payload, sender=True)
+                        try:
+                            self.bus.publish(topic, data, priority, origin=origin, sender=link)
+                        except (struct.error, ValueError, KeyError) as e:
+                            self.log(f"Bus message '{topic}' from {origin}: {e}", "ERR")
+                    data = await reader.read(65536)
+                    if not data:
+                        raise ConnectionError("bus closed the connection")
+                    framer.feed(data)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, struct.error, FramingError) as e:
+                if connected is not False:
+                    self.log(f"Bus {host}:{port}: {str(e) or type(e).__name__} (retrying)", "ERR")
+                connected = False
+            finally:
+                if link is not None:
+                    self.bus.detach(link)
+                self._bus_link = None
+                self.bus_server_id = 0
+                self.remote_players.clear()
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(BUS_RECONNECT_DELAY)
+
+    def _bus_forward(self, writer, link: BusSubscriber, batch: List[BusMessage]):
+        """링크 큐 구독자 deliver: BUS_PUBLISH 묶음. 버스 쪽이 밀리면 drain까지 큐에만 쌓는다"""
+        if writer.is_closing():
+            return
+        writer.write(b''.join([Schema.BUS_PUBLISH.packet(m.priority, m.topic, m.data) for m in batch]))
+        if _write_buffer_size(writer) >= self.OUT_HIGH_WATERMARK and not link.paused:
+            link.paused = True
+            asyncio.ensure_future(self._bus_drain(writer, link))
+
+    async def _bus_drain(self, writer, link: BusSubscriber):
+        try:
+            await writer.drain()
+        except (OSError, RuntimeError):
+            return
+        self.bus.resume(link)
+
+    def _announce(self, msg_type: int, payload: bytes):
+        """전체 공지: 이 프로세스 접속자 + (버스 링크가 있으면) 다른 브릿지 프로세스 접속자"""
+        self.bus.publish(BUS_TOPIC_WORLD, _BUS_WORLD.pack(msg_type) + payload)
+
+    def _on_bus_world(self, topic: str, data, origin: int):
+        (msg_type,) = _BUS_WORLD.unpack_from(data)
+        self._broadcast_to_all(msg_type, bytes(data[_BUS_WORLD.size:]))
+
+    def _publish_presence(self, session: PlayerSession, state: int):
+        if self._bus_link is not None:
+            self.bus.publish(BUS_TOPIC_PRESENCE, BUS_PRESENCE.encode(state, session.account_id, session.char_name))
+
+    def _publish_presence_all(self):
+        for same_name in list(self.sessions_by_name.values()):
+            for session in same_name.values():
+                self._publish_presence(session, 1)
+
+    def _on_bus_presence(self, topic: str, data, origin: int):
+        if not origin:
+            return  # 이 프로세스가 보낸 것
+        p = BUS_PRESENCE.decode(data)
+        if p.state == 2:
+            self._publish_presence_all()
+        elif p.state == 1:
+            self.remote_players[p.name] = (p.account_id, origin)
+        elif self.remote_players.get(p.name, (0, 0))[1] == origin:
+            del self.remote_players[p.name]
+
+    def _on_bus_left(self, topic: str, data, origin: int):
+        """다른 브릿지가 버스에서 끊김: 그 프로세스 접속자를 목록에서 뺀다"""
+        (gone,) = struct.unpack_from('<I', data)
+        for name in [n for n, (_, sid) in self.remote_players.items() if sid == gone]:
+            del self.remote_players[name]
+
+    def _on_bus_whisper(self, topic: str, data, origin: int):
+        w = BUS_WHISPER.decode(data)
+        target = self._find_session_by_name(w.target) if origin else None
+        if target is None:
+            return
+        message = w.message.encode('utf-8')[:255]
+        self._send(target, MsgType.WHISPER_RESULT,
+                   struct.pack('<BB', 0, 0) + w.sender.encode('utf-8')[:32].ljust(32, b'\x00')
+                   + struct.pack('<B', len(message)) + message)
+
+    def _on_bus_mail(self, topic: str, data, origin: int):
+        server_id, account_id = _BUS_MAIL.unpack_from(data)
+        if not origin or server_id != self.bus_server_id:
+            return
+        mail = json.loads(bytes(data[_BUS_MAIL.size:]))
+        mail["id"] = self.next_mail_id  # 우편 id는 프로세스마다 따로 매긴다
+        self.next_mail_id += 1
+        self._deliver_mail(account_id, mail)
+
+    # ━━━ 영속화 ━━━
+
+    def _load_world(self):
+        """기동 시 저장소에서 월드 상태 복구 (id 카운터는 저장된 최대값 다음부터)"""
+        store = self.store
+        for username, account_id, profile in store.accounts.load_raw():
+            self.accounts[username] = account_id
+            self.account_profiles[account_id] = profile
+        for account_id, _, slots in store.inventory.load_raw():
+            self.inventories[account_id] = slots
+        for account_id, _, chars in store.characters.load():
+            self.characters[account_id] = chars
+        for _, account_id, mail in sorted(store.mail.load(), key=lambda r: r[0]):
+            self._track_mail(account_id, mail)
+        for auction_id, _, listing in store.auction.load():
+            self.auction_book.add(listing)
+            self.timers.schedule("auction", auction_id, listing["expires_at"], self._expire_auction, auction_id)
+        for guild_id, _, guild in store.guild.load():
+            self.guilds[guild_id] = guild
+        for username, _, rating in store.ratings.load():
+            self.pvp_ratings[username] = rating
+        self.next_account_id = max([self.next_account_id] + [a + 1 for a in self.accounts.values()])
+        self.next_char_id = max([self.next_char_id] + [c["id"] + 1 for chars in self.characters.values() for c in chars])
+        self.next_mail_id = max([self.next_mail_id] + [m["id"] + 1 for mails in self.mails.values() for m in mails])
+        self.next_auction_id = max([self.next_auction_id] + [l["id"] + 1 for l in self.auction_book])
+        self.next_guild_id = max([self.next_guild_id] + [g + 1 for g in self.guilds])
+        report = store.load_report
+        self.log(f"Storage: loaded {len(self.accounts)} accounts, {len(self.auction_book)} auctions, "
+                 f"{sum(map(len, self.mails.values()))} mails, {len(self.guilds)} guilds from {store.path} "
+                 f"({report['source']} seq={report['snapshot_seq']} + {report['journal_batches']} journal batches, "
+                 f"{report['seconds'] * 1000:.0f} ms)", "INFO")
+        if store.last_error:
+            self.log(f"Storage: {store.last_error} — recovered from SQLite", "ERR")
+
+    def _login_account(self, session: PlayerSession, username: str):
+        """로그인 계정 결정. 저장소가 있으면 username별 고정 account_id + 저장된 재화/인벤토리 복구"""
+        if not self.store.enabled:
+            session.account_id = self.next_account_id
+            self.next_account_id += 1
+            return
+        account_id = self.accounts.get(username)
+        if account_id is None:
+            account_id = self.accounts[username] = self.next_account_id
+            self.next_account_id += 1
+            session.account_id = account_id
+            self.login_sessions[account_id] = session
+            self._save_account(session, username)
+            return
+        old = self.login_sessions.get(account_id)
+        if old is not None and old is not session:
+            self._kick_duplicate_login(old)
+        self.login_sessions[account_id] = session
+        session.account_id = account_id
+        profile = self.account_profiles.get(account_id, {})
+        if isinstance(profile, str):
+            profile = self.account_profiles[account_id] = json.loads(profile)
+        for name, value in profile.items():
+            if name in self.ACCOUNT_FIELDS and value != getattr(session, name):  # 기본값이면 하위 상태 안 만듦
+                setattr(session, name, value)
+        slots = self.inventories.get(account_id)
+        if isinstance(slots, str):
+            slots = self.inventories[account_id] = json.loads(slots)
+        if slots is not None:
+            session.inventory = Inventory.load(slots)
+
+    def _kick_duplicate_login(self, old: PlayerSession):
+        """같은 계정 두 번째 로그인: 이전 연결의 상태를 저장하고 끊는다 (새 세션은 그 저장값을 읽는다).
+
+        이후 이전 연결의 접속 종료 경로는 저장하지 않는다 (logged_in=False) — 새 세션 상태를 덮어쓰지 않게.
+        """
+        self.log(f"Duplicate login: {old.username} (account={old.account_id}) — closing previous connection", "INFO")
+        self._save_account(old)
+        self._leave_world(old)
+        old.logged_in = False
+        old.in_game = False
+        writer = old.writer
+        if writer is not None and not writer.is_closing():
+            writer.close()
+
+    def _save_now(self, *sessions: PlayerSession):
+        """재화/아이템을 옮긴 핸들러: 같은 틱에 만든 우편/경매 행과 같은 배치로 프로필/인벤토리도 저장"""
+        if self.store.enabled:
+            for s in sessions:
+                if s.logged_in:
+                    self._save_account(s)
+
+    def _save_account(self, session: PlayerSession, username: Optional[str] = None):
+        """세션의 계정 프로필/인벤토리 저장 (접속 종료, autosave, 캐릭터 재선택)"""
+        account_id = session.account_id
+        # 리스트(친구/차단)는 복사 — 직렬화는 writer 스레드에서 하므로 doc은 이 시점 값이어야 한다
+        profile = {name: list(v) if type(v) is list else v
+                   for name, v in ((name, getattr(session, name)) for name in self.ACCOUNT_FIELDS)}
+        characters = self._saved_characters(account_id)
+        if session.in_game and session.char_name:
+            characters = dict(characters)
+            characters[session.char_name] = self._character_record(session)
+        profile["characters"] = characters
+        slots = session.inventory.dump()
+        self.account_profiles[account_id] = profile
+        self.inventories[account_id] = slots
+        self.store.accounts.save(username or session.username, profile, account_id)
+        self.store.inventory.save(account_id, slots, account_id)
+
+    def _saved_characters(self, account_id: int) -> dict:
+        """저장된 캐릭터 진행도 {char_name: record}"""
+        profile = self.account_profiles.get(account_id)
+        if isinstance(profile, str):
+            profile = self.account_profiles[account_id] = json.loads(profile)
+        return profile.get("characters", {}) if profile else {}
+
+    def _character_record(self, session: PlayerSession) -> dict:
+        stats = session.stats
+        record = {name: getattr(stats, name) for name in self.CHARACTER_STAT_FIELDS}
+        record["zone_id"] = session.zone_id
+        record["pos"] = [session.pos.x, session.pos.y, session.pos.z]
+        return record
+
+    def _restore_character(self, session: PlayerSession) -> bool:
+        """CHAR_SELECT: 같은 이름 캐릭터의 저장된 레벨/경험치/스탯/위치를 세션에 (없으면 False)"""
+        record = self._saved_characters(session.account_id).get(session.char_name)
+        if record is None:
+            return False
+        stats = session.stats
+        for name in self.CHARACTER_STAT_FIELDS:
+            if name in record:
+                setattr(stats, name, record[name])
+        session.zone_id = record.get("zone_id", session.zone_id)
+        if "pos" in record:
+            session.pos = Position(*record["pos"])
+        return True
+
+    def _autosave(self, dt: float):
+        for session in self.writers.values():
+            if session.logged_in:
+                self._save_account(session)
+
+    def _snapshot(self, dt: float):
+        self.store.request_snapshot()
+
+    def close_storage(self):
+        """접속 중 세션을 저장하고 남은 변경을 모두 커밋, 스냅샷을 쓴 뒤 writer 스레드 종료"""
+        if self.store.enabled:
+            self._autosave(0.0)
+        self.store.close()
+
+    def _index_session(self, session: PlayerSession):
+        """캐릭터 선택 시 이름/계정 인덱스 등록"""
+        self.sessions_by_name.setdefault(session.char_name, {})[session.entity_id] = session
+        self.sessions_by_account[session.account_id] = session
+        self._publish_presence(session, 1)
+
+    def _unindex_session(self, session: PlayerSession):
+        """캐릭터 재선택/접속 종료 시 이름/계정 인덱스 해제"""
+        same_name = self.sessions_by_name.get(session.char_name)
+        if same_name is not None and same_name.get(session.entity_id) is session:
+            del same_name[session.entity_id]
+            if not same_name:
+                del self.sessions_by_name[session.char_name]
+        if self.sessions_by_account.get(session.account_id) is session:
+            del self.sessions_by_account[session.account_id]
+            self._publish_presence(session, 0)
+
+    def _find_session_by_name(self, name: str) -> Optional[PlayerSession]:
+        """접속 중인 캐릭터를 이름으로 찾기 (O(1))"""
+        same_name = self.sessions_by_name.get(name)
+        if not same_name:
+            return None
+        return next(iter(same_name.values()))
+
+    def _find_session_by_account(self, account_id: int) -> Optional[PlayerSession]:
+        """접속 중인 캐릭터를 계정으로 찾기 (O(1))"""
+        return self.sessions_by_account.get(account_id)
+
+    def _cancel_session_timers(self, session: PlayerSession):
+        """세션에 묶인 타이머(버프/월정액) 취소"""
+        for buff_id in {b["buff_id"] for b in session.buffs}:
+            self.timers.cancel("buff", (session.entity_id, buff_id))
+        self.timers.cancel("subscription", session.entity_id)
+
+    def _restore_session_timers(self, session: PlayerSession):
+        """핸드오프로 넘어온 세션: 버프/월정액 만료 타이머를 다시 건다"""
+        for buff_id in {b["buff_id"] for b in session.buffs}:
+            expires = min(b["expires"] for b in session.buffs if b["buff_id"] == buff_id)
+            self.timers.schedule("buff", (session.entity_id, buff_id), expires,
+                                 self._expire_buff, session, buff_id)
+        if session.subscription_active:
+            self.timers.schedule("subscription", session.entity_id, session.subscription_expires,
+                                 self._expire_subscription, session)
+
     def _on_client_disconnected(self, writer: asyncio.StreamWriter, session: PlayerSession):
+        if writer in self.writers:
+            del self.writers[writer]
+        if session.handoff is not None:
+            return  # 다른 샤드로 넘어간 세션 — 월드 정리는 _migrate가 했다
         addr = writer.get_extra_info('peername')
         self.log(f"Client disconnected: {addr} (entity={session.entity_id})", "INFO")
 
+        # 세션 정리 (못 보낸 패킷은 버린다)
+        self.outbound_stats["dropped"] += len(session.out_queue)
+        session.out_queue.clear()
+        session.out_bytes = 0
+        session.out_held.clear()
+        if session.logged_in and self.store.enabled:
+            self._save_account(session)
+        if self.login_sessions.get(session.account_id) is session:
+            del self.login_sessions[session.account_id]
+        self._leave_world(session)
+        self._ghost_touch(session)  # 인접 존 고스트 제거
+
+        try:
+            writer.close()
+        except:
+            pass
+
+    def _leave_world(self, session: PlayerSession):
+        """접속 종료/샤드 이동: 파티/거래/인덱스/타이머/AOI에서 세션을 뺀다"""
         # 파티에서 제거
         if session.party_id and session.party_id in self.parties:
             party = self.parties[session.party_id]
@@ -2464,280 +5979,576 @@ class BridgeServer:
                 partner.trade_confirmed = False
                 self._send(partner, MsgType.TRADE_RESULT, struct.pack('<B', 4))  # cancelled
 
-        # 세션 정리
+        self._unindex_session(session)
+        self._cancel_session_timers(session)
         if session.entity_id in self.sessions:
             del self.sessions[session.entity_id]
-        if writer in self.writers:
-            del self.writers[writer]
 
-        # DISAPPEAR 브로드캐스트
+        # DISAPPEAR 브로드캐스트 (시야 안)
         if session.in_game:
             disappear = struct.pack('<Q', session.entity_id)
-            self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                     MsgType.DISAPPEAR, disappear)
-
-        try:
-            writer.close()
-        except:
-            pass
+            self._broadcast_nearby(session.space, session.pos.x, session.pos.z,
+                                   session.entity_id, MsgType.DISAPPEAR, disappear)
+        self._aoi_remove(session)
 
     async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, session: PlayerSession):
-        recv_buf = bytearray()
+        framer = PacketFramer()
 
         while True:
             data = await reader.read(4096)
             if not data:
                 break
 
-            recv_buf.extend(data)
+            framer.feed(data)
 
             # 패킷 어셈블링
-            while len(recv_buf) >= PACKET_HEADER_SIZE:
-                pkt_len = struct.unpack_from('<I', recv_buf, 0)[0]
+            try:
+                for msg_type, payload in framer.packets():
+                    if self.verbose:
+                        self._log_recv(msg_type, payload)
 
-                if pkt_len < PACKET_HEADER_SIZE or pkt_len > MAX_PACKET_SIZE:
-                    self.log(f"Invalid packet length: {pkt_len}", "ERR")
-                    return  # 연결 끊기
+                    await self._dispatch(writer, session, msg_type, payload)
+                    if session.handoff is not None:
+                        break
+            except FramingError as e:
+                self.log(str(e), "ERR")
+                return  # 연결 끊기
+
+            if session.handoff is not None:
+                # 다른 샤드로: 아직 처리 안 한 바이트(framer + StreamReader 버퍼)를 연결과 같이 넘긴다.
+                # 읽기를 멈춘 뒤 EOF를 걸면 read()는 이미 받아 둔 바이트만 기다림 없이 돌려준다.
+                writer.transport.pause_reading()
+                reader.feed_eof()
+                rest = framer.take_rest() + await reader.read()
+                await self._migrate(session, writer, rest)
+                return
 
-                if len(recv_buf) < pkt_len:
-                    break  # 아직 다 안 옴
+    # ━━━ 존 샤딩: 핸드오프 / 고스트 ━━━
 
-                # 완전한 패킷
-                packet = bytes(recv_buf[:pkt_len])
-                recv_buf = recv_buf[pkt_len:]
+    def _hands_off(self, session: PlayerSession, zone_id: int, arrival: str,
+                   pos: Optional[Position] = None) -> bool:
+        """zone_id를 다른 샤드가 맡고 있으면 핸드오프를 걸고 True (읽기 루프가 _migrate로 넘긴다).
 
-                _, msg_type = parse_header(packet)
-                payload = packet[PACKET_HEADER_SIZE:]
+        arrival = 도착한 샤드가 이어서 할 일 (_arrive), pos = 도착 위치 (None이면 그대로).
+        """
+        if self.shard is None or self.shard.owns(zone_id):
+            return False
+        session.handoff = (zone_id, pos, arrival)
+        return True
+
+    async def _migrate(self, session: PlayerSession, writer, rest: bytes):
+        """핸드오프 출발: 월드에서 빼고 송신분을 다 내보낸 뒤 상태(pickle) + 소켓 fd를 대상 샤드로"""
+        zone_id, pos, arrival = session.handoff
+        transport = getattr(writer, 'transport', writer)
+        if self.sessions.get(session.entity_id) is session:  # 캐릭터 선택 직후면 아직 월드에 없음
+            self._leave_world(session)
+        queued = session.out_queue
+        queued.extend(session.out_held.values())
+        session.out_held.clear()
+        if queued and not transport.is_closing():
+            writer.write(b''.join(queued))
+            self.outbound_stats["writes"] += 1
+        session.out_queue = []
+        session.out_bytes = 0
+
+        # asyncio 버퍼에 남은 바이트는 이 프로세스만 보낼 수 있으니 커널로 다 넘어갈 때까지 기다린다
+        deadline = time.monotonic() + self.HANDOFF_DRAIN_TIMEOUT
+        while _write_buffer_size(transport) and not transport.is_closing() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        if transport.is_closing() or _write_buffer_size(transport):
+            self.shard_stats["handoffs_failed"] += 1
+            self.log(f"Handoff failed: entity={session.entity_id} send buffer not drained → disconnect", "ERR")
+            session.handoff = None
+            session.in_game = False   # 이미 월드에서 뺐다 — 접속 종료 경로는 저장/고스트 정리만
+            transport.abort()
+            return
 
-                if self.verbose:
-                    try:
-                        name = MsgType(msg_type).name
-                    except ValueError:
-                        name = f"UNKNOWN({msg_type})"
-                    self.log(f"Recv {name} ({len(payload)} bytes)", "RECV")
+        session.zone_id = zone_id
+        if pos is not None:
+            session.pos = pos
+        target = self.shard.owner(zone_id)
+        blob = pickle.dumps((arrival, session.export_state(), rest), pickle.HIGHEST_PROTOCOL)
+        fd = os.dup(transport.get_extra_info('socket').fileno())
+        self.shard.send(target, build_packet(MsgType.HANDOFF_DATA, blob), fd)
+        self.shard_stats["handoffs_out"] += 1
+        self.log(f"Handoff: {session.char_name} (entity={session.entity_id}) → shard {target} zone {zone_id}", "GAME")
+        transport.close()   # 연결은 넘긴 fd로 살아 있다
+
+    def _on_shard_packet(self, peer: int, msg_type: int, payload: bytes, fd: int):
+        if msg_type == MsgType.HANDOFF_DATA:
+            asyncio.ensure_future(self._adopt(peer, payload, fd))
+        elif msg_type == MsgType.GHOST_INFO:
+            self._apply_ghosts(_GHOST_RECORD.iter_unpack(payload))
+        else:
+            self.log(f"Shard {peer}: unexpected {_msg_name(msg_type)}", "ERR")
+
+    async def _adopt(self, peer: int, blob: bytes, fd: int):
+        """핸드오프 도착: 넘겨받은 소켓에 transport를 붙이고 세션을 복원해 월드에 넣는다"""
+        arrival, state, rest = pickle.loads(blob)
+        sock = socket.socket(fileno=fd)
+        session = PlayerSession.from_state(state)
+        self.shard_stats["handoffs_in"] += 1
+        self.log(f"Handoff in: {session.char_name} (entity={session.entity_id}) from shard {peer}"
+                 f" zone {session.zone_id}", "GAME")
+        loop = asyncio.get_running_loop()
+        if self.transport == "protocol":
+            await loop.connect_accepted_socket(lambda: BridgeProtocol(self, (session, arrival, rest)), sock=sock)
+            return
+        reader = asyncio.StreamReader()
+        if rest:
+            reader.feed_data(rest)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock=sock)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        session.writer = writer
+        self.writers[writer] = session
+        self._arrive(session, arrival)
+        await self._serve(reader, writer, session)
 
-                await self._dispatch(writer, session, msg_type, payload)
+    def _arrive(self, session: PlayerSession, arrival: str):
+        """핸드오프 도착 동작: 출발 샤드의 핸들러가 넘긴 나머지 절반"""
+        if arrival == "enter_game":
+            self._enter_world(session)
+        else:
+            self.sessions[session.entity_id] = session
+            self._index_session(session)
+            if arrival == "zone_enter":
+                self._zone_entered(session)
+            else:
+                self._zone_transferred(session)
+        self._restore_session_timers(session)
+
+    def _ghost_touch(self, session: PlayerSession):
+        """다음 고스트 틱에 이 세션의 경계 고스트를 다시 계산"""
+        if self.ghosts_enabled:
+            self._ghost_dirty[session.entity_id] = session
+
+    def _sync_ghosts(self, dt: float):
+        """고스트 틱: 움직이거나 나간 세션의 고스트를 인접 존 소유 샤드로 (샤드별 한 묶음)"""
+        dirty = self._ghost_dirty
+        if not dirty:
+            return
+        self._ghost_dirty = {}
+        shard = self.shard
+        local = shard.index if shard is not None else 0
+        sessions = self.sessions
+        batches: Dict[int, list] = {}
+        for eid, s in dirty.items():
+            if s.handoff is not None:
+                continue  # 도착한 샤드가 이어서 맡는다
+            pos = s.pos
+            target = ghost_zone_for(s.zone_id, pos.x, pos.z) if s.in_game and sessions.get(eid) is s else 0
+            if target:
+                target = channel_space(target, s.channel_id)  # 인접 존의 같은 번호 채널에 비춘다
+            old = s.ghost_zone
+            if old and old != target:
+                batches.setdefault(shard.owner(space_zone(old)) if shard else local, []).append(
+                    (eid, old, 0, 0.0, 0.0, 0.0))
+            if target:
+                batches.setdefault(shard.owner(space_zone(target)) if shard else local, []).append(
+                    (eid, target, s.zone_id, pos.x, pos.y, pos.z))
+            s.ghost_zone = target
+        for owner, records in batches.items():
+            self.shard_stats["ghost_updates"] += len(records)
+            if owner == local:
+                self._apply_ghosts(records)
+            else:
+                for pkt in pack_ghost_records(records):
+                    shard.send(owner, pkt)
+
+    def _apply_ghosts(self, records):
+        """고스트 레코드 반영: 그 존 시야 안 플레이어에게 APPEAR / MOVE_BROADCAST / DISAPPEAR.
+
+        셀이 바뀌면 _aoi_cross처럼 시야에 새로 들어온 플레이어는 APPEAR, 벗어난 플레이어는
+        DISAPPEAR, 계속 보는 플레이어만 MOVE_BROADCAST.
+        """
+        ghosts = self.ghosts
+        sessions = self.sessions
+        st = self.aoi_stats
+        for eid, space, origin, x, y, z in records:
+            zone_ghosts = ghosts.get(space)
+            if not origin:
+                ghost = zone_ghosts.pop(eid, None) if zone_ghosts else None
+                if ghost is not None:
+                    self._broadcast_nearby(space, ghost[1], ghost[3], 0,
+                                           MsgType.DISAPPEAR, struct.pack('<Q', eid))
+                continue
+            if zone_ghosts is None:
+                zone_ghosts = ghosts[space] = {}
+            old = zone_ghosts.get(eid)
+            zone_ghosts[eid] = (origin, x, y, z)
+            if old is not None and old[1:] == (x, y, z):
+                continue
+            move = struct.pack('<Qfff', eid, x, y, z)
+            if old is None:
+                self._broadcast_nearby(space, x, z, 0, MsgType.APPEAR, move)
+                continue
+            grid = self.player_grids.get(space)
+            if grid is None:
+                continue
+            old_cell = grid.cell_of(old[1], old[3])
+            new_cell = grid.cell_of(x, z)
+            if old_cell == new_cell:
+                self._broadcast_nearby(space, x, z, 0, MsgType.MOVE_BROADCAST, move)
+                continue
+            cells = grid.cells
+            old_view = set(grid.view_cells(old_cell))
+            new_view = set(grid.view_cells(new_cell))
+            st["disappear"] += self._multicast([sessions[v] for c in old_view - new_view for v in cells.get(c, ())],
+                                               MsgType.DISAPPEAR, struct.pack('<Q', eid))
+            st["appear"] += self._multicast([sessions[v] for c in new_view - old_view for v in cells.get(c, ())],
+                                            MsgType.APPEAR, move)
+            self._multicast([sessions[v] for c in old_view & new_view for v in cells.get(c, ())],
+                            MsgType.MOVE_BROADCAST, move)
+
+    def ghost_count(self) -> int:
+        return sum(len(g) for g in self.ghosts.values())
+
+    def _log_recv(self, msg_type: int, payload):
+        name = _msg_name(msg_type)
+        self.log(f"Recv {name} ({len(payload)} bytes)", "RECV")
 
     async def _dispatch(self, writer: asyncio.StreamWriter, session: PlayerSession,
                          msg_type: int, payload: bytes):
-        handlers = {
-            MsgType.ECHO: self._on_echo,
-            MsgType.PING: self._on_ping,
-            MsgType.STATS: self._on_stats,
-            MsgType.LOGIN: self._on_login,
-            MsgType.CHAR_LIST_REQ: self._on_char_list_req,
-            MsgType.CHAR_SELECT: self._on_char_select,
-            MsgType.MOVE: self._on_move,
-            MsgType.POS_QUERY: self._on_pos_query,
-            MsgType.CHANNEL_JOIN: self._on_channel_join,
-            MsgType.ZONE_ENTER: self._on_zone_enter,
-            MsgType.ZONE_TRANSFER_REQ: self._on_zone_transfer,
-            MsgType.STAT_QUERY: self._on_stat_query,
-            MsgType.STAT_ADD_EXP: self._on_stat_add_exp,
-            MsgType.STAT_TAKE_DMG: self._on_stat_take_dmg,
-            MsgType.STAT_HEAL: self._on_stat_heal,
-            MsgType.ATTACK_REQ: self._on_attack_req,
-            MsgType.RESPAWN_REQ: self._on_respawn_req,
-            MsgType.SKILL_LIST_REQ: self._on_skill_list_req,
-            MsgType.SKILL_USE: self._on_skill_use,
-            MsgType.SKILL_LEVEL_UP: self._on_skill_level_up,
-            MsgType.PARTY_CREATE: self._on_party_create,
-            MsgType.PARTY_INVITE: self._on_party_invite,
-            MsgType.PARTY_ACCEPT: self._on_party_accept,
-            MsgType.PARTY_LEAVE: self._on_party_leave,
-            MsgType.PARTY_KICK: self._on_party_kick,
-            MsgType.INVENTORY_REQ: self._on_inventory_req,
-            MsgType.ITEM_ADD: self._on_item_add,
-            MsgType.ITEM_USE: self._on_item_use,
-            MsgType.ITEM_EQUIP: self._on_item_equip,
-            MsgType.ITEM_UNEQUIP: self._on_item_unequip,
-            MsgType.BUFF_LIST_REQ: self._on_buff_list_req,
-            MsgType.BUFF_APPLY_REQ: self._on_buff_apply,
-            MsgType.BUFF_REMOVE_REQ: self._on_buff_remove,
-            MsgType.LOOT_ROLL_REQ: self._on_loot_roll,
-            MsgType.QUEST_LIST_REQ: self._on_quest_list_req,
-            MsgType.QUEST_ACCEPT: self._on_quest_accept,
-            MsgType.QUEST_PROGRESS: self._on_quest_progress,
-            MsgType.QUEST_COMPLETE: self._on_quest_complete,
-            MsgType.CHAT_SEND: self._on_chat_send,
-            MsgType.WHISPER_SEND: self._on_whisper_send,
-            MsgType.SHOP_OPEN: self._on_shop_open,
-            MsgType.SHOP_BUY: self._on_shop_buy,
-            MsgType.SHOP_SELL: self._on_shop_sell,
-            MsgType.CONFIG_QUERY: self._on_config_query,
-            MsgType.ADMIN_RELOAD: self._on_admin_reload,
-            MsgType.ADMIN_GET_CONFIG: self._on_admin_get_config,
-            MsgType.SPATIAL_QUERY_REQ: self._on_spatial_query,
-            MsgType.GHOST_QUERY: self._on_ghost_query,
-            MsgType.GUILD_CREATE: self._on_guild_create,
-            MsgType.GUILD_DISBAND: self._on_guild_disband,
-            MsgType.GUILD_INVITE: self._on_guild_invite,
-            MsgType.GUILD_ACCEPT: self._on_guild_accept,
-            MsgType.GUILD_LEAVE: self._on_guild_leave,
-            MsgType.GUILD_KICK: self._on_guild_kick,
-            MsgType.GUILD_INFO_REQ: self._on_guild_info_req,
-            MsgType.GUILD_LIST_REQ: self._on_guild_list_req,
-            MsgType.TRADE_REQUEST: self._on_trade_request,
-            MsgType.TRADE_ACCEPT: self._on_trade_accept,
-            MsgType.TRADE_DECLINE: self._on_trade_decline,
-            MsgType.TRADE_ADD_ITEM: self._on_trade_add_item,
-            MsgType.TRADE_ADD_GOLD: self._on_trade_add_gold,
-            MsgType.TRADE_CONFIRM: self._on_trade_confirm,
-            MsgType.TRADE_CANCEL: self._on_trade_cancel,
-            MsgType.MAIL_SEND: self._on_mail_send,
-            MsgType.MAIL_LIST_REQ: self._on_mail_list_req,
-            MsgType.MAIL_READ: self._on_mail_read,
-            MsgType.MAIL_CLAIM: self._on_mail_claim,
-            MsgType.MAIL_DELETE: self._on_mail_delete,
-            MsgType.SERVER_LIST_REQ: self._on_server_list_req,
-            MsgType.CHARACTER_LIST_REQ: self._on_character_list_req,
-            MsgType.CHARACTER_CREATE: self._on_character_create,
-            MsgType.CHARACTER_DELETE: self._on_character_delete,
-            MsgType.TUTORIAL_STEP_COMPLETE: self._on_tutorial_step_complete,
-            MsgType.NPC_INTERACT: self._on_npc_interact,
-            MsgType.ENHANCE_REQ: self._on_enhance_req,
-            MsgType.MATCH_ENQUEUE: self._on_match_enqueue,
-            MsgType.MATCH_DEQUEUE: self._on_match_dequeue,
-            MsgType.MATCH_ACCEPT: self._on_match_accept,
-            MsgType.INSTANCE_CREATE: self._on_instance_create,
-            MsgType.INSTANCE_ENTER: self._on_instance_enter,
-            MsgType.INSTANCE_LEAVE: self._on_instance_leave,
-            MsgType.PVP_QUEUE_REQ: self._on_pvp_queue_req,
-            MsgType.PVP_QUEUE_CANCEL: self._on_pvp_queue_cancel,
-            MsgType.PVP_MATCH_ACCEPT: self._on_pvp_match_accept,
-            MsgType.PVP_ATTACK: self._on_pvp_attack,
-            MsgType.RAID_ATTACK: self._on_raid_attack,
-            # S041: Crafting
-            MsgType.CRAFT_LIST_REQ: self._on_craft_list_req,
-            MsgType.CRAFT_EXECUTE: self._on_craft_execute,
-            MsgType.GATHER_START: self._on_gather_start,
-            MsgType.COOK_EXECUTE: self._on_cook_execute,
-            MsgType.ENCHANT_REQ: self._on_enchant_req,
-            # Auction House
-            MsgType.AUCTION_LIST_REQ: self._on_auction_list_req,
-            MsgType.AUCTION_REGISTER: self._on_auction_register,
-            MsgType.AUCTION_BUY: self._on_auction_buy,
-            MsgType.AUCTION_BID: self._on_auction_bid,
-            MsgType.TRIPOD_LIST_REQ: self._on_tripod_list_req,
-            MsgType.TRIPOD_EQUIP: self._on_tripod_equip,
-            MsgType.SCROLL_DISCOVER: self._on_scroll_discover,
-            MsgType.BOUNTY_LIST_REQ: self._on_bounty_list_req,
-            MsgType.BOUNTY_ACCEPT: self._on_bounty_accept,
-            MsgType.BOUNTY_COMPLETE: self._on_bounty_complete,
-            MsgType.BOUNTY_RANKING_REQ: self._on_bounty_ranking_req,
-            MsgType.DAILY_QUEST_LIST_REQ: self._on_daily_quest_list_req,
-            MsgType.WEEKLY_QUEST_REQ: self._on_weekly_quest_req,
-            MsgType.REPUTATION_QUERY: self._on_reputation_query,
-            MsgType.TITLE_LIST_REQ: self._on_title_list_req,
-            MsgType.TITLE_EQUIP: self._on_title_equip,
-            MsgType.COLLECTION_QUERY: self._on_collection_query,
-            MsgType.JOB_CHANGE_REQ: self._on_job_change_req,
-            MsgType.GEM_EQUIP: self._on_gem_equip,
-            MsgType.GEM_FUSE: self._on_gem_fuse,
-            MsgType.ENGRAVING_LIST_REQ: self._on_engraving_list_req,
-            MsgType.ENGRAVING_EQUIP: self._on_engraving_equip,
-            MsgType.TRANSCEND_REQ: self._on_transcend_req,
-            MsgType.FRIEND_REQUEST: self._on_friend_request,
-            MsgType.FRIEND_ACCEPT: self._on_friend_accept,
-            MsgType.FRIEND_REJECT: self._on_friend_reject,
-            MsgType.FRIEND_LIST_REQ: self._on_friend_list_req,
-            MsgType.BLOCK_PLAYER: self._on_block_player,
-            MsgType.BLOCK_LIST_REQ: self._on_block_list_req,
-            MsgType.PARTY_FINDER_LIST_REQ: self._on_party_finder_list_req,
-            MsgType.PARTY_FINDER_CREATE: self._on_party_finder_create,
-            MsgType.REPAIR_REQ: self._on_repair_req,
-            MsgType.REROLL_REQ: self._on_reroll_req,
-            MsgType.DURABILITY_QUERY: self._on_durability_query,
-            MsgType.BATTLEGROUND_QUEUE: self._on_battleground_queue,
-            MsgType.BATTLEGROUND_SCORE: self._on_battleground_score,
-            MsgType.GUILD_WAR_DECLARE: self._on_guild_war_declare,
-            MsgType.CURRENCY_QUERY: self._on_currency_query,
-            MsgType.TOKEN_SHOP_LIST: self._on_token_shop_list,
-            MsgType.TOKEN_SHOP_BUY: self._on_token_shop_buy,
-            MsgType.SECRET_REALM_ENTER: self._on_secret_realm_enter,
-            MsgType.SECRET_REALM_COMPLETE: self._on_secret_realm_complete,
-            MsgType.SECRET_REALM_FAIL: self._on_secret_realm_fail,
-            MsgType.MENTOR_SEARCH: self._on_mentor_search,
-            MsgType.MENTOR_REQUEST: self._on_mentor_request,
-            MsgType.MENTOR_ACCEPT: self._on_mentor_accept,
-            MsgType.MENTOR_QUEST_LIST: self._on_mentor_quest_list,
-            MsgType.MENTOR_GRADUATE: self._on_mentor_graduate,
-            MsgType.MENTOR_SHOP_LIST: self._on_mentor_shop_list,
-            MsgType.MENTOR_SHOP_BUY: self._on_mentor_shop_buy,
-            # TASK 11: Cash Shop / BP / Event
-            MsgType.CASH_SHOP_LIST_REQ: self._on_cash_shop_list,
-            MsgType.CASH_SHOP_BUY: self._on_cash_shop_buy,
-            MsgType.BATTLEPASS_INFO_REQ: self._on_battlepass_info,
-            MsgType.BATTLEPASS_CLAIM: self._on_battlepass_claim,
-            MsgType.EVENT_LIST_REQ: self._on_event_list,
-            MsgType.EVENT_CLAIM: self._on_event_claim,
-            MsgType.SUBSCRIPTION_INFO: self._on_subscription_info,
-            MsgType.SUBSCRIPTION_BUY: self._on_subscription_buy,
-            # TASK 12: World System
-            MsgType.WEATHER_INFO_REQ: self._on_weather_info,
-            MsgType.TELEPORT_REQ: self._on_teleport_req,
-            MsgType.WAYPOINT_DISCOVER: self._on_waypoint_discover,
-            MsgType.DESTROY_OBJECT: self._on_destroy_object,
-            MsgType.INTERACT_OBJECT: self._on_interact_object,
-            MsgType.MOUNT_SUMMON: self._on_mount_summon,
-            # TASK 13: Login Reward / Reset
-            MsgType.LOGIN_REWARD_REQ: self._on_login_reward_req,
-            MsgType.LOGIN_REWARD_CLAIM: self._on_login_reward_claim,
-            MsgType.CONTENT_UNLOCK_QUERY: self._on_content_unlock_query,
-            # TASK 14: Story / Dialog
-            MsgType.DIALOG_CHOICE: self._on_dialog_choice,
-            MsgType.CUTSCENE_TRIGGER: self._on_cutscene_trigger,
-            MsgType.CHAPTER_PROGRESS_REQ: self._on_chapter_progress_req,
-            MsgType.MAIN_QUEST_DATA_REQ: self._on_main_quest_data_req,
-        }
+        handler = self._handlers.get(msg_type)
+        if handler is None:
+            name = _msg_name(msg_type)
+            self.log(f"Unhandled: {name}", "ERR")
+            return
 
-        handler = handlers.get(msg_type)
-        if handler:
+        if type(payload) is memoryview and msg_type not in self._zero_copy:
+            payload = bytes(payload)
+
+        t0 = time.perf_counter()
+        try:
             await handler(session, payload)
-        else:
-            try:
-                name = MsgType(msg_type).name
-            except ValueError:
-                name = f"UNKNOWN({msg_type})"
-            self.log(f"Unhandled: {name}", "ERR")
+        finally:
+            elapsed = time.perf_counter() - t0
+            st = self.handler_stats.get(msg_type)
+            if st is None:
+                st = self.handler_stats[msg_type] = [0, 0.0, 0.0]
+            st[0] += 1
+            st[1] += elapsed
+            if elapsed > st[2]:
+                st[2] = elapsed
+            if self.flush_policy == "dispatch" and self._dirty_sessions:
+                self.flush_outbound()
+
+    def handler_stats_report(self, top: int = 0) -> List[dict]:
+        """핸들러별 호출 통계. 누적 시간 내림차순, top > 0이면 상위 N개만."""
+        rows = []
+        for msg_type, (calls, total, worst) in self.handler_stats.items():
+            name = _msg_name(msg_type)
+            rows.append({
+                "msg_type": msg_type,
+                "name": name,
+                "calls": calls,
+                "total_ms": total * 1000.0,
+                "avg_us": total / calls * 1e6 if calls else 0.0,
+                "max_us": worst * 1e6,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows[:top] if top > 0 else rows
 
     def _send(self, session: PlayerSession, msg_type: int, payload: bytes = b''):
-        if session.writer and not session.writer.is_closing():
-            pkt = build_packet(msg_type, payload)
-            session.writer.write(pkt)
-            if self.verbose:
-                try:
-                    name = MsgType(msg_type).name
-                except ValueError:
-                    name = f"UNKNOWN({msg_type})"
-                self.log(f"Send {name} ({len(payload)} bytes)", "SEND")
+        writer = session.writer
+        if writer and not writer.is_closing():
+            self._send_packet(session, writer, msg_type, build_packet(msg_type, payload))
+
+    def _send_msg(self, session: PlayerSession, message: Message, *values):
+        """스키마 메시지를 헤더까지 한 번에 인코딩해서 전송"""
+        writer = session.writer
+        if writer and not writer.is_closing():
+            self._send_packet(session, writer, message.msg_type, message.packet(*values))
+
+    def _send_cached(self, session: PlayerSession, key: tuple, build):
+        """정적 응답 전송: key = (msg_type, 파라미터...), 캐시에 없을 때만 build() -> payload"""
+        writer = session.writer
+        if writer and not writer.is_closing():
+            self._send_packet(session, writer, key[0], self.response_cache.packet(key, build))
+
+    def _send_packet(self, session: PlayerSession, writer, msg_type: int, pkt):
+        """헤더까지 만든 패킷 전송 (혼잡 제어 + 큐잉)"""
+        self._deliver(session, writer, msg_type, pkt)
+        if self.verbose:
+            self.log(f"Send {_msg_name(msg_type)} ({len(pkt) - PACKET_HEADER_SIZE} bytes)", "SEND")
+
+    def _multicast(self, targets, msg_type: int, payload: bytes, exclude: int = 0) -> int:
+        """같은 패킷을 여러 세션에 전송. 헤더는 한 번만 붙이고 모든 transport에 같은 bytes를 쓴다.
+
+        targets는 미리 모아 둔 수신자 세션 (zone/파티/길드/인스턴스 멤버). exclude는 건너뛸 entity_id.
+        보낸 세션 수를 돌려준다.
+        """
+        pkt = build_packet(msg_type, payload)
+        deliver = self._deliver
+        sent = 0
+        for s in targets:
+            writer = s.writer
+            if writer is None or s.entity_id == exclude or writer.is_closing():
+                continue
+            deliver(s, writer, msg_type, pkt)
+            sent += 1
+        if self.verbose and sent:
+            self.log(f"Multicast {_msg_name(msg_type)} ({len(payload)} bytes) -> {sent}", "SEND")
+        return sent
+
+    def _online(self, entity_ids):
+        """entity_id 목록 중 접속 중인 세션만"""
+        sessions = self.sessions
+        for eid in entity_ids:
+            s = sessions.get(eid)
+            if s is not None:
+                yield s
+
+    def _deliver(self, session: PlayerSession, writer, msg_type: int, pkt):
+        buffered = _write_buffer_size(writer)
+        pending = session.out_bytes + buffered
+        if session.congested or pending >= self.OUT_HIGH_WATERMARK:
+            # hard limit은 transport 버퍼만: out_queue는 이번 루프에 우리가 쌓은 것 (큰 burst일 수 있음)
+            if buffered >= self.OUT_HARD_LIMIT:
+                self._disconnect_slow_consumer(session, buffered)
+                return
+            if not session.congested:
+                self._mark_congested(session)
+            if msg_type in self.SHEDDABLE_MSG_TYPES:
+                key = (msg_type, bytes(pkt[PACKET_HEADER_SIZE:PACKET_HEADER_SIZE + 8]))
+                if key in session.out_held:
+                    session.out_shed += 1
+                    self.outbound_stats["shed"] += 1
+                session.out_held[key] = pkt
+                return
+        if session.out_held and msg_type in self.ENTITY_ORDERED_MSG_TYPES:
+            self._release_held(session, writer, msg_type,
+                               bytes(pkt[PACKET_HEADER_SIZE:PACKET_HEADER_SIZE + 8]))
+        self._enqueue(session, writer, pkt)
+
+    def _release_held(self, session: PlayerSession, writer, msg_type: int, eid: bytes):
+        """엔티티 패킷 앞에서 그 엔티티의 보류 이동 패킷 정리 (DISAPPEAR 뒤에 MOVE가 가지 않게)"""
+        held = session.out_held
+        for move_type in self.SHEDDABLE_MSG_TYPES:
+            pkt = held.pop((move_type, eid), None)
+            if pkt is None:
+                continue
+            if msg_type == MsgType.DISAPPEAR:
+                session.out_shed += 1
+                self.outbound_stats["shed"] += 1
+            else:
+                self._enqueue(session, writer, pkt)
+
+    def _enqueue(self, session: PlayerSession, writer, pkt: bytes):
+        ob = self.outbound_stats
+        ob["packets"] += 1
+        ob["bytes"] += len(pkt)
+        if self.flush_policy == "immediate":
+            writer.write(pkt)
+            ob["writes"] += 1
+            return
+        q = session.out_queue
+        if not q:
+            self._dirty_sessions.append(session)
+            if self._flush_handle is None:
+                self._schedule_flush()
+        q.append(pkt)
+        session.out_bytes += len(pkt)
+
+    def _mark_congested(self, session: PlayerSession):
+        session.congested = True
+        self._congested_sessions.append(session)
+        if self._congestion_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._congestion_handle = loop.call_later(
+                self.CONGESTION_CHECK_INTERVAL, self._check_congestion)
+
+    def _check_congestion(self):
+        """혼잡 세션: low watermark 아래면 모아 둔 최신 이동 패킷을 보내고 해제."""
+        self._congestion_handle = None
+        still = []
+        for s in self._congested_sessions:
+            writer = s.writer
+            if writer is None or writer.is_closing():
+                s.congested = False
+                s.out_held.clear()
+                continue
+            buffered = _write_buffer_size(writer)
+            pending = s.out_bytes + buffered
+            if buffered >= self.OUT_HARD_LIMIT:
+                self._disconnect_slow_consumer(s, buffered)
+            elif pending <= self.OUT_LOW_WATERMARK:
+                s.congested = False
+                held = s.out_held
+                s.out_held = {}
+                for pkt in held.values():
+                    self._enqueue(s, writer, pkt)
+            else:
+                still.append(s)
+        self._congested_sessions = still
+        if still:
+            self._congestion_handle = asyncio.get_running_loop().call_later(
+                self.CONGESTION_CHECK_INTERVAL, self._check_congestion)
+
+    def _disconnect_slow_consumer(self, session: PlayerSession, pending: int):
+        """hard limit 초과: 버퍼를 버리고 끊는다. 세션 정리는 연결 종료 경로가 한다."""
+        self.log(f"Slow consumer: entity={session.entity_id} buffered={pending} bytes → disconnect", "ERR")
+        self.outbound_stats["slow_disconnects"] += 1
+        self.outbound_stats["dropped"] += len(session.out_queue)
+        session.out_queue.clear()
+        session.out_bytes = 0
+        session.out_held.clear()
+        session.congested = False
+        transport = getattr(session.writer, 'transport', session.writer)
+        transport.abort()
+
+    def outbound_buffer_report(self) -> dict:
+        """세션 송신 버퍼 현황 (STATS용)"""
+        total = peak = 0
+        for s in self.writers.values():
+            if s.writer is None:
+                continue
+            n = s.out_bytes + _write_buffer_size(s.writer)
+            total += n
+            if n > peak:
+                peak = n
+        return {"buffered": total, "max_session": peak,
+                "congested": len(self._congested_sessions),
+                "shed": self.outbound_stats["shed"],
+                "slow_disconnects": self.outbound_stats["slow_disconnects"]}
+
+    def _schedule_flush(self):
+        # dispatch 정책이어도 핸들러 밖(틱 루프, call_later)에서 보낸 패킷은 여기서 나간다
+        if self._tick_flush:
+            return  # 틱 끝의 "flush" 시스템이 내보낸다
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_outbound()
+            return
+        self._flush_handle = loop.call_soon(self.flush_outbound)
+
+    def flush_outbound(self):
+        """대기 중인 패킷을 세션마다 write 한 번으로 내보낸다."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        dirty = self._dirty_sessions
+        if not dirty:
+            return
+        self._dirty_sessions = []
+        writes = 0
+        for s in dirty:
+            q = s.out_queue
+            if not q:
+                continue
+            s.out_queue = []
+            s.out_bytes = 0
+            writer = s.writer
+            if writer is None or writer.is_closing():
+                self.outbound_stats["dropped"] += len(q)
+                continue
+            writer.write(q[0] if len(q) == 1 else b''.join(q))
+            writes += 1
+        self.outbound_stats["writes"] += writes
+
+    def outbound_stats_report(self) -> dict:
+        ob = self.outbound_stats
+        queued = sum(len(s.out_queue) for s in self._dirty_sessions)
+        saved = ob["packets"] - queued - ob["dropped"] - ob["writes"]
+        return {
+            "policy": self.flush_policy,
+            "packets": ob["packets"],
+            "bytes": ob["bytes"],
+            "writes": ob["writes"],
+            "syscalls_saved": max(saved, 0),
+            "bytes_saved": max(saved, 0) * self.TCPIP_HEADER_BYTES,
+        }
 
     def _broadcast_to_zone(self, zone_id: int, exclude_entity: int,
-                            msg_type: int, payload: bytes):
-        for eid, s in self.sessions.items():
-            if s.zone_id == zone_id and eid != exclude_entity and s.in_game:
-                self._send(s, msg_type, payload)
+                            msg_type: int, payload: bytes, channel: int = 0):
+        """존 플레이어 전체. channel > 0이면 그 채널만 (존 채팅), 0이면 열린 채널 전부 (존 공지)"""
+        zone_players = self.zone_players
+        sessions = self.sessions
+        targets = []
+        for ch in (channel,) if channel else (1, *self.zone_channels.get(zone_id, ())):
+            members = zone_players.get(channel_space(zone_id, ch))
+            if members:
+                targets += [sessions[eid] for eid in members if eid != exclude_entity]
+        if targets:
+            self._multicast(targets, msg_type, payload)
 
     def _broadcast_to_all(self, msg_type: int, payload: bytes, exclude: int = 0):
-        for eid, s in self.sessions.items():
-            if eid != exclude and s.in_game:
-                self._send(s, msg_type, payload)
+        self._multicast([s for s in self.sessions.values() if s.in_game], msg_type, payload, exclude)
 
     # ━━━ 핸들러: 기본 ━━━
 
+    @packet_handler(MsgType.ECHO)
     async def _on_echo(self, session: PlayerSession, payload: bytes):
         self._send(session, MsgType.ECHO, payload)
 
+    @packet_handler(MsgType.PING, zero_copy=True)
     async def _on_ping(self, session: PlayerSession, payload: bytes):
         self._send(session, MsgType.PING, b'PONG')
 
+    @packet_handler(MsgType.STATS)
     async def _on_stats(self, session: PlayerSession, payload: bytes):
         entity_count = len(self.sessions) + len(self.monsters)
         stats_str = f"entity_count={entity_count}|sessions={len(self.sessions)}|monsters={len(self.monsters)}|uptime={int(time.time()-self.start_time)}s"
+        # 핸들러 비용 상위 3개: NAME:calls:avg_us
+        dispatched = sum(st[0] for st in self.handler_stats.values())
+        hot = ",".join(f"{r['name']}:{r['calls']}:{r['avg_us']:.1f}" for r in self.handler_stats_report(top=3))
+        stats_str += f"|dispatched={dispatched}|hot_handlers={hot}"
+        ob = self.outbound_stats_report()
+        stats_str += (f"|out_policy={ob['policy']}|out_packets={ob['packets']}|out_writes={ob['writes']}"
+                      f"|syscalls_saved={ob['syscalls_saved']}|bytes_saved={ob['bytes_saved']}")
+        bp = self.outbound_buffer_report()
+        stats_str += (f"|out_buffered={bp['buffered']}|out_max_session={bp['max_session']}"
+                      f"|congested={bp['congested']}|shed={bp['shed']}|slow_disconnects={bp['slow_disconnects']}")
+        aoi = self.aoi_stats
+        stats_str += (f"|aoi_radius={self.view_radius:g}|aoi_sent={aoi['sent']}|aoi_skipped={aoi['skipped']}"
+                      f"|aoi_bytes_saved={aoi['bytes_saved']}|aoi_appear={aoi['appear']}|aoi_disappear={aoi['disappear']}")
+        # 게임 틱: 시스템별 NAME:runs:p50_us:p99_us
+        tk = self.ticker.report()
+        systems = ",".join(f"{r['name']}:{r['runs']}:{r['p50_us']:.0f}:{r['p99_us']:.0f}" for r in tk["systems"])
+        stats_str += (f"|tick_rate={tk['tick_rate']:g}|ticks={tk['ticks']}|tick_overruns={tk['overruns']}"
+                      f"|tick_skipped={tk['skipped']}|tick_errors={tk['errors']}|tick_p99_us={tk['p99_us']:.0f}|tick_systems={systems}")
+        # 타이머 휠: 카테고리별 대기 수 CATEGORY:n
+        pending = ",".join(f"{c}:{n}" for c, n in self.timers.report().items())
+        stats_str += f"|timers_pending={len(self.timers)}|timers_fired={self.timers.fired}|timers={pending}"
+        if self.store.enabled:
+            db = self.store.stats
+            stats_str += (f"|db_dirty={len(self.store.dirty)}|db_backlog={self.store.backlog}|db_commits={db['commits']}"
+                          f"|db_rows={db['rows']}|db_errors={db['errors']}|db_commit_ms_max={db['commit_ms_max']:.1f}"
+                          f"|db_load_ms={self.store.load_report['seconds'] * 1000:.0f}|db_snapshots={db['snapshots']}"
+                          f"|db_snapshot_ms={db['snapshot_ms']:.0f}|db_journal_bytes={db['journal_bytes']}")
+        rc = self.response_cache.report()
+        stats_str += (f"|resp_cache_hits={rc['hits']}|resp_cache_misses={rc['misses']}"
+                      f"|resp_cache_entries={rc['entries']}|resp_cache_invalidations={rc['invalidations']}")
+        if self.shard is not None or self.ghosts_enabled:
+            sh = self.shard_stats
+            stats_str += (f"|shard={self.shard.index if self.shard else 0}|shards={self.shard.count if self.shard else 1}"
+                          f"|handoffs_out={sh['handoffs_out']}|handoffs_in={sh['handoffs_in']}"
+                          f"|handoffs_failed={sh['handoffs_failed']}|ghosts={self.ghost_count()}"
+                          f"|ghost_updates={sh['ghost_updates']}")
+        cs = self.channel_stats
+        busiest = sorted(self.zone_players.items(), key=lambda kv: len(kv[1]), reverse=True)[:5]
+        stats_str += (f"|channel_capacity={self.channel_capacity}|extra_channels={sum(map(len, self.zone_channels.values()))}"
+                      f"|channel_opened={cs['opened']}|channel_collapsed={cs['collapsed']}|channel_switches={cs['switches']}"
+                      f"|channel_refused={cs['refused']}|channel_overflow={cs['overflow']}|server_full={cs['server_full']}"
+                      f"|channel_load={','.join(f'{space_zone(k)}.{space_channel(k)}:{len(v)}' for k, v in busiest)}")
+        bus = self.bus.report(top=3)
+        stats_str += (f"|bus_server_id={self.bus_server_id}|bus_published={bus['published']}"
+                      f"|bus_fanout={bus['fanout']}|bus_dropped={bus['dropped']}|bus_remote_players={len(self.remote_players)}"
+                      f"|bus_topics={','.join(f'{t}:{p}:{f}:{d}' for t, p, f, d in bus['hot'])}")
+        if self.gate is not None:
+            gs = self.gate_stats
+            stats_str += (f"|gate={self.gate[0]}:{self.gate[1]}|gate_registered={gs['registered']}"
+                          f"|gate_heartbeats={gs['heartbeats']}|gate_errors={gs['errors']}")
         self._send(session, MsgType.STATS, stats_str.encode('utf-8'))
 
     # ━━━ 핸들러: 로그인 ━━━
 
+    @packet_handler(MsgType.LOGIN)
     async def _on_login(self, session: PlayerSession, payload: bytes):
         if len(payload) < 2:
             self._send(session, MsgType.LOGIN_RESULT, struct.pack('<BI', 1, 0))  # FAIL=1
@@ -2748,44 +6559,52 @@ class BridgeServer:
             self._send(session, MsgType.LOGIN_RESULT, struct.pack('<BI', 1, 0))  # FAIL=1
             return
 
+        if session.logged_in:
+            # 같은 연결에서 다시 LOGIN: 저장된 프로필로 살아 있는 세션을 덮어쓰지 않는다
+            self._send(session, MsgType.LOGIN_RESULT, struct.pack('<BI', 1, 0))  # FAIL=1
+            return
+
         username = payload[1:1+name_len].decode('utf-8', errors='replace')
         pw_len = payload[1+name_len]
         password = payload[2+name_len:2+name_len+pw_len].decode('utf-8', errors='replace')
 
         # 간단한 로그인 (항상 성공)
-        session.account_id = self.next_account_id
-        self.next_account_id += 1
+        self._login_account(session, username)
         session.username = username
         session.logged_in = True
 
         self.log(f"Login: {username} (account={session.account_id})", "GAME")
         self._send(session, MsgType.LOGIN_RESULT, struct.pack('<BI', 0, session.account_id))  # SUCCESS=0
 
+    @packet_handler(MsgType.CHAR_LIST_REQ)
     async def _on_char_list_req(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHAR_LIST_RESP, struct.pack('<B', 0))
             return
 
-        count = len(CHARACTER_TEMPLATES)
-        buf = struct.pack('<B', count)
-        for ch in CHARACTER_TEMPLATES:
-            name_bytes = ch["name"].encode('utf-8')[:32].ljust(32, b'\x00')
-            buf += struct.pack('<I', ch["id"])
-            buf += name_bytes
-            buf += struct.pack('<II', ch["level"], ch["job"])
-        self._send(session, MsgType.CHAR_LIST_RESP, buf)
+        self._send_cached(session, (MsgType.CHAR_LIST_RESP,), lambda: Schema.CHAR_LIST_RESP.encode(
+            [(ch["id"], ch["name"], ch["level"], ch["job"]) for ch in CHARACTER_TEMPLATES]))
 
+    @packet_handler(MsgType.CHAR_SELECT)
     async def _on_char_select(self, session: PlayerSession, payload: bytes):
         if len(payload) < 4 or not session.logged_in:
             self._send(session, MsgType.ENTER_GAME, struct.pack('<B', 1) + b'\x00' * 24)  # FAIL=1
             return
 
         char_id = struct.unpack('<I', payload[:4])[0]
-        tmpl = next((c for c in CHARACTER_TEMPLATES if c["id"] == char_id), None)
+        tmpl = self.index.get("character_template", char_id)
         if not tmpl:
             self._send(session, MsgType.ENTER_GAME, struct.pack('<B', 1) + b'\x00' * 24)  # FAIL=1
             return
+        if not session.in_game and len(self.sessions) >= self.max_ccu:
+            self.channel_stats["server_full"] += 1
+            self._send(session, MsgType.ENTER_GAME, struct.pack('<B', 1) + b'\x00' * 24)  # FAIL=1 (max_players)
+            return
 
+        if session.in_game and self.store.enabled:
+            self._save_account(session)  # 이전 캐릭터 진행도
+        self._aoi_remove(session)
+        self._unindex_session(session)
         session.entity_id = new_entity()
         session.char_name = tmpl["name"]
         session.in_game = True
@@ -2796,38 +6615,32 @@ class BridgeServer:
         session.stats.hp = session.stats.max_hp
         session.stats.atk = 10 + (tmpl["level"] - 1) * 3
         session.stats.defense = 5 + (tmpl["level"] - 1) * 2
+        if self.store.enabled:
+            self._restore_character(session)
 
         # 기본 스킬 부여
         session.skills = {1: 1, 2: 1, 6: 1}
 
+        if self._hands_off(session, session.zone_id, "enter_game"):
+            return
+        self._enter_world(session)
+
+    def _enter_world(self, session: PlayerSession):
+        """캐릭터 선택 마무리: 월드 등록, ENTER_GAME, 시야 안 APPEAR/몬스터, STAT_SYNC, 환영 메시지"""
         self.sessions[session.entity_id] = session
+        self._index_session(session)
+        channel = session.channel_id
+        self._aoi_update(session)
 
-        self.log(f"EnterGame: {session.char_name} (entity={session.entity_id}, zone={session.zone_id})", "GAME")
+        self.log(f"EnterGame: {session.char_name} (entity={session.entity_id}, zone={session.zone_id},"
+                 f" channel={session.channel_id})", "GAME")
 
         resp = struct.pack('<BQIfff',
             0, session.entity_id, session.zone_id,  # SUCCESS=0
             session.pos.x, session.pos.y, session.pos.z)
         self._send(session, MsgType.ENTER_GAME, resp)
-
-        # 기존 플레이어에게 APPEAR
-        appear_data = struct.pack('<Qfff', session.entity_id,
-                                   session.pos.x, session.pos.y, session.pos.z)
-        self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                 MsgType.APPEAR, appear_data)
-
-        # 이 플레이어에게 기존 플레이어+몬스터 APPEAR
-        for eid, other in self.sessions.items():
-            if eid != session.entity_id and other.zone_id == session.zone_id and other.in_game:
-                a = struct.pack('<Qfff', eid, other.pos.x, other.pos.y, other.pos.z)
-                self._send(session, MsgType.APPEAR, a)
-
-        # 존 내 몬스터 전송
-        for mid, m in self.monsters.items():
-            if m["zone"] == session.zone_id and m["ai"].state != 5:
-                spawn_pkt = struct.pack('<QIIIIfff',
-                    mid, m["monster_id"], m["level"], m["hp"], m["max_hp"],
-                    m["pos"].x, m["pos"].y, m["pos"].z)
-                self._send(session, MsgType.MONSTER_SPAWN, spawn_pkt)
+        self._notify_channel(session, channel)
+        self._send_view(session)
 
         # STAT_SYNC
         self._send_stat_sync(session)
@@ -2838,8 +6651,44 @@ class BridgeServer:
         self._send(session, MsgType.SYSTEM_MESSAGE,
                     struct.pack('<B', len(msg_bytes)) + msg_bytes)
 
+    def _send_view(self, session: PlayerSession):
+        """존/채널에 막 들어온 세션: 시야 안 플레이어에게 APPEAR, 이 세션에게 시야 안 플레이어/몬스터/고스트"""
+        # 시야 안 기존 플레이어에게 APPEAR
+        appear_data = struct.pack('<Qfff', session.entity_id,
+                                   session.pos.x, session.pos.y, session.pos.z)
+        self._broadcast_nearby(session.space, session.pos.x, session.pos.z,
+                               session.entity_id, MsgType.APPEAR, appear_data)
+
+        # 이 플레이어에게 시야 안 플레이어+몬스터 APPEAR
+        grid = self.player_grids[session.space]
+        cell = grid.where[session.entity_id]
+        for eid in grid.nearby(cell):
+            if eid != session.entity_id:
+                other = self.sessions[eid]
+                a = struct.pack('<Qfff', eid, other.pos.x, other.pos.y, other.pos.z)
+                self._send(session, MsgType.APPEAR, a)
+
+        # 시야 안 몬스터 전송
+        mgrid = self.monster_grids.get(session.space)
+        if mgrid is not None:
+            for mid in sorted(mgrid.nearby(cell)):
+                m = self.monsters[mid]
+                if m["ai"].state != 5:
+                    self._send(session, MsgType.MONSTER_SPAWN, self._monster_spawn_packet(mid, m))
+
+        # 인접 존에서 비치는 고스트
+        zone_ghosts = self.ghosts.get(session.space)
+        if zone_ghosts:
+            cx, cz = cell
+            for eid, (_, x, y, z) in zone_ghosts.items():
+                gx, gz = grid.cell_of(x, z)
+                if abs(gx - cx) <= 1 and abs(gz - cz) <= 1:
+                    self._send(session, MsgType.APPEAR, struct.pack('<Qfff', eid, x, y, z))
+        self._ghost_touch(session)
+
     # ━━━ 핸들러: 이동 ━━━
 
+    @packet_handler(MsgType.MOVE, zero_copy=True)
     async def _on_move(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -2893,11 +6742,15 @@ class BridgeServer:
         session.last_move_time = now
         session.violation_count = max(0, session.violation_count - 1)  # 정상이면 감소
 
-        # 브로드캐스트
+        # 셀 경계를 넘었으면 APPEAR/DISAPPEAR, 그다음 시야 안에 브로드캐스트
+        self._aoi_update(session)
+        if self.ghosts_enabled:
+            self._ghost_dirty[session.entity_id] = session
         bcast = struct.pack('<Qfff', session.entity_id, x, y, z)
-        self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                 MsgType.MOVE_BROADCAST, bcast)
+        self._broadcast_nearby(session.space, x, z, session.entity_id,
+                               MsgType.MOVE_BROADCAST, bcast)
 
+    @packet_handler(MsgType.POS_QUERY, zero_copy=True)
     async def _on_pos_query(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -2907,20 +6760,142 @@ class BridgeServer:
 
     # ━━━ 핸들러: 채널/존 ━━━
 
+    @packet_handler(MsgType.CHANNEL_JOIN)
     async def _on_channel_join(self, session: PlayerSession, payload: bytes):
+        """[channel_id i32] 채널 입장/변경 (0 이하 = 서버가 고름). 정원이 찼거나 범위 밖이면 지금 채널 그대로 응답"""
         if len(payload) < 4:
             return
-        ch_id = struct.unpack('<I', payload[:4])[0]
-        session.channel_id = ch_id
-        self._send(session, MsgType.CHANNEL_INFO, struct.pack('<I', ch_id))
-
+        ch_id = struct.unpack('<i', payload[:4])[0]
+        if not session.in_game:
+            # 캐릭터 선택 전: 선호 채널만 기억 (존에 들어갈 때 그 채널이 열려 있고 자리가 있으면 그리로)
+            if 1 <= ch_id <= self.max_channels:
+                session.channel_id = ch_id
+        elif ch_id <= 0:
+            ch_id = self._pick_channel(session.zone_id, session.channel_id)
+            if ch_id != session.channel_id:
+                self._switch_channel(session, ch_id)
+        elif ch_id != session.channel_id:
+            if ch_id > self.max_channels or self._channel_players(session.zone_id, ch_id) >= self.channel_capacity:
+                self.channel_stats["refused"] += 1
+            else:
+                self._switch_channel(session, ch_id)
+        self._send(session, MsgType.CHANNEL_INFO, self._channel_info(session))
+
+    def _switch_channel(self, session: PlayerSession, channel_id: int):
+        """같은 존 다른 채널로: 옛 채널 시야와 서로 DISAPPEAR, 새 채널 시야와 서로 APPEAR (C++ OnChannelJoin)"""
+        zone_id = session.zone_id
+        if channel_id > 1 and channel_id not in self.zone_channels.get(zone_id, ()):
+            self._open_channel(zone_id, channel_id)
+        self._clear_view(session)
+        session.channel_id = channel_id
+        self._aoi_update(session)
+        self._send_view(session)
+        self.channel_stats["switches"] += 1
+
+    def _clear_view(self, session: PlayerSession):
+        """_send_view의 반대: 시야 안 플레이어에게 DISAPPEAR, 이 세션에게 시야 안 플레이어/몬스터/고스트 DISAPPEAR"""
+        grid = self.player_grids.get(session.space)
+        if grid is None:
+            return
+        self._broadcast_nearby(session.space, session.pos.x, session.pos.z, session.entity_id,
+                               MsgType.DISAPPEAR, struct.pack('<Q', session.entity_id))
+        cell = grid.where[session.entity_id]
+        gone = [eid for eid in grid.nearby(cell) if eid != session.entity_id]
+        mgrid = self.monster_grids.get(session.space)
+        if mgrid is not None:
+            gone += sorted(mid for mid in mgrid.nearby(cell) if self.monsters[mid]["ai"].state != 5)
+        zone_ghosts = self.ghosts.get(session.space)
+        if zone_ghosts:
+            cx, cz = cell
+            for eid, (_, x, _, z) in zone_ghosts.items():
+                gx, gz = grid.cell_of(x, z)
+                if abs(gx - cx) <= 1 and abs(gz - cz) <= 1:
+                    gone.append(eid)
+        for eid in gone:
+            self._send(session, MsgType.DISAPPEAR, struct.pack('<Q', eid))
+
+    def _channel_players(self, zone_id: int, channel_id: int) -> int:
+        return len(self.zone_players.get(channel_space(zone_id, channel_id), ()))
+
+    def _channel_load(self, zone_id: int) -> List[Tuple[int, int]]:
+        """존의 열린 채널 [(번호, 인원)] 번호 순. 채널 1은 항상 열려 있다"""
+        return [(ch, self._channel_players(zone_id, ch)) for ch in sorted({1}.union(self.zone_channels.get(zone_id, ())))]
+
+    def _pick_channel(self, zone_id: int, preferred: int = 1) -> int:
+        """자동 배정: preferred가 열려 있고 자리가 있으면 그대로, 아니면 번호 낮은 순으로 자리 있는 채널,
+        다 찼으면 새 채널. 채널 수 상한이면 가장 한가한 채널 (정원 초과)"""
+        capacity = self.channel_capacity
+        load = self._channel_load(zone_id)
+        if any(ch == preferred and n < capacity for ch, n in load):
+            return preferred
+        for ch, n in load:
+            if n < capacity:
+                return ch
+        ch = self._open_channel(zone_id)
+        if ch:
+            return ch
+        self.channel_stats["overflow"] += 1
+        return min(load, key=lambda e: e[1])[0]
+
+    def _open_channel(self, zone_id: int, channel_id: int = 0) -> int:
+        """채널을 열고 그 존 몬스터를 한 벌 스폰. channel_id 0이면 비어 있는 가장 낮은 번호. 반환: 연 채널 (0 = 상한)"""
+        opened = self.zone_channels.setdefault(zone_id, set())
+        if not channel_id:
+            channel_id = next((ch for ch in range(2, self.max_channels + 1) if ch not in opened), 0)
+            if not channel_id:
+                return 0
+        opened.add(channel_id)
+        spawned = self._spawn_monsters(zone_id, channel_id)
+        self.channel_stats["opened"] += 1
+        self.log(f"Channel open: zone {zone_id} ch {channel_id} ({spawned} monsters)", "GAME")
+        return channel_id
+
+    def _collapse_channel(self, zone_id: int, channel_id: int):
+        """빈 채널 닫기 (CHANNEL_COLLAPSE_DELAY 타이머): 그 채널 몬스터와 그리드를 지운다"""
+        space = channel_space(zone_id, channel_id)
+        opened = self.zone_channels.get(zone_id)
+        if self.zone_players.get(space) or not opened or channel_id not in opened:
+            return
+        opened.discard(channel_id)
+        if not opened:
+            del self.zone_channels[zone_id]
+        for mid in self.zone_monsters.pop(space, ()):
+            del self.monsters[mid]
+            self.timers.cancel("respawn", mid)
+        self.monster_grids.pop(space, None)
+        self.player_grids.pop(space, None)
+        self.channel_stats["collapsed"] += 1
+        self.log(f"Channel collapse: zone {zone_id} ch {channel_id}", "GAME")
+
+    def _channel_info(self, session: PlayerSession) -> bytes:
+        """CHANNEL_INFO: [channel_id i32] + CHANNEL_LOAD (그 존 채널별 인원, 클라이언트 채널 선택용)"""
+        return struct.pack('<i', session.channel_id) + CHANNEL_LOAD.encode(
+            session.zone_id, min(self.channel_capacity, 0xFFFF),
+            [(ch, min(n, 0xFFFF)) for ch, n in self._channel_load(session.zone_id)])
+
+    def _notify_channel(self, session: PlayerSession, before: int):
+        """존에 들어가며 채널이 바뀌었으면 (원래 채널이 찼거나 없음) CHANNEL_INFO로 알린다"""
+        if session.channel_id != before:
+            self._send(session, MsgType.CHANNEL_INFO, self._channel_info(session))
+
+    @packet_handler(MsgType.ZONE_ENTER)
     async def _on_zone_enter(self, session: PlayerSession, payload: bytes):
         if len(payload) < 4:
             return
         zone_id = struct.unpack('<I', payload[:4])[0]
+        if session.in_game and self._hands_off(session, zone_id, "zone_enter"):
+            return
         session.zone_id = zone_id
-        self._send(session, MsgType.ZONE_INFO, struct.pack('<I', zone_id))
+        self._zone_entered(session)
 
+    def _zone_entered(self, session: PlayerSession):
+        channel = session.channel_id
+        self._aoi_update(session)
+        self._ghost_touch(session)
+        self._send(session, MsgType.ZONE_INFO, struct.pack('<I', session.zone_id))
+        self._notify_channel(session, channel)
+
+    @packet_handler(MsgType.ZONE_TRANSFER_REQ)
     async def _on_zone_transfer(self, session: PlayerSession, payload: bytes):
         if len(payload) < 4 or not session.in_game:
             self._send(session, MsgType.ZONE_TRANSFER_RESULT,
@@ -2938,44 +6913,281 @@ class BridgeServer:
                         struct.pack('<BIfff', 2, target_zone, 0.0, 0.0, 0.0))
             return
 
+        spawn = ZONE_BOUNDS[target_zone]
+        spawn_x = float(spawn["min_x"] + 100)
+        spawn_z = float(spawn["min_z"] + 100)
+        self.log(f"ZoneTransfer: {session.char_name} Zone{session.zone_id}→Zone{target_zone}", "GAME")
+        if self._hands_off(session, target_zone, "zone_transfer", Position(spawn_x, session.pos.y, spawn_z)):
+            return
+
         # DISAPPEAR
         disappear = struct.pack('<Q', session.entity_id)
-        self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                 MsgType.DISAPPEAR, disappear)
+        self._broadcast_nearby(session.space, session.pos.x, session.pos.z,
+                               session.entity_id, MsgType.DISAPPEAR, disappear)
 
-        old_zone = session.zone_id
         session.zone_id = target_zone
-        spawn = ZONE_BOUNDS[target_zone]
-        session.pos.x = float(spawn["min_x"] + 100)
-        session.pos.z = float(spawn["min_z"] + 100)
-
-        self.log(f"ZoneTransfer: {session.char_name} Zone{old_zone}→Zone{target_zone}", "GAME")
-
+        session.pos.x = spawn_x
+        session.pos.z = spawn_z
+        self._zone_transferred(session)
+
+    def _zone_transferred(self, session: PlayerSession):
+        channel = session.channel_id
+        self._aoi_update(session)
+        self._ghost_touch(session)
         self._send(session, MsgType.ZONE_TRANSFER_RESULT,
-                    struct.pack('<BIfff', 0, target_zone,
+                    struct.pack('<BIfff', 0, session.zone_id,
                                 session.pos.x, session.pos.y, session.pos.z))
+        self._notify_channel(session, channel)
 
         # APPEAR
         appear = struct.pack('<Qfff', session.entity_id,
                               session.pos.x, session.pos.y, session.pos.z)
-        self._broadcast_to_zone(target_zone, session.entity_id,
-                                 MsgType.APPEAR, appear)
+        self._broadcast_nearby(session.space, session.pos.x, session.pos.z,
+                               session.entity_id, MsgType.APPEAR, appear)
 
     # ━━━ 핸들러: 스탯 ━━━
 
+
+    # ━━━ AOI (관심 영역) ━━━
+
+    def _grid(self, grids: Dict[int, AOIGrid], space: int) -> AOIGrid:
+        grid = grids.get(space)
+        if grid is None:
+            grid = grids[space] = AOIGrid(self.view_radius or None)
+        return grid
+
+    def _broadcast_nearby(self, space: int, x: float, z: float, exclude_entity: int,
+                          msg_type: int, payload: bytes):
+        """같은 (존, 채널)에서 (x, z)를 볼 수 있는 플레이어(3x3 셀)에게만 전송. space = session.space / m["space"]"""
+        grid = self.player_grids.get(space)
+        if grid is None:
+            return
+        sessions = self.sessions
+        sent = self._multicast([sessions[eid] for eid in grid.nearby(grid.cell_of(x, z)) if eid != exclude_entity],
+                               msg_type, payload)
+        st = self.aoi_stats
+        skipped = len(grid) - sent - (exclude_entity in grid)
+        st["sent"] += sent
+        if skipped > 0:
+            st["skipped"] += skipped
+            st["bytes_saved"] += skipped * (PACKET_HEADER_SIZE + len(payload))
+
+    def _aoi_update(self, session: PlayerSession):
+        """세션의 zone_id/channel_id/pos/in_game 변경을 존 인덱스와 AOI 그리드에 반영.
+
+        zone_id나 in_game을 바꾸는 곳은 전부 이걸 불러야 한다 (check_zone_index로 검증).
+        존에 새로 들어오면 채널을 배정한다 (_pick_channel — 알림은 _notify_channel).
+        같은 공간 안에서 셀이 바뀌면 시야 경계를 넘은 플레이어/몬스터와 APPEAR/DISAPPEAR를
+        주고받는다. 존/채널이 바뀐 경우엔 인덱스만 옮긴다 (전환 알림은 호출한 쪽 담당).
+        """
+        eid = session.entity_id
+        if not session.in_game or eid not in self.sessions:
+            self._aoi_remove(session)
+            return
+        if session.space is None or session.space & _SPACE_ZONE_MASK != session.zone_id:
+            session.channel_id = self._pick_channel(session.zone_id, session.channel_id)
+        space = session.zone_id | (session.channel_id - 1) << CHANNEL_SPACE_SHIFT
+        grid = self._grid(self.player_grids, space)
+        cell = grid.cell_of(session.pos.x, session.pos.z)
+        if session.space != space:
+            self._aoi_remove(session)
+            grid.add(eid, cell)
+            members = self.zone_players.get(space)
+            if members is None:
+                self.zone_players[space] = {eid}
+                if session.channel_id > 1:
+                    self.timers.cancel("channel", space)  # 닫히려던 빈 채널에 다시 사람이 옴
+            else:
+                members.add(eid)
+            session.space = space
+            return
+        old = grid.move(eid, cell)
+        if old is not None:
+            self._aoi_cross(session, grid, old, cell)
+
+    def _aoi_remove(self, session: PlayerSession):
+        space = session.space
+        if space is None:
+            return
+        grid = self.player_grids.get(space)
+        if grid is not None:
+            grid.remove(session.entity_id)
+        members = self.zone_players.get(space)
+        if members is not None:
+            members.discard(session.entity_id)
+            if not members:
+                del self.zone_players[space]
+                if space_channel(space) > 1:
+                    self.timers.schedule("channel", space, time.time() + CHANNEL_COLLAPSE_DELAY,
+                                         self._collapse_channel, space_zone(space), space_channel(space))
+        session.space = None
+
+    def check_zone_index(self) -> List[str]:
+        """존 인덱스/AOI 그리드(셀 위치 포함)가 sessions/monsters와 일치하는지 검사 (테스트용). 위반 목록 반환."""
+        errors = []
+        expected: Dict[int, Set[int]] = {}
+        for eid, s in self.sessions.items():
+            if s.in_game and s.entity_id == eid:
+                expected.setdefault(channel_space(s.zone_id, s.channel_id), set()).add(eid)
+        for zone_id in set(expected) | set(self.zone_players):
+            want = expected.get(zone_id, set())
+            have = self.zone_players.get(zone_id, set())
+            if want != have:
+                errors.append(f"zone_players[{zone_id}]: missing={sorted(want - have)} stale={sorted(have - want)}")
+            grid = self.player_grids.get(zone_id)
+            in_grid = set(grid.where) if grid is not None else set()
+            if in_grid != have:
+                errors.append(f"player_grids[{zone_id}] != zone_players[{zone_id}]")
+            for eid in in_grid & want:
+                pos = self.sessions[eid].pos
+                if grid.where[eid] != grid.cell_of(pos.x, pos.z):
+                    errors.append(f"player_grids[{zone_id}]: entity {eid} in stale cell")
+        expected_m: Dict[int, Set[int]] = {}
+        for mid, m in self.monsters.items():
+            expected_m.setdefault(m["space"], set()).add(mid)
+        for zone_id in set(expected_m) | set(self.zone_monsters):
+            want = expected_m.get(zone_id, set())
+            have = self.zone_monsters.get(zone_id, set())
+            if want != have:
+                errors.append(f"zone_monsters[{zone_id}]: missing={sorted(want - have)} stale={sorted(have - want)}")
+            grid = self.monster_grids.get(zone_id)
+            if (set(grid.where) if grid is not None else set()) != have:
+                errors.append(f"monster_grids[{zone_id}] != zone_monsters[{zone_id}]")
+                continue
+            for mid in have & want:
+                pos = self.monsters[mid]["pos"]
+                if grid.where[mid] != grid.cell_of(pos.x, pos.z):
+                    errors.append(f"monster_grids[{zone_id}]: monster {mid} in stale cell")
+        return errors
+
+    def _aoi_cross(self, session: PlayerSession, grid: AOIGrid,
+                   old: Tuple[int, int], new: Tuple[int, int]):
+        me = session.entity_id
+        st = self.aoi_stats
+        sessions = self.sessions
+        old_view = set(grid.view_cells(old))
+        new_view = set(grid.view_cells(new))
+        mgrid = self.monster_grids.get(session.space)
+
+        left = old_view - new_view
+        if left:
+            gone = struct.pack('<Q', me)
+            for c in left:
+                for eid in grid.cells.get(c, ()):
+                    self._send(sessions[eid], MsgType.DISAPPEAR, gone)
+                    self._send(session, MsgType.DISAPPEAR, struct.pack('<Q', eid))
+                    st["disappear"] += 2
+                if mgrid is not None:
+                    for mid in mgrid.cells.get(c, ()):
+                        self._send(session, MsgType.DISAPPEAR, struct.pack('<Q', mid))
+                        st["disappear"] += 1
+
+        entered = new_view - old_view
+        if entered:
+            appear = struct.pack('<Qfff', me, session.pos.x, session.pos.y, session.pos.z)
+            for c in entered:
+                for eid in grid.cells.get(c, ()):
+                    if eid == me:
+                        continue
+                    other = sessions[eid]
+                    self._send(other, MsgType.APPEAR, appear)
+                    self._send(session, MsgType.APPEAR,
+                               struct.pack('<Qfff', eid, other.pos.x, other.pos.y, other.pos.z))
+                    st["appear"] += 2
+                if mgrid is not None:
+                    for mid in mgrid.cells.get(c, ()):
+                        m = self.monsters[mid]
+                        if m["ai"].state != 5:
+                            self._send(session, MsgType.MONSTER_SPAWN, self._monster_spawn_packet(mid, m))
+                            st["appear"] += 1
+
+    def _aoi_update_monster(self, mid: int, m: dict):
+        """몬스터 이동을 그리드에 반영. 셀이 바뀌면 시야에 들어온/나간 플레이어에게 알린다."""
+        grid = self._grid(self.monster_grids, m["space"])
+        new = grid.cell_of(m["pos"].x, m["pos"].z)
+        old = grid.move(mid, new)
+        if old is None:
+            return
+        pgrid = self.player_grids.get(m["space"])
+        if pgrid is None:
+            return
+        st = self.aoi_stats
+        sessions = self.sessions
+        old_view = set(grid.view_cells(old))
+        new_view = set(grid.view_cells(new))
+        gone = struct.pack('<Q', mid)
+        for c in old_view - new_view:
+            for eid in pgrid.cells.get(c, ()):
+                self._send(sessions[eid], MsgType.DISAPPEAR, gone)
+                st["disappear"] += 1
+        if m["ai"].state != 5:
+            spawn_pkt = self._monster_spawn_packet(mid, m)
+            for c in new_view - old_view:
+                for eid in pgrid.cells.get(c, ()):
+                    self._send(sessions[eid], MsgType.MONSTER_SPAWN, spawn_pkt)
+                    st["appear"] += 1
+
+    @staticmethod
+    def _monster_spawn_packet(mid: int, m: dict) -> bytes:
+        return struct.pack('<QIIIIfff',
+            mid, m["monster_id"], m["level"], m["hp"], m["max_hp"],
+            m["pos"].x, m["pos"].y, m["pos"].z)
+
+    def _query_radius(self, space: int, x: float, z: float, radius: float,
+                      players: bool = True, monsters: bool = True,
+                      limit: int = 0) -> List[Tuple[float, int]]:
+        """공간(존, 채널) 안 (x, z) 반경 radius의 살아 있는 엔티티를 가까운 순으로 [(거리², entity_id)].
+
+        AOI 그리드로 후보 셀만 보고 제곱 거리로 거른다 (sqrt는 호출자가 필요할 때만).
+        limit > 0이면 가장 가까운 limit개만 (k-최근접).
+        """
+        if not radius >= 0:  # 음수/NaN
+            return []
+        r2 = radius * radius
+        hits = []
+        if players:
+            grid = self.player_grids.get(space)
+            if grid is not None:
+                sessions = self.sessions
+                for eid in grid.within(x, z, radius):
+                    pos = sessions[eid].pos
+                    dx = pos.x - x
+                    dz = pos.z - z
+                    d2 = dx*dx + dz*dz
+                    if d2 <= r2:
+                        hits.append((d2, eid))
+        if monsters:
+            grid = self.monster_grids.get(space)
+            if grid is not None:
+                all_monsters = self.monsters
+                for mid in grid.within(x, z, radius):
+                    m = all_monsters[mid]
+                    if m["ai"].state == 5:  # DEAD
+                        continue
+                    pos = m["pos"]
+                    dx = pos.x - x
+                    dz = pos.z - z
+                    d2 = dx*dx + dz*dz
+                    if d2 <= r2:
+                        hits.append((d2, mid))
+        if limit and len(hits) > limit:
+            return heapq.nsmallest(limit, hits)
+        hits.sort()
+        return hits
+
     def _send_stat_sync(self, session: PlayerSession):
         s = session.stats
         total_atk = s.atk + s.equip_atk_bonus
         total_def = s.defense + s.equip_def_bonus
-        payload = struct.pack('<IiiiiIIII',
-            s.level, s.hp, s.max_hp, s.mp, s.max_mp,
-            total_atk, total_def, s.exp, s.exp_next)
-        self._send(session, MsgType.STAT_SYNC, payload)
+        self._send_msg(session, Schema.STAT_SYNC, s.level, s.hp, s.max_hp, s.mp, s.max_mp,
+                       total_atk, total_def, s.exp, s.exp_next)
 
+    @packet_handler(MsgType.STAT_QUERY, zero_copy=True)
     async def _on_stat_query(self, session: PlayerSession, payload: bytes):
         if session.in_game:
             self._send_stat_sync(session)
 
+    @packet_handler(MsgType.STAT_ADD_EXP, zero_copy=True)
     async def _on_stat_add_exp(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -2986,6 +7198,7 @@ class BridgeServer:
             self.log(f"LevelUp: {session.char_name} Lv{old_level}→Lv{session.stats.level}", "GAME")
         self._send_stat_sync(session)
 
+    @packet_handler(MsgType.STAT_TAKE_DMG, zero_copy=True)
     async def _on_stat_take_dmg(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -2994,6 +7207,7 @@ class BridgeServer:
         session.stats.hp = max(0, session.stats.hp - actual)
         self._send_stat_sync(session)
 
+    @packet_handler(MsgType.STAT_HEAL, zero_copy=True)
     async def _on_stat_heal(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3003,15 +7217,16 @@ class BridgeServer:
 
     # ━━━ 핸들러: 전투 ━━━
 
+    @packet_handler(MsgType.ATTACK_REQ, zero_copy=True)
     async def _on_attack_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8:
             return
 
         target = struct.unpack('<Q', payload[:8])[0]
 
-        # 타겟이 몬스터인지 확인
-        if target in self.monsters:
-            m = self.monsters[target]
+        # 타겟이 몬스터인지 확인 (다른 존/채널 몬스터는 안 보이므로 대상 아님)
+        m = self.monsters.get(target)
+        if m is not None and m["space"] == session.space:
             if m["hp"] <= 0:
                 self._send(session, MsgType.ATTACK_RESULT,
                             struct.pack('<BQQiII', 0, session.entity_id, target, 0, 0, 0))
@@ -3026,18 +7241,19 @@ class BridgeServer:
 
             result = struct.pack('<BQQiII', 1, session.entity_id, target,
                                   damage, m["hp"], m["max_hp"])
+            mx, mz = m["pos"].x, m["pos"].z
             self._send(session, MsgType.ATTACK_RESULT, result)
-            self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                     MsgType.ATTACK_RESULT, result)
+            self._broadcast_nearby(session.space, mx, mz, session.entity_id,
+                                   MsgType.ATTACK_RESULT, result)
 
             # 어그로 변경 알림
             aggro_pkt = struct.pack('<QQ', target, session.entity_id)
-            self._broadcast_to_zone(session.zone_id, 0, MsgType.MONSTER_AGGRO, aggro_pkt)
+            self._broadcast_nearby(session.space, mx, mz, 0, MsgType.MONSTER_AGGRO, aggro_pkt)
 
             if m["hp"] <= 0:
                 m["ai"].state = 5  # DEAD
                 died = struct.pack('<QQ', target, session.entity_id)
-                self._broadcast_to_zone(session.zone_id, 0, MsgType.COMBAT_DIED, died)
+                self._broadcast_nearby(session.space, mx, mz, 0, MsgType.COMBAT_DIED, died)
                 self._send(session, MsgType.COMBAT_DIED, died)
 
                 # 루트 드롭
@@ -3056,10 +7272,11 @@ class BridgeServer:
                 self._on_monster_killed(session, m["monster_id"])
 
                 # 리스폰 예약 (10초 후)
-                asyncio.get_event_loop().call_later(10.0, self._respawn_monster, target)
+                self._schedule_respawn(target)
 
                 self.log(f"MonsterDied: {m['name']} (killer={session.char_name})", "GAME")
 
+    @packet_handler(MsgType.RESPAWN_REQ, zero_copy=True)
     async def _on_respawn_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -3069,6 +7286,7 @@ class BridgeServer:
         session.pos.x = float(bounds["min_x"] + 100)
         session.pos.z = float(bounds["min_z"] + 100)
         session.pos.y = 0.0
+        self._aoi_update(session)
 
         resp = struct.pack('<Biifff', 1, session.stats.hp, session.stats.mp,
                             session.pos.x, session.pos.y, session.pos.z)
@@ -3076,26 +7294,21 @@ class BridgeServer:
 
     # ━━━ 핸들러: 스킬 ━━━
 
+    @packet_handler(MsgType.SKILL_LIST_REQ)
     async def _on_skill_list_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
 
-        skills_to_send = []
+        # 확장 포맷: +level +effect +min_level
+        skills = []
         for sid, slevel in session.skills.items():
-            if sid in SKILLS:
-                skills_to_send.append((sid, slevel, SKILLS[sid]))
-
-        buf = struct.pack('<B', len(skills_to_send))
-        for sid, slevel, sdata in skills_to_send:
-            name_bytes = sdata["name"].encode('utf-8')[:16].ljust(16, b'\x00')
-            # 확장 포맷: +level +effect +min_level
-            buf += struct.pack('<I', sid)
-            buf += name_bytes
-            buf += struct.pack('<IIIIB', sdata["cd_ms"], sdata["dmg"], sdata["mp"],
-                               sdata["range"], sdata["type"])
-            buf += struct.pack('<BBI', slevel, sdata["effect"], sdata["min_level"])
-        self._send(session, MsgType.SKILL_LIST_RESP, buf)
+            sdata = SKILLS.get(sid)
+            if sdata is not None:
+                skills.append((sid, sdata["name"], sdata["cd_ms"], sdata["dmg"], sdata["mp"], sdata["range"],
+                               sdata["type"], slevel, sdata["effect"], sdata["min_level"]))
+        self._send_msg(session, Schema.SKILL_LIST_RESP, skills)
 
+    @packet_handler(MsgType.SKILL_USE, zero_copy=True)
     async def _on_skill_use(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 12:
             return
@@ -3120,8 +7333,8 @@ class BridgeServer:
         damage = sdata["dmg"] * slevel
 
         target_hp = 0
-        if target_entity in self.monsters:
-            m = self.monsters[target_entity]
+        m = self.monsters.get(target_entity)
+        if m is not None and m["space"] == session.space:
             if m["hp"] > 0:
                 actual_dmg = max(0, damage)
                 m["hp"] = max(0, m["hp"] - actual_dmg)
@@ -3132,22 +7345,24 @@ class BridgeServer:
                 if m["hp"] <= 0:
                     m["ai"].state = 5
                     died = struct.pack('<QQ', target_entity, session.entity_id)
-                    self._broadcast_to_zone(session.zone_id, 0, MsgType.COMBAT_DIED, died)
+                    self._broadcast_nearby(session.space, m["pos"].x, m["pos"].z, 0,
+                                           MsgType.COMBAT_DIED, died)
                     self._send(session, MsgType.COMBAT_DIED, died)
                     loot_table_id = 1 if m["monster_id"] <= 2 else 2
                     self._drop_loot(session, loot_table_id)
                     exp = m["level"] * 20
                     session.stats.add_exp(exp)
                     self._on_monster_killed(session, m["monster_id"])
-                    asyncio.get_event_loop().call_later(10.0, self._respawn_monster, target_entity)
+                    self._schedule_respawn(target_entity)
 
         result = struct.pack('<BIQQI', 1, skill_id, session.entity_id,
                               target_entity, abs(damage), target_hp)
         self._send(session, MsgType.SKILL_RESULT, result)
-        self._broadcast_to_zone(session.zone_id, session.entity_id,
-                                 MsgType.SKILL_RESULT, result)
+        self._broadcast_nearby(session.space, session.pos.x, session.pos.z, session.entity_id,
+                               MsgType.SKILL_RESULT, result)
         self._send_stat_sync(session)
 
+    @packet_handler(MsgType.SKILL_LEVEL_UP)
     async def _on_skill_level_up(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3177,6 +7392,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 파티 ━━━
 
+    @packet_handler(MsgType.PARTY_CREATE)
     async def _on_party_create(self, session: PlayerSession, payload: bytes):
         if not session.in_game or session.party_id:
             self._send(session, MsgType.PARTY_INFO,
@@ -3191,6 +7407,7 @@ class BridgeServer:
         self.log(f"PartyCreate: {session.char_name} (party={pid})", "GAME")
         self._send_party_info(session)
 
+    @packet_handler(MsgType.PARTY_INVITE)
     async def _on_party_invite(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8 or not session.party_id:
             return
@@ -3206,9 +7423,11 @@ class BridgeServer:
                 self._send_party_info(session)
                 self._send_party_info(target_session)
 
+    @packet_handler(MsgType.PARTY_ACCEPT)
     async def _on_party_accept(self, session: PlayerSession, payload: bytes):
         pass  # 자동 수락으로 간소화
 
+    @packet_handler(MsgType.PARTY_LEAVE)
     async def _on_party_leave(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.party_id:
             return
@@ -3226,6 +7445,7 @@ class BridgeServer:
         session.party_id = 0
         self._send(session, MsgType.PARTY_INFO, struct.pack('<BIQB', 1, 0, 0, 0))
 
+    @packet_handler(MsgType.PARTY_KICK)
     async def _on_party_kick(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8 or not session.party_id:
             return
@@ -3243,25 +7463,23 @@ class BridgeServer:
             return
 
         party = self.parties[session.party_id]
-        count = len(party["members"])
-        buf = struct.pack('<BIQB', 1, session.party_id, party["leader"], count)
+        members = []
         for eid in party["members"]:
             s = self.sessions.get(eid)
-            level = s.stats.level if s else 1
-            buf += struct.pack('<QI', eid, level)
-        self._send(session, MsgType.PARTY_INFO, buf)
+            members.append((eid, s.stats.level if s else 1))
+        self._send_msg(session, Schema.PARTY_INFO, 1, session.party_id, party["leader"], members)
 
     # ━━━ 핸들러: 인벤토리 ━━━
 
+    @packet_handler(MsgType.INVENTORY_REQ)
     async def _on_inventory_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
-        slots = [(i, s) for i, s in enumerate(session.inventory) if s.item_id > 0]
-        buf = struct.pack('<B', len(slots))
-        for i, s in slots:
-            buf += struct.pack('<BIHB', i, s.item_id, s.count, 1 if s.equipped else 0)
-        self._send(session, MsgType.INVENTORY_RESP, buf)
+        slots = [(i, s.item_id, s.count, 1 if s.equipped else 0)
+                 for i, s in enumerate(session.inventory) if s.item_id > 0]
+        self._send_msg(session, Schema.INVENTORY_RESP, slots)
 
+    @packet_handler(MsgType.ITEM_ADD)
     async def _on_item_add(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 6:
             return
@@ -3276,6 +7494,7 @@ class BridgeServer:
             self._send(session, MsgType.ITEM_ADD_RESULT,
                         struct.pack('<BBIH', 0, 0, item_id, count))
 
+    @packet_handler(MsgType.ITEM_USE)
     async def _on_item_use(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             return
@@ -3291,6 +7510,7 @@ class BridgeServer:
             self._send(session, MsgType.ITEM_USE_RESULT,
                         struct.pack('<BBI', 0, slot, 0))
 
+    @packet_handler(MsgType.ITEM_EQUIP)
     async def _on_item_equip(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             return
@@ -3310,6 +7530,7 @@ class BridgeServer:
             self._send(session, MsgType.ITEM_EQUIP_RESULT,
                         struct.pack('<BBIB', 0, slot, 0, 0))
 
+    @packet_handler(MsgType.ITEM_UNEQUIP)
     async def _on_item_unequip(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             return
@@ -3329,13 +7550,11 @@ class BridgeServer:
                         struct.pack('<BBIB', 0, slot, 0, 0))
 
     def _find_empty_slot(self, session: PlayerSession) -> int:
-        for i, s in enumerate(session.inventory):
-            if s.item_id == 0:
-                return i
-        return -1
+        return session.inventory.find_empty()
 
     # ━━━ 핸들러: 버프 ━━━
 
+    @packet_handler(MsgType.BUFF_LIST_REQ)
     async def _on_buff_list_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -3345,28 +7564,48 @@ class BridgeServer:
             buf += struct.pack('<IIB', b["buff_id"], remaining, b.get("stacks", 1))
         self._send(session, MsgType.BUFF_LIST_RESP, buf)
 
+    @packet_handler(MsgType.BUFF_APPLY_REQ)
     async def _on_buff_apply(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
         buff_id = struct.unpack('<I', payload[:4])[0]
-        duration_ms = 30000  # 30초
+        duration_ms = int(self.BUFF_DURATION * 1000)
+        expires = time.time() + self.BUFF_DURATION
         session.buffs.append({
             "buff_id": buff_id,
-            "expires": time.time() + duration_ms / 1000,
+            "expires": expires,
             "stacks": 1,
         })
+        # 같은 버프 id는 타이머 하나: 가장 먼저 끝나는 시각에 걸어 둔다
+        timer = self.timers.get("buff", (session.entity_id, buff_id))
+        if timer is None or expires < timer.when:
+            self.timers.schedule("buff", (session.entity_id, buff_id), expires,
+                                 self._expire_buff, session, buff_id)
         self._send(session, MsgType.BUFF_RESULT,
                     struct.pack('<BIBI', 1, buff_id, 1, duration_ms))
 
+    @packet_handler(MsgType.BUFF_REMOVE_REQ)
     async def _on_buff_remove(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
         buff_id = struct.unpack('<I', payload[:4])[0]
         session.buffs = [b for b in session.buffs if b["buff_id"] != buff_id]
+        self.timers.cancel("buff", (session.entity_id, buff_id))
         self._send(session, MsgType.BUFF_REMOVE_RESP, struct.pack('<BI', 1, buff_id))
 
+    def _expire_buff(self, session: PlayerSession, buff_id: int):
+        """버프 타이머 만료: 끝난 것만 지우고, 같은 id가 남아 있으면 다음 만료 시각에 다시 건다"""
+        now = time.time()
+        session.buffs = [b for b in session.buffs
+                         if b["buff_id"] != buff_id or b["expires"] > now]
+        remaining = [b["expires"] for b in session.buffs if b["buff_id"] == buff_id]
+        if remaining:
+            self.timers.schedule("buff", (session.entity_id, buff_id), min(remaining),
+                                 self._expire_buff, session, buff_id)
+
     # ━━━ 핸들러: 루트 ━━━
 
+    @packet_handler(MsgType.LOOT_ROLL_REQ)
     async def _on_loot_roll(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3393,6 +7632,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 퀘스트 ━━━
 
+    @packet_handler(MsgType.QUEST_LIST_REQ)
     async def _on_quest_list_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -3401,6 +7641,7 @@ class BridgeServer:
             buf += struct.pack('<IBII', q["quest_id"], q["state"], q["progress"], q["target"])
         self._send(session, MsgType.QUEST_LIST_RESP, buf)
 
+    @packet_handler(MsgType.QUEST_ACCEPT)
     async def _on_quest_accept(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3417,6 +7658,7 @@ class BridgeServer:
         })
         self._send(session, MsgType.QUEST_ACCEPT_RESULT, struct.pack('<BI', 1, qid))
 
+    @packet_handler(MsgType.QUEST_PROGRESS)
     async def _on_quest_progress(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3427,6 +7669,7 @@ class BridgeServer:
                 self._send(session, MsgType.QUEST_LIST_RESP, struct.pack('<B', 1) + buf)
                 return
 
+    @packet_handler(MsgType.QUEST_COMPLETE)
     async def _on_quest_complete(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3461,6 +7704,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 채팅 ━━━
 
+    @packet_handler(MsgType.CHAT_SEND)
     async def _on_chat_send(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 2:
             return
@@ -3476,18 +7720,18 @@ class BridgeServer:
                    message.encode('utf-8')[:msg_len]
 
         if channel == 0:  # Zone
-            self._broadcast_to_zone(session.zone_id, 0, MsgType.CHAT_MESSAGE, chat_pkt)
+            self._broadcast_to_zone(session.zone_id, 0, MsgType.CHAT_MESSAGE, chat_pkt, session.channel_id)
         elif channel == 1:  # Party
             if session.party_id and session.party_id in self.parties:
-                for eid in self.parties[session.party_id]["members"]:
-                    if eid in self.sessions:
-                        self._send(self.sessions[eid], MsgType.CHAT_MESSAGE, chat_pkt)
+                self._multicast(self._online(self.parties[session.party_id]["members"]),
+                                MsgType.CHAT_MESSAGE, chat_pkt)
         elif channel == 3:  # System (admin only, broadcast to all)
-            self._broadcast_to_all(MsgType.CHAT_MESSAGE, chat_pkt)
+            self._announce(MsgType.CHAT_MESSAGE, chat_pkt)
 
         if self.verbose:
             self.log(f"Chat[ch{channel}] {session.char_name}: {message}", "GAME")
 
+    @packet_handler(MsgType.WHISPER_SEND)
     async def _on_whisper_send(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 2:
             return
@@ -3496,14 +7740,10 @@ class BridgeServer:
         msg_len = payload[1+target_name_len]
         message = payload[2+target_name_len:2+target_name_len+msg_len].decode('utf-8', errors='replace')
 
-        # 대상 찾기
-        target_session = None
-        for s in self.sessions.values():
-            if s.char_name == target_name:
-                target_session = s
-                break
+        # 대상 찾기 (이 프로세스 -> 버스로 연결된 다른 브릿지)
+        target_session = self._find_session_by_name(target_name)
 
-        if not target_session:
+        if not target_session and target_name not in self.remote_players:
             # 실패 응답: WhisperResult::TARGET_NOT_FOUND=1
             other_name = target_name.encode('utf-8')[:32].ljust(32, b'\x00')
             self._send(session, MsgType.WHISPER_RESULT,
@@ -3517,6 +7757,11 @@ class BridgeServer:
                     struct.pack('<BB', 0, 1) + other_name +
                     struct.pack('<B', msg_len) + message.encode('utf-8')[:msg_len])
 
+        if not target_session:
+            self.bus.publish(BUS_TOPIC_WHISPER, BUS_WHISPER.encode(
+                target_name, session.char_name, message.encode('utf-8')[:255].decode('utf-8', errors='ignore')))
+            return
+
         # 수신자에게: WhisperResult::SUCCESS=0, WhisperDirection::RECEIVED=0
         sender_name = session.char_name.encode('utf-8')[:32].ljust(32, b'\x00')
         self._send(target_session, MsgType.WHISPER_RESULT,
@@ -3525,6 +7770,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 상점 ━━━
 
+    @packet_handler(MsgType.SHOP_OPEN)
     async def _on_shop_open(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3533,12 +7779,15 @@ class BridgeServer:
         if not shop:
             return
 
-        items = shop["items"]
-        buf = struct.pack('<IB', npc_id, len(items))
-        for item in items:
-            buf += struct.pack('<IIH', item["item_id"], item["price"], item["stock"])
-        self._send(session, MsgType.SHOP_LIST, buf)
+        def build():
+            items = shop["items"]
+            buf = struct.pack('<IB', npc_id, len(items))
+            for item in items:
+                buf += struct.pack('<IIH', item["item_id"], item["price"], item["stock"])
+            return buf
+        self._send_cached(session, (MsgType.SHOP_LIST, npc_id), build)
 
+    @packet_handler(MsgType.SHOP_BUY)
     async def _on_shop_buy(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 10:
             return
@@ -3550,7 +7799,7 @@ class BridgeServer:
                         struct.pack('<BBIH', 1, 0, item_id, count) + struct.pack('<I', session.gold))
             return
 
-        item_data = next((i for i in shop["items"] if i["item_id"] == item_id), None)
+        item_data = self.index.get("shop_item", (npc_id, item_id))
         if not item_data:
             # ShopResult::ITEM_NOT_FOUND=2, ShopAction::BUY=0
             self._send(session, MsgType.SHOP_RESULT,
@@ -3579,6 +7828,7 @@ class BridgeServer:
                     struct.pack('<BBIH', 0, 0, item_id, count) + struct.pack('<I', session.gold))
         self.log(f"ShopBuy: {session.char_name} bought {item_id}x{count} (-{total_price}g)", "GAME")
 
+    @packet_handler(MsgType.SHOP_SELL)
     async def _on_shop_sell(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 3:
             return
@@ -3606,23 +7856,82 @@ class BridgeServer:
 
     # ━━━ 핸들러: 기타 ━━━
 
+    @packet_handler(MsgType.CONFIG_QUERY)
     async def _on_config_query(self, session: PlayerSession, payload: bytes):
         # 간단한 구현
         self._send(session, MsgType.CONFIG_RESP,
                     struct.pack('<B', 0) + struct.pack('<H', 0))
 
+    def _apply_tables(self):
+        """데이터 테이블 -> 게임 상수. 새 dict를 다 만든 뒤 한 번에 바꾼다 (루프 스레드)"""
+        global MOVEMENT, ZONE_BOUNDS
+        movement = dict(_BUILTIN_MOVEMENT)
+        rules = self.data.get("movement_rules")
+        if rules is not None:
+            for src, key in MOVEMENT_RULE_KEYS:
+                if src in rules.settings:
+                    movement[key] = type(_BUILTIN_MOVEMENT[key])(rules.settings[src])
+        bounds = dict(_BUILTIN_ZONE_BOUNDS)
+        zones = self.data.get("zone_bounds")
+        if zones is not None:
+            # CSV의 y축 = 게임 좌표 z (x/z 평면)
+            for row in zones.rows:
+                bounds[row["zone_id"]] = {"min_x": row["min_x"], "max_x": row["max_x"],
+                                          "min_z": row["min_y"], "max_z": row["max_y"]}
+        ai = self.data.get("monster_ai")
+        if ai is not None:
+            cls = type(self)
+            speed = float(ai.get("move_speed", cls.AI_RETURN_SPEED))
+            self.AI_ATTACK_RANGE = float(ai.get("attack_range", cls.AI_ATTACK_RANGE))
+            self.AI_RETURN_SPEED = speed
+            self.AI_CHASE_SPEED = speed * float(ai.get("chase_speed_mult", cls.AI_CHASE_SPEED / cls.AI_RETURN_SPEED))
+            self.AI_RETURN_ARRIVE = float(ai.get("arrival_threshold", cls.AI_RETURN_ARRIVE))
+            self.AI_LEASH_RANGE = float(ai.get("leash_range", cls.AI_LEASH_RANGE))  # 스폰/리스폰 때 적용
+        MOVEMENT, ZONE_BOUNDS = movement, bounds
+        self.index.rebuild()
+        self._bounty_board = None
+        self.response_cache.invalidate()
+
+    @packet_handler(MsgType.ADMIN_RELOAD)
     async def _on_admin_reload(self, session: PlayerSession, payload: bytes):
+        """ADMIN_RELOAD(280) -> ADMIN_RELOAD_RESULT(281)
+        Request: name_len(u8) + name(utf8)  (empty = 전체)
+        Response: result(u8) + version(u32) + reload_count(u32) + name_len(u8) + name
+                  + reload_us(u32) + table_count(u8) + [name_len(u8) + name + rows(u32)] * count
+        """
         name = ""
         if len(payload) >= 1:
             name_len = payload[0]
             if name_len > 0 and len(payload) >= 1 + name_len:
                 name = payload[1:1+name_len].decode('utf-8', errors='replace')
 
-        self.log(f"AdminReload: '{name}' (requested by {session.char_name})", "GAME")
-        name_bytes = name.encode('utf-8')
-        self._send(session, MsgType.ADMIN_RELOAD_RESULT,
-                    struct.pack('<BIIB', 1, 1, 1, len(name_bytes)) + name_bytes)
+        # 파일 읽기/파싱/인덱스는 워커 스레드, 교체는 여기서 (틱 안 멈춤)
+        t0 = time.perf_counter()
+        try:
+            built = await asyncio.get_running_loop().run_in_executor(
+                None, self.data.build, [name] if name else None)
+        except DataTableError as e:
+            built = {}
+            self.log(f"AdminReload failed: {e}", "ERR")
+        else:
+            self.data.swap(built, reload=True)
+            self._apply_tables()
+        elapsed_us = int((time.perf_counter() - t0) * 1e6)
+        if built:
+            rows = ", ".join(f"{n}={len(t)}" for n, t in built.items())
+            self.log(f"AdminReload: '{name}' v{self.data.version} in {elapsed_us / 1000:.1f}ms [{rows}] "
+                     f"(requested by {session.char_name})", "GAME")
 
+        name_bytes = name.encode('utf-8')
+        resp = struct.pack('<BIIB', 1 if built else 0, self.data.version, self.data.reload_count,
+                           len(name_bytes)) + name_bytes
+        resp += struct.pack('<IB', min(elapsed_us, 0xFFFFFFFF), len(built))
+        for tname, table in built.items():
+            tb = tname.encode('utf-8')[:255]
+            resp += struct.pack('<B', len(tb)) + tb + struct.pack('<I', len(table))
+        self._send(session, MsgType.ADMIN_RELOAD_RESULT, resp)
+
+    @packet_handler(MsgType.ADMIN_GET_CONFIG)
     async def _on_admin_get_config(self, session: PlayerSession, payload: bytes):
         if len(payload) < 2:
             self._send(session, MsgType.ADMIN_CONFIG_RESP,
@@ -3630,69 +7939,46 @@ class BridgeServer:
             return
         name_len = payload[0]
         name = payload[1:1+name_len].decode('utf-8', errors='replace')
-        key_len = payload[1+name_len]
+        key_len = payload[1+name_len] if len(payload) > 1 + name_len else 0
         key = payload[2+name_len:2+name_len+key_len].decode('utf-8', errors='replace')
 
-        # 간단한 config 조회
-        configs = {
-            "monster_ai": {
-                "move_speed": "80.0", "patrol_radius": "100.0",
-                "leash_range": "500.0", "chase_speed_mult": "1.3",
-                "attack_range": "200.0"
-            },
-            "movement_rules": {
-                "base_speed": "200.0", "sprint_multiplier": "1.5",
-                "tolerance": "1.5"
-            },
-        }
-        section = configs.get(name, {})
-        value = section.get(key, "")
-        if value:
-            v_bytes = value.encode('utf-8')
+        # JSON 테이블 설정값 (ConfigLoader GetSettings와 같이 문자열로)
+        table = self.data.get(name)
+        value = table.get(key) if table is not None and key else None
+        if value is not None:
+            v_bytes = str(value).encode('utf-8')
             self._send(session, MsgType.ADMIN_CONFIG_RESP,
                         struct.pack('<BH', 1, len(v_bytes)) + v_bytes)
         else:
             self._send(session, MsgType.ADMIN_CONFIG_RESP,
                         struct.pack('<BH', 0, 0))
 
+    @packet_handler(MsgType.SPATIAL_QUERY_REQ)
     async def _on_spatial_query(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 17:
             return
         x, y, z, radius = struct.unpack_from('<ffff', payload, 0)
         filter_type = payload[16]
 
-        results = []
-        # 플레이어 검색
-        if filter_type in (0, 1):
-            for eid, s in self.sessions.items():
-                if s.zone_id == session.zone_id and s.in_game:
-                    dx = s.pos.x - x
-                    dz = s.pos.z - z
-                    dist = math.sqrt(dx*dx + dz*dz)
-                    if dist <= radius:
-                        results.append((eid, dist))
-
-        # 몬스터 검색
-        if filter_type in (0, 2):
-            for mid, m in self.monsters.items():
-                if m["zone"] == session.zone_id and m["ai"].state != 5:
-                    dx = m["pos"].x - x
-                    dz = m["pos"].z - z
-                    dist = math.sqrt(dx*dx + dz*dz)
-                    if dist <= radius:
-                        results.append((mid, dist))
-
-        results.sort(key=lambda r: r[1])
-        buf = struct.pack('<B', min(len(results), 255))
-        for eid, dist in results[:255]:
-            buf += struct.pack('<Qf', eid, dist)
-        self._send(session, MsgType.SPATIAL_QUERY_RESP, buf)
-
+        hits = self._query_radius(session.space, x, z, radius,
+                                  players=filter_type in (0, 1),
+                                  monsters=filter_type in (0, 2),
+                                  limit=255)
+        flat = []
+        for d2, eid in hits:
+            flat.append(eid)
+            flat.append(math.sqrt(d2))
+        self._send(session, MsgType.SPATIAL_QUERY_RESP,
+                   struct.pack('<B' + 'Qf' * len(hits), len(hits), *flat))
+
+    @packet_handler(MsgType.GHOST_QUERY)
     async def _on_ghost_query(self, session: PlayerSession, payload: bytes):
-        self._send(session, MsgType.GHOST_INFO, struct.pack('<I', 0))
+        """이 프로세스가 비추고 있는 고스트 수 (인접 존 경계 근처 플레이어)"""
+        self._send(session, MsgType.GHOST_INFO, struct.pack('<I', self.ghost_count()))
 
     # ━━━ 핸들러: 길드 (문파) ━━━
 
+    @packet_handler(MsgType.GUILD_CREATE)
     async def _on_guild_create(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             self._send(session, MsgType.GUILD_INFO, struct.pack('<BI', 1, 0) + b'\x00' * 42)
@@ -3721,11 +8007,13 @@ class BridgeServer:
             "exp": 0,
             "created": time.time()
         }
+        self.store.guild.save(gid, self.guilds[gid])
         session.guild_id = gid
 
         self.log(f"GuildCreate: {guild_name} (id={gid}, master={session.char_name})", "GAME")
         self._send_guild_info(session)
 
+    @packet_handler(MsgType.GUILD_DISBAND)
     async def _on_guild_disband(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.guild_id:
             return
@@ -3739,16 +8027,16 @@ class BridgeServer:
             return  # not master
 
         # Notify all members
-        for member_id in guild["members"]:
-            if member_id in self.sessions:
-                member_session = self.sessions[member_id]
-                member_session.guild_id = 0
-                empty_info = struct.pack('<BI', 0, 0) + b'\x00' * 42
-                self._send(member_session, MsgType.GUILD_INFO, empty_info)
+        members = list(self._online(guild["members"]))
+        for member_session in members:
+            member_session.guild_id = 0
+        self._multicast(members, MsgType.GUILD_INFO, struct.pack('<BI', 0, 0) + b'\x00' * 42)
 
         del self.guilds[gid]
+        self.store.guild.delete(gid)
         self.log(f"GuildDisband: {guild['name']} (id={gid})", "GAME")
 
+    @packet_handler(MsgType.GUILD_INVITE)
     async def _on_guild_invite(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8 or not session.guild_id:
             return
@@ -3781,6 +8069,7 @@ class BridgeServer:
 
         self.log(f"GuildInvite: {session.char_name} invited {target_session.char_name} to {guild['name']}", "GAME")
 
+    @packet_handler(MsgType.GUILD_ACCEPT)
     async def _on_guild_accept(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -3801,15 +8090,15 @@ class BridgeServer:
 
         # Add to guild
         guild["members"].append(session.entity_id)
+        self.store.guild.save(gid, guild)
         session.guild_id = gid
 
         self.log(f"GuildAccept: {session.char_name} joined {guild['name']}", "GAME")
 
         # Send updated guild info to all members
-        for member_id in guild["members"]:
-            if member_id in self.sessions:
-                self._send_guild_info(self.sessions[member_id])
+        self._multicast_guild_info(guild)
 
+    @packet_handler(MsgType.GUILD_LEAVE)
     async def _on_guild_leave(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.guild_id:
             return
@@ -3827,18 +8116,18 @@ class BridgeServer:
         # Remove from guild
         if session.entity_id in guild["members"]:
             guild["members"].remove(session.entity_id)
+            self.store.guild.save(gid, guild)
 
         session.guild_id = 0
         empty_info = struct.pack('<BI', 0, 0) + b'\x00' * 42
         self._send(session, MsgType.GUILD_INFO, empty_info)
 
         # Notify remaining members
-        for member_id in guild["members"]:
-            if member_id in self.sessions:
-                self._send_guild_info(self.sessions[member_id])
+        self._multicast_guild_info(guild)
 
         self.log(f"GuildLeave: {session.char_name} left {guild['name']}", "GAME")
 
+    @packet_handler(MsgType.GUILD_KICK)
     async def _on_guild_kick(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8 or not session.guild_id:
             return
@@ -3860,6 +8149,7 @@ class BridgeServer:
 
         # Remove target
         guild["members"].remove(target_entity)
+        self.store.guild.save(gid, guild)
         if target_entity in self.sessions:
             target_session = self.sessions[target_entity]
             target_session.guild_id = 0
@@ -3867,29 +8157,24 @@ class BridgeServer:
             self._send(target_session, MsgType.GUILD_INFO, empty_info)
 
         # Notify remaining members
-        for member_id in guild["members"]:
-            if member_id in self.sessions:
-                self._send_guild_info(self.sessions[member_id])
+        self._multicast_guild_info(guild)
 
         self.log(f"GuildKick: {session.char_name} kicked entity {target_entity} from {guild['name']}", "GAME")
 
+    @packet_handler(MsgType.GUILD_INFO_REQ)
     async def _on_guild_info_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
         self._send_guild_info(session)
 
+    @packet_handler(MsgType.GUILD_LIST_REQ)
     async def _on_guild_list_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
 
-        count = min(len(self.guilds), 255)
-        buf = struct.pack('<B', count)
-        for guild in list(self.guilds.values())[:255]:
-            name_bytes = guild["name"].encode('utf-8')[:32].ljust(32, b'\x00')
-            buf += struct.pack('<I', guild["id"])
-            buf += name_bytes
-            buf += struct.pack('<BB', len(guild["members"]), guild["level"])
-        self._send(session, MsgType.GUILD_LIST, buf)
+        guilds = [(g["id"], g["name"], len(g["members"]), g["level"])
+                  for g in list(self.guilds.values())[:255]]
+        self._send_msg(session, Schema.GUILD_LIST, guilds)
 
     def _send_guild_info(self, session: PlayerSession):
         if not session.guild_id or session.guild_id not in self.guilds:
@@ -3898,14 +8183,18 @@ class BridgeServer:
             return
 
         guild = self.guilds[session.guild_id]
-        name_bytes = guild["name"].encode('utf-8')[:32].ljust(32, b'\x00')
-        buf = struct.pack('<BI', 0, guild["id"])  # result=0 (success)
-        buf += name_bytes
-        buf += struct.pack('<QBB', guild["master_id"], len(guild["members"]), guild["level"])
-        self._send(session, MsgType.GUILD_INFO, buf)
+        self._send_msg(session, Schema.GUILD_INFO, 0, guild["id"], guild["name"],  # result=0 (success)
+                       guild["master_id"], len(guild["members"]), guild["level"])
+
+    def _multicast_guild_info(self, guild: dict):
+        """길드원 전원에게 같은 GUILD_INFO"""
+        payload = Schema.GUILD_INFO.encode(0, guild["id"], guild["name"], guild["master_id"],
+                                           len(guild["members"]), guild["level"])
+        self._multicast(self._online(guild["members"]), MsgType.GUILD_INFO, payload)
 
     # ━━━ 핸들러: 거래 ━━━
 
+    @packet_handler(MsgType.TRADE_REQUEST)
     async def _on_trade_request(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8:
             return
@@ -3945,6 +8234,7 @@ class BridgeServer:
 
         self.log(f"TradeRequest: {session.char_name} → {target_session.char_name}", "GAME")
 
+    @packet_handler(MsgType.TRADE_ACCEPT)
     async def _on_trade_accept(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 8:
             return
@@ -3964,6 +8254,7 @@ class BridgeServer:
 
         self.log(f"TradeAccept: {requester.char_name} ↔ {session.char_name}", "GAME")
 
+    @packet_handler(MsgType.TRADE_DECLINE)
     async def _on_trade_decline(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.trade_partner:
             return
@@ -3983,6 +8274,7 @@ class BridgeServer:
         session.trade_confirmed = False
         self._send(session, MsgType.TRADE_RESULT, struct.pack('<B', 3))  # declined
 
+    @packet_handler(MsgType.TRADE_ADD_ITEM)
     async def _on_trade_add_item(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.trade_partner or len(payload) < 3:
             return
@@ -4007,6 +8299,7 @@ class BridgeServer:
             add_pkt = struct.pack('<BIH', slot_index, slot.item_id, count)
             self._send(partner, MsgType.TRADE_ADD_ITEM, add_pkt)
 
+    @packet_handler(MsgType.TRADE_ADD_GOLD)
     async def _on_trade_add_gold(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.trade_partner or len(payload) < 4:
             return
@@ -4025,6 +8318,7 @@ class BridgeServer:
             # Send to partner
             self._send(partner, MsgType.TRADE_ADD_GOLD, struct.pack('<I', amount))
 
+    @packet_handler(MsgType.TRADE_CONFIRM)
     async def _on_trade_confirm(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.trade_partner:
             return
@@ -4108,6 +8402,7 @@ class BridgeServer:
         partner.gold += session.trade_gold
         partner.gold -= partner.trade_gold
         session.gold += partner.trade_gold
+        self._save_now(session, partner)
 
         # Send success
         self._send(session, MsgType.TRADE_RESULT, struct.pack('<B', 0))  # complete
@@ -4125,6 +8420,7 @@ class BridgeServer:
         partner.trade_gold = 0
         partner.trade_confirmed = False
 
+    @packet_handler(MsgType.TRADE_CANCEL)
     async def _on_trade_cancel(self, session: PlayerSession, payload: bytes):
         if not session.in_game or not session.trade_partner:
             return
@@ -4146,6 +8442,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 우편 ━━━
 
+    @packet_handler(MsgType.MAIL_SEND)
     async def _on_mail_send(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 3:
             return
@@ -4180,16 +8477,14 @@ class BridgeServer:
             return
         gold, item_id, item_count = struct.unpack_from('<IIH', payload, offset)
 
-        # Find recipient
-        recipient_session = None
-        recipient_account_id = 0
-        for s in self.sessions.values():
-            if s.char_name == recipient_name:
-                recipient_session = s
-                recipient_account_id = s.account_id
-                break
-
-        if not recipient_session:
+        # Find recipient (이 프로세스 -> 버스로 연결된 다른 브릿지)
+        recipient_session = self._find_session_by_name(recipient_name)
+        recipient_server = 0
+        if recipient_session:
+            recipient_account_id = recipient_session.account_id
+        elif recipient_name in self.remote_players:
+            recipient_account_id, recipient_server = self.remote_players[recipient_name]
+        else:
             self._send(session, MsgType.MAIL_DELETE_RESULT, struct.pack('<BI', 1, 0))  # recipient not found
             return
 
@@ -4231,14 +8526,21 @@ class BridgeServer:
             "read": False,
             "claimed": False,
             "sent_time": time.time(),
-            "expires": time.time() + 7 * 86400
+            "expires": time.time() + self.MAIL_EXPIRE_SEC
         }
 
-        if recipient_account_id not in self.mails:
-            self.mails[recipient_account_id] = []
+        if recipient_server:
+            # 다른 브릿지 프로세스 접속자: 버스로 넘기고 그쪽이 우편함에 넣는다 (우편함 개수는 그쪽 사정)
+            forward = _BUS_MAIL.pack(recipient_server, recipient_account_id) + json.dumps(mail).encode('utf-8')
+            if self._bus_link is None:
+                error = 1  # 버스 링크가 끊김 — 받을 프로세스에 닿지 않는다
+            else:
+                error = 4 if len(forward) > BUS_MAX_DATA else 0
+        else:
+            error = 4 if len(self.mails.get(recipient_account_id, ())) >= 50 else 0  # mailbox full
 
-        if len(self.mails[recipient_account_id]) >= 50:
-            self._send(session, MsgType.MAIL_DELETE_RESULT, struct.pack('<BI', 4, 0))  # mailbox full
+        if error:
+            self._send(session, MsgType.MAIL_DELETE_RESULT, struct.pack('<BI', error, 0))
             # Refund
             session.gold += gold
             if item_id > 0:
@@ -4248,11 +8550,32 @@ class BridgeServer:
                     session.inventory[slot].count = item_count
             return
 
-        self.mails[recipient_account_id].append(mail)
+        if recipient_server:
+            self.bus.publish(BUS_TOPIC_MAIL, forward, BusPriority.CRITICAL)  # 재화가 실림 — 큐가 넘쳐도 안 버린다
+        else:
+            self._deliver_mail(recipient_account_id, mail)
+        self._save_now(session)
 
         self._send(session, MsgType.MAIL_DELETE_RESULT, struct.pack('<BI', 0, mail_id))  # success
         self.log(f"MailSend: {session.char_name} → {recipient_name} (id={mail_id})", "GAME")
 
+    def _deliver_mail(self, account_id: int, mail: dict):
+        """우편함에 넣고 저장"""
+        self._track_mail(account_id, mail)
+        self.store.mail.save(mail["id"], mail, account_id)
+
+    def _track_mail(self, account_id: int, mail: dict):
+        """우편함에 넣고 mail["expires"]에 만료 타이머를 건다"""
+        self.mails.setdefault(account_id, []).append(mail)
+        self.timers.schedule("mail", mail["id"], mail["expires"], self._expire_mail, account_id, mail["id"])
+
+    def _expire_mail(self, account_id: int, mail_id: int):
+        mails = self.mails.get(account_id)
+        if mails:
+            self.mails[account_id] = [m for m in mails if m["id"] != mail_id]
+        self.store.mail.delete(mail_id)
+
+    @packet_handler(MsgType.MAIL_LIST_REQ)
     async def _on_mail_list_req(self, session: PlayerSession, payload: bytes):
         if not session.in_game:
             return
@@ -4262,10 +8585,6 @@ class BridgeServer:
             self._send(session, MsgType.MAIL_LIST, struct.pack('<B', 0))
             return
 
-        # Clean expired mails
-        now = time.time()
-        self.mails[account_id] = [m for m in self.mails[account_id] if m["expires"] > now]
-
         mails = self.mails[account_id]
         count = min(len(mails), 255)
         buf = struct.pack('<B', count)
@@ -4279,6 +8598,7 @@ class BridgeServer:
             buf += struct.pack('<BBI', 1 if mail["read"] else 0, has_attachment, int(mail["sent_time"]))
         self._send(session, MsgType.MAIL_LIST, buf)
 
+    @packet_handler(MsgType.MAIL_READ)
     async def _on_mail_read(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -4296,6 +8616,7 @@ class BridgeServer:
 
         # Mark as read
         mail["read"] = True
+        self.store.mail.save(mail_id, mail, account_id)
 
         sender_name_bytes = mail["sender_name"].encode('utf-8')[:32].ljust(32, b'\x00')
         subject_bytes = mail["subject"].encode('utf-8')[:64].ljust(64, b'\x00')
@@ -4307,6 +8628,7 @@ class BridgeServer:
         buf += struct.pack('<IIH', mail["gold"], mail["item_id"], mail["item_count"])
         self._send(session, MsgType.MAIL_READ_RESP, buf)
 
+    @packet_handler(MsgType.MAIL_CLAIM)
     async def _on_mail_claim(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -4346,9 +8668,12 @@ class BridgeServer:
                 return
 
         mail["claimed"] = True
+        self.store.mail.save(mail_id, mail, account_id)
+        self._save_now(session)
         self._send(session, MsgType.MAIL_CLAIM_RESULT,
                     struct.pack('<BIIIH', 0, mail_id, mail["gold"], mail["item_id"], mail["item_count"]))
 
+    @packet_handler(MsgType.MAIL_DELETE)
     async def _on_mail_delete(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -4371,10 +8696,13 @@ class BridgeServer:
 
         # Delete mail
         self.mails[account_id].remove(mail)
+        self.timers.cancel("mail", mail_id)
+        self.store.mail.delete(mail_id)
         self._send(session, MsgType.MAIL_DELETE_RESULT, struct.pack('<BI', 0, mail_id))
 
     # ━━━ 핸들러: 서버 선택 ━━━
 
+    @packet_handler(MsgType.SERVER_LIST_REQ)
     async def _on_server_list_req(self, session: PlayerSession, payload: bytes):
         count = len(SERVER_LIST_DATA)
         buf = struct.pack('<B', count)
@@ -4387,6 +8715,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: 캐릭터 CRUD ━━━
 
+    @packet_handler(MsgType.CHARACTER_LIST_REQ)
     async def _on_character_list_req(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_LIST, struct.pack('<B', 0))
@@ -4400,6 +8729,7 @@ class BridgeServer:
         self._send(session, MsgType.CHARACTER_LIST, buf)
         self.log(f"CharacterList: {len(chars)} chars for account {session.account_id}", "GAME")
 
+    @packet_handler(MsgType.CHARACTER_CREATE)
     async def _on_character_create(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_CREATE_RESULT, struct.pack('<BI', 1, 0))
@@ -4430,9 +8760,11 @@ class BridgeServer:
         if session.account_id not in self.characters:
             self.characters[session.account_id] = []
         self.characters[session.account_id].append(new_char)
+        self.store.characters.save(session.account_id, self.characters[session.account_id], session.account_id)
         self.log(f"CharCreate: {char_name} class={char_class} (account={session.account_id})", "GAME")
         self._send(session, MsgType.CHARACTER_CREATE_RESULT, struct.pack('<BI', 0, char_id))
 
+    @packet_handler(MsgType.CHARACTER_DELETE)
     async def _on_character_delete(self, session: PlayerSession, payload: bytes):
         if not session.logged_in:
             self._send(session, MsgType.CHARACTER_DELETE_RESULT, struct.pack('<BI', 2, 0))
@@ -4447,11 +8779,13 @@ class BridgeServer:
             self._send(session, MsgType.CHARACTER_DELETE_RESULT, struct.pack('<BI', 1, char_id))
             return
         chars.remove(target)
+        self.store.characters.save(session.account_id, chars, session.account_id)
         self.log(f"CharDelete: {target['name']} id={char_id} (account={session.account_id})", "GAME")
         self._send(session, MsgType.CHARACTER_DELETE_RESULT, struct.pack('<BI', 0, char_id))
 
     # ━━━ 핸들러: 튜토리얼 ━━━
 
+    @packet_handler(MsgType.TUTORIAL_STEP_COMPLETE)
     async def _on_tutorial_step_complete(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 1:
             return
@@ -4497,6 +8831,7 @@ class BridgeServer:
 
     # ━━━ 핸들러: NPC 대화 (P1_S04_S01) ━━━
 
+    @packet_handler(MsgType.NPC_INTERACT)
     async def _on_npc_interact(self, session: PlayerSession, payload: bytes):
         if not session.in_game or len(payload) < 4:
             return
@@ -4515,25 +8850,29 @@ class BridgeServer:
         if not dialogs:
             return
         npc_id = npc["npc_id"]
-        npc_type_val = {"quest": 0, "shop": 1, "blacksmith": 2, "skill": 3}.get(npc["type"], 0)
         line_count = len(dialogs)
-        # 대화 패킷: npc_id(u16) + npc_type(u8) + line_count(u8) + [speaker_len(u8) + speaker + text_len(u16) + text] * N
-        buf = struct.pack("<HBB", npc_id, npc_type_val, line_count)
-        for d in dialogs:
-            speaker_bytes = d["speaker"].encode("utf-8")[:32]
-            text_bytes = d["text"].encode("utf-8")[:256]
-            buf += struct.pack("<B", len(speaker_bytes)) + speaker_bytes
-            buf += struct.pack("<H", len(text_bytes)) + text_bytes
-        # quest_ids 추가: quest_count(u8) + [quest_id(u32)] * N
-        quest_ids = npc.get("quest_ids", [])
-        buf += struct.pack("<B", len(quest_ids))
-        for qid in quest_ids:
-            buf += struct.pack("<I", qid)
-        self._send(session, MsgType.NPC_DIALOG, buf)
+
+        def build():
+            npc_type_val = {"quest": 0, "shop": 1, "blacksmith": 2, "skill": 3}.get(npc["type"], 0)
+            # 대화 패킷: npc_id(u16) + npc_type(u8) + line_count(u8) + [speaker_len(u8) + speaker + text_len(u16) + text] * N
+            buf = struct.pack("<HBB", npc_id, npc_type_val, line_count)
+            for d in dialogs:
+                speaker_bytes = d["speaker"].encode("utf-8")[:32]
+                text_bytes = d["text"].encode("utf-8")[:256]
+                buf += struct.pack("<B", len(speaker_bytes)) + speaker_bytes
+                buf += struct.pack("<H", len(text_bytes)) + text_bytes
+            # quest_ids 추가: quest_count(u8) + [quest_id(u32)] * N
+            quest_ids = npc.get("quest_ids", [])
+            buf += struct.pack("<B", len(quest_ids))
+            for qid in quest_ids:
+                buf += struct.pack("<I", qid)
+            return buf
+        self._send_cached(session, (MsgType.NPC_DIALOG, npc_id), build)
         self.log(f"NPC Dialog: npc_id={npc_id} lines={line_count} ({session.char_name})", "GAME")
 
     # ━━━ 핸들러: 강화 (P2_S02_S01) ━━━
 
+    @packet_handler(MsgType.ENHANCE_REQ)
     async def _on_enhance_req(self, session: PlayerSession, payload: bytes):
         """ENHANCE_REQ: slot_index(u8). 해당 슬롯 장비를 강화."""
         if not session.in_game or len(payload) < 1:
@@ -4568,6 +8907,7 @@ class BridgeServer:
 
     # ━━━ 던전 매칭 시스템 (P2_S03_S01) ━━━
 
+    @packet_handler(MsgType.MATCH_ENQUEUE)
     async def _on_match_enqueue(self, session: PlayerSession, payload: bytes):
         """MATCH_ENQUEUE: dungeon_id(u8)+difficulty(u8) 또는 dungeon_id(u32). 매칭 큐 등록."""
         if not session.in_game or len(payload) < 1:
@@ -4582,7 +8922,7 @@ class BridgeServer:
             dungeon_id = payload[0]
             difficulty = payload[1] if len(payload) >= 2 else 0
             is_client_format = False
-        dungeon = next((d for d in DUNGEON_LIST_DATA if d["id"] == dungeon_id), None)
+        dungeon = self.index.get("dungeon", dungeon_id)
         if not dungeon:
             if is_client_format:
                 self._send(session, MsgType.MATCH_STATUS, struct.pack("<BI", 1, 0))
@@ -4642,9 +8982,10 @@ class BridgeServer:
         self.instances[inst_id] = instance
         self.log(f"Instance #{inst_id} created: {dungeon['name']} ({diff_name}) with {len(instance['players'])} players", "GAME")
         # MATCH_FOUND: instance_id(u32) + dungeon_id(u8) + difficulty(u8)
-        for s in instance["players"]:
-            self._send(s, MsgType.MATCH_FOUND, struct.pack("<IBB", inst_id, dungeon["id"], instance["difficulty"]))
+        self._multicast(instance["players"], MsgType.MATCH_FOUND,
+                        struct.pack("<IBB", inst_id, dungeon["id"], instance["difficulty"]))
 
+    @packet_handler(MsgType.MATCH_DEQUEUE)
     async def _on_match_dequeue(self, session: PlayerSession, payload: bytes):
         """MATCH_DEQUEUE: dungeon_id(u8) 또는 빈 페이로드. 매칭 큐 이탈."""
         if not session.in_game:
@@ -4668,6 +9009,7 @@ class BridgeServer:
                     del self.match_queue[qk]
             self.log(f"MatchQueue: {session.char_name} dequeued (all)", "GAME")
 
+    @packet_handler(MsgType.MATCH_ACCEPT)
     async def _on_match_accept(self, session: PlayerSession, payload: bytes):
         """MATCH_ACCEPT: instance_id(u32). 매칭 수락 (현재는 자동 수락)."""
         if not session.in_game or len(payload) < 4:
@@ -4689,13 +9031,14 @@ class BridgeServer:
         buf += struct.pack("<B", len(instance["players"]))
         self._send(session, MsgType.INSTANCE_INFO, buf)
 
+    @packet_handler(MsgType.INSTANCE_CREATE)
     async def _on_instance_create(self, session: PlayerSession, payload: bytes):
         """INSTANCE_CREATE: dungeon_type(u32). 즉시 인스턴스 생성 + 입장."""
         if not session.in_game or len(payload) < 4:
             return
         dungeon_type = struct.unpack("<I", payload[:4])[0]
         # 던전 데이터에서 찾기
-        dungeon = next((d for d in DUNGEON_LIST_DATA if d["id"] == dungeon_type), None)
+        dungeon = self.index.get("dungeon", dungeon_type)
         if not dungeon:
             # 기본 던전 데이터 생성 (클라이언트 테스트용)
             dungeon = {"id": dungeon_type, "name": f"Dungeon_{dungeon_type}", "type": "party",
@@ -4722,10 +9065,12 @@ class BridgeServer:
         session.pos.x = 50.0
         session.pos.y = 0.0
         session.pos.z = 50.0
+        self._aoi_update(session)
         self.log(f"InstanceCreate: {session.char_name} -> Instance#{inst_id} dungeon={dungeon_type}", "GAME")
         # INSTANCE_ENTER 응답: result(u8) + instance_id(u32) + dungeon_type(u32)
         self._send(session, MsgType.INSTANCE_ENTER, struct.pack("<BII", 0, inst_id, dungeon_type))
 
+    @packet_handler(MsgType.INSTANCE_ENTER)
     async def _on_instance_enter(self, session: PlayerSession, payload: bytes):
         """INSTANCE_ENTER: instance_id(u32). 던전 인스턴스 입장."""
         if not session.in_game or len(payload) < 4:
@@ -4744,9 +9089,11 @@ class BridgeServer:
         session.pos.x = 50.0
         session.pos.y = 0.0
         session.pos.z = 50.0
+        self._aoi_update(session)
         self.log(f"InstanceEnter: {session.char_name} → Instance#{inst_id} zone={instance['zone_id']}", "GAME")
         await self._send_instance_info(session, instance)
 
+    @packet_handler(MsgType.INSTANCE_LEAVE)
     async def _on_instance_leave(self, session: PlayerSession, payload: bytes):
         """INSTANCE_LEAVE: instance_id(u32) 또는 빈 페이로드. 던전 퇴장."""
         if not session.in_game:
@@ -4783,6 +9130,7 @@ class BridgeServer:
         session.pos.x = 150.0
         session.pos.y = 0.0
         session.pos.z = 150.0
+        self._aoi_update(session)
         session._current_instance_id = None
         self.log(f"InstanceLeave: {session.char_name} <- Instance#{inst_id}", "GAME")
         if is_client_format:
@@ -4816,6 +9164,7 @@ class BridgeServer:
         new_l = max(0, int(loser_r + k * (0.0 - exp_l)))
         return new_w, new_l
 
+    @packet_handler(MsgType.PVP_QUEUE_REQ)
     async def _on_pvp_queue_req(self, session: PlayerSession, payload: bytes):
         """PVP_QUEUE_REQ: mode(u8). 아레나 매칭 큐 등록."""
         if not session.in_game or len(payload) < 1:
@@ -4888,11 +9237,10 @@ class BridgeServer:
         self.pvp_matches[match_id] = match_data
         self.log(f"PvP Match #{match_id} created: {mode['name']} ({len(team_a)}v{len(team_b)})", "PVP")
         # PVP_MATCH_FOUND 전송
-        for entry in all_players:
-            s = entry["session"]
-            team_id = 0 if s in match_data["team_a"] else 1
-            self._send(s, MsgType.PVP_MATCH_FOUND, struct.pack("<IBB", match_id, mode_id, team_id))
+        for team_id, team in enumerate((match_data["team_a"], match_data["team_b"])):
+            self._multicast(team, MsgType.PVP_MATCH_FOUND, struct.pack("<IBB", match_id, mode_id, team_id))
 
+    @packet_handler(MsgType.PVP_QUEUE_CANCEL)
     async def _on_pvp_queue_cancel(self, session: PlayerSession, payload: bytes):
         """PVP_QUEUE_CANCEL: mode(u8). 큐에서 이탈."""
         if not session.in_game or len(payload) < 1:
@@ -4903,6 +9251,7 @@ class BridgeServer:
         self.log(f"PvPQueue: {session.char_name} left mode={mode_id}", "PVP")
         self._send(session, MsgType.PVP_QUEUE_STATUS, struct.pack("<BBH", mode_id, 4, 0))  # 4=CANCELLED
 
+    @packet_handler(MsgType.PVP_MATCH_ACCEPT)
     async def _on_pvp_match_accept(self, session: PlayerSession, payload: bytes):
         """PVP_MATCH_ACCEPT: match_id(u32). 매치 수락 → 시작."""
         if not session.in_game or len(payload) < 4:
@@ -4919,12 +9268,14 @@ class BridgeServer:
             all_players = match["team_a"] + match["team_b"]
             for s in all_players:
                 s.zone_id = match["zone_id"]
+                self._aoi_update(s)
             # PVP_MATCH_START 전송: match_id(u32) + mode(u8) + time_limit(u16)
-            for s in all_players:
-                team_id = 0 if s in match["team_a"] else 1
-                self._send(s, MsgType.PVP_MATCH_START, struct.pack("<IBH", match_id, team_id, match["mode"]["time_limit"]))
+            for team_id, team in enumerate((match["team_a"], match["team_b"])):
+                self._multicast(team, MsgType.PVP_MATCH_START,
+                                struct.pack("<IBH", match_id, team_id, match["mode"]["time_limit"]))
             self.log(f"PvP Match #{match_id} STARTED", "PVP")
 
+    @packet_handler(MsgType.PVP_ATTACK)
     async def _on_pvp_attack(self, session: PlayerSession, payload: bytes):
         """PVP_ATTACK: match_id(u32) + target_team(u8) + target_idx(u8) + skill_id(u16) + damage(u16)."""
         if not session.in_game or len(payload) < 10:
@@ -4948,8 +9299,7 @@ class BridgeServer:
         # PVP_ATTACK_RESULT: match_id(u32) + attacker_team(u8) + target_team(u8) + target_idx(u8) + damage(u16) + remaining_hp(u32)
         attacker_team = 0 if session in match["team_a"] else 1
         result_pkt = struct.pack("<IBBBHI", match_id, attacker_team, target_team, target_idx, damage, new_hp)
-        for s in match["team_a"] + match["team_b"]:
-            self._send(s, MsgType.PVP_ATTACK_RESULT, result_pkt)
+        self._multicast(match["team_a"] + match["team_b"], MsgType.PVP_ATTACK_RESULT, result_pkt)
         # 승패 확인
         if new_hp <= 0:
             alive_a = sum(1 for s in match["team_a"] if match["team_a_hp"].get(id(s), 0) > 0)
@@ -4987,6 +9337,7 @@ class BridgeServer:
         all_players = match["team_a"] + match["team_b"]
         for s in all_players:
             r_info = self._get_pvp_rating(s.username)
+            self.store.ratings.save(s.username, r_info)
             team_id = 0 if s in match["team_a"] else 1
             won = 1 if team_id == winner_team else 0
             tier_str = self._get_tier(r_info["rating"])
@@ -4996,6 +9347,7 @@ class BridgeServer:
             self._send(s, MsgType.PVP_MATCH_END, buf)
             # 마을로 복귀
             s.zone_id = 10
+            self._aoi_update(s)
         self.log(f"PvP Match #{match_id} ended: Team {winner_team} wins", "PVP")
 
     # ━━━ 레이드 보스 기믹 시스템 (P3_S02_S01) ━━━
@@ -5035,10 +9387,10 @@ class BridgeServer:
         buf += struct.pack("<IIBB", raid_data["max_hp"], raid_data["current_hp"],
                            raid_data["phase"], raid_data["max_phases"])
         buf += struct.pack("<H", raid_data["enrage_timer"])
-        for s in instance.get("players", []):
-            self._send(s, MsgType.RAID_BOSS_SPAWN, buf)
+        self._multicast(instance.get("players", ()), MsgType.RAID_BOSS_SPAWN, buf)
         self.log(f"Raid Boss spawned: {raid_data['boss_name']} ({diff_name}) in Instance#{instance_id}", "RAID")
 
+    @packet_handler(MsgType.RAID_ATTACK)
     async def _on_raid_attack(self, session: PlayerSession, payload: bytes):
         """RAID_ATTACK: instance_id(u32) + skill_id(u16) + damage(u32)."""
         if not session.in_game or len(payload) < 10:
@@ -5059,19 +9411,17 @@ class BridgeServer:
         if raid.get("mechanic_active") == "stagger_check":
             raid["stagger_gauge"] = min(100, raid["stagger_gauge"] + 15)
             stagger_buf = struct.pack("<IB", inst_id, raid["stagger_gauge"])
-            for s in instance.get("players", []):
-                self._send(s, MsgType.RAID_STAGGER, stagger_buf)
+            self._multicast(instance.get("players", ()), MsgType.RAID_STAGGER, stagger_buf)
             if raid["stagger_gauge"] >= 100:
                 raid["mechanic_active"] = None
                 raid["stagger_gauge"] = 0
                 # 기믹 성공
-                for s in instance.get("players", []):
-                    self._send(s, MsgType.RAID_MECHANIC_RESULT, struct.pack("<IBB", inst_id, 2, 1))  # id=2(stagger), success=1
+                self._multicast(instance.get("players", ()), MsgType.RAID_MECHANIC_RESULT,
+                                struct.pack("<IBB", inst_id, 2, 1))  # id=2(stagger), success=1
         # RAID_ATTACK_RESULT 전송
         result_buf = struct.pack("<IHI II", inst_id, skill_id, raw_dmg,
                                 raid["current_hp"], raid["max_hp"])
-        for s in instance.get("players", []):
-            self._send(s, MsgType.RAID_ATTACK_RESULT, result_buf)
+        self._multicast(instance.get("players", ()), MsgType.RAID_ATTACK_RESULT, result_buf)
         # 페이즈 전환 체크
         thresholds = raid["phase_thresholds"]
         for i, thr in enumerate(thresholds):
@@ -5079,8 +9429,7 @@ class BridgeServer:
             if hp_pct <= thr and raid["phase"] < target_phase:
                 raid["phase"] = target_phase
                 phase_buf = struct.pack("<IBB", inst_id, raid["phase"], raid["max_phases"])
-                for s in instance.get("players", []):
-                    self._send(s, MsgType.RAID_PHASE_CHANGE, phase_buf)
+                self._multicast(instance.get("players", ()), MsgType.RAID_PHASE_CHANGE, phase_buf)
                 self.log(f"Raid Boss phase → {raid['phase']} (HP {hp_pct:.1%})", "RAID")
                 # 새 페이즈 기믹 발동
                 mechanics = raid["mechanics"].get(raid["phase"], [])
@@ -5105,8 +9454,7 @@ class BridgeServer:
             raid["stagger_gauge"] = 0
         # RAID_MECHANIC 전송: instance_id(u32) + mechanic_id(u8) + phase(u8)
         buf = struct.pack("<IBB", inst_id, mech_def["id"], raid["phase"])
-        for s in instance.get("players", []):
-            self._send(s, MsgType.RAID_MECHANIC, buf)
+        self._multicast(instance.get("players", ()), MsgType.RAID_MECHANIC, buf)
         self.log(f"Raid Mechanic: {mechanic_name} (phase {raid['phase']}) in Instance#{inst_id}", "RAID")
 
     async def _raid_clear(self, inst_id: int):
@@ -5127,7 +9475,7 @@ class BridgeServer:
             _dt_reward = DUNGEON_TOKEN_REWARDS.get(diff, 50)
             s.dungeon_token = min(s.dungeon_token + _dt_reward, CURRENCY_MAX["dungeon_token"])
             s.stats.add_exp(rewards["exp"])
-            self._send(s, MsgType.RAID_CLEAR, buf)
+        self._multicast(instance.get("players", ()), MsgType.RAID_CLEAR, buf)
         self.log(f"Raid CLEAR! Instance#{inst_id} ({diff}) - rewards: {rewards}", "RAID")
 
     async def _raid_wipe(self, inst_id: int):
@@ -5138,9 +9486,10 @@ class BridgeServer:
             return
         raid["active"] = False
         buf = struct.pack("<IB", inst_id, raid["phase"])
+        self._multicast(instance.get("players", ()), MsgType.RAID_WIPE, buf)
         for s in instance.get("players", []):
-            self._send(s, MsgType.RAID_WIPE, buf)
             s.zone_id = 10  # 마을로 복귀
+            self._aoi_update(s)
         self.log(f"Raid WIPE at phase {raid['phase']} in Instance#{inst_id}", "RAID")
 
     # ━━━ 몬스터 시스템 ━━━
@@ -5164,6 +9513,7 @@ class BridgeServer:
     # MsgType 474-489
     # ================================================================
 
+    @packet_handler(MsgType.CASH_SHOP_LIST_REQ)
     async def _on_cash_shop_list(self, session, payload: bytes):
         """CASH_SHOP_LIST_REQ(474) -> CASH_SHOP_LIST(475)
         Request: category_len(u8) + category(utf8)  (empty = all)
@@ -5182,16 +9532,24 @@ class BridgeServer:
         if cat_filter:
             items = [i for i in items if i["category"] == cat_filter]
 
-        data = struct.pack('<I B', session.crystal, len(items))
-        for item in items:
-            bought = purchases.get(item["id"], 0)
-            name_b = item["name"].encode('utf-8')[:30]
-            cat_b = item["category"].encode('utf-8')[:20]
-            data += struct.pack('<B H B B B', item["id"], item["price"], item["max_buy"], bought, len(name_b))
-            data += name_b
-            data += struct.pack('<B', len(cat_b)) + cat_b
-        self._send(session, MsgType.CASH_SHOP_LIST, data)
+        def build():
+            data = struct.pack('<B', len(items))
+            for item in items:
+                bought = purchases.get(item["id"], 0)
+                name_b = item["name"].encode('utf-8')[:30]
+                cat_b = item["category"].encode('utf-8')[:20]
+                data += struct.pack('<B H B B B', item["id"], item["price"], item["max_buy"], bought, len(name_b))
+                data += name_b
+                data += struct.pack('<B', len(cat_b)) + cat_b
+            return data
+        # 구매 기록이 없는 플레이어(대부분)는 카테고리별 목록이 같다 — 잔액만 앞에 붙인다
+        if purchases or not items:
+            body = build()
+        else:
+            body = self.response_cache.payload((MsgType.CASH_SHOP_LIST, cat_filter), build)
+        self._send(session, MsgType.CASH_SHOP_LIST, struct.pack('<I', session.crystal) + body)
 
+    @packet_handler(MsgType.CASH_SHOP_BUY)
     async def _on_cash_shop_buy(self, session, payload: bytes):
         """CASH_SHOP_BUY(476) -> CASH_SHOP_BUY_RESULT(477)
         Request: item_id(u8)
@@ -5201,11 +9559,7 @@ class BridgeServer:
         if not session.in_game or len(payload) < 1:
             return
         item_id = payload[0]
-        shop_item = None
-        for it in CASH_SHOP_ITEMS:
-            if it["id"] == item_id:
-                shop_item = it
-                break
+        shop_item = self.index.get("cash_shop_item", item_id)
         if not shop_item:
             self._send(session, MsgType.CASH_SHOP_BUY_RESULT, struct.pack('<B I', 3, session.crystal))
             return
@@ -5225,6 +9579,7 @@ class BridgeServer:
         _CASH_SHOP_PURCHASES[eid][item_id] = bought + 1
         self._send(session, MsgType.CASH_SHOP_BUY_RESULT, struct.pack('<B I', 0, session.crystal))
 
+    @packet_handler(MsgType.BATTLEPASS_INFO_REQ)
     async def _on_battlepass_info(self, session, payload: bytes):
         """BATTLEPASS_INFO_REQ(478) -> BATTLEPASS_INFO(479)
         Response: level(u8) + exp(u16) + exp_needed(u16) + premium(u8) + claimed_free_bits(u64) + claimed_premium_bits(u64)
@@ -5250,6 +9605,7 @@ class BridgeServer:
                            claimed_free_bits, claimed_prem_bits)
         self._send(session, MsgType.BATTLEPASS_INFO, data)
 
+    @packet_handler(MsgType.BATTLEPASS_CLAIM)
     async def _on_battlepass_claim(self, session, payload: bytes):
         """BATTLEPASS_CLAIM(480) -> BATTLEPASS_CLAIM_RESULT(481)
         Request: level(u8) + track(u8) — track: 0=free, 1=premium
@@ -5318,22 +9674,27 @@ class BridgeServer:
         session.bp_level = state["level"]
         session.bp_exp = state["exp"]
 
+    @packet_handler(MsgType.EVENT_LIST_REQ)
     async def _on_event_list(self, session, payload: bytes):
         """EVENT_LIST_REQ(482) -> EVENT_LIST(483)
         Response: count(u8) + [id(u8) + type_len(u8) + type(utf8) + name_len(u8) + name(utf8) + active(u8)] * count
         """
         if not session.in_game:
             return
-        events = EVENT_LIST_DATA
-        data = struct.pack('<B', len(events))
-        for ev in events:
-            type_b = ev["type"].encode('utf-8')[:20]
-            name_b = ev["name"].encode('utf-8')[:40]
-            data += struct.pack('<B B', ev["id"], len(type_b)) + type_b
-            data += struct.pack('<B', len(name_b)) + name_b
-            data += struct.pack('<B', 1)  # active
-        self._send(session, MsgType.EVENT_LIST, data)
 
+        def build():
+            events = EVENT_LIST_DATA
+            data = struct.pack('<B', len(events))
+            for ev in events:
+                type_b = ev["type"].encode('utf-8')[:20]
+                name_b = ev["name"].encode('utf-8')[:40]
+                data += struct.pack('<B B', ev["id"], len(type_b)) + type_b
+                data += struct.pack('<B', len(name_b)) + name_b
+                data += struct.pack('<B', 1)  # active
+            return data
+        self._send_cached(session, (MsgType.EVENT_LIST,), build)
+
+    @packet_handler(MsgType.EVENT_CLAIM)
     async def _on_event_claim(self, session, payload: bytes):
         """EVENT_CLAIM(484) -> EVENT_CLAIM_RESULT(485)
         Request: event_id(u8) + day(u8) — day for login events
@@ -5345,11 +9706,7 @@ class BridgeServer:
         event_id = payload[0]
         day = payload[1]
 
-        ev = None
-        for e in EVENT_LIST_DATA:
-            if e["id"] == event_id:
-                ev = e
-                break
+        ev = self.index.get("event", event_id)
         if not ev:
             self._send(session, MsgType.EVENT_CLAIM_RESULT, struct.pack('<B B I', 3, event_id, 0))
             return
@@ -5382,6 +9739,7 @@ class BridgeServer:
         session.gold = min(session.gold + gold_reward, 999999999)
         self._send(session, MsgType.EVENT_CLAIM_RESULT, struct.pack('<B B I', 0, event_id, gold_reward))
 
+    @packet_handler(MsgType.SUBSCRIPTION_INFO)
     async def _on_subscription_info(self, session, payload: bytes):
         """SUBSCRIPTION_INFO(486) -> SUBSCRIPTION_STATUS(487)
         Response: active(u8) + remaining_days(u16) + crystal(u32) + benefits_count(u8) + [key_len+key+value_f32]*count
@@ -5403,6 +9761,7 @@ class BridgeServer:
             data += struct.pack('<B', len(kb)) + kb + struct.pack('<f', float(v))
         self._send(session, MsgType.SUBSCRIPTION_STATUS, data)
 
+    @packet_handler(MsgType.SUBSCRIPTION_BUY)
     async def _on_subscription_buy(self, session, payload: bytes):
         """SUBSCRIPTION_BUY(488) -> SUBSCRIPTION_RESULT(489)
         Response: result(u8) + remaining_crystal(u32) + expires_days(u16)
@@ -5423,14 +9782,23 @@ class BridgeServer:
         _SUBSCRIPTION_STATE[session.entity_id] = {
             "active": True, "expires": session.subscription_expires
         }
+        self.timers.schedule("subscription", session.entity_id, session.subscription_expires,
+                             self._expire_subscription, session)
         self._send(session, MsgType.SUBSCRIPTION_RESULT,
                    struct.pack('<B I H', 0, session.crystal, SUBSCRIPTION_DURATION_DAYS))
 
+    def _expire_subscription(self, session):
+        session.subscription_active = False
+        state = _SUBSCRIPTION_STATE.get(session.entity_id)
+        if state:
+            state["active"] = False
+
     # ================================================================
     # TASK 12: World System — Weather / Teleport / Objects / Mount
     # MsgType 490-501
     # ================================================================
 
+    @packet_handler(MsgType.WEATHER_INFO_REQ)
     async def _on_weather_info(self, session, payload: bytes):
         """WEATHER_INFO_REQ(490) -> WEATHER_INFO(491)
         Response: weather_id(u8) + weather_name_len(u8) + weather_name(utf8) +
@@ -5469,6 +9837,7 @@ class BridgeServer:
 
         self._send(session, MsgType.WEATHER_INFO, data)
 
+    @packet_handler(MsgType.TELEPORT_REQ)
     async def _on_teleport_req(self, session, payload: bytes):
         """TELEPORT_REQ(492) -> TELEPORT_RESULT(493)
         Request: waypoint_id(u16)
@@ -5507,6 +9876,7 @@ class BridgeServer:
 
         self._send(session, MsgType.TELEPORT_RESULT, struct.pack('<B H I', 0, wp_id, cost))
 
+    @packet_handler(MsgType.WAYPOINT_DISCOVER)
     async def _on_waypoint_discover(self, session, payload: bytes):
         """WAYPOINT_DISCOVER(494) -> WAYPOINT_LIST(495)
         Request: waypoint_id(u16)
@@ -5528,6 +9898,7 @@ class BridgeServer:
             data += struct.pack('<H', wid)
         self._send(session, MsgType.WAYPOINT_LIST, data)
 
+    @packet_handler(MsgType.DESTROY_OBJECT)
     async def _on_destroy_object(self, session, payload: bytes):
         """DESTROY_OBJECT(496) -> DESTROY_OBJECT_RESULT(497)
         Request: object_type_len(u8) + object_type(utf8) + object_id(u32)
@@ -5576,6 +9947,7 @@ class BridgeServer:
         self._send(session, MsgType.DESTROY_OBJECT_RESULT,
                    struct.pack('<B I B', 0, loot_gold, len(loot_b)) + loot_b)
 
+    @packet_handler(MsgType.INTERACT_OBJECT)
     async def _on_interact_object(self, session, payload: bytes):
         """INTERACT_OBJECT(498) -> INTERACT_RESULT(499)
         Request: object_id(u32) + interact_type(u8) — 0=open_chest, 1=activate
@@ -5601,6 +9973,7 @@ class BridgeServer:
         session.gold = min(session.gold + gold, 999999999)
         self._send(session, MsgType.INTERACT_RESULT, struct.pack('<B I B', 0, gold, trapped))
 
+    @packet_handler(MsgType.MOUNT_SUMMON)
     async def _on_mount_summon(self, session, payload: bytes):
         """MOUNT_SUMMON(500) -> MOUNT_RESULT(501)
         Request: action(u8) — 0=dismiss, 1=summon, mount_id(u8)
@@ -5642,6 +10015,7 @@ class BridgeServer:
     # MsgType 502-509
     # ================================================================
 
+    @packet_handler(MsgType.LOGIN_REWARD_REQ)
     async def _on_login_reward_req(self, session, payload: bytes):
         """LOGIN_REWARD_REQ(502) -> LOGIN_REWARD_INFO(503)
         Response: total_days(u16) + cycle_day(u8) + claimed_today(u8) +
@@ -5675,6 +10049,7 @@ class BridgeServer:
 
         self._send(session, MsgType.LOGIN_REWARD_INFO, data)
 
+    @packet_handler(MsgType.LOGIN_REWARD_CLAIM)
     async def _on_login_reward_claim(self, session, payload: bytes):
         """LOGIN_REWARD_CLAIM(504) -> LOGIN_REWARD_CLAIM_RESULT(505)
         Response: result(u8) + day(u8) + gold_reward(u32) + new_total_days(u16)
@@ -5756,6 +10131,7 @@ class BridgeServer:
             s.weekly_quests_done = 0
             self._send(s, MsgType.WEEKLY_RESET_NOTIFY, struct.pack('<B', 1))
 
+    @packet_handler(MsgType.CONTENT_UNLOCK_QUERY)
     async def _on_content_unlock_query(self, session, payload: bytes):
         """CONTENT_UNLOCK_QUERY(509) -> CONTENT_UNLOCK_NOTIFY(508)
         Response: count(u8) + [level(u8) + content_count(u8) + [name_len(u8)+name(utf8)]*count] * count
@@ -5782,6 +10158,7 @@ class BridgeServer:
     # MsgType 510-517
     # ================================================================
 
+    @packet_handler(MsgType.DIALOG_CHOICE)
     async def _on_dialog_choice(self, session, payload: bytes):
         """DIALOG_CHOICE(510) -> DIALOG_CHOICE_RESULT(511)
         Request: npc_id_len(u8) + npc_id(utf8) + choice_id(u8)
@@ -5860,6 +10237,7 @@ class BridgeServer:
         data += struct.pack('<B', len(action_b)) + action_b
         self._send(session, MsgType.DIALOG_CHOICE_RESULT, data)
 
+    @packet_handler(MsgType.CUTSCENE_TRIGGER)
     async def _on_cutscene_trigger(self, session, payload: bytes):
         """CUTSCENE_TRIGGER(512) -> CUTSCENE_DATA(513)
         Request: cutscene_id_len(u8) + cutscene_id(utf8)
@@ -5900,13 +10278,17 @@ class BridgeServer:
 
         progress["seen_cutscenes"].add(cs_id)
 
-        sequences = cs.get("sequences", [])
-        data = struct.pack('<B B', 0, len(sequences))
-        for seq in sequences:
-            sb = seq.encode('utf-8')[:80]
-            data += struct.pack('<B', len(sb)) + sb
-        self._send(session, MsgType.CUTSCENE_DATA, data)
 
+        def build():
+            sequences = cs.get("sequences", [])
+            data = struct.pack('<B B', 0, len(sequences))
+            for seq in sequences:
+                sb = seq.encode('utf-8')[:80]
+                data += struct.pack('<B', len(sb)) + sb
+            return data
+        self._send_cached(session, (MsgType.CUTSCENE_DATA, cs_id), build)
+
+    @packet_handler(MsgType.CHAPTER_PROGRESS_REQ)
     async def _on_chapter_progress_req(self, session, payload: bytes):
         """CHAPTER_PROGRESS_REQ(514) -> CHAPTER_PROGRESS(515)
         Response: current_chapter(u8) + total_chapters(u8) + seal_fragments(u8) + total_needed(u8) +
@@ -5944,6 +10326,7 @@ class BridgeServer:
 
         self._send(session, MsgType.CHAPTER_PROGRESS, data)
 
+    @packet_handler(MsgType.MAIN_QUEST_DATA_REQ)
     async def _on_main_quest_data_req(self, session, payload: bytes):
         """MAIN_QUEST_DATA_REQ(516) -> MAIN_QUEST_DATA(517)
         Request: quest_id_len(u8) + quest_id(utf8)  (empty = get current available)
@@ -5960,30 +10343,37 @@ class BridgeServer:
                 quest_filter = payload[1:1+qlen].decode('utf-8', errors='ignore')
 
         player_level = session.stats.level
-        quests = []
-        if quest_filter:
-            q = MAIN_QUEST_TABLE.get(quest_filter)
-            if q:
-                quests.append((quest_filter, q))
-        else:
-            # Return available quests (matching level)
-            for qid, q in MAIN_QUEST_TABLE.items():
-                if q["level"] <= player_level:
-                    quests.append((qid, q))
+        if quest_filter and quest_filter not in MAIN_QUEST_TABLE:
+            quest_filter = None  # 없는 id는 한 키로 (빈 목록)
 
-        quests = quests[:20]  # Limit
-        data = struct.pack('<B', len(quests))
-        for qid, q in quests:
-            qid_b = qid.encode('utf-8')[:20]
-            name_b = q["name"].encode('utf-8')[:40]
-            type_b = q["type"].encode('utf-8')[:20]
-            data += struct.pack('<B', len(qid_b)) + qid_b
-            data += struct.pack('<B', len(name_b)) + name_b
-            data += struct.pack('<B B', q["chapter"], q["level"])
-            data += struct.pack('<B', len(type_b)) + type_b
-            data += struct.pack('<H I I', q.get("count", 1), q["reward_exp"], q["reward_gold"])
-
-        self._send(session, MsgType.MAIN_QUEST_DATA, data)
+        def build():
+            quests = []
+            if quest_filter:
+                quests.append((quest_filter, MAIN_QUEST_TABLE[quest_filter]))
+            elif quest_filter is not None:
+                # Return available quests (matching level)
+                for qid, q in MAIN_QUEST_TABLE.items():
+                    if q["level"] <= player_level:
+                        quests.append((qid, q))
+
+            quests = quests[:20]  # Limit
+            data = struct.pack('<B', len(quests))
+            for qid, q in quests:
+                qid_b = qid.encode('utf-8')[:20]
+                name_b = q["name"].encode('utf-8')[:40]
+                type_b = q["type"].encode('utf-8')[:20]
+                data += struct.pack('<B', len(qid_b)) + qid_b
+                data += struct.pack('<B', len(name_b)) + name_b
+                data += struct.pack('<B B', q["chapter"], q["level"])
+                data += struct.pack('<B', len(type_b)) + type_b
+                data += struct.pack('<H I I', q.get("count", 1), q["reward_exp"], q["reward_gold"])
+            return data
+        # 레벨 필터 목록은 레벨별로 같다
+        if quest_filter == "":
+            key = (MsgType.MAIN_QUEST_DATA, "", player_level)
+        else:
+            key = (MsgType.MAIN_QUEST_DATA, quest_filter)
+        self._send_cached(session, key, build)
 
     # ---- Mentorship System (TASK 18: MsgType 550-560) ----
 
@@ -6036,6 +10426,7 @@ class BridgeServer:
                 s.stats.exp += bonus
                 break
 
+    @packet_handler(MsgType.MENTOR_SEARCH)
     async def _on_mentor_search(self, session, payload: bytes):
         """MENTOR_SEARCH(550) -> MENTOR_LIST(551)
         Request: search_type(u8) — 0=search_masters, 1=search_disciples
@@ -6078,6 +10469,7 @@ class BridgeServer:
 
         self._send(session, MsgType.MENTOR_LIST, data)
 
+    @packet_handler(MsgType.MENTOR_REQUEST)
     async def _on_mentor_request(self, session, payload: bytes):
         """MENTOR_REQUEST(552) -> MENTOR_REQUEST_RESULT(553)
         Request: target_eid(u32) + role(u8) — role: 0=I want to be disciple, 1=I want to be master
@@ -6155,6 +10547,7 @@ class BridgeServer:
 
         _send_result(0)  # REQUEST_SENT
 
+    @packet_handler(MsgType.MENTOR_ACCEPT)
     async def _on_mentor_accept(self, session, payload: bytes):
         """MENTOR_ACCEPT(554) -> MENTOR_ACCEPT_RESULT(555)
         Request: accept(u8) — 0=reject, 1=accept
@@ -6233,6 +10626,7 @@ class BridgeServer:
             self._send(from_s, MsgType.MENTOR_ACCEPT_RESULT,
                        struct.pack('<B I I', 0, master_eid, disciple_eid))
 
+    @packet_handler(MsgType.MENTOR_QUEST_LIST)
     async def _on_mentor_quest_list(self, session, payload: bytes):
         """MENTOR_QUEST_LIST(556) -> MENTOR_QUESTS(557)
         Request: (empty)
@@ -6289,6 +10683,7 @@ class BridgeServer:
 
         self._send(session, MsgType.MENTOR_QUESTS, data)
 
+    @packet_handler(MsgType.MENTOR_GRADUATE)
     async def _on_mentor_graduate(self, session, payload: bytes):
         """MENTOR_GRADUATE(558) — auto-triggered when disciple reaches Lv30.
         Can also be called explicitly to check & trigger graduation.
@@ -6377,10 +10772,9 @@ class BridgeServer:
         grad_msg = f"[사제졸업] 축하합니다!"
         grad_bytes = grad_msg.encode('utf-8')[:100]
         broadcast_data = struct.pack('<I I B', master_eid, disciple_eid, len(grad_bytes)) + grad_bytes
-        for s in self.sessions.values():
-            if s.in_game:
-                self._send(s, MsgType.MENTOR_GRADUATE, broadcast_data)
+        self._announce(MsgType.MENTOR_GRADUATE, broadcast_data)
 
+    @packet_handler(MsgType.MENTOR_SHOP_LIST)
     async def _on_mentor_shop_list(self, session, payload: bytes):
         """MENTOR_SHOP_LIST(559) -> MENTOR_SHOP(560 as list response reuse)
         Request: (empty)
@@ -6388,14 +10782,19 @@ class BridgeServer:
         """
         if not session.in_game:
             return
+
+        def build():
+            data = struct.pack('<B', len(MENTOR_SHOP_ITEMS))
+            for item in MENTOR_SHOP_ITEMS:
+                name_bytes = item["name"].encode('utf-8')[:30]
+                data += struct.pack('<B H B', item["id"], item["cost"], len(name_bytes))
+                data += name_bytes
+            return data
         contrib = session.mentor_contribution
-        data = struct.pack('<I B', contrib, len(MENTOR_SHOP_ITEMS))
-        for item in MENTOR_SHOP_ITEMS:
-            name_bytes = item["name"].encode('utf-8')[:30]
-            data += struct.pack('<B H B', item["id"], item["cost"], len(name_bytes))
-            data += name_bytes
-        self._send(session, MsgType.MENTOR_SHOP_LIST, data)
+        self._send(session, MsgType.MENTOR_SHOP_LIST,
+                   struct.pack('<I', contrib) + self.response_cache.payload((MsgType.MENTOR_SHOP_LIST,), build))
 
+    @packet_handler(MsgType.MENTOR_SHOP_BUY)
     async def _on_mentor_shop_buy(self, session, payload: bytes):
         """MENTOR_SHOP_BUY(560)
         Request: item_id(u8)
@@ -6406,11 +10805,7 @@ class BridgeServer:
             return
         item_id = payload[0]
 
-        shop_item = None
-        for it in MENTOR_SHOP_ITEMS:
-            if it["id"] == item_id:
-                shop_item = it
-                break
+        shop_item = self.index.get("mentor_shop_item", item_id)
 
         if not shop_item:
             self._send(session, MsgType.MENTOR_SHOP_BUY,
@@ -6527,10 +10922,9 @@ class BridgeServer:
         data += name_bytes
 
         # Broadcast to zone
-        for s in list(self.sessions.values()):
-            if s.in_game and s.zone_id == zone_id:
-                self._send(s, MsgType.SECRET_REALM_SPAWN, data)
+        self._broadcast_to_zone(zone_id, 0, MsgType.SECRET_REALM_SPAWN, data)
 
+    @packet_handler(MsgType.SECRET_REALM_ENTER)
     async def _on_secret_realm_enter(self, session, payload: bytes):
         """SECRET_REALM_ENTER(541) -> SECRET_REALM_ENTER_RESULT(542)
         Request: zone_id(u8) [+ auto_spawn(u8) — optional: 1=auto-create portal if none]
@@ -6623,6 +11017,7 @@ class BridgeServer:
         self._send(session, MsgType.SECRET_REALM_ENTER_RESULT,
                    struct.pack('<B H B H B H', 0, instance_id, rt_idx, time_limit, is_special, mult_u16))
 
+    @packet_handler(MsgType.SECRET_REALM_COMPLETE)
     async def _on_secret_realm_complete(self, session, payload: bytes):
         """SECRET_REALM_COMPLETE(543)
         Request: score_value(u16) + extra_data(u8) — interpretation depends on realm_type
@@ -6679,6 +11074,7 @@ class BridgeServer:
         session.realm_instance_id = 0
         _REALM_INSTANCES.pop(instance_id, None)
 
+    @packet_handler(MsgType.SECRET_REALM_FAIL)
     async def _on_secret_realm_fail(self, session, payload: bytes):
         """SECRET_REALM_FAIL(544)
         Request: (empty)
@@ -6705,6 +11101,7 @@ class BridgeServer:
 
     # ---- Sub-Currency / Token Shop (TASK 10: MsgType 468-473) ----
 
+    @packet_handler(MsgType.CURRENCY_QUERY)
     async def _on_currency_query(self, session, payload: bytes):
         """CURRENCY_QUERY(468) -> CURRENCY_INFO(469)
         Request: (empty or u8 currency_type — 0=all, 1=gold, 2=silver, 3=dungeon, 4=pvp, 5=guild)
@@ -6721,6 +11118,7 @@ class BridgeServer:
                                min(session.pvp_token, CURRENCY_MAX["pvp_token"]),
                                min(session.guild_contribution, CURRENCY_MAX["guild_contribution"])))
 
+    @packet_handler(MsgType.TOKEN_SHOP_LIST)
     async def _on_token_shop_list(self, session, payload: bytes):
         """TOKEN_SHOP_LIST(470) -> TOKEN_SHOP(471)
         Request: shop_type(u8) — 0=dungeon, 1=pvp, 2=guild
@@ -6739,16 +11137,18 @@ class BridgeServer:
                        struct.pack('<B B', shop_type, 0))
             return
 
-        items = TOKEN_SHOPS[shop_key]
-        data = struct.pack('<B B', shop_type, len(items))
-        for item in items:
-            currency_type = {"dungeon_token": 0, "pvp_token": 1, "guild_contribution": 2}.get(item["currency"], 0)
-            name_bytes = item["name"].encode('utf-8')[:50]
-            data += struct.pack('<H I B B', item["shop_id"], item["price"], currency_type, len(name_bytes))
-            data += name_bytes
-
-        self._send(session, MsgType.TOKEN_SHOP, data)
+        def build():
+            items = TOKEN_SHOPS[shop_key]
+            data = struct.pack('<B B', shop_type, len(items))
+            for item in items:
+                currency_type = {"dungeon_token": 0, "pvp_token": 1, "guild_contribution": 2}.get(item["currency"], 0)
+                name_bytes = item["name"].encode('utf-8')[:50]
+                data += struct.pack('<H I B B', item["shop_id"], item["price"], currency_type, len(name_bytes))
+                data += name_bytes
+            return data
+        self._send_cached(session, (MsgType.TOKEN_SHOP, shop_type), build)
 
+    @packet_handler(MsgType.TOKEN_SHOP_BUY)
     async def _on_token_shop_buy(self, session, payload: bytes):
         """TOKEN_SHOP_BUY(472) -> TOKEN_SHOP_BUY_RESULT(473)
         Request: shop_id(u16) + quantity(u8)
@@ -6762,14 +11162,7 @@ class BridgeServer:
         quantity = max(1, payload[2])
 
         # Find item across all shops
-        target_item = None
-        for shop_list in TOKEN_SHOPS.values():
-            for item in shop_list:
-                if item["shop_id"] == shop_id:
-                    target_item = item
-                    break
-            if target_item:
-                break
+        target_item = self.index.get("token_shop_item", shop_id)
 
         def _send_result(result, remaining=0):
             self._send(session, MsgType.TOKEN_SHOP_BUY_RESULT,
@@ -6802,6 +11195,7 @@ class BridgeServer:
 
     # ---- Battleground / Guild War (TASK 6: MsgType 430-435) ----
 
+    @packet_handler(MsgType.BATTLEGROUND_QUEUE)
     async def _on_battleground_queue(self, session, payload: bytes):
         """BATTLEGROUND_QUEUE(430) -> BATTLEGROUND_STATUS(431)
         Request: action(u8) + mode(u8)
@@ -6882,22 +11276,19 @@ class BridgeServer:
             _BG_ACTIVE_MATCHES[match_id] = match_state
 
             # Notify all players in match
-            for eid in red_team + blue_team:
-                for s in self.sessions.values():
-                    if s.entity_id == eid:
-                        team = 0 if eid in red_team else 1
-                        s.bg_match_id = match_id
-                        s.bg_team = team
-                        s.bg_queue_mode = -1
-                        _send_status2 = lambda st, mid, md, tm, qc, ss=s: self._send(
-                            ss, MsgType.BATTLEGROUND_STATUS,
-                            struct.pack('<B I B B B', st, mid, md, tm, qc))
-                        _send_status2(1, match_id, mode, team, 0)  # MATCH_FOUND
-                        break
+            for team, eids in enumerate((red_team, blue_team)):
+                members = list(self._online(eids))
+                for s in members:
+                    s.bg_match_id = match_id
+                    s.bg_team = team
+                    s.bg_queue_mode = -1
+                self._multicast(members, MsgType.BATTLEGROUND_STATUS,
+                                struct.pack('<B I B B B', 1, match_id, mode, team, 0))  # MATCH_FOUND
         else:
             # Still waiting
             _send_status(0, 0, mode, 0, len(q))  # QUEUED
 
+    @packet_handler(MsgType.BATTLEGROUND_SCORE)
     async def _on_battleground_score(self, session, payload: bytes):
         """BATTLEGROUND_SCORE(432) -> BATTLEGROUND_SCORE_UPDATE(433)
         Request: action(u8) + point_index(u8)
@@ -7020,6 +11411,7 @@ class BridgeServer:
                     s.bg_team = 0
                     break
 
+    @packet_handler(MsgType.GUILD_WAR_DECLARE)
     async def _on_guild_war_declare(self, session, payload: bytes):
         """GUILD_WAR_DECLARE(434) -> GUILD_WAR_STATUS(435)
         Request: action(u8) + target_guild_id(u32)
@@ -7202,6 +11594,7 @@ class BridgeServer:
         for inv_idx, dur, newly_broken in results:
             self._send_durability_notify(session, inv_idx, dur, dur <= 0)
 
+    @packet_handler(MsgType.REPAIR_REQ)
     async def _on_repair_req(self, session, payload: bytes):
         """REPAIR_REQ(462) -> REPAIR_RESULT(463)
         Request: mode(u8) + inv_slot(u8)
@@ -7268,6 +11661,7 @@ class BridgeServer:
 
         _send_result(0, total_cost, len(repairs))
 
+    @packet_handler(MsgType.REROLL_REQ)
     async def _on_reroll_req(self, session, payload: bytes):
         """REROLL_REQ(464) -> REROLL_RESULT(465)
         Request: inv_slot(u8) + lock_count(u8) + [lock_idx(u8)]
@@ -7366,6 +11760,7 @@ class BridgeServer:
         session.equipment_random_opts[inv_slot] = new_opts
         _send_result(0, new_opts)
 
+    @packet_handler(MsgType.DURABILITY_QUERY)
     async def _on_durability_query(self, session, payload: bytes):
         """DURABILITY_QUERY(467) -> DURABILITY_NOTIFY(466) per equipped slot
         Request: (empty)
@@ -7381,13 +11776,7 @@ class BridgeServer:
 
     # ---- Social Enhancement (TASK 5: MsgType 410-422) ----
 
-    def _find_session_by_name(self, name: str):
-        """Find a connected session by character name."""
-        for s in self.sessions.values():
-            if getattr(s, 'character_name', '') == name:
-                return s
-        return None
-
+    @packet_handler(MsgType.FRIEND_REQUEST)
     async def _on_friend_request(self, session, payload: bytes):
         """FRIEND_REQUEST(410) -> FRIEND_REQUEST_RESULT(411)
         Request: target_name_len(u8) + target_name(str)
@@ -7408,7 +11797,7 @@ class BridgeServer:
                        struct.pack('<B B', result_code, len(nb)) + nb)
 
         # Self request check
-        if target_name == getattr(session, 'character_name', ''):
+        if target_name == session.char_name:
             _send_result(7)  # SELF_REQUEST
             return
 
@@ -7444,7 +11833,7 @@ class BridgeServer:
             return
 
         # Check if blocked by target
-        my_name = getattr(session, 'character_name', '')
+        my_name = session.char_name
         if my_name in target.blocked_players:
             _send_result(4)  # BLOCKED (by target)
             return
@@ -7456,6 +11845,7 @@ class BridgeServer:
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_ACCEPT)
     async def _on_friend_accept(self, session, payload: bytes):
         """FRIEND_ACCEPT(412) -> FRIEND_REQUEST_RESULT(411)
         Request: from_name_len(u8) + from_name(str)
@@ -7488,7 +11878,7 @@ class BridgeServer:
         session.friend_requests_recv.remove(from_name)
 
         # Add both as friends
-        my_name = getattr(session, 'character_name', '')
+        my_name = session.char_name
         if from_name not in session.friends:
             session.friends.append(from_name)
 
@@ -7502,6 +11892,7 @@ class BridgeServer:
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_REJECT)
     async def _on_friend_reject(self, session, payload: bytes):
         """FRIEND_REJECT(413) -> FRIEND_REQUEST_RESULT(411)
         Request: from_name_len(u8) + from_name(str)
@@ -7529,12 +11920,13 @@ class BridgeServer:
         # Clean sender's sent list if online
         sender = self._find_session_by_name(from_name)
         if sender:
-            my_name = getattr(session, 'character_name', '')
+            my_name = session.char_name
             if my_name in sender.friend_requests_sent:
                 sender.friend_requests_sent.remove(my_name)
 
         _send_result(0)  # SUCCESS
 
+    @packet_handler(MsgType.FRIEND_LIST_REQ)
     async def _on_friend_list_req(self, session, payload: bytes):
         """FRIEND_LIST_REQ(414) -> FRIEND_LIST(415)
         Response: count(u8) + [name_len(u8) + name(str) + is_online(u8) + zone_id(u16)]"""
@@ -7555,6 +11947,7 @@ class BridgeServer:
 
         self._send(session, MsgType.FRIEND_LIST, data)
 
+    @packet_handler(MsgType.BLOCK_PLAYER)
     async def _on_block_player(self, session, payload: bytes):
         """BLOCK_PLAYER(416) -> BLOCK_RESULT(417)
         Request: action(u8) + name_len(u8) + name(str)
@@ -7576,7 +11969,7 @@ class BridgeServer:
                        struct.pack('<B B B', result_code, action, len(nb)) + nb)
 
         # Self block check
-        if target_name == getattr(session, 'character_name', ''):
+        if target_name == session.char_name:
             _send_result(4)  # SELF_BLOCK
             return
 
@@ -7600,6 +11993,7 @@ class BridgeServer:
             session.blocked_players.remove(target_name)
             _send_result(0)
 
+    @packet_handler(MsgType.BLOCK_LIST_REQ)
     async def _on_block_list_req(self, session, payload: bytes):
         """BLOCK_LIST_REQ(418) -> BLOCK_LIST(419)
         Response: count(u8) + [name_len(u8) + name(str)]"""
@@ -7615,6 +12009,7 @@ class BridgeServer:
 
         self._send(session, MsgType.BLOCK_LIST, data)
 
+    @packet_handler(MsgType.PARTY_FINDER_LIST_REQ)
     async def _on_party_finder_list_req(self, session, payload: bytes):
         """PARTY_FINDER_LIST_REQ(420) -> PARTY_FINDER_LIST(421)
         Request: category(u8)  — 0xFF=all, 0~4=specific category
@@ -7642,6 +12037,7 @@ class BridgeServer:
 
         self._send(session, MsgType.PARTY_FINDER_LIST, data)
 
+    @packet_handler(MsgType.PARTY_FINDER_CREATE)
     async def _on_party_finder_create(self, session, payload: bytes):
         """PARTY_FINDER_CREATE(422) -> PARTY_FINDER_LIST(421) (echo back updated list)
         Request: title_len(u8) + title(str) + category(u8) + min_level(u8) + role(u8)
@@ -7659,7 +12055,7 @@ class BridgeServer:
         min_level = payload[2+title_len]
         role = payload[3+title_len]
 
-        owner_name = getattr(session, 'character_name', 'unknown')
+        owner_name = session.char_name or 'unknown'
 
         # Send ack via a simple response reusing BLOCK_RESULT(417) as generic social ack
         # Actually let's use a clean approach: send PARTY_FINDER_LIST as result
@@ -7700,6 +12096,7 @@ class BridgeServer:
 
     # ---- Enhancement Deepening (TASK 8: MsgType 450-459) ----
 
+    @packet_handler(MsgType.GEM_EQUIP)
     async def _on_gem_equip(self, session, payload: bytes):
         """GEM_EQUIP(450) -> GEM_EQUIP_RESULT(451)
         Request: action(u8) + gem_id(u16) + slot_len(u8) + slot(str)
@@ -7771,6 +12168,7 @@ class BridgeServer:
             else:
                 _send_gem_result(1)  # GEM_NOT_FOUND (not in that slot)
 
+    @packet_handler(MsgType.GEM_FUSE)
     async def _on_gem_fuse(self, session, payload: bytes):
         """GEM_FUSE(452) -> GEM_FUSE_RESULT(453)
         Request: gem_type_len(u8) + gem_type(str) + tier(u8) — fuse 3 gems of this type+tier
@@ -7841,6 +12239,7 @@ class BridgeServer:
 
         _send_fuse_result(0, new_gem["gem_id"], new_tier, gold_cost)
 
+    @packet_handler(MsgType.ENGRAVING_LIST_REQ)
     async def _on_engraving_list_req(self, session, payload: bytes):
         """ENGRAVING_LIST_REQ(454) -> ENGRAVING_LIST(455)
         Response: count(u8) + [name_len(u8) + name(str) + name_kr_len(u8) + name_kr(str) +
@@ -7879,6 +12278,7 @@ class BridgeServer:
 
         self._send(session, MsgType.ENGRAVING_LIST, data)
 
+    @packet_handler(MsgType.ENGRAVING_EQUIP)
     async def _on_engraving_equip(self, session, payload: bytes):
         """ENGRAVING_EQUIP(456) -> ENGRAVING_RESULT(457)
         Request: action(u8) + name_len(u8) + name(str)
@@ -7925,6 +12325,7 @@ class BridgeServer:
             else:
                 _send_eng_result(3)  # NOT_ACTIVE
 
+    @packet_handler(MsgType.TRANSCEND_REQ)
     async def _on_transcend_req(self, session, payload: bytes):
         """TRANSCEND_REQ(458) -> TRANSCEND_RESULT(459)
         Request: slot_len(u8) + slot(str) — equipment slot to transcend (e.g. "weapon")
@@ -8004,27 +12405,21 @@ class BridgeServer:
         gold = getattr(session, 'gold', 0)
         newly_unlocked = []
 
-        for title in TITLE_LIST_DATA:
-            tid = title["title_id"]
-            if tid in session.titles_unlocked:
-                continue
-            ct = title["condition_type"]
-            cv = title["condition_value"]
-            unlocked = False
-            if ct == "level" and level >= cv:
-                unlocked = True
-            elif ct == "dungeon_clear" and session.dungeon_clears >= cv:
-                unlocked = True
-            elif ct == "boss_kill" and session.boss_kills >= cv:
-                unlocked = True
-            elif ct == "gold_held" and gold >= cv:
-                unlocked = True
-            # pvp_rank, guild_level, all_quests — check when relevant data available
-            if unlocked:
-                session.titles_unlocked.append(tid)
-                newly_unlocked.append(tid)
+        # pvp_rank, guild_level, all_quests — check when relevant data available
+        progress = (("level", level), ("dungeon_clear", session.dungeon_clears),
+                    ("boss_kill", session.boss_kills), ("gold_held", gold))
+        for ct, value in progress:
+            # 조건 값 오름차순 — 못 넘는 첫 칭호에서 멈춘다
+            for title in self.index.group("titles_by_condition", ct):
+                if title["condition_value"] > value:
+                    break
+                tid = title["title_id"]
+                if tid not in session.titles_unlocked:
+                    session.titles_unlocked.append(tid)
+                    newly_unlocked.append(tid)
         return newly_unlocked
 
+    @packet_handler(MsgType.TITLE_LIST_REQ)
     async def _on_title_list_req(self, session, payload: bytes):
         """TITLE_LIST_REQ(440) -> TITLE_LIST(441)
         Response: equipped_id(u16) + count(u8) + [title_id(u16) + name_len(u8) + name(str) +
@@ -8047,6 +12442,7 @@ class BridgeServer:
             data += struct.pack('<H B', title["bonus_value"], is_unlocked)
         self._send(session, MsgType.TITLE_LIST, data)
 
+    @packet_handler(MsgType.TITLE_EQUIP)
     async def _on_title_equip(self, session, payload: bytes):
         """TITLE_EQUIP(442) -> TITLE_EQUIP_RESULT(443)
         Request: title_id(u16) — 0 to unequip
@@ -8080,6 +12476,7 @@ class BridgeServer:
         session.title_equipped = title_id
         self._send(session, MsgType.TITLE_EQUIP_RESULT, struct.pack('<B H', 0, title_id))
 
+    @packet_handler(MsgType.COLLECTION_QUERY)
     async def _on_collection_query(self, session, payload: bytes):
         """COLLECTION_QUERY(444) -> COLLECTION_INFO(445)
         Response: monster_cat_count(u8) + [cat_id(u8) + name_len(u8) + name(str) +
@@ -8122,6 +12519,7 @@ class BridgeServer:
 
         self._send(session, MsgType.COLLECTION_INFO, data)
 
+    @packet_handler(MsgType.JOB_CHANGE_REQ)
     async def _on_job_change_req(self, session, payload: bytes):
         """JOB_CHANGE_REQ(446) -> JOB_CHANGE_RESULT(447)
         Request: job_name_len(u8) + job_name(str) — e.g. "berserker", "guardian"
@@ -8171,11 +12569,7 @@ class BridgeServer:
         if job_name not in class_jobs:
             job_bytes = job_name.encode('utf-8')
             # Check if it's a valid job for another class
-            found_in_other = False
-            for cls, jobs in SECOND_JOB_TABLE.items():
-                if job_name in jobs:
-                    found_in_other = True
-                    break
+            found_in_other = self.index.get("second_job_class", job_name) is not None
             result_code = 4 if found_in_other else 3
             self._send(session, MsgType.JOB_CHANGE_RESULT,
                        struct.pack('<B B', result_code, len(job_bytes)) + job_bytes +
@@ -8298,6 +12692,7 @@ class BridgeServer:
                 current_tier = tier
         return current_tier["name"], current_tier["min"]
 
+    @packet_handler(MsgType.DAILY_QUEST_LIST_REQ)
     async def _on_daily_quest_list_req(self, session, payload: bytes):
         """DAILY_QUEST_LIST_REQ(400) -> DAILY_QUEST_LIST(401)
         Response: quest_count(u8) + [dq_id(u16) + type_len(u8) + type(str) +
@@ -8351,6 +12746,7 @@ class BridgeServer:
 
         self._send(session, MsgType.DAILY_QUEST_LIST, data)
 
+    @packet_handler(MsgType.WEEKLY_QUEST_REQ)
     async def _on_weekly_quest_req(self, session, payload: bytes):
         """WEEKLY_QUEST_REQ(402) -> WEEKLY_QUEST(403)
         Response: has_quest(u8) + [wq_id(u16) + type_len(u8) + type(str) +
@@ -8401,6 +12797,7 @@ class BridgeServer:
 
         self._send(session, MsgType.WEEKLY_QUEST, data)
 
+    @packet_handler(MsgType.REPUTATION_QUERY)
     async def _on_reputation_query(self, session, payload: bytes):
         """REPUTATION_QUERY(404) -> REPUTATION_INFO(405)
         Response: faction_count(u8) + [faction_len(u8) + faction(str) +
@@ -8456,14 +12853,14 @@ class BridgeServer:
             if dq["dq_id"] == dq_id and not dq["completed"] and dq["progress"] >= dq["count"]:
                 dq["completed"] = True
                 # Find quest data for rewards
-                for pool_q in DAILY_QUEST_POOL:
-                    if pool_q["dq_id"] == dq_id:
-                        if session.stats:
-                            session.stats.add_exp(pool_q["reward_exp"])
-                        session.gold = getattr(session, 'gold', 0) + pool_q["reward_gold"]
-                        self._add_reputation(session, pool_q["reward_rep_faction"],
-                                           pool_q["reward_rep"], is_quest_reward=True)
-                        return True
+                pool_q = self.index.get("daily_quest", dq_id)
+                if pool_q is not None:
+                    if session.stats:
+                        session.stats.add_exp(pool_q["reward_exp"])
+                    session.gold = getattr(session, 'gold', 0) + pool_q["reward_gold"]
+                    self._add_reputation(session, pool_q["reward_rep_faction"],
+                                       pool_q["reward_rep"], is_quest_reward=True)
+                    return True
         return False
 
 
@@ -8490,6 +12887,17 @@ class BridgeServer:
             })
         return bounties
 
+    def _daily_bounty_board(self):
+        """오늘의 현상금 (날짜 시드로 하루 한 번만 생성) -> (목록, bounty_id -> 항목)"""
+        date_seed = int(time.strftime("%Y%m%d"))
+        board = self._bounty_board
+        if board is None or board[0] != date_seed:
+            random.seed(date_seed)
+            bounties = self._generate_daily_bounties()
+            random.seed()  # restore random state
+            board = self._bounty_board = (date_seed, bounties, {b["bounty_id"]: b for b in bounties})
+        return board[1], board[2]
+
     def _get_weekly_boss(self):
         """Get current weekly world boss (rotate by week number)."""
         import time as _t
@@ -8531,6 +12939,7 @@ class BridgeServer:
             session.bounty_weekly_reset_date = last_wed
             session.bounty_score_weekly = 0
 
+    @packet_handler(MsgType.BOUNTY_LIST_REQ)
     async def _on_bounty_list_req(self, session, payload: bytes):
         """BOUNTY_LIST_REQ(530) -> BOUNTY_LIST(531)
         Response: daily_count(u8) + [bounty_id(u16) + monster_id(u16) + level(u8) + zone_len(u8) + zone(str) +
@@ -8549,12 +12958,7 @@ class BridgeServer:
         self._check_bounty_reset(session)
 
         # Generate daily bounties (deterministic per day using date seed)
-        import time as _t
-        import random as _rng3
-        date_seed = int(_t.strftime("%Y%m%d"))
-        _rng3.seed(date_seed)
-        daily_bounties = self._generate_daily_bounties()
-        _rng3.seed()  # restore random state
+        daily_bounties, _ = self._daily_bounty_board()
 
         # Build daily bounty data
         accepted_ids = {b["bounty_id"] for b in session.bounty_accepted}
@@ -8588,6 +12992,7 @@ class BridgeServer:
 
         self._send(session, MsgType.BOUNTY_LIST, data)
 
+    @packet_handler(MsgType.BOUNTY_ACCEPT)
     async def _on_bounty_accept(self, session, payload: bytes):
         """BOUNTY_ACCEPT(532) -> BOUNTY_ACCEPT_RESULT(533)
         Payload: bounty_id(u16)
@@ -8625,18 +13030,8 @@ class BridgeServer:
             return
 
         # Find bounty info
-        import time as _t
-        import random as _rng4
-        date_seed = int(_t.strftime("%Y%m%d"))
-        _rng4.seed(date_seed)
-        daily_bounties = self._generate_daily_bounties()
-        _rng4.seed()
-
-        found = None
-        for b in daily_bounties:
-            if b["bounty_id"] == bounty_id:
-                found = b
-                break
+        _, by_id = self._daily_bounty_board()
+        found = by_id.get(bounty_id)
 
         # Check weekly
         if not found and bounty_id == 20000:
@@ -8658,6 +13053,7 @@ class BridgeServer:
 
         self._send(session, MsgType.BOUNTY_ACCEPT_RESULT, struct.pack('<BH', 0, bounty_id))
 
+    @packet_handler(MsgType.BOUNTY_COMPLETE)
     async def _on_bounty_complete(self, session, payload: bytes):
         """BOUNTY_COMPLETE(534) -- server checks on monster kill.
         Also callable by client with payload: bounty_id(u16)
@@ -8719,13 +13115,8 @@ class BridgeServer:
         session.bounty_accepted.pop(accepted_idx)
 
         # Check daily completion bonus (all 3 daily done)
-        import time as _t
-        import random as _rng5
-        date_seed = int(_t.strftime("%Y%m%d"))
-        _rng5.seed(date_seed)
-        daily_bounties = self._generate_daily_bounties()
-        _rng5.seed()
-        daily_ids = {b["bounty_id"] for b in daily_bounties}
+        _, by_id = self._daily_bounty_board()
+        daily_ids = set(by_id)
         completed_daily = set(session.bounty_completed_today)
         if daily_ids.issubset(completed_daily):
             # All 3 daily bounties completed!
@@ -8738,6 +13129,7 @@ class BridgeServer:
         self._send(session, MsgType.BOUNTY_COMPLETE,
                        struct.pack('<BHIIB', 0, bounty_id, gold, exp, token))
 
+    @packet_handler(MsgType.BOUNTY_RANKING_REQ)
     async def _on_bounty_ranking_req(self, session, payload: bytes):
         """BOUNTY_RANKING_REQ(535) -> BOUNTY_RANKING(536)
         Response: rank_count(u8) + [rank(u8) + name_len(u8) + name(str) + score(u16)]
@@ -8756,14 +13148,6 @@ class BridgeServer:
         rankings.sort(key=lambda x: x["score"], reverse=True)
         top10 = rankings[:10]
 
-        # Build response
-        data = struct.pack('<B', len(top10))
-        for i, r in enumerate(top10):
-            name_bytes = r["name"].encode('utf-8')
-            data += struct.pack('<B B', i + 1, len(name_bytes))
-            data += name_bytes
-            data += struct.pack('<H', r["score"])
-
         # My rank
         my_rank = 0
         for i, r in enumerate(rankings):
@@ -8771,9 +13155,10 @@ class BridgeServer:
                 my_rank = i + 1
                 break
 
-        data += struct.pack('<BH', my_rank, session.bounty_score_weekly)
-
-        self._send(session, MsgType.BOUNTY_RANKING, data)
+        # score는 u16 필드 (넘치면 포화), rank도 u8
+        ranks = [(i + 1, r["name"], min(r["score"], 0xFFFF)) for i, r in enumerate(top10)]
+        self._send_msg(session, Schema.BOUNTY_RANKING, ranks, min(my_rank, 0xFF),
+                       min(session.bounty_score_weekly, 0xFFFF))
 
     def _check_pvp_bounty(self, session):
         """Check if player should get PvP bounty after kill streak.
@@ -8807,13 +13192,12 @@ class BridgeServer:
         data += name_bytes
 
         # Broadcast to all players in same zone (or all)
-        for s in self.sessions.values():
-            if s.in_game:
-                self._send(s, MsgType.PVP_BOUNTY_NOTIFY, data)
+        self._announce(MsgType.PVP_BOUNTY_NOTIFY, data)
 
 
     # ---- Tripod & Scroll System (TASK 15: MsgType 520-524) ----
 
+    @packet_handler(MsgType.TRIPOD_LIST_REQ)
     async def _on_tripod_list_req(self, session: PlayerSession, payload: bytes):
         """TRIPOD_LIST_REQ(520): no payload needed.
         Returns all unlocked tripods + equipped selections for the character's class.
@@ -8872,6 +13256,7 @@ class BridgeServer:
         )
         self.log(f"TripodList: {session.char_name} class={class_name} unlocked={total_unlocked}", "TRIPOD")
 
+    @packet_handler(MsgType.TRIPOD_EQUIP)
     async def _on_tripod_equip(self, session: PlayerSession, payload: bytes):
         """TRIPOD_EQUIP(522): skill_id(u16) + tier(u8) + option_idx(u8).
         Result codes: 0=ok, 1=not_in_game, 2=invalid_skill, 3=tier_locked, 4=not_unlocked, 5=need_lower_tier"""
@@ -8924,6 +13309,7 @@ class BridgeServer:
         opt_name = options[option_idx]["name"]
         self.log(f"TripodEquip: {session.char_name} skill={skill_id} tier={tier} -> {opt_name}", "TRIPOD")
 
+    @packet_handler(MsgType.SCROLL_DISCOVER)
     async def _on_scroll_discover(self, session: PlayerSession, payload: bytes):
         """SCROLL_DISCOVER(524): scroll_item_slot(u8).
         Uses a scroll item from inventory to permanently unlock a tripod option.
@@ -8993,35 +13379,11 @@ class BridgeServer:
         Encoding: 9000 + (skill_idx_in_table * 100) + (tier * 10) + option_idx
         where skill_idx_in_table is position in sorted TRIPOD_TABLE keys.
         Returns None if not a valid scroll."""
-        if item_id < 9000 or item_id >= 9000 + len(TRIPOD_TABLE) * 100 + 40:
-            return None
-        offset = item_id - 9000
-        # Decode: skill_pos * 100 + tier * 10 + option_idx
-        skill_pos = offset // 100
-        remainder = offset % 100
-        tier = remainder // 10
-        option_idx = remainder % 10
-
-        sorted_skills = sorted(TRIPOD_TABLE.keys())
-        if skill_pos >= len(sorted_skills):
-            return None
-        skill_id = sorted_skills[skill_pos]
-        if tier < 1 or tier > 3:
-            return None
-        if tier not in TRIPOD_TABLE[skill_id]:
-            return None
-        options = TRIPOD_TABLE[skill_id][tier]
-        if option_idx >= len(options):
-            return None
-        return (skill_id, tier, option_idx, options[option_idx]["id"])
+        return self.index.get("scroll", item_id)
 
     def _generate_scroll_item_id(self, skill_id, tier, option_idx):
         """Generate a scroll item_id from skill_id + tier + option_idx."""
-        sorted_skills = sorted(TRIPOD_TABLE.keys())
-        if skill_id not in sorted_skills:
-            return None
-        skill_pos = sorted_skills.index(skill_id)
-        return 9000 + skill_pos * 100 + tier * 10 + option_idx
+        return self.index.get("scroll_item_id", (skill_id, tier, option_idx))
 
     def _try_scroll_drop(self, session, monster_type="normal"):
         """Roll for scroll drop on monster kill. Returns scroll item_id or None.
@@ -9061,65 +13423,60 @@ class BridgeServer:
 
     # ---- Auction House System (TASK 3: MsgType 390-397) ----
 
-    def _clean_expired_auctions(self):
-        """Remove expired auctions, return items/gold via mail."""
+    def _expire_auction(self, auction_id: int):
+        """Auction timer fired: remove the listing, return items/gold via mail."""
         import time as _t
         now = _t.time()
-        still_active = []
-        for listing in self.auction_listings:
-            if now >= listing["expires_at"]:
-                # Expired: return item to seller via mail
-                seller_acc = listing["seller_account"]
-                mail_id = self.next_mail_id
-                self.next_mail_id += 1
-                mail = {
-                    "id": mail_id,
-                    "sender_name": "Auction House",
-                    "sender_account": 0,
-                    "subject": "Expired Listing",
-                    "body": f"Your listing has expired.",
-                    "gold": 0,
-                    "item_id": listing["item_id"],
-                    "item_count": listing["item_count"],
-                    "read": False,
-                    "claimed": False,
-                    "sent_time": now,
-                    "expires": now + 7 * 86400,
-                }
-                if seller_acc not in self.mails:
-                    self.mails[seller_acc] = []
-                self.mails[seller_acc].append(mail)
-                # If there was a highest bidder, refund them
-                if listing.get("bid_account", 0) > 0:
-                    bid_acc = listing["bid_account"]
-                    refund_mail_id = self.next_mail_id
-                    self.next_mail_id += 1
-                    refund_mail = {
-                        "id": refund_mail_id,
-                        "sender_name": "Auction House",
-                        "sender_account": 0,
-                        "subject": "Bid Refund",
-                        "body": "Auction expired. Your bid has been refunded.",
-                        "gold": listing["bid_price"],
-                        "item_id": 0,
-                        "item_count": 0,
-                        "read": False,
-                        "claimed": False,
-                        "sent_time": now,
-                        "expires": now + 7 * 86400,
-                    }
-                    if bid_acc not in self.mails:
-                        self.mails[bid_acc] = []
-                    self.mails[bid_acc].append(refund_mail)
-                # Decrement seller listing count
-                for s in self.sessions.values():
-                    if s.account_id == seller_acc:
-                        s.auction_listings = max(0, s.auction_listings - 1)
-                self.log(f"Auction: expired listing #{listing['id']} ({listing['item_id']})", "ECON")
-            else:
-                still_active.append(listing)
-        self.auction_listings = still_active
+        listing = self.auction_book.remove(auction_id)
+        if listing is None:
+            return
+        self.store.auction.delete(auction_id)
+        # Expired: return item to seller via mail
+        seller_acc = listing["seller_account"]
+        mail_id = self.next_mail_id
+        self.next_mail_id += 1
+        mail = {
+            "id": mail_id,
+            "sender_name": "Auction House",
+            "sender_account": 0,
+            "subject": "Expired Listing",
+            "body": f"Your listing has expired.",
+            "gold": 0,
+            "item_id": listing["item_id"],
+            "item_count": listing["item_count"],
+            "read": False,
+            "claimed": False,
+            "sent_time": now,
+            "expires": now + 7 * 86400,
+        }
+        self._deliver_mail(seller_acc, mail)
+        # If there was a highest bidder, refund them
+        if listing.get("bid_account", 0) > 0:
+            bid_acc = listing["bid_account"]
+            refund_mail_id = self.next_mail_id
+            self.next_mail_id += 1
+            refund_mail = {
+                "id": refund_mail_id,
+                "sender_name": "Auction House",
+                "sender_account": 0,
+                "subject": "Bid Refund",
+                "body": "Auction expired. Your bid has been refunded.",
+                "gold": listing["bid_price"],
+                "item_id": 0,
+                "item_count": 0,
+                "read": False,
+                "claimed": False,
+                "sent_time": now,
+                "expires": now + 7 * 86400,
+            }
+            self._deliver_mail(bid_acc, refund_mail)
+        # Decrement seller listing count
+        seller = self._find_session_by_account(seller_acc)
+        if seller:
+            seller.auction_listings = max(0, seller.auction_listings - 1)
+        self.log(f"Auction: expired listing #{listing['id']} ({listing['item_id']})", "ECON")
 
+    @packet_handler(MsgType.AUCTION_LIST_REQ)
     async def _on_auction_list_req(self, session: PlayerSession, payload: bytes):
         """AUCTION_LIST_REQ(390): category(u8) + page(u8) + sort_by(u8).
         category: 0xFF=all, 0=weapon, 1=armor, 2=potion, 3=gem, 4=material, 5=etc
@@ -9133,33 +13490,14 @@ class BridgeServer:
         page = payload[1]
         sort_by = payload[2]
 
-        self._clean_expired_auctions()
-
-        # Filter by category
-        filtered = []
-        for listing in self.auction_listings:
-            if category != 0xFF and listing.get("category", 0xFF) != category:
-                continue
-            filtered.append(listing)
-
-        # Sort
-        if sort_by == 0:  # price asc
-            filtered.sort(key=lambda x: x["buyout_price"])
-        elif sort_by == 1:  # price desc
-            filtered.sort(key=lambda x: x["buyout_price"], reverse=True)
-        elif sort_by == 2:  # newest
-            filtered.sort(key=lambda x: x["listed_at"], reverse=True)
-
-        # Paginate (20 per page)
-        page_size = 20
-        total_count = len(filtered)
+        # 카테고리/정렬별 인덱스에서 해당 페이지만 잘라 온다 (20 per page)
+        page_size = AUCTION_PAGE_SIZE
+        total_count, page_items = self.auction_book.page(category, sort_by, page * page_size, page_size)
         total_pages = max(1, (total_count + page_size - 1) // page_size)
-        start = page * page_size
-        end = min(start + page_size, total_count)
-        page_items = filtered[start:end] if start < total_count else []
 
         # Build response: total_count(u16) + total_pages(u8) + current_page(u8) + item_count(u8) + items
-        parts = [struct.pack("<HBBB", total_count, total_pages, page, len(page_items))]
+        # (u16/u8 필드는 포화 — 255페이지 너머는 page(u8)로 어차피 요청할 수 없다)
+        parts = [struct.pack("<HBBB", min(total_count, 0xFFFF), min(total_pages, 0xFF), page, len(page_items))]
         for item in page_items:
             # auction_id(u32) + item_id(u16) + item_count(u8) + buyout_price(u32) + bid_price(u32) + seller_name_len(u8) + seller_name
             seller_bytes = item["seller_name"].encode("utf-8")[:20]
@@ -9170,6 +13508,7 @@ class BridgeServer:
         self._send(session, MsgType.AUCTION_LIST, b"".join(parts))
         self.log(f"AuctionList: {session.char_name} cat={category} page={page} sort={sort_by} -> {len(page_items)} items", "ECON")
 
+    @packet_handler(MsgType.AUCTION_REGISTER)
     async def _on_auction_register(self, session: PlayerSession, payload: bytes):
         """AUCTION_REGISTER(392): slot_index(u8) + count(u8) + buyout_price(u32) + category(u8).
         Result codes: 0=ok, 1=not_in_game, 2=no_item, 3=max_listings, 4=no_fee_gold, 5=invalid_price"""
@@ -9228,12 +13567,16 @@ class BridgeServer:
             "listed_at": now,
             "expires_at": now + AUCTION_DURATION_HOURS * 3600,
         }
-        self.auction_listings.append(listing)
+        self.auction_book.add(listing)
+        self.store.auction.save(auction_id, listing, session.account_id)
+        self.timers.schedule("auction", auction_id, listing["expires_at"], self._expire_auction, auction_id)
         session.auction_listings += 1
+        self._save_now(session)
 
         self._send(session, MsgType.AUCTION_REGISTER_RESULT, struct.pack("<BI", 0, auction_id))
         self.log(f"AuctionReg: {session.char_name} listed item={item_id}x{item_count} buyout={buyout_price}g (id={auction_id})", "ECON")
 
+    @packet_handler(MsgType.AUCTION_BUY)
     async def _on_auction_buy(self, session: PlayerSession, payload: bytes):
         """AUCTION_BUY(394): auction_id(u32).
         Instant buyout. Result: 0=ok, 1=not_found, 2=self_buy, 3=no_gold"""
@@ -9243,16 +13586,8 @@ class BridgeServer:
             return
         auction_id = struct.unpack_from("<I", payload, 0)[0]
 
-        self._clean_expired_auctions()
-
         # Find listing
-        listing = None
-        listing_idx = -1
-        for i, l in enumerate(self.auction_listings):
-            if l["id"] == auction_id:
-                listing = l
-                listing_idx = i
-                break
+        listing = self.auction_book.get(auction_id)
 
         if listing is None:
             self._send(session, MsgType.AUCTION_BUY_RESULT, struct.pack("<BI", 1, 0))
@@ -9301,9 +13636,7 @@ class BridgeServer:
             "sent_time": _t.time(),
             "expires": _t.time() + 7 * 86400,
         }
-        if seller_acc not in self.mails:
-            self.mails[seller_acc] = []
-        self.mails[seller_acc].append(mail)
+        self._deliver_mail(seller_acc, mail)
 
         # If there was a previous bidder, refund them
         if listing.get("bid_account", 0) > 0:
@@ -9324,20 +13657,22 @@ class BridgeServer:
                 "sent_time": _t.time(),
                 "expires": _t.time() + 7 * 86400,
             }
-            if bid_acc not in self.mails:
-                self.mails[bid_acc] = []
-            self.mails[bid_acc].append(refund_mail)
+            self._deliver_mail(bid_acc, refund_mail)
 
         # Remove listing
-        self.auction_listings.pop(listing_idx)
+        self.auction_book.remove(auction_id)
+        self.store.auction.delete(auction_id)
+        self.timers.cancel("auction", auction_id)
         # Decrement seller listing count
-        for s in self.sessions.values():
-            if s.account_id == seller_acc:
-                s.auction_listings = max(0, s.auction_listings - 1)
+        seller = self._find_session_by_account(seller_acc)
+        if seller:
+            seller.auction_listings = max(0, seller.auction_listings - 1)
+        self._save_now(session)
 
         self._send(session, MsgType.AUCTION_BUY_RESULT, struct.pack("<BI", 0, auction_id))
         self.log(f"AuctionBuy: {session.char_name} bought #{auction_id} for {price}g (tax={tax}g, seller gets {proceeds}g)", "ECON")
 
+    @packet_handler(MsgType.AUCTION_BID)
     async def _on_auction_bid(self, session: PlayerSession, payload: bytes):
         """AUCTION_BID(396): auction_id(u32) + bid_amount(u32).
         Result: 0=ok, 1=not_found, 2=self_bid, 3=no_gold, 4=bid_too_low"""
@@ -9348,14 +13683,8 @@ class BridgeServer:
         auction_id = struct.unpack_from("<I", payload, 0)[0]
         bid_amount = struct.unpack_from("<I", payload, 4)[0]
 
-        self._clean_expired_auctions()
-
         # Find listing
-        listing = None
-        for l in self.auction_listings:
-            if l["id"] == auction_id:
-                listing = l
-                break
+        listing = self.auction_book.get(auction_id)
 
         if listing is None:
             self._send(session, MsgType.AUCTION_BID_RESULT, struct.pack("<BI", 1, 0))
@@ -9400,9 +13729,7 @@ class BridgeServer:
                 "sent_time": _t.time(),
                 "expires": _t.time() + 7 * 86400,
             }
-            if old_bid_acc not in self.mails:
-                self.mails[old_bid_acc] = []
-            self.mails[old_bid_acc].append(refund_mail)
+            self._deliver_mail(old_bid_acc, refund_mail)
 
         # Deduct gold from new bidder
         session.gold -= bid_amount
@@ -9412,6 +13739,8 @@ class BridgeServer:
         listing["bid_account"] = session.account_id
         listing["highest_bidder"] = session.entity_id
         listing["highest_bidder_name"] = session.char_name
+        self.store.auction.save(auction_id, listing, listing["seller_account"])
+        self._save_now(session)
 
         self._send(session, MsgType.AUCTION_BID_RESULT, struct.pack("<BI", 0, auction_id))
         self.log(f"AuctionBid: {session.char_name} bid {bid_amount}g on #{auction_id}", "ECON")
@@ -9453,6 +13782,7 @@ class BridgeServer:
             session.energy = min(GATHER_ENERGY_MAX, session.energy + regen)
             session.energy_last_regen = now
 
+    @packet_handler(MsgType.CRAFT_LIST_REQ)
     async def _on_craft_list_req(self, session: PlayerSession, payload: bytes):
         """CRAFT_LIST_REQ(380): category(u8). proficiency_level filtered recipe list."""
         if not session.in_game:
@@ -9460,26 +13790,31 @@ class BridgeServer:
         category_filter = payload[0] if len(payload) >= 1 else 0xFF
         cat_map = {0: "weapon", 1: "armor", 2: "potion", 3: "gem", 4: "material"}
         filter_cat = cat_map.get(category_filter, None)
-        recipes = []
-        for rid, recipe in CRAFTING_RECIPES.items():
-            if recipe["proficiency_required"] > session.crafting_level:
-                continue
-            if filter_cat and recipe["category"] != filter_cat:
-                continue
-            recipes.append(recipe)
-        parts = [struct.pack("<B", len(recipes))]
-        for r in recipes:
-            rid_bytes = r["id"].encode("utf-8")
-            parts.append(struct.pack("<B", len(rid_bytes)))
-            parts.append(rid_bytes)
-            parts.append(struct.pack("<BHB", r["proficiency_required"],
-                                     r["gold_cost"], int(r["success_rate"] * 100)))
-            parts.append(struct.pack("<HB", r["result"]["item_id"], r["result"]["count"]))
-            parts.append(struct.pack("<B", len(r["materials"])))
-        resp = b"".join(parts)
-        self._send(session, MsgType.CRAFT_LIST, resp)
-        self.log(f"CraftList: {session.char_name} got {len(recipes)} recipes (cat={category_filter})", "GAME")
+        level = session.crafting_level
 
+        def build():
+            recipes = []
+            for rid, recipe in CRAFTING_RECIPES.items():
+                if recipe["proficiency_required"] > level:
+                    continue
+                if filter_cat and recipe["category"] != filter_cat:
+                    continue
+                recipes.append(recipe)
+            parts = [struct.pack("<B", len(recipes))]
+            for r in recipes:
+                rid_bytes = r["id"].encode("utf-8")
+                parts.append(struct.pack("<B", len(rid_bytes)))
+                parts.append(rid_bytes)
+                parts.append(struct.pack("<BHB", r["proficiency_required"],
+                                         r["gold_cost"], int(r["success_rate"] * 100)))
+                parts.append(struct.pack("<HB", r["result"]["item_id"], r["result"]["count"]))
+                parts.append(struct.pack("<B", len(r["materials"])))
+            return b"".join(parts)
+        # 목록은 (카테고리, 숙련도)로만 정해진다. 알 수 없는 카테고리 = 전체
+        self._send_cached(session, (MsgType.CRAFT_LIST, filter_cat, level), build)
+        self.log(f"CraftList: {session.char_name} (cat={category_filter}, level={level})", "GAME")
+
+    @packet_handler(MsgType.CRAFT_EXECUTE)
     async def _on_craft_execute(self, session: PlayerSession, payload: bytes):
         """CRAFT_EXECUTE(382): recipe_id_len(u8) + recipe_id(str). Execute crafting."""
         if not session.in_game or len(payload) < 2:
@@ -9522,6 +13857,7 @@ class BridgeServer:
         self.log(f"Craft: {session.char_name} SUCCESS {recipe_id} -> item={result_item_id}x{result_count} bonus={has_bonus}", "GAME")
         self._send(session, MsgType.CRAFT_RESULT, struct.pack("<BHBB", 0, result_item_id, result_count, has_bonus))
 
+    @packet_handler(MsgType.GATHER_START)
     async def _on_gather_start(self, session: PlayerSession, payload: bytes):
         """GATHER_START(384): gather_type(u8). Gather with energy cost + loot drop."""
         if not session.in_game or len(payload) < 1:
@@ -9560,6 +13896,7 @@ class BridgeServer:
             parts.append(struct.pack("<H", item["item_id"]))
         self._send(session, MsgType.GATHER_RESULT, b"".join(parts))
 
+    @packet_handler(MsgType.COOK_EXECUTE)
     async def _on_cook_execute(self, session: PlayerSession, payload: bytes):
         """COOK_EXECUTE(386): recipe_id_len(u8) + recipe_id(str). Cook + apply buff."""
         if not session.in_game or len(payload) < 2:
@@ -9589,6 +13926,7 @@ class BridgeServer:
         effects = recipe["effect"]
         self._send(session, MsgType.COOK_RESULT, struct.pack("<BHB", 0, recipe["duration"], len(effects)))
 
+    @packet_handler(MsgType.ENCHANT_REQ)
     async def _on_enchant_req(self, session: PlayerSession, payload: bytes):
         """ENCHANT_REQ(388): slot_index(u8) + element_id(u8) + target_level(u8). Weapon enchant."""
         if not session.in_game or len(payload) < 3:
@@ -9628,28 +13966,57 @@ class BridgeServer:
         self.log(f"Enchant: {session.char_name} slot={slot_idx} -> {element_name} Lv{target_level} (cost={gold_cost}g)", "GAME")
         self._send(session, MsgType.ENCHANT_RESULT, struct.pack("<BBBB", 0, element_id, target_level, int(level_data["damage_bonus"] * 100)))
 
-    def _spawn_monsters(self):
+    def _spawn_monsters(self, zone_id: int = 0, channel_id: int = 1) -> int:
+        """MONSTER_SPAWNS 스폰. monster_scale > 1이면 항목마다 추가 개체를 존 범위 안에 흩뿌린다.
+
+        zone_id 0 = 기동 시 채널 1 전체, 아니면 새로 연 채널 (_open_channel)에 그 존 구성을 한 벌. 반환: 스폰 수
+        """
+        spawned = 0
         for spawn in MONSTER_SPAWNS:
-            eid = new_entity()
-            self.monsters[eid] = {
-                "entity_id": eid,
-                "monster_id": spawn["id"],
-                "name": spawn["name"],
-                "level": spawn["level"],
-                "hp": spawn["hp"],
-                "max_hp": spawn["hp"],
-                "atk": spawn["atk"],
-                "def": spawn.get("def", 0),
-                "zone": spawn["zone"],
-                "pos": Position(float(spawn["x"]), float(spawn["y"]), float(spawn["z"])),
-                "ai": MonsterAI(
-                    monster_id=spawn["id"],
-                    spawn_x=float(spawn["x"]),
-                    spawn_y=float(spawn["y"]),
-                    spawn_z=float(spawn["z"]),
-                ),
-            }
-        self.log(f"Spawned {len(self.monsters)} monsters", "GAME")
+            if zone_id and spawn["zone"] != zone_id:
+                continue
+            if self.shard is not None and not self.shard.owns(spawn["zone"]):
+                continue  # 그 존을 맡은 샤드가 스폰
+            space = channel_space(spawn["zone"], channel_id)
+            bounds = ZONE_BOUNDS.get(spawn["zone"])
+            for copy in range(self.monster_scale):
+                if copy == 0 or bounds is None:
+                    x, z = float(spawn["x"]), float(spawn["z"])
+                else:
+                    x = random.uniform(bounds["min_x"], bounds["max_x"])
+                    z = random.uniform(bounds["min_z"], bounds["max_z"])
+                eid = new_entity()
+                self.monsters[eid] = {
+                    "entity_id": eid,
+                    "monster_id": spawn["id"],
+                    "name": spawn["name"],
+                    "level": spawn["level"],
+                    "hp": spawn["hp"],
+                    "max_hp": spawn["hp"],
+                    "atk": spawn["atk"],
+                    "def": spawn.get("def", 0),
+                    "zone": spawn["zone"],
+                    "channel": channel_id,
+                    "space": space,
+                    "pos": Position(x, float(spawn["y"]), z),
+                    "ai": MonsterAI(
+                        monster_id=spawn["id"],
+                        spawn_x=x,
+                        spawn_y=float(spawn["y"]),
+                        spawn_z=z,
+                        leash_range=self.AI_LEASH_RANGE,
+                    ),
+                }
+                self.zone_monsters.setdefault(space, set()).add(eid)
+                self._aoi_update_monster(eid, self.monsters[eid])
+                spawned += 1
+        if not zone_id:
+            self.log(f"Spawned {len(self.monsters)} monsters", "GAME")
+        return spawned
+
+    def _schedule_respawn(self, entity_id: int):
+        self.timers.schedule("respawn", entity_id, time.time() + self.MONSTER_RESPAWN_DELAY,
+                             self._respawn_monster, entity_id)
 
     def _respawn_monster(self, entity_id: int):
         if entity_id not in self.monsters:
@@ -9659,149 +14026,326 @@ class BridgeServer:
         m["ai"].state = 0  # IDLE
         m["ai"].aggro_table.clear()
         m["ai"].target_entity = 0
+        m["ai"].leash_range = self.AI_LEASH_RANGE
         m["pos"].x = m["ai"].spawn_x
         m["pos"].y = m["ai"].spawn_y
         m["pos"].z = m["ai"].spawn_z
+        self._aoi_update_monster(entity_id, m)
 
         # MONSTER_RESPAWN 브로드캐스트
         pkt = struct.pack('<QIIfff', entity_id, m["hp"], m["max_hp"],
                            m["pos"].x, m["pos"].y, m["pos"].z)
-        self._broadcast_to_zone(m["zone"], 0, MsgType.MONSTER_RESPAWN, pkt)
+        self._broadcast_nearby(m["space"], m["pos"].x, m["pos"].z, 0, MsgType.MONSTER_RESPAWN, pkt)
         self.log(f"MonsterRespawn: {m['name']} (entity={entity_id})", "GAME")
 
+    @property
+    def tick_count(self) -> int:
+        return self.ticker.ticks
+
     async def _game_tick_loop(self):
-        """3초마다 몬스터 AI 업데이트"""
-        while self._running:
-            await asyncio.sleep(3.0)
-            self.tick_count += 1
-            self._update_monster_ai()
-            self._cleanup_expired_buffs()
+        """고정 주기 게임 틱: 몬스터 AI는 AI_HZ, 타이머 휠은 매 기본 틱"""
+        ticker = self.ticker
+        ticker.add("monster_ai", self._update_monster_ai, self.AI_HZ)
+        ticker.add("timers", self._fire_timers)
+        if self.ghosts_enabled:
+            ticker.add("ghosts", self._sync_ghosts, GHOST_HZ)
+        if self.store.enabled:
+            ticker.add("persist", lambda dt: self.store.flush())
+            ticker.add("autosave", self._autosave, self.AUTOSAVE_HZ)
+            ticker.add("snapshot", self._snapshot, self.SNAPSHOT_HZ)
+        if self.flush_policy == "tick":
+            # 시스템은 등록 순서대로 돈다: 이 틱에 쌓인 패킷을 마지막에 세션별 write 한 번으로
+            ticker.add("flush", lambda dt: self.flush_outbound())
+            self._tick_flush = True
+        try:
+            await ticker.run(lambda: self._running)
+        finally:
+            self._tick_flush = False
+            self.flush_outbound()
 
-    def _update_monster_ai(self):
-        for mid, m in self.monsters.items():
-            if m["ai"].state == 5:  # DEAD
-                continue
+    def _fire_timers(self, dt: float):
+        for timer in self.timers.advance(time.time()):
+            try:
+                timer.fn(*timer.args)
+            except Exception as e:
+                self.log(f"Timer {timer.category}:{timer.key} failed: {type(e).__name__}: {e}", "ERR")
+
+    def _update_monster_ai(self, dt: float):
+        """몬스터 AI 틱. dt = 직전 틱 이후 경과 초 (이동 거리/패트롤 확률에 반영).
+
+        1단계: 몬스터 순서대로 어그로 타겟 선정 + 상태 전이 + 공격 (플레이어 HP를 바꾸므로 순차).
+        2단계: CHASE/RETURN/PATROL 이동을 모아 한 번에 계산한 뒤 몬스터별 MONSTER_MOVE를 보낸다.
+        플레이어가 없는 존의 IDLE 몬스터는 패트롤하지 않는다 (볼 사람이 없음).
+        """
+        sessions = self.sessions
+        zone_players = self.zone_players
+        rand = random.random
+        patrol_chance = min(1.0, self.AI_PATROL_RATE * dt)
+        now = time.monotonic()
+        chasers = []    # (mid, m, target session)
+        returners = []  # (mid, m)
+        patrols = []    # (mid, m)
 
+        for mid, m in self.monsters.items():
             ai = m["ai"]
+            state = ai.state
+            if state == 5:  # DEAD
+                continue
+            in_zone = zone_players.get(m["space"])
 
             # 가장 높은 어그로 타겟 찾기
             best_target = 0
-            best_aggro = 0.0
-            for eid, aggro in list(ai.aggro_table.items()):
-                if eid in self.sessions and self.sessions[eid].in_game and \
-                   self.sessions[eid].zone_id == m["zone"] and \
-                   self.sessions[eid].stats.is_alive():
-                    if aggro > best_aggro:
-                        best_aggro = aggro
-                        best_target = eid
-                else:
-                    del ai.aggro_table[eid]  # 타겟 제거
+            if ai.aggro_table:
+                best_aggro = 0.0
+                for eid, aggro in list(ai.aggro_table.items()):
+                    if in_zone and eid in in_zone and sessions[eid].stats.is_alive():
+                        if aggro > best_aggro:
+                            best_aggro = aggro
+                            best_target = eid
+                    else:
+                        del ai.aggro_table[eid]  # 타겟 제거
 
-            if best_target and ai.state in (0, 1):  # IDLE/PATROL → CHASE
-                ai.state = 2  # CHASE
+            if best_target and state in (0, 1):  # IDLE/PATROL → CHASE
+                ai.state = state = 2  # CHASE
                 ai.target_entity = best_target
 
-            if ai.state == 2:  # CHASE
+            if state == 2:  # CHASE
                 if not best_target:
                     ai.state = 4  # RETURN
                     ai.target_entity = 0
                 else:
-                    target = self.sessions.get(best_target)
-                    if target:
-                        dx = target.pos.x - m["pos"].x
-                        dz = target.pos.z - m["pos"].z
-                        dist = math.sqrt(dx*dx + dz*dz)
-
-                        # 리쉬 체크
-                        sdx = m["pos"].x - ai.spawn_x
-                        sdz = m["pos"].z - ai.spawn_z
-                        spawn_dist = math.sqrt(sdx*sdx + sdz*sdz)
-                        if spawn_dist > ai.leash_range:
-                            ai.state = 4  # RETURN
-                            ai.target_entity = 0
-                            ai.aggro_table.clear()
-                        elif dist <= 200.0:  # 공격 범위
-                            ai.state = 3  # ATTACK
-                        else:
-                            # 이동
-                            speed = 80.0 * 1.3  # chase speed
-                            move_dist = min(speed * 3.0, dist)  # 3초 틱
-                            if dist > 0:
-                                nx = m["pos"].x + (dx / dist) * move_dist
-                                nz = m["pos"].z + (dz / dist) * move_dist
-                                m["pos"].x = nx
-                                m["pos"].z = nz
-                                # MONSTER_MOVE 브로드캐스트
-                                move_pkt = struct.pack('<Qfff', mid, nx, m["pos"].y, nz)
-                                self._broadcast_to_zone(m["zone"], 0, MsgType.MONSTER_MOVE, move_pkt)
-
-            elif ai.state == 3:  # ATTACK
-                if not best_target or best_target not in self.sessions:
+                    chasers.append((mid, m, sessions[best_target]))
+
+            elif state == 3:  # ATTACK
+                if not best_target or best_target not in sessions:
                     ai.state = 4  # RETURN
                     ai.target_entity = 0
-                else:
-                    target = self.sessions[best_target]
+                elif now >= ai.next_attack_at:
+                    ai.next_attack_at = now + self.AI_ATTACK_INTERVAL
+                    target = sessions[best_target]
                     damage = max(1, m["atk"] - target.stats.defense)
                     target.stats.hp = max(0, target.stats.hp - damage)
 
                     result = struct.pack('<BQQiII', 1, mid, best_target,
                                           damage, target.stats.hp, target.stats.max_hp)
-                    self._broadcast_to_zone(m["zone"], 0, MsgType.ATTACK_RESULT, result)
+                    self._broadcast_nearby(m["space"], m["pos"].x, m["pos"].z, 0,
+                                           MsgType.ATTACK_RESULT, result)
 
                     if target.stats.hp <= 0:
                         died = struct.pack('<QQ', best_target, mid)
-                        self._broadcast_to_zone(m["zone"], 0, MsgType.COMBAT_DIED, died)
+                        self._broadcast_nearby(m["space"], m["pos"].x, m["pos"].z, 0,
+                                               MsgType.COMBAT_DIED, died)
                         ai.aggro_table.pop(best_target, None)
                         ai.state = 0 if not ai.aggro_table else 2
 
                     self._send_stat_sync(target)
 
-            elif ai.state == 4:  # RETURN
-                dx = ai.spawn_x - m["pos"].x
-                dz = ai.spawn_z - m["pos"].z
-                dist = math.sqrt(dx*dx + dz*dz)
-                if dist < 10.0:
-                    ai.state = 0  # IDLE
-                    m["hp"] = m["max_hp"]  # 귀환 시 회복
-                else:
-                    speed = 80.0
-                    move_dist = min(speed * 3.0, dist)
-                    if dist > 0:
-                        m["pos"].x += (dx / dist) * move_dist
-                        m["pos"].z += (dz / dist) * move_dist
-                        move_pkt = struct.pack('<Qfff', mid, m["pos"].x, m["pos"].y, m["pos"].z)
-                        self._broadcast_to_zone(m["zone"], 0, MsgType.MONSTER_MOVE, move_pkt)
-
-            elif ai.state == 0:  # IDLE → 랜덤 패트롤
-                if random.random() < 0.3:  # 30% 확률로 이동
-                    ai.state = 1
-                    angle = random.uniform(0, 2 * math.pi)
-                    dist = random.uniform(20, ai.patrol_radius)
-                    target_x = ai.spawn_x + math.cos(angle) * dist
-                    target_z = ai.spawn_z + math.sin(angle) * dist
-                    m["pos"].x = target_x
-                    m["pos"].z = target_z
-                    move_pkt = struct.pack('<Qfff', mid, m["pos"].x, m["pos"].y, m["pos"].z)
-                    self._broadcast_to_zone(m["zone"], 0, MsgType.MONSTER_MOVE, move_pkt)
-                    ai.state = 0  # 이동 후 다시 IDLE
-
-    def _cleanup_expired_buffs(self):
-        now = time.time()
-        for session in self.sessions.values():
-            session.buffs = [b for b in session.buffs if b["expires"] > now]
+            elif state == 4:  # RETURN
+                returners.append((mid, m))
+
+            elif state == 0 and in_zone and rand() < patrol_chance:  # IDLE → 랜덤 패트롤
+                patrols.append((mid, m))
+
+        # ── 2단계: 이동 일괄 계산 ──
+        moves = []  # (mid, m, nx, nz)
+        sqrt = math.sqrt
+        attack_range = self.AI_ATTACK_RANGE
+        chase_step = self.AI_CHASE_SPEED * dt
+        for mid, m, target in chasers:
+            ai = m["ai"]
+            px, pz = m["pos"].x, m["pos"].z
+            dx = target.pos.x - px
+            dz = target.pos.z - pz
+            dist = sqrt(dx*dx + dz*dz)
+            # 리쉬 체크
+            sdx = px - ai.spawn_x
+            sdz = pz - ai.spawn_z
+            if sqrt(sdx*sdx + sdz*sdz) > ai.leash_range:
+                ai.state = 4  # RETURN
+                ai.target_entity = 0
+                ai.aggro_table.clear()
+            elif dist <= attack_range:
+                ai.state = 3  # ATTACK
+            else:
+                f = min(chase_step, dist) / dist
+                moves.append((mid, m, px + dx * f, pz + dz * f))
+
+        return_step = self.AI_RETURN_SPEED * dt
+        arrive = self.AI_RETURN_ARRIVE
+        for mid, m in returners:
+            ai = m["ai"]
+            px, pz = m["pos"].x, m["pos"].z
+            dx = ai.spawn_x - px
+            dz = ai.spawn_z - pz
+            dist = sqrt(dx*dx + dz*dz)
+            if dist < arrive:
+                ai.state = 0  # IDLE
+                m["hp"] = m["max_hp"]  # 귀환 시 회복
+            else:
+                f = min(return_step, dist) / dist
+                moves.append((mid, m, px + dx * f, pz + dz * f))
+
+        uniform = random.uniform
+        cos, sin, two_pi = math.cos, math.sin, 2 * math.pi
+        for mid, m in patrols:
+            ai = m["ai"]
+            angle = uniform(0, two_pi)
+            dist = uniform(20, ai.patrol_radius)
+            moves.append((mid, m, ai.spawn_x + cos(angle) * dist, ai.spawn_z + sin(angle) * dist))
+
+        pack_move = _MONSTER_MOVE.pack
+        for mid, m, nx, nz in moves:
+            pos = m["pos"]
+            pos.x = nx
+            pos.z = nz
+            self._aoi_update_monster(mid, m)
+            self._broadcast_nearby(m["space"], nx, nz, 0, MsgType.MONSTER_MOVE,
+                                   pack_move(mid, nx, pos.y, nz))
+
+
+BridgeServer._collect_handlers()
 
 
 # ━━━ 엔트리포인트 ━━━
 
+def _shard_main(index: int, count: int, links: Dict[Tuple[int, int], tuple], listener: socket.socket,
+                server_kwargs: dict):
+    """샤드 워커 프로세스 (fork): 자기 링크 소켓만 남기고 공유 리슨 소켓으로 서비스"""
+    peers = {}
+    for (a, b), (sock_a, sock_b) in links.items():
+        if a == index:
+            peers[b] = sock_a
+            sock_b.close()
+        elif b == index:
+            peers[a] = sock_b
+            sock_a.close()
+        else:
+            sock_a.close()
+            sock_b.close()
+    server = BridgeServer(shard=ShardLink(index, count, peers), **server_kwargs)
+    try:
+        asyncio.run(server.start(sock=listener))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_shards(count: int, port: int, server_kwargs: dict):
+    """필드 존을 count개 워커 프로세스에 나눠 돌린다 (fork + AF_UNIX SCM_RIGHTS — Linux/macOS)"""
+    if not hasattr(socket, "AF_UNIX") or "fork" not in multiprocessing.get_all_start_methods():
+        raise SystemExit("--shards needs fork and AF_UNIX sockets (Linux/macOS)")
+    listener = socket.create_server(('0.0.0.0', port), backlog=1024)
+    links = {(a, b): socket.socketpair() for a in range(count) for b in range(a + 1, count)}
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_shard_main, name=f"shard-{i}", daemon=True,
+                           args=(i, count, links, listener, server_kwargs))
+               for i in range(count)]
+    for w in workers:
+        w.start()
+    for pair in links.values():
+        for sock in pair:
+            sock.close()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for w in workers:
+            w.join()
+    finally:
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+
+
 def main():
     parser = argparse.ArgumentParser(description="TCP Bridge Server - ECS FieldServer Python")
-    parser.add_argument('--port', type=int, default=7777, help='Listen port (default: 7777)')
+    parser.add_argument('--role', choices=('field', 'gate', 'bus'), default='field',
+                        help='field: game server, gate: routes GATE_ROUTE_REQ to registered fields,'
+                             ' bus: topic pub/sub between field processes (default: field)')
+    parser.add_argument('--port', type=int, default=None,
+                        help=f'Listen port (default: 7777, {GATE_PORT} with --role gate, {BUS_PORT} with --role bus)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
+    parser.add_argument('--transport', choices=BridgeServer.TRANSPORTS, default='stream',
+                        help='stream: StreamReader per connection, protocol: asyncio.Protocol (default: stream)')
+    parser.add_argument('--flush', choices=BridgeServer.FLUSH_POLICIES, default='loop',
+                        help='outbound flush policy: immediate, dispatch (per handler), loop (per event-loop iteration),'
+                             ' tick (end of game tick) (default: loop)')
+    parser.add_argument('--view-radius', type=float, default=GRID_CELL_SIZE,
+                        help=f'AOI view radius = grid cell size, 0 = whole zone (default: {GRID_CELL_SIZE:g})')
+    parser.add_argument('--monster-scale', type=int, default=1,
+                        help='monsters spawned per MONSTER_SPAWNS entry, for load testing (default: 1)')
+    parser.add_argument('--tick-rate', type=float, default=None,
+                        help='base game tick rate in Hz (default: tick_rate in data/server.json, else 30)')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='directory with game data tables (*.csv, *.json), reloaded by ADMIN_RELOAD (default: data/)')
+    parser.add_argument('--db', default=None,
+                        help='SQLite file for persistent world state (default: db_path in data/server.json, else memory only)')
+    parser.add_argument('--no-journal-fsync', dest='journal_fsync', action='store_false',
+                        help='only flush the --db journal per batch: survives process crashes, not power loss (default: fsync)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='worker processes that split the field zones, 0 = worker_threads in data/server.json'
+                             ' (default: 1 = single process)')
+    parser.add_argument('--ghosts', action='store_true',
+                        help='mirror players near zone borders into the adjacent zone (always on with --shards > 1)')
+    parser.add_argument('--gate', default=None, metavar='[HOST:]PORT',
+                        help='register with a gate and send load heartbeats (default: off)')
+    parser.add_argument('--bus', default=None, metavar='[HOST:]PORT',
+                        help='share world announcements, whispers, mail and presence through a bus (default: off)')
     args = parser.parse_args()
+    if args.role == 'gate':
+        port = args.port or GATE_PORT
+        print("=" * 50)
+        print("  ECS Gate Server (Python)")
+        print(f"  Port: {port}")
+        print(f"  Heartbeat timeout: {GATE_HEARTBEAT_TIMEOUT:g}s (load-aware routing)")
+        print("=" * 50)
+        print()
+        try:
+            asyncio.run(GateServer(port=port, verbose=args.verbose).start())
+        except KeyboardInterrupt:
+            print("\nGate stopped.")
+        return
+    if args.role == 'bus':
+        port = args.port or BUS_PORT
+        print("=" * 50)
+        print("  ECS Message Bus (Python)")
+        print(f"  Port: {port}")
+        print(f"  Queue limit: {BUS_QUEUE_LIMIT} messages per server (drop lowest priority first, never CRITICAL)")
+        print("=" * 50)
+        print()
+        try:
+            asyncio.run(BusServer(port=port, verbose=args.verbose).start())
+        except KeyboardInterrupt:
+            print("\nBus stopped.")
+        return
+    args.port = args.port or 7777
+
+    def address(option: str, value: Optional[str]) -> Optional[Tuple[str, int]]:
+        if not value:
+            return None
+        host, _, port = value.rpartition(':')
+        if not port.isdigit():
+            parser.error(f"{option} expects [HOST:]PORT (got {value!r})")
+        return host or '127.0.0.1', int(port)
+    gate = address('--gate', args.gate)
+    bus = address('--bus', args.bus)
+    config = load_server_config()
+    db_path = args.db or config.get("db_path")
+    shards = args.shards or int(config.get("worker_threads", 1))
+    if shards > 1 and db_path:
+        parser.error("--shards does not support --db (storage is per process)")
+    if shards > 1 and gate:
+        parser.error("--shards does not support --gate (shards share one port)")
 
     print("=" * 50)
     print("  ECS TCP Bridge Server v1.0")
     print(f"  Port: {args.port}")
+    print(f"  Transport: {args.transport} (flush: {args.flush})")
+    print(f"  AOI view radius: {args.view_radius:g}" + (" (whole zone)" if not args.view_radius else ""))
+    print(f"  Storage: {db_path or 'memory only'}")
+    if gate:
+        print(f"  Gate: {gate[0]}:{gate[1]}")
+    if bus:
+        print(f"  Bus: {bus[0]}:{bus[1]}")
+    if shards > 1:
+        print(f"  Shards: {shards} processes (zone handoff + ghosts)")
     print(f"  Protocol: PacketComponents.h compatible")
     print(f"  Handlers: Login, Move, Chat, Shop, Skill,")
     print(f"            Party, Inventory, Quest, Boss, AI,")
@@ -9809,10 +14353,16 @@ def main():
     print("=" * 50)
     print()
 
-    server = BridgeServer(port=args.port, verbose=args.verbose)
-
+    options = dict(port=args.port, verbose=args.verbose, transport=args.transport,
+                   flush_policy=args.flush, view_radius=args.view_radius,
+                   monster_scale=args.monster_scale, tick_rate=args.tick_rate, data_dir=args.data_dir, bus=bus)
     try:
-        asyncio.run(server.start())
+        if shards > 1:
+            run_shards(shards, args.port, options)
+        else:
+            server = BridgeServer(db_path=db_path, journal_fsync=args.journal_fsync, ghosts=args.ghosts,
+                                  gate=gate, **options)
+            asyncio.run(server.start())
     except KeyboardInterrupt:
         print("\nServer stopped.")
 
@@ -0,0 +1,144 @@
+"""
+TCP Bridge Server 테스트 — asyncio.Protocol 전송 모드
+======================================================
+test_tcp_bridge.py의 통합 테스트(run_tests)를 --transport protocol 서버에 그대로 돌리고,
+끝난 뒤 존 인덱스 불변식(check_zone_index)과, 핸들러가 await로 멈출 때
+(Task 폴백 경로)의 패킷 순서를 추가로 확인한다.
+"""
+
+import asyncio
+import struct
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+from tcp_bridge import BridgeServer, MsgType, build_packet, packet_handler
+from test_tcp_bridge import TestClient, run_tests
+
+
+class SlowEchoServer(BridgeServer):
+    """ECHO 핸들러가 잠깐 await 하는 서버 (동기 fast path가 아닌 Task 경로 강제)"""
+
+    @packet_handler(MsgType.ECHO)
+    async def _on_echo(self, session, payload: bytes):
+        await asyncio.sleep(0.01)
+        self._send(session, MsgType.ECHO, payload)
+
+
+async def start_server(server: BridgeServer, port: int) -> asyncio.Task:
+    async def run_server():
+        srv = await server.listen(port=port)
+        server._running = True
+        server._spawn_monsters()
+        server._spawn_npcs()
+        asyncio.create_task(server._game_tick_loop())
+        async with srv:
+            await srv.serve_forever()
+
+    task = asyncio.create_task(run_server())
+    await asyncio.sleep(0.5)  # 서버 기동 대기
+    return task
+
+
+async def stop_server(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def run_order_tests(server: BridgeServer, port: int):
+    passed = 0
+    total = 0
+
+    async def test(name, coro):
+        nonlocal passed, total
+        total += 1
+        try:
+            await coro
+            passed += 1
+            print(f"  [PASS] {name}")
+        except AssertionError as e:
+            print(f"  [FAIL] {name}: {e}")
+        except Exception as e:
+            print(f"  [ERROR] {name}: {type(e).__name__}: {e}")
+
+    async def test_suspend_keeps_order():
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        # ECHO(멈춤) → PING(즉시) → ECHO(멈춤) 을 한 번에 전송
+        c.writer.write(b''.join([
+            build_packet(MsgType.ECHO, struct.pack('<I', 1)),
+            build_packet(MsgType.PING, b''),
+            build_packet(MsgType.ECHO, struct.pack('<I', 2)),
+        ]))
+        await c.writer.drain()
+        got = []
+        for _ in range(3):
+            msg_type, payload = await c.recv_packet(timeout=2.0)
+            assert msg_type is not None, f"timeout after {got}"
+            got.append((msg_type, payload))
+        assert [mt for mt, _ in got] == [MsgType.ECHO, MsgType.PING, MsgType.ECHO], \
+            f"order: {[mt for mt, _ in got]}"
+        assert got[0][1] == struct.pack('<I', 1) and got[2][1] == struct.pack('<I', 2)
+        c.close()
+
+    await test("PROTOCOL: await 하는 핸들러 뒤 패킷도 순서대로 처리", test_suspend_keeps_order())
+
+    async def test_disconnect_cleans_up():
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        await c.send(MsgType.PING)
+        msg_type, _ = await c.recv_packet()
+        assert msg_type == MsgType.PING
+        c.close()
+        await asyncio.sleep(0.2)
+        assert not server.writers, f"writers left: {len(server.writers)}"
+
+    await test("PROTOCOL: 연결 종료 → connection_lost → 세션 정리", test_disconnect_cleans_up())
+
+    return passed, total
+
+
+async def main():
+    port = 17787  # test_tcp_bridge.py(17777)와 충돌 방지
+
+    print("=" * 50)
+    print("  TCP Bridge Server Integration Tests (protocol transport)")
+    print(f"  Port: {port}")
+    print("=" * 50)
+    print()
+
+    server = BridgeServer(port=port, verbose=False, transport="protocol")
+    task = await start_server(server, port)
+    try:
+        passed, total = await run_tests(port)
+        # 통합 테스트 전체를 거친 뒤에도 존 인덱스가 실제 세션 상태와 일치해야 함
+        await asyncio.sleep(0.5)
+        errors = server.check_zone_index()
+        total += 1
+        if errors:
+            print(f"  [FAIL] ZONE_INDEX: 통합 테스트 후 불변식: {errors[:5]}")
+        else:
+            passed += 1
+            print("  [PASS] ZONE_INDEX: 통합 테스트 후 불변식")
+    finally:
+        await stop_server(task)
+
+    slow = SlowEchoServer(port=port + 1, verbose=False, transport="protocol")
+    task = await start_server(slow, port + 1)
+    try:
+        p2, t2 = await run_order_tests(slow, port + 1)
+    finally:
+        await stop_server(task)
+
+    passed += p2
+    total += t2
+    print(f"\n  Protocol Transport Results: {passed}/{total} PASSED")
+    return 0 if passed == total else 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
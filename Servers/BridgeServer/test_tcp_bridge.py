@@ -13,7 +13,8 @@ import time
 # 브릿지 서버 임포트
 sys.path.insert(0, os.path.dirname(__file__))
 from tcp_bridge import (
-    BridgeServer, MsgType, build_packet, parse_header,
+    BridgeServer, MsgType, Schema, build_packet, parse_header,
+    PacketFramer, FramingError, TickScheduler,
     PACKET_HEADER_SIZE, MAX_PACKET_SIZE,
     CRAFTING_RECIPES, GATHER_TYPES, COOKING_RECIPES,
     ENCHANT_ELEMENTS, ENCHANT_LEVELS,
@@ -57,6 +58,34 @@ from tcp_bridge import (
 )
 
 
+class FakeWriter:
+    """서버 핸들러 단위 테스트용 writer 대역. writes=True면 write한 바이트를 self.writes에 쌓는다"""
+
+    def __init__(self, writes: bool = False):
+        self.writes = [] if writes else None
+        self.closed = False
+
+    def write(self, data):
+        if self.writes is not None:
+            self.writes.append(bytes(data))
+
+    def is_closing(self):
+        return self.closed
+
+    def get_extra_info(self, name):
+        return None
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        """쌓인 write를 [(msg_type, payload)]로 풀고 비운다"""
+        f = PacketFramer()
+        f.feed(b''.join(self.writes))
+        self.writes.clear()
+        return [(mt, bytes(pl)) for mt, pl in f.packets()]
+
+
 class TestClient:
     """테스트용 TCP 클라이언트"""
 
@@ -223,8 +252,9 @@ async def run_tests(port: int):
         await c.send(MsgType.CHAR_LIST_REQ)
         msg_type, resp = await c.recv_packet()
         assert msg_type == MsgType.CHAR_LIST_RESP, f"Expected CHAR_LIST_RESP, got {msg_type}"
-        count = resp[0]
-        assert count == 3, f"Expected 3 characters, got {count}"
+        chars = Schema.CHAR_LIST_RESP.decode(resp).chars
+        assert len(chars) == 3, f"Expected 3 characters, got {len(chars)}"
+        assert chars[0].name == "Warrior_01" and chars[0].level == 10, chars[0]
         c.close()
 
     await test("CHAR_LIST: 3캐릭터 반환", test_char_list())
@@ -415,8 +445,9 @@ async def run_tests(port: int):
         await c.send(MsgType.SKILL_LIST_REQ)
         msg_type, resp = await c.recv_packet()
         assert msg_type == MsgType.SKILL_LIST_RESP, f"Expected SKILL_LIST_RESP, got {msg_type}"
-        count = resp[0]
-        assert count == 3, f"Should have 3 starting skills, got {count}"
+        skills = Schema.SKILL_LIST_RESP.decode(resp).skills
+        assert len(skills) == 3, f"Should have 3 starting skills, got {len(skills)}"
+        assert sorted(s.id for s in skills) == [1, 2, 6] and all(s.level == 1 for s in skills), skills
         c.close()
 
     await test("SKILL: 스킬 목록 조회", test_skill())
@@ -1822,8 +1853,9 @@ async def run_tests(port: int):
         await c.send(MsgType.BOUNTY_RANKING_REQ, b'')
         msg_type, resp = await c.recv_expect(MsgType.BOUNTY_RANKING)
         assert msg_type == MsgType.BOUNTY_RANKING, f"Expected BOUNTY_RANKING, got {msg_type}"
-        rank_count = resp[0]
-        assert rank_count >= 0, f"Rank count should be >= 0, got {rank_count}"
+        ranking = Schema.BOUNTY_RANKING.decode(resp)
+        assert ranking.ranks and ranking.my_rank >= 1, ranking
+        assert ranking.ranks[ranking.my_rank - 1].score == ranking.my_score > 0, ranking
         c.close()
 
     await test("BOUNTY_RANKING: 주간 랭킹 조회", test_bounty_ranking())
@@ -3136,6 +3168,1765 @@ async def run_tests(port: int):
 
     await test("MAIN_QUEST_DATA: 메인 퀘스트 목록 조회", test_main_quest_data())
 
+    # ━━━ Test: DISPATCH — 클래스 레벨 핸들러 테이블 + 호출 통계 ━━━
+    async def test_dispatch_registry():
+        """핸들러 테이블은 클래스 정의 시점에 고정, STATS에 핸들러 통계 노출."""
+        assert BridgeServer.HANDLERS[MsgType.MOVE] == '_on_move'
+        assert BridgeServer.HANDLERS[MsgType.ZONE_TRANSFER_REQ] == '_on_zone_transfer'
+        for mt, name in BridgeServer.HANDLERS.items():
+            assert callable(getattr(BridgeServer, name, None)), f"{mt} -> {name} missing"
+        try:
+            BridgeServer.register_handler(MsgType.ECHO, '_on_ping')
+            assert False, "conflicting registration should fail"
+        except ValueError:
+            pass
+
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        await asyncio.sleep(0.1)
+        await c.send(MsgType.ECHO, b'x')
+        await c.recv_expect(MsgType.ECHO)
+        await c.send(MsgType.STATS)
+        msg_type, resp = await c.recv_expect(MsgType.STATS)
+        assert msg_type == MsgType.STATS
+        fields = dict(kv.split('=', 1) for kv in resp.decode('utf-8').split('|'))
+        assert int(fields['dispatched']) >= 1, f"dispatched={fields['dispatched']}"
+        assert fields['hot_handlers'], "hot_handlers should not be empty"
+        c.close()
+
+    await test("DISPATCH: 핸들러 레지스트리 + 호출 통계", test_dispatch_registry())
+
+    # ━━━ Test: FRAMER — 오프셋 기반 프레이밍 + memoryview payload ━━━
+    async def test_framer():
+        """한 read에 여러 패킷 / 헤더가 쪼개진 경우 / 잘못된 길이."""
+        f = PacketFramer(compact_threshold=64)
+        stream = b''.join(build_packet(MsgType.ECHO, bytes([i]) * i) for i in range(1, 41))
+        got = []
+        # 7바이트씩 잘라서 feed — 헤더/페이로드가 경계에 걸침
+        for i in range(0, len(stream), 7):
+            f.feed(stream[i:i + 7])
+            for msg_type, payload in f.packets():
+                assert isinstance(payload, memoryview)
+                got.append((msg_type, bytes(payload)))
+        assert len(got) == 40, f"Expected 40 packets, got {len(got)}"
+        assert all(mt == MsgType.ECHO and pl == bytes([i + 1]) * (i + 1) for i, (mt, pl) in enumerate(got))
+        assert len(f) == 0
+
+        # 소비 후 payload 뷰는 해제됨 → 버퍼 재사용 가능
+        f.feed(build_packet(MsgType.PING))
+        views = [pl for _, pl in f.packets()]
+        try:
+            bytes(views[0])
+            assert False, "payload view should be released"
+        except ValueError:
+            pass
+
+        f.feed(struct.pack('<IH', 3, MsgType.ECHO))
+        try:
+            list(f.packets())
+            assert False, "invalid length should raise"
+        except FramingError:
+            pass
+
+    await test("FRAMER: 분할/연속 패킷 + 뷰 해제 + 잘못된 길이", test_framer())
+
+    # ━━━ Test: PIPELINE — 한 번에 100개 패킷 ━━━
+    async def test_pipelined_packets():
+        """클라이언트가 한 write에 100개 패킷을 보내도 순서대로 모두 응답."""
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        await asyncio.sleep(0.1)
+        c.writer.write(b''.join(build_packet(MsgType.ECHO, struct.pack('<I', i)) for i in range(100)))
+        await c.writer.drain()
+        for i in range(100):
+            msg_type, resp = await c.recv_packet()
+            assert msg_type == MsgType.ECHO, f"[{i}] Expected ECHO, got {msg_type}"
+            assert struct.unpack('<I', resp)[0] == i, f"[{i}] out of order"
+        c.close()
+
+    await test("PIPELINE: 100 패킷 연속 전송 → 순서대로 응답", test_pipelined_packets())
+
+    # ━━━ Test: OUTBOUND — 세션별 송신 묶음 ━━━
+    async def test_outbound_coalescing():
+        """tick/dispatch 정책: 여러 _send가 세션당 write 한 번으로 나감."""
+        from tcp_bridge import PlayerSession
+        srv = BridgeServer(port=0, verbose=False, flush_policy="loop")
+        a, b = PlayerSession(writer=FakeWriter(writes=True)), PlayerSession(writer=FakeWriter(writes=True))
+        for i in range(5):
+            srv._send(a, MsgType.ECHO, bytes([i]))
+        srv._send(b, MsgType.PING, b'PONG')
+        assert a.writer.writes == [] and b.writer.writes == [], "loop policy must defer writes"
+        await asyncio.sleep(0)  # 루프 한 바퀴 → flush
+        assert a.writer.writes == [b''.join(build_packet(MsgType.ECHO, bytes([i])) for i in range(5))]
+        assert b.writer.writes == [build_packet(MsgType.PING, b'PONG')]
+        ob = srv.outbound_stats_report()
+        assert ob["packets"] == 6 and ob["writes"] == 2 and ob["syscalls_saved"] == 4, ob
+        assert ob["bytes_saved"] == 4 * BridgeServer.TCPIP_HEADER_BYTES
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        a = PlayerSession(writer=FakeWriter(writes=True))
+        srv._send(a, MsgType.ECHO, b'1')
+        srv._send(a, MsgType.ECHO, b'2')
+        assert len(a.writer.writes) == 2
+        assert srv.outbound_stats_report()["syscalls_saved"] == 0
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="dispatch")
+        a = PlayerSession(writer=FakeWriter(writes=True))
+        await srv._dispatch(a.writer, a, MsgType.ECHO, b'x')
+        await srv._dispatch(a.writer, a, MsgType.PING, b'')
+        assert a.writer.writes == [build_packet(MsgType.ECHO, b'x'), build_packet(MsgType.PING, b'PONG')]
+
+        # tick: 틱 루프가 도는 동안은 루프 여러 바퀴에 걸친 패킷도 틱 끝에 한 번에
+        srv = BridgeServer(port=0, verbose=False, flush_policy="tick", tick_rate=20.0)
+        a = PlayerSession(writer=FakeWriter(writes=True))
+        srv._running = True
+        tick_task = asyncio.create_task(srv._game_tick_loop())
+        await asyncio.sleep(0)
+        ticks = srv.ticker.ticks
+        srv._send(a, MsgType.ECHO, b'1')
+        await asyncio.sleep(0)
+        srv._send(a, MsgType.ECHO, b'2')
+        await asyncio.sleep(0)
+        if srv.ticker.ticks == ticks:
+            assert a.writer.writes == [], "tick policy must wait for the game tick"
+        while srv.ticker.ticks == ticks:
+            await asyncio.sleep(0.01)
+        assert a.writer.writes == [build_packet(MsgType.ECHO, b'1') + build_packet(MsgType.ECHO, b'2')]
+        srv._running = False
+        await tick_task
+        srv._send(a, MsgType.ECHO, b'3')  # 틱 루프가 멈추면 loop 정책처럼
+        await asyncio.sleep(0)
+        assert a.writer.writes[-1] == build_packet(MsgType.ECHO, b'3')
+
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        await asyncio.sleep(0.1)
+        await c.send(MsgType.STATS)
+        msg_type, resp = await c.recv_expect(MsgType.STATS)
+        fields = dict(kv.split('=', 1) for kv in resp.decode('utf-8').split('|'))
+        assert 'syscalls_saved' in fields and 'bytes_saved' in fields, fields.keys()
+        c.close()
+
+    await test("OUTBOUND: 세션별 송신 묶음 (loop/tick/dispatch/immediate) + 절약 통계", test_outbound_coalescing())
+
+    # ━━━ Test: BACKPRESSURE — 느린 클라이언트 ━━━
+    async def test_backpressure():
+        """soft limit: 이동 패킷은 엔티티별 최신값만 / low 아래로 오면 해제 / hard limit: 끊기."""
+        class StalledTransport:
+            def __init__(self):
+                self.buffered = 0
+                self.writes = []
+                self.aborted = False
+            def write(self, data):
+                self.writes.append(bytes(data))
+            def is_closing(self):
+                return self.aborted
+            def get_write_buffer_size(self):
+                return self.buffered
+            def abort(self):
+                self.aborted = True
+
+        from tcp_bridge import PlayerSession
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        w = StalledTransport()
+        s = PlayerSession(writer=w)
+        w.buffered = srv.OUT_HIGH_WATERMARK
+        for i in range(10):
+            srv._send(s, MsgType.MOVE_BROADCAST, struct.pack('<Qfff', 7, float(i), 0.0, 0.0))
+            srv._send(s, MsgType.MONSTER_MOVE, struct.pack('<Qfff', 9, float(i), 0.0, 0.0))
+        srv._send(s, MsgType.CHAT_MESSAGE, b'important')
+        assert s.congested
+        assert w.writes == [build_packet(MsgType.CHAT_MESSAGE, b'important')], "only non-sheddable goes out"
+        assert s.out_shed == 18 and srv.outbound_stats["shed"] == 18
+        assert len(s.out_held) == 2
+
+        w.buffered = srv.OUT_LOW_WATERMARK  # 클라이언트가 따라잡음
+        await asyncio.sleep(srv.CONGESTION_CHECK_INTERVAL * 3)
+        assert not s.congested and not s.out_held
+        assert w.writes[1:] == [
+            build_packet(MsgType.MOVE_BROADCAST, struct.pack('<Qfff', 7, 9.0, 0.0, 0.0)),
+            build_packet(MsgType.MONSTER_MOVE, struct.pack('<Qfff', 9, 9.0, 0.0, 0.0)),
+        ], "latest position per entity"
+
+        w.buffered = srv.OUT_HARD_LIMIT
+        srv._send(s, MsgType.CHAT_MESSAGE, b'x')
+        assert w.aborted and srv.outbound_stats["slow_disconnects"] == 1
+        srv._send(s, MsgType.CHAT_MESSAGE, b'y')
+        assert len(w.writes) == 3, "no writes after abort"
+
+        # 보류한 이동 패킷이 같은 엔티티의 DISAPPEAR/COMBAT_DIED를 앞지르지 않는다
+        w = StalledTransport()
+        s = PlayerSession(writer=w)
+        w.buffered = srv.OUT_HIGH_WATERMARK
+        srv._send(s, MsgType.MOVE_BROADCAST, struct.pack('<Qfff', 7, 1.0, 0.0, 0.0))
+        srv._send(s, MsgType.MONSTER_MOVE, struct.pack('<Qfff', 9, 1.0, 0.0, 0.0))
+        srv._send(s, MsgType.DISAPPEAR, struct.pack('<Q', 7))
+        srv._send(s, MsgType.COMBAT_DIED, struct.pack('<QQ', 9, 7))
+        assert w.writes == [
+            build_packet(MsgType.DISAPPEAR, struct.pack('<Q', 7)),
+            build_packet(MsgType.MONSTER_MOVE, struct.pack('<Qfff', 9, 1.0, 0.0, 0.0)),
+            build_packet(MsgType.COMBAT_DIED, struct.pack('<QQ', 9, 7)),
+        ], w.writes
+        assert not s.out_held
+        w.buffered = 0
+        await asyncio.sleep(srv.CONGESTION_CHECK_INTERVAL * 3)
+        assert not s.congested and len(w.writes) == 3, "no MOVE after DISAPPEAR"
+
+        # 한 루프에 hard limit보다 많이 쌓아도 (캐릭터 선택 burst) 클라이언트가 읽고 있으면 끊지 않는다
+        srv = BridgeServer(port=0, verbose=False, flush_policy="loop")
+        w = StalledTransport()
+        s = PlayerSession(writer=w)
+        chunk = b'x' * 60000
+        for _ in range(srv.OUT_HARD_LIMIT // len(chunk) + 2):
+            srv._send(s, MsgType.CHAT_MESSAGE, chunk)
+        assert not w.aborted and srv.outbound_stats["slow_disconnects"] == 0
+        await asyncio.sleep(0)
+        assert len(w.writes) == 1 and len(w.writes[0]) > srv.OUT_HARD_LIMIT
+
+        c = TestClient()
+        await c.connect('127.0.0.1', port)
+        await asyncio.sleep(0.1)
+        await c.send(MsgType.STATS)
+        msg_type, resp = await c.recv_expect(MsgType.STATS)
+        fields = dict(kv.split('=', 1) for kv in resp.decode('utf-8').split('|'))
+        for key in ('out_buffered', 'out_max_session', 'congested', 'shed', 'slow_disconnects'):
+            assert key in fields, f"STATS missing {key}"
+        c.close()
+
+    await test("BACKPRESSURE: 이동 패킷 합치기 + 혼잡 해제 + hard limit 끊기", test_backpressure())
+
+    # ━━━ Test: AOI — 그리드 관심 영역 ━━━
+    async def test_aoi_grid():
+        """시야(3x3 셀) 밖으로는 MOVE_BROADCAST 안 감, 경계 넘을 때 APPEAR/DISAPPEAR."""
+        from tcp_bridge import PlayerSession
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", view_radius=100.0)
+        srv._spawn_monsters()
+        a, b = PlayerSession(writer=FakeWriter(writes=True)), PlayerSession(writer=FakeWriter(writes=True))
+        for sess in (a, b):
+            sess.logged_in = True
+            await srv._on_char_select(sess, struct.pack('<I', 1))
+        a_types = [mt for mt, _ in a.writer.take()]
+        b.writer.take()
+        assert MsgType.APPEAR in a_types, "B appears to A (same cell)"
+        # (100,100) 기준 시야 = 셀 (0..2, 0..2) → Slime 3마리만
+        assert a_types.count(MsgType.MONSTER_SPAWN) == 3, a_types
+
+        # B가 시야 밖으로 → 양쪽 DISAPPEAR, 이후 이동은 A에게 안 감
+        await srv._on_move(b, struct.pack('<fff', 450.0, 0.0, 100.0))
+        got = a.writer.take()
+        assert (MsgType.DISAPPEAR, struct.pack('<Q', b.entity_id)) in got, got
+        assert MsgType.MOVE_BROADCAST not in [mt for mt, _ in got]
+        b_got = b.writer.take()
+        assert (MsgType.DISAPPEAR, struct.pack('<Q', a.entity_id)) in b_got
+        assert MsgType.MONSTER_SPAWN in [mt for mt, _ in b_got], "Goblins come into view"
+        b.last_move_time = 0
+        await srv._on_move(b, struct.pack('<fff', 460.0, 0.0, 100.0))
+        assert a.writer.take() == []
+        assert srv.aoi_stats["skipped"] >= 1 and srv.aoi_stats["bytes_saved"] > 0
+
+        # 다시 시야 안으로 → 양쪽 APPEAR + A에게 MOVE_BROADCAST
+        b.last_move_time = 0
+        await srv._on_move(b, struct.pack('<fff', 150.0, 0.0, 100.0))
+        a_types = [mt for mt, _ in a.writer.take()]
+        assert a_types == [MsgType.APPEAR, MsgType.MOVE_BROADCAST], a_types
+        assert (MsgType.APPEAR, struct.pack('<Qfff', a.entity_id, 100.0, 0.0, 100.0)) in b.writer.take()
+
+        # 반경 0 = 존 전체
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", view_radius=0)
+        a, b = PlayerSession(writer=FakeWriter(writes=True)), PlayerSession(writer=FakeWriter(writes=True))
+        for sess in (a, b):
+            sess.logged_in = True
+            await srv._on_char_select(sess, struct.pack('<I', 1))
+        a.writer.take()
+        await srv._on_move(b, struct.pack('<fff', 450.0, 0.0, 100.0))
+        assert [mt for mt, _ in a.writer.take()] == [MsgType.MOVE_BROADCAST]
+
+        # 끊기면 그리드에서 빠짐
+        srv._on_client_disconnected(b.writer, b)
+        assert b.entity_id not in srv.player_grids[1]
+        assert (MsgType.DISAPPEAR, struct.pack('<Q', b.entity_id)) in a.writer.take()
+
+    await test("AOI: 시야 밖 브로드캐스트 생략 + 경계 APPEAR/DISAPPEAR", test_aoi_grid())
+
+    # ━━━ Test: ZONE_INDEX — 존별 엔티티 인덱스 불변식 ━━━
+    async def test_zone_index():
+        """입장/존 이동/인스턴스/접속 종료마다 zone_players·zone_monsters가 실제 상태와 일치."""
+        from tcp_bridge import PlayerSession
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        srv._spawn_monsters()
+        assert srv.check_zone_index() == []
+        a, b = PlayerSession(writer=FakeWriter()), PlayerSession(writer=FakeWriter())
+        for sess in (a, b):
+            sess.logged_in = True
+            await srv._on_char_select(sess, struct.pack('<I', 1))
+        assert srv.zone_players[1] == {a.entity_id, b.entity_id}
+        assert srv.check_zone_index() == []
+
+        await srv._on_zone_transfer(b, struct.pack('<I', 2))
+        assert srv.zone_players[1] == {a.entity_id} and srv.zone_players[2] == {b.entity_id}
+        assert srv.check_zone_index() == []
+
+        await srv._on_instance_create(a, struct.pack('<I', 1))
+        assert a.entity_id in srv.zone_players[a.zone_id] and 1 not in srv.zone_players
+        assert srv.check_zone_index() == []
+        await srv._on_instance_leave(a, b'')
+        assert srv.zone_players[10] == {a.entity_id}
+        assert srv.check_zone_index() == []
+
+        await srv._on_zone_enter(b, struct.pack('<I', 3))
+        assert srv.check_zone_index() == []
+
+        old_eid = a.entity_id
+        await srv._on_char_select(a, struct.pack('<I', 2))  # 캐릭터 재선택 → 새 entity
+        assert old_eid not in srv.zone_players.get(10, set())
+        assert srv.check_zone_index() == []
+
+        srv._on_client_disconnected(b.writer, b)
+        assert 3 not in srv.zone_players
+        assert srv.check_zone_index() == []
+
+        srv.zone_players.setdefault(1, set()).add(999999)  # 일부러 깨뜨림 → 검출
+        assert srv.check_zone_index(), "checker must report stale entries"
+
+    await test("ZONE_INDEX: 존 인덱스 갱신 + 불변식 검사", test_zone_index())
+
+    # ━━━ Test: SESSION_INDEX — 이름/계정 → 세션 인덱스 ━━━
+    async def test_session_index():
+        """캐릭터 선택/재선택/접속 종료에 따라 이름·계정 인덱스가 갱신되고 친구 요청이 이름으로 대상을 찾음."""
+        from tcp_bridge import PlayerSession
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        a, b, c = (PlayerSession(writer=FakeWriter()) for _ in range(3))
+        for sess, char_id in ((a, 1), (b, 2), (c, 1)):
+            await srv._on_login(sess, struct.pack('<B', 1) + b'u' + struct.pack('<B', 0))
+            await srv._on_char_select(sess, struct.pack('<I', char_id))
+        assert srv._find_session_by_name("Mage_01") is b
+        assert srv._find_session_by_name("Warrior_01") is a, "same name -> first selected wins"
+        assert srv._find_session_by_account(c.account_id) is c
+        assert srv._find_session_by_name("nobody") is None
+
+        # 친구 요청: 이름으로 접속 중인 대상을 찾아야 함 (자기 자신은 SELF_REQUEST)
+        await srv._on_friend_request(a, struct.pack('<B', 7) + b'Mage_01')
+        assert b.friend_requests_recv == ["Warrior_01"], b.friend_requests_recv
+        await srv._on_friend_request(b, struct.pack('<B', 7) + b'Mage_01')
+        assert b.friend_requests_sent == []
+
+        await srv._on_char_select(b, struct.pack('<I', 3))  # 재선택 → 이전 이름 해제
+        assert srv._find_session_by_name("Mage_01") is None
+        assert srv._find_session_by_name("Archer_01") is b
+
+        srv._on_client_disconnected(a.writer, a)
+        assert srv._find_session_by_name("Warrior_01") is c
+        assert srv._find_session_by_account(a.account_id) is None
+        for sess in (b, c):
+            srv._on_client_disconnected(sess.writer, sess)
+        assert not srv.sessions_by_name and not srv.sessions_by_account
+
+    await test("SESSION_INDEX: 이름/계정 인덱스 갱신 + 친구 요청 대상 조회", test_session_index())
+
+    # ━━━ Test: SPATIAL_QUERY — 그리드 기반 반경/k-최근접 질의 ━━━
+    async def test_spatial_query_engine():
+        """_query_radius 결과가 전수 검사와 같고, SPATIAL_QUERY_RESP는 가까운 순 + 최대 255개."""
+        import random as _random
+        from tcp_bridge import PlayerSession, Position, PacketFramer
+
+        class RecordingWriter:
+            def __init__(self):
+                self.data = bytearray()
+            def write(self, data):
+                self.data += data
+            def is_closing(self):
+                return False
+
+        rng = _random.Random(7)
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", view_radius=300.0)
+        srv.channel_capacity = 10 ** 6  # 400명을 채널 하나에 (채널 분할은 ZONE_CHANNEL에서)
+        sessions = []
+        for i in range(400):
+            sess = PlayerSession(writer=RecordingWriter())
+            sess.entity_id = 10_000_000 + i
+            sess.in_game = True
+            sess.zone_id = 1
+            sess.pos = Position(rng.uniform(-2000, 2000), 0.0, rng.uniform(-2000, 2000))
+            srv.sessions[sess.entity_id] = sess
+            srv._aoi_update(sess)
+            sessions.append(sess)
+        srv._spawn_monsters()
+        assert srv.check_zone_index() == []
+
+        def brute(x, z, radius, players=True, monsters=True):
+            out = []
+            if players:
+                for s in sessions:
+                    dx, dz = s.pos.x - x, s.pos.z - z
+                    d2 = dx * dx + dz * dz
+                    if d2 <= radius * radius:
+                        out.append((d2, s.entity_id))
+            if monsters:
+                for mid, m in srv.monsters.items():
+                    if m["zone"] != 1 or m["ai"].state == 5:
+                        continue
+                    dx, dz = m["pos"].x - x, m["pos"].z - z
+                    d2 = dx * dx + dz * dz
+                    if d2 <= radius * radius:
+                        out.append((d2, mid))
+            return sorted(out)
+
+        for radius in (0.0, 50.0, 299.0, 300.0, 777.0, 5000.0, float('inf')):
+            for _ in range(20):
+                x, z = rng.uniform(-2500, 2500), rng.uniform(-2500, 2500)
+                assert srv._query_radius(1, x, z, radius) == brute(x, z, radius), radius
+        assert srv._query_radius(1, 0.0, 0.0, 800.0, monsters=False) == brute(0.0, 0.0, 800.0, monsters=False)
+        assert srv._query_radius(1, 0.0, 0.0, 1e9, limit=5) == brute(0.0, 0.0, 1e9)[:5]
+        assert srv._query_radius(1, 0.0, 0.0, -1.0) == []
+        assert srv._query_radius(1, 0.0, 0.0, float('nan')) == []
+        assert srv._query_radius(99, 0.0, 0.0, 1e9) == []
+
+        me = sessions[0]
+        await srv._on_spatial_query(me, struct.pack('<ffffB', 0.0, 0.0, 0.0, 1e9, 1))
+        framer = PacketFramer()
+        framer.feed(bytes(me.writer.data))
+        msg_type, resp = [(mt, bytes(pl)) for mt, pl in framer.packets()][0]
+        assert msg_type == MsgType.SPATIAL_QUERY_RESP
+        assert resp[0] == 255 and len(resp) == 1 + 255 * 12, (resp[0], len(resp))
+        got = [struct.unpack_from('<Qf', resp, 1 + i * 12) for i in range(255)]
+        want = brute(0.0, 0.0, 1e9, monsters=False)[:255]
+        assert [eid for eid, _ in got] == [eid for _, eid in want]
+        assert all(abs(d - d2 ** 0.5) < 1e-2 for (_, d), (d2, _) in zip(got, want))
+
+    await test("SPATIAL_QUERY: 그리드 반경/k-최근접 == 전수 검사", test_spatial_query_engine())
+
+    # ━━━ Test: MONSTER_AI — 상태별 일괄 이동 틱 ━━━
+    async def test_monster_ai_tick():
+        """CHASE/ATTACK/RETURN/리쉬 전이, dt 비례 이동, 공격 간격, 빈 존 IDLE 몬스터는 정지."""
+        from tcp_bridge import PlayerSession, Position, PacketFramer
+
+        class RecordingWriter:
+            def __init__(self):
+                self.data = bytearray()
+            def write(self, data):
+                self.data += data
+            def is_closing(self):
+                return False
+
+        def drain(sess):
+            framer = PacketFramer()
+            framer.feed(bytes(sess.writer.data))
+            sess.writer.data.clear()
+            return [(mt, bytes(pl)) for mt, pl in framer.packets()]
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", view_radius=0)
+        srv._spawn_monsters()
+        p = PlayerSession(writer=RecordingWriter())
+        p.entity_id = 900_001
+        p.in_game = True
+        p.zone_id = 1
+        p.pos = Position(1000.0, 0.0, 1000.0)
+        srv.sessions[p.entity_id] = p
+        srv._aoi_update(p)
+
+        zone1 = sorted(srv.zone_monsters[1])
+        chaser, attacker, leashed, returner = (srv.monsters[mid] for mid in zone1[:4])
+        for mid in zone1[4:]:
+            srv.monsters[mid]["ai"].state = 5  # 나머지는 가만히 (DEAD)
+        chaser["pos"].x, chaser["pos"].z = 1000.0, 600.0       # 400 떨어짐 → 추격
+        chaser["ai"].spawn_x, chaser["ai"].spawn_z = 1000.0, 600.0
+        attacker["pos"].x, attacker["pos"].z = 1000.0, 900.0   # 100 → 공격 범위
+        attacker["ai"].spawn_x, attacker["ai"].spawn_z = 1000.0, 900.0
+        leashed["pos"].x, leashed["pos"].z = 1000.0, 100.0     # 스폰에서 900 → 리쉬
+        leashed["ai"].spawn_x, leashed["ai"].spawn_z = 100.0, 100.0
+        returner["ai"].state = 4
+        returner["ai"].spawn_x, returner["ai"].spawn_z = returner["pos"].x + 300.0, returner["pos"].z
+        for mid, m in ((zone1[0], chaser), (zone1[1], attacker), (zone1[2], leashed)):
+            m["ai"].aggro_table[p.entity_id] = 10.0
+            srv._aoi_update_monster(mid, m)
+        sleeping = {mid: (m["pos"].x, m["pos"].z) for mid, m in srv.monsters.items()
+                    if m["zone"] != 1 and m["ai"].state == 0}
+        ret_x = returner["pos"].x
+
+        srv._update_monster_ai(3.0)
+        assert chaser["ai"].state == 2 and abs(chaser["pos"].z - (600.0 + srv.AI_CHASE_SPEED * 3.0)) < 1e-6
+        assert attacker["ai"].state == 3
+        assert leashed["ai"].state == 4 and not leashed["ai"].aggro_table
+        assert abs(returner["pos"].x - (ret_x + srv.AI_RETURN_SPEED * 3.0)) < 1e-6
+        assert all((m["pos"].x, m["pos"].z) == sleeping[mid]
+                   for mid, m in srv.monsters.items() if mid in sleeping), "empty zone must not patrol"
+        moved = {struct.unpack_from('<Q', pl)[0] for mt, pl in drain(p) if mt == MsgType.MONSTER_MOVE}
+        assert moved == {zone1[0], zone1[3]}, moved
+
+        hp = p.stats.hp
+        srv._update_monster_ai(3.0)
+        pkts = drain(p)
+        hits = [pl for mt, pl in pkts if mt == MsgType.ATTACK_RESULT]
+        assert len(hits) == 1 and p.stats.hp < hp  # attacker 공격, 범위에 들어온 chaser는 ATTACK 전이만
+        assert struct.unpack_from('<BQ', hits[0])[1] == zone1[1]
+        assert chaser["ai"].state == 3
+        assert any(mt == MsgType.STAT_SYNC for mt, _ in pkts)
+
+        srv._update_monster_ai(0.1)  # 공격 간격(AI_ATTACK_INTERVAL) 전이면 attacker는 대기
+        hits = [pl for mt, pl in drain(p) if mt == MsgType.ATTACK_RESULT]
+        assert [struct.unpack_from('<BQ', pl)[1] for pl in hits] == [zone1[0]], hits
+        assert srv.check_zone_index() == []
+
+    await test("MONSTER_AI: 상태 전이 + 일괄 이동 + 빈 존 정지", test_monster_ai_tick())
+
+    # ━━━ Test: TICK_SCHEDULER — 고정 주기 + 시스템별 주기 + overrun ━━━
+    async def test_tick_scheduler():
+        """가짜 시계로 기본 틱 8Hz: 매 틱/2Hz 시스템 실행 횟수, dt, 느린 시스템 overrun과 건너뛰기, p50/p99 보고."""
+        now = [0.0]
+        sched = TickScheduler(8.0, clock=lambda: now[0])
+        calls = {"every": [], "slow": [], "heavy": 0}
+        sched.add("every", lambda dt: calls["every"].append(dt))
+        sched.add("slow", lambda dt: calls["slow"].append(dt), hz=2.0)
+        for i in range(1, 17):  # 2초
+            now[0] = i * 0.125
+            sched.run_due(now[0])
+        assert len(calls["every"]) == 16 and len(calls["slow"]) == 4, (len(calls["every"]), len(calls["slow"]))
+        assert all(dt == 0.125 for dt in calls["every"]) and all(dt == 0.5 for dt in calls["slow"])
+        assert sched.ticks == 16
+
+        def heavy(dt):  # 한 번에 0.3초 걸리는 시스템
+            calls["heavy"] += 1
+            now[0] += 0.3
+        sys_heavy = sched.add("heavy", heavy, hz=4.0)
+        t = now[0]
+        for _ in range(8):
+            t = max(t + 0.125, now[0])
+            now[0] = t
+            sched.run_due(t)
+        assert sys_heavy.overruns == calls["heavy"] > 0
+        assert sys_heavy.next_due > now[0] - 0.3, "overrun 뒤 밀린 실행을 몰아서 돌리면 안 됨"
+        rep = sched.report()
+        assert rep["tick_rate"] == 8.0 and rep["ticks"] == 24
+        heavy_row = next(r for r in rep["systems"] if r["name"] == "heavy")
+        assert heavy_row["hz"] == 4.0 and abs(heavy_row["p50_us"] - 300_000) < 1 and heavy_row["p99_us"] >= heavy_row["p50_us"]
+
+        # 시스템 하나가 예외를 던져도 다른 시스템과 틱은 계속, ERR 로그 + 통계
+        logged = []
+        guarded = TickScheduler(8.0, clock=lambda: now[0], log=lambda msg, level: logged.append((level, msg)))
+        ran = []
+        guarded.add("broken", lambda dt: 1 / 0)
+        guarded.add("persist", lambda dt: ran.append(dt))
+        for _ in range(3):
+            now[0] += 0.125
+            guarded.run_due(now[0])
+        assert len(ran) == 3 and guarded.ticks == 3 and guarded.errors == 3
+        assert logged[0][0] == "ERR" and "broken" in logged[0][1] and "ZeroDivisionError" in logged[0][1]
+        rep = guarded.report()
+        assert rep["errors"] == 3 and [r["errors"] for r in rep["systems"]] == [3, 0]
+        try:
+            TickScheduler(0)
+            assert False, "tick_rate 0 must be rejected"
+        except ValueError:
+            pass
+
+        # 실제 이벤트 루프: 100Hz로 0.2초 → 20틱 안팎, 드리프트 보정으로 크게 모자라지 않음
+        live = TickScheduler(100.0)
+        live.add("noop", lambda dt: None)
+        running = [True]
+        task = asyncio.create_task(live.run(lambda: running[0]))
+        await asyncio.sleep(0.2)
+        running[0] = False
+        await task
+        assert 15 <= live.ticks + live.skipped <= 25, (live.ticks, live.skipped)
+
+    await test("TICK_SCHEDULER: 고정 주기 + 시스템별 주기 + overrun 통계", test_tick_scheduler())
+
+    # ━━━ Test: TIMER_WHEEL — 계층형 타이머 휠 + 서버 만료 이벤트 ━━━
+    async def test_timer_wheel():
+        """무작위 등록/취소/advance를 전수 비교: 늦지도 이르지도 않게 발사, 긴 지연은 cascade, 카테고리별 대기 수."""
+        import random
+        from tcp_bridge import TimerWheel, TIMER_RESOLUTION, PlayerSession
+
+        def tick_of(t):
+            return -int(-t // TIMER_RESOLUTION)
+
+        rng = random.Random(12)
+        now = 1_700_000_000.0
+        wheel = TimerWheel(now)
+        expected = {}   # key -> 마감 틱
+        fired = {}      # key -> 발사된 advance 시각
+        cats = ("buff", "mail", "auction")
+        for i in range(5000):
+            delay = rng.choice((rng.uniform(-1, 0), rng.uniform(0, 30), rng.uniform(0, 5000), rng.uniform(0, 5e6)))
+            cat = cats[i % 3]
+            expected[i] = (cat, max(tick_of(now + delay), wheel.current))  # 이미 지난 시각이면 다음 advance
+            wheel.schedule(cat, i, now + delay, None)
+            if rng.random() < 0.2:
+                j = rng.randrange(i + 1)
+                cancelled = wheel.cancel(cats[j % 3], j)
+                assert cancelled == (j in expected and j not in fired)
+                if cancelled:
+                    del expected[j]
+            if rng.random() < 0.05:
+                now += rng.choice((0.05, 1.0, 300.0, 40000.0))
+                target = int(now / TIMER_RESOLUTION)
+                for t in wheel.advance(now):
+                    fired[t.key] = now
+                for k, (_, tk) in expected.items():  # 마감이 지났는데 남아 있으면 안 됨
+                    assert tk > target or k in fired, f"late timer {k}"
+        pending = {}
+        for k, (cat, _) in expected.items():
+            if k not in fired:
+                pending[cat] = pending.get(cat, 0) + 1
+        assert wheel.report() == pending and len(wheel) == sum(pending.values()), (wheel.report(), pending)
+        while len(wheel):
+            now += rng.choice((1.0, 1000.0, 100000.0))
+            for t in wheel.advance(now):
+                fired[t.key] = now
+        assert set(fired) == set(expected), "취소된 타이머가 발사되거나 등록한 타이머가 빠짐"
+        assert all(fired[k] >= (tk - 1) * TIMER_RESOLUTION for k, (_, tk) in expected.items())
+        assert wheel.report() == {}
+        # 같은 (category, key) 재등록은 교체
+        wheel.schedule("respawn", 1, now + 5, None)
+        wheel.schedule("respawn", 1, now + 1, None)
+        assert len(wheel) == 1 and wheel.get("respawn", 1).when == now + 1
+
+        # 서버: 버프/우편/경매/월정액이 휠 타이머로 만료되고, 제거/삭제/접속 종료 시 취소된다
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        p = PlayerSession(writer=FakeWriter())
+        p.entity_id, p.account_id, p.in_game, p.char_name = 910_001, 91_001, True, "Timer"
+        srv.sessions[p.entity_id] = p
+        await srv._on_buff_apply(p, struct.pack('<I', 7))
+        await srv._on_buff_apply(p, struct.pack('<I', 7))
+        await srv._on_buff_apply(p, struct.pack('<I', 8))
+        assert srv.timers.report() == {"buff": 2}, srv.timers.report()
+        await srv._on_buff_remove(p, struct.pack('<I', 8))
+        assert srv.timers.report() == {"buff": 1}
+        p.buffs[0]["expires"] = time.time() - 1  # 첫 번째 7번 버프만 끝난 것으로
+        srv.timers.schedule("buff", (p.entity_id, 7), p.buffs[0]["expires"], srv._expire_buff, p, 7)
+        await asyncio.sleep(TIMER_RESOLUTION)  # 방금 지난 시각은 다음 슬롯에서 발사
+        srv._fire_timers(0.0)
+        assert [b["buff_id"] for b in p.buffs] == [7] and srv.timers.report() == {"buff": 1}, \
+            "남은 같은 id 버프의 만료 시각으로 다시 걸려야 함"
+
+        srv._deliver_mail(p.account_id, {"id": 1, "expires": time.time() - 1})
+        srv._deliver_mail(p.account_id, {"id": 2, "expires": time.time() + 60})
+        await asyncio.sleep(TIMER_RESOLUTION)  # 방금 지난 시각은 다음 슬롯에서 발사
+        srv._fire_timers(0.0)
+        assert [m["id"] for m in srv.mails[p.account_id]] == [2] and srv.timers.report()["mail"] == 1
+
+        srv.auction_book.add({"id": 5, "seller_account": 0, "item_id": 1, "item_count": 1, "category": 0,
+                              "buyout_price": 10, "bid_account": 0, "bid_price": 0,
+                              "listed_at": time.time() - 2, "expires_at": time.time() - 1})
+        srv.timers.schedule("auction", 5, time.time() - 1, srv._expire_auction, 5)
+        p.crystal = 10 ** 6
+        await srv._on_subscription_buy(p, b'')
+        assert p.subscription_active and srv.timers.get("subscription", p.entity_id)
+        await asyncio.sleep(TIMER_RESOLUTION)  # 방금 지난 시각은 다음 슬롯에서 발사
+        srv._fire_timers(0.0)
+        assert not srv.auction_book and "auction" not in srv.timers.report()
+        srv._expire_subscription(p)
+        assert not p.subscription_active
+
+        srv._cancel_session_timers(p)
+        assert srv.timers.report() == {"mail": 2}, srv.timers.report()  # 우편 2 + 경매 반송 우편
+
+    await test("TIMER_WHEEL: 계층형 타이머 휠 + 버프/우편/경매/월정액 만료", test_timer_wheel())
+
+    # ━━━ Test: AUCTION_BOOK — 카테고리별 정렬 인덱스 주문장 ━━━
+    async def test_auction_book():
+        """무작위 등록/구매/만료 뒤 모든 카테고리·정렬·페이지가 기존 필터+stable sort 결과와 같은지."""
+        import random
+        from tcp_bridge import AuctionBook, SortedKeyList
+
+        def brute(listings, category, sort_by):
+            filtered = [l for l in listings if category == 0xFF or l.get("category", 0xFF) == category]
+            if sort_by == 0:
+                filtered.sort(key=lambda x: x["buyout_price"])
+            elif sort_by == 1:
+                filtered.sort(key=lambda x: x["buyout_price"], reverse=True)
+            elif sort_by == 2:
+                filtered.sort(key=lambda x: x["listed_at"], reverse=True)
+            return filtered
+
+        SortedKeyList.LOAD, load = 8, SortedKeyList.LOAD  # 작은 버킷으로 분할/병합 경로까지
+        try:
+            rng = random.Random(13)
+            book = AuctionBook()
+            live = []  # 등록 순서
+            for aid in range(1, 1500):
+                listing = {"id": aid, "buyout_price": rng.randint(1, 40), "listed_at": float(rng.randint(0, 200)),
+                           "category": rng.choice((0, 1, 2, 5, 0xFF))}
+                book.add(listing)
+                live.append(listing)
+                if rng.random() < 0.3:
+                    gone = live.pop(rng.randrange(len(live)))
+                    assert book.remove(gone["id"]) is gone
+            assert book.remove(10 ** 9) is None and len(book) == len(live)
+            for category in (0xFF, 0, 1, 2, 5, 7):
+                for sort_by in (0, 1, 2, 9):
+                    expected = brute(live, category, sort_by)
+                    for start in (0, 20, 37, len(expected) - 5, len(expected) + 20):
+                        total, items = book.page(category, sort_by, max(0, start), 20)
+                        want = expected[max(0, start):max(0, start) + 20]
+                        assert total == len(expected) and [l["id"] for l in items] == [l["id"] for l in want], \
+                            (category, sort_by, start)
+        finally:
+            SortedKeyList.LOAD = load
+
+        # 서버: 5100개 초과(255페이지 초과)여도 목록 응답의 u16/u8 필드가 포화되어 나간다
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        for aid in range(1, 6001):
+            srv.auction_book.add({"id": aid, "seller_name": "S", "item_id": 1, "item_count": 1,
+                                  "buyout_price": aid, "bid_price": 0, "listed_at": 0.0, "category": 0})
+        from tcp_bridge import PlayerSession, PacketFramer
+
+        class RecordingWriter:
+            def __init__(self):
+                self.data = bytearray()
+            def write(self, data):
+                self.data += data
+            def is_closing(self):
+                return False
+
+        p = PlayerSession(writer=RecordingWriter())
+        p.in_game = True
+        await srv._on_auction_list_req(p, bytes([0xFF, 255, 1]))
+        framer = PacketFramer()
+        framer.feed(bytes(p.writer.data))
+        (mt, payload), = [(mt, bytes(pl)) for mt, pl in framer.packets()]
+        total, pages, page, n = struct.unpack_from("<HBBB", payload, 0)
+        first_id = struct.unpack_from("<I", payload, 5)[0]
+        assert mt == MsgType.AUCTION_LIST and (total, pages, page, n) == (6000, 255, 255, 20)
+        assert first_id == 6000 - 255 * 20, first_id  # price desc
+
+    await test("AUCTION_BOOK: 카테고리별 정렬 인덱스 = 필터+정렬 결과, 페이지 필드 포화", test_auction_book())
+
+    # ━━━ Test: STORAGE — SQLite write-behind 영속화 + 재시작 복구 ━━━
+    async def test_storage():
+        """save는 flush 전까지 디스크에 안 감, 틱 배치 커밋, 재시작하면 계정/캐릭터/우편/경매/길드/레이팅/재화 복구."""
+        import sqlite3
+        import tempfile
+        from tcp_bridge import PlayerSession, Storage
+
+        def login(srv, username):
+            sess = PlayerSession(writer=FakeWriter())
+            srv.writers[sess.writer] = sess
+            name = username.encode()
+            return sess, srv._on_login(sess, bytes([len(name)]) + name + b'\x02pw')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # 저장소 단독: flush 전에는 아무것도 안 써지고, 같은 키는 마지막 값만 한 번 커밋
+            raw = os.path.join(tmp, "raw.db")
+            store = Storage(raw)
+            doc = {"v": 1}
+            store.mail.save(1, doc, 7)
+            doc["v"] = 2
+            store.mail.save(2, {"v": 0}, 7)
+            store.mail.delete(2)
+            assert store.mail.load() == [] and len(store.dirty) == 2
+            assert store.flush() == 2 and store.flush() == 0
+            doc["v"] = 3  # flush 뒤 바뀐 공유 doc은 다음 save/flush 몫
+            store.close()
+            assert store.mail.load() == [(1, 7, {"v": 2})], store.mail.load()
+            assert store.stats["commits"] == 1 and store.stats["rows"] == 2 and not store.stats["errors"]
+            conn = sqlite3.connect(raw)
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            conn.close()
+
+            path = os.path.join(tmp, "world.db")
+            srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            alice, coro = login(srv, "alice")
+            await coro
+            bob, coro = login(srv, "bob")
+            await coro
+            assert alice.account_id != bob.account_id
+            alice.gold = 999
+            await login(srv, "bob")[1]
+            await srv._on_login(alice, b'\x03bob\x02pw')  # 같은 연결에서 다시 LOGIN은 거절
+            assert (alice.account_id, alice.gold) != (bob.account_id, 1000) and alice.gold == 999
+            assert srv.login_sessions[alice.account_id] is alice
+            alice.in_game = bob.in_game = True
+            alice.char_name, bob.char_name = "Alice", "Bob"
+            await srv._on_character_create(alice, b'\x05Alice\x01')
+            srv._deliver_mail(bob.account_id, {"id": srv.next_mail_id, "sender_name": "Alice", "subject": "hi",
+                                               "gold": 5, "item_id": 0, "item_count": 0, "read": False,
+                                               "claimed": False, "sent_time": time.time(),
+                                               "expires": time.time() + 3600})
+            srv.next_mail_id += 1
+            alice.inventory[0].item_id, alice.inventory[0].count = 201, 3
+            await srv._on_auction_register(alice, struct.pack("<BBIB", 0, 1, 500, 2))
+            assert len(srv.auction_book) == 1
+            srv._get_pvp_rating("bob")["rating"] = 1234
+            srv.store.ratings.save("bob", srv.pvp_ratings["bob"])
+            await srv._on_guild_create(alice, b'\x04Guld')
+            alice.gold, alice.silver, alice.friends = 777, 42, ["Bob"]
+            await srv._on_char_select(alice, struct.pack('<I', 1))  # Warrior_01 (Lv.10)
+            alice.stats.add_exp(100 + 250)
+            alice.pos.x = 321.0
+            srv._on_client_disconnected(alice.writer, alice)  # 접속 종료 = 계정 저장
+            srv.store.flush()
+            srv.close_storage()  # 정상 종료
+
+            srv2 = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            alice2, coro = login(srv2, "alice")
+            await coro
+            carol, coro = login(srv2, "carol")
+            await coro
+            assert alice2.account_id == alice.account_id, "같은 username은 같은 account_id"
+            assert carol.account_id not in (alice.account_id, bob.account_id), "새 계정 id는 기존과 겹치면 안 됨"
+            assert (alice2.gold, alice2.silver, alice2.friends) == (777, 42, ["Bob"])
+            await srv2._on_char_select(alice2, struct.pack('<I', 1))
+            assert (alice2.stats.level, alice2.stats.exp, alice2.stats.max_hp) == (11, 250, 300), alice2.stats
+            assert alice2.pos.x == 321.0 and alice2.zone_id == 1
+            await srv2._on_char_select(alice2, struct.pack('<I', 2))  # 다른 캐릭터는 템플릿 그대로
+            assert alice2.stats.level == 5
+            assert alice2.inventory[0].item_id == 201 and alice2.inventory[0].count == 2, "경매에 1개 올린 뒤 인벤토리"
+            assert [c["name"] for c in srv2.characters[alice.account_id]] == ["Alice"]
+            assert [m["subject"] for m in srv2.mails[bob.account_id]] == ["hi"]
+            assert srv2.timers.get("mail", srv2.mails[bob.account_id][0]["id"]), "복구된 우편도 만료 타이머"
+            (listing,) = list(srv2.auction_book)
+            assert listing["buyout_price"] == 500 and srv2.timers.get("auction", listing["id"])
+            assert srv2.next_auction_id == listing["id"] + 1
+            assert srv2.pvp_ratings["bob"]["rating"] == 1234
+            assert [g["name"] for g in srv2.guilds.values()] == ["Guld"]
+
+            # 같은 계정 두 번째 로그인: 이전 연결을 저장하고 끊은 뒤 그 값을 읽는다
+            alice2.gold = 555
+            alice3, coro = login(srv2, "alice")
+            await coro
+            assert alice3.gold == 555 and not alice2.logged_in and alice2.writer.closed
+            assert srv2.login_sessions[alice.account_id] is alice3
+            srv2._on_client_disconnected(alice2.writer, alice2)  # 이전 연결의 종료는 새 세션을 건드리지 않음
+            assert srv2.login_sessions[alice.account_id] is alice3
+
+            # 크래시: flush 안 된 변경은 사라지고, 커밋된 배치는 그대로
+            srv2.store.guild.delete(next(iter(srv2.guilds)))
+            srv2.store.flush()
+            srv2.store.characters.save(alice.account_id, [], alice.account_id)  # flush 전에 "죽음"
+            srv2.store.close = lambda: None
+            srv2.store._queue.put(None)
+            srv2.store._thread.join()
+            srv3 = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            assert not srv3.guilds and [c["name"] for c in srv3.characters[alice.account_id]] == ["Alice"]
+            # 경매 등록은 인벤토리도 같은 배치로 — 그 틱 flush 뒤 크래시해도 아이템이 복제되지 않음
+            dave, coro = login(srv3, "dave")
+            await coro
+            dave.in_game, dave.char_name = True, "Dave"
+            dave.inventory[0].item_id, dave.inventory[0].count = 301, 1
+            srv3._save_account(dave)
+            await srv3._on_auction_register(dave, struct.pack("<BBIB", 0, 1, 900, 2))
+            srv3.store.flush()
+            srv3.store._queue.put(None)
+            srv3.store._thread.join()
+            srv4 = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            dave2, coro = login(srv4, "dave")
+            await coro
+            assert [l["item_id"] for l in srv4.auction_book if l["seller_account"] == dave.account_id] == [301]
+            assert dave2.inventory[0].item_id == 0
+            assert dave2.gold == dave.gold, "등록 수수료도 같은 배치"
+            # 정상 종료는 접속 중 세션도 저장
+            dave2.gold = 4321
+            srv4.close_storage()
+            srv5 = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            dave3, coro = login(srv5, "dave")
+            await coro
+            assert dave3.gold == 4321
+            srv5.close_storage()
+
+        # db_path 없으면 예전처럼 메모리 전용 (로그인마다 새 account_id)
+        mem = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        a1, coro = login(mem, "alice")
+        await coro
+        a2, coro = login(mem, "alice")
+        await coro
+        assert a1.account_id != a2.account_id and not mem.store.enabled and not mem.store.dirty
+
+    await test("STORAGE: SQLite write-behind + 재시작 복구", test_storage())
+
+    # ━━━ Test: STORAGE_SNAPSHOT — 스냅샷 + 저널 꼬리 재생으로 기동 ━━━
+    async def test_storage_snapshot():
+        """정상 종료는 스냅샷만으로 기동, 크래시는 스냅샷 + 저널 꼬리 재생, 깨진 꼬리/스냅샷은 버리고 복구."""
+        import sqlite3
+        import tempfile
+        from tcp_bridge import Storage
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "world.db")
+            store = Storage(path)
+            assert store.load_report["source"] == "sqlite" and store.load_report["rows"] == 0
+            for i in range(10):
+                store.mail.save(i, {"id": i, "gold": i}, 7)
+            store.accounts.save("alice", {"gold": 5}, 1)
+            store.flush()
+            store.close()  # 정상 종료 = 스냅샷 + 빈 저널
+            assert store.stats["snapshots"] == 1 and os.path.getsize(store.journal_path) == 0
+
+            store = Storage(path)
+            report = store.load_report
+            assert report["source"] == "snapshot" and report["rows"] == 11 and report["journal_batches"] == 0, report
+            assert store.accounts.load_raw() == [("alice", 1, '{"gold":5}')]
+            # 스냅샷 이후 변경 → 저널에만 남은 채로 크래시
+            store.mail.delete(0)
+            store.mail.save(1, {"id": 1, "gold": 100}, 7)
+            store.flush()
+            store.request_snapshot()  # 주기 스냅샷: 여기까지 스냅샷에 들어가고 저널은 비워짐
+            store.mail.save(2, {"id": 2, "gold": 200}, 7)
+            store.flush()
+            store.guild.save(1, {"name": "G"})
+            store.flush()
+            store.close(snapshot=False)  # 크래시 흉내: 스냅샷 없이 종료
+            assert store.stats["snapshots"] == 1 and store.seq == 4
+            with open(store.journal_path, "ab") as f:
+                f.write(b'\x10\x00\x00\x00garbage')  # 쓰다 만 레코드
+
+            store = Storage(path)
+            report = store.load_report
+            assert report["source"] == "snapshot" and report["snapshot_seq"] == 2, report
+            assert report["journal_batches"] == 2 and report["journal_torn_bytes"] == 11, report
+            mails = {key: doc["gold"] for key, _, doc in store.mail.load()}
+            assert mails == {i: {1: 100, 2: 200}.get(i, i) for i in range(1, 10)}, mails
+            assert store.guild.load() == [(1, 0, {"name": "G"})]
+            store.mail.save(3, {"id": 3, "gold": 300}, 7)  # seq는 저널 꼬리 다음부터
+            store.flush()
+            store.close(snapshot=False)
+            assert store.seq == 5
+            conn = sqlite3.connect(path)  # SQLite도 같은 상태
+            assert dict(conn.execute("SELECT key, json_extract(data, '$.gold') FROM mail")) == {**mails, 3: 300}
+            conn.close()
+
+            # 스냅샷이 깨지면 SQLite + 저널 전체로 복구
+            with open(store.snapshot_path, "r+b") as f:
+                f.seek(40)
+                f.write(b'\xff\xff\xff\xff')
+            store = Storage(path)
+            report = store.load_report
+            assert report["source"] == "sqlite" and "snapshot" in store.last_error, (report, store.last_error)
+            assert {key: doc["gold"] for key, _, doc in store.mail.load()} == {**mails, 3: 300}
+            store.close()
+            store = Storage(path)
+            assert store.load_report["source"] == "snapshot", "다음 종료 때 스냅샷 재생성"
+            store.close()
+
+        # 저널은 배치마다 fsync (journal_fsync=False면 flush만 — 프로세스 크래시까지만 안전)
+        with tempfile.TemporaryDirectory() as tmp:
+            synced = []
+            real_fsync = os.fsync
+            os.fsync = lambda fd: synced.append(fd) or real_fsync(fd)
+            try:
+                for journal_fsync, expected in ((True, 2), (False, 0)):
+                    synced.clear()
+                    store = Storage(os.path.join(tmp, f"sync{expected}.db"), journal_fsync=journal_fsync)
+                    for i in range(2):
+                        store.mail.save(i, {"gold": i}, 7)
+                        store.flush()
+                    store.close(snapshot=False)
+                    assert len(synced) == expected, (journal_fsync, synced)
+            finally:
+                os.fsync = real_fsync
+
+        # 서버: 계정 프로필/인벤토리는 로그인 전까지 JSON 그대로
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "world.db")
+            store = Storage(path)
+            store.accounts.save("alice", {"gold": 77}, 3)
+            store.inventory.save(3, [{"item_id": 201, "count": 2, "equipped": False, "enhance_level": 1}], 3)
+            store.close()
+            srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", db_path=path)
+            assert isinstance(srv.account_profiles[3], str) and isinstance(srv.inventories[3], str)
+            from tcp_bridge import PlayerSession
+            sess = PlayerSession(writer=None)
+            srv._login_account(sess, "alice")
+            assert sess.account_id == 3 and sess.gold == 77
+            assert (sess.inventory[0].item_id, sess.inventory[0].enhance_level) == (201, 1)
+            assert srv.account_profiles[3] == {"gold": 77}
+            srv.close_storage()
+
+    await test("STORAGE_SNAPSHOT: 스냅샷 + 저널 꼬리 재생 기동", test_storage_snapshot())
+
+    # ━━━ Test: SESSION_COMPACT — 슬롯 세션 + 배열 인벤토리 + 지연 생성 하위 상태 ━━━
+    async def test_session_compact():
+        """새 세션은 하위 상태/컨테이너 없음, 스칼라 읽기는 기본값, 첫 쓰기/가변 읽기에 생성. 인벤토리 뷰/복사 의미."""
+        from tcp_bridge import PlayerSession, InventorySlot, Inventory, SESSION_FEATURES
+
+        sess = PlayerSession(writer=None)
+        assert not hasattr(sess, "__dict__") and sess.features() == []
+        assert (sess.gold, sess.silver, sess.bp_level, sess.bg_queue_mode, sess.pvp_season_rating) == (1000, 5000, 0, -1, 1000)
+        assert sess._pvp is None and sess._inventory is None, "스칼라 읽기는 하위 상태를 만들지 않음"
+        sess.bounty_tokens += 3
+        sess.bounty_accepted.append({"bounty_id": 1})
+        sess.tutorial_steps.add(2)
+        assert sess.features() == ["_bounty", "_progression"] and sess.bounty_tokens == 3
+        other = PlayerSession(writer=None)
+        assert other.bounty_accepted == [] and other.tutorial_steps == set(), "가변 기본값은 세션마다 따로"
+        assert getattr(sess, "_match_queue_key", "x") is None and not hasattr(sess, "job_id")
+        try:
+            sess.undeclared_field = 1
+            assert False, "선언 안 된 필드는 AttributeError"
+        except AttributeError:
+            pass
+        names = [n for f in SESSION_FEATURES.values() for n, _ in f.DEFAULTS]
+        names += [n for n, _ in PlayerSession.CORE + PlayerSession.LAZY]
+        assert len(names) == len(set(names)), "필드 이름 중복"
+
+        inv = sess.inventory
+        assert len(inv) == 20 and inv.find_empty() == 0
+        inv[0].item_id, inv[0].count = 201, 3
+        slot = inv[0]
+        slot.count -= 1
+        slot.equipped = True
+        assert (inv[0].count, inv[0].equipped, inv.find_empty()) == (2, True, 1)
+        inv[-1] = InventorySlot(item_id=7, count=1, enhance_level=4)
+        assert (inv[19].item_id, inv[19].enhance_level) == (7, 4)
+        inv[0] = InventorySlot()
+        assert (slot.item_id, slot.equipped) == (0, False), "빈 칸 대입은 값 복사"
+        assert [s.item_id for s in inv if s.item_id] == [7]
+        try:
+            inv[20]
+            assert False, "범위 밖 IndexError"
+        except IndexError:
+            pass
+        restored = Inventory.load(inv.dump())
+        assert restored.dump() == inv.dump() and restored.dump()[19] == \
+            {"item_id": 7, "count": 1, "equipped": False, "enhance_level": 4}
+
+    await test("SESSION_COMPACT: 슬롯 세션 + 배열 인벤토리", test_session_compact())
+
+    # ━━━ Test: SCHEMA — 미리 컴파일한 메시지 코덱 ━━━
+    async def test_schema():
+        """스키마 인코딩 = 기존 손으로 짠 struct.pack 바이트, 디코드 왕복, 가변 길이/고정 문자열 처리."""
+        from tcp_bridge import Message, Array, Fixed, Text
+
+        # 예전 _on_guild_list_req / _send_stat_sync 바이트와 동일
+        guilds = [(1, "Alpha", 3, 2), (7, "가나다" * 20, 1, 1)]
+        legacy = struct.pack('<B', len(guilds))
+        for gid, name, members, level in guilds:
+            legacy += struct.pack('<I', gid) + name.encode('utf-8')[:32].ljust(32, b'\x00') + struct.pack('<BB', members, level)
+        assert Schema.GUILD_LIST.encode(guilds) == legacy
+        assert Schema.GUILD_LIST.packet(guilds) == build_packet(MsgType.GUILD_LIST, legacy)
+        stat = (5, 180, 180, 70, 70, 22, 13, 40, 500)
+        assert Schema.STAT_SYNC.packet(*stat) == build_packet(MsgType.STAT_SYNC, struct.pack('<IiiiiIIII', *stat))
+        assert Schema.STAT_SYNC.size == 36 and Schema.GUILD_LIST.size is None
+
+        decoded = Schema.GUILD_LIST.decode(legacy)
+        assert type(decoded).__name__ == "GUILD_LIST" and decoded.guilds[0] == (1, "Alpha", 3, 2)
+        assert decoded.guilds[1].name.startswith("가나다"), "32바이트에서 잘린 utf-8도 디코드"
+        assert Schema.STAT_SYNC.decode(Schema.STAT_SYNC.encode(*stat)) == stat
+
+        # 가변 길이 문자열 + 레코드 뒤 필드
+        msg = Message(MsgType.BOUNTY_RANKING, [
+            ("ranks", Array('u8', [("rank", 'u8'), ("name", Text('u8')), ("score", 'u16')])),
+            ("note", Text('u16')), ("tag", Fixed(4)), ("ok", 'bool'), ("ratio", 'f32'),
+        ])
+        values = ([(1, "Bob", 9), (2, "", 0xFFFF)], "메모", "ab", True, 0.5)
+        payload = msg.encode(*values)
+        assert len(payload) == 1 + (1 + 1 + 3 + 2) + (1 + 1 + 0 + 2) + 2 + 6 + 4 + 1 + 4
+        buf = bytearray(len(payload) + 3)
+        assert msg.pack_into(buf, 3, *values) == len(buf) and buf[3:] == payload
+        assert msg.decode(memoryview(payload)) == ([(1, "Bob", 9), (2, "", 0xFFFF)], "메모", "ab", True, 0.5)
+        for cut in (0, 3, len(payload) - 1):
+            try:
+                msg.decode(payload[:cut])
+                assert False, f"짧은 페이로드({cut})는 struct.error"
+            except struct.error:
+                pass
+
+        # parsed_protocol.json(C++ 헤더)에서 생성한 스키마와 와이어 배치 일치
+        from tcp_bridge import load_protocol_schemas
+        generated = load_protocol_schemas()
+        assert generated["LOGIN"].encode("alice", "pw") == b'\x05alice\x02pw'
+        assert generated["MOVE_BROADCAST"].layout() == (8, 4, 4, 4) and "STAT_SYNC" not in generated
+        shared = [name for name in vars(Schema) if name in generated]
+        assert set(shared) >= {"CHAR_LIST_RESP", "PARTY_INFO", "INVENTORY_RESP", "SKILL_LIST_RESP"}, shared
+        for name in shared:
+            ours, theirs = getattr(Schema, name).layout(), generated[name].layout()
+            if name == "SKILL_LIST_RESP":  # Session 33에서 원소 뒤에 level/effect/min_level 확장
+                assert ours[0][2][:len(theirs[0][2])] == theirs[0][2], (ours, theirs)
+                continue
+            assert ours == theirs, (name, ours, theirs)
+
+    await test("SCHEMA: 미리 컴파일한 메시지 코덱", test_schema())
+
+    # ━━━ Test: RESPONSE_CACHE — 정적 테이블 응답 캐시 ━━━
+    async def test_response_cache():
+        """같은 (msg_type, 파라미터) 요청은 같은 bytes를 캐시에서, 세션 값 접두는 따로. invalidate 후 테이블 변경 반영."""
+        from tcp_bridge import ResponseCache, PlayerSession, CHARACTER_TEMPLATES
+        rc = ResponseCache(max_entries=2)
+        built = []
+        build = lambda: built.append(1) or b'\x01\x02'
+        pkt = rc.packet((MsgType.EVENT_LIST,), build)
+        assert pkt == build_packet(MsgType.EVENT_LIST, b'\x01\x02')
+        assert rc.packet((MsgType.EVENT_LIST,), build) is pkt and len(built) == 1
+        assert rc.payload((MsgType.MENTOR_SHOP_LIST,), build) == b'\x01\x02'
+        rc.payload((MsgType.SHOP_LIST, 9), build)
+        assert len(rc) == 2 and (rc.hits, rc.misses) == (1, 3), "꽉 차면 저장 안 함"
+        assert rc.invalidate(MsgType.EVENT_LIST) == 1 and len(rc) == 1
+        assert rc.invalidate() == 1 and len(rc) == 0 and rc.report()["invalidations"] == 2
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        a = PlayerSession(writer=FakeWriter(writes=True), logged_in=True, in_game=True)
+        b = PlayerSession(writer=FakeWriter(writes=True), logged_in=True, in_game=True)
+        b.mentor_contribution = 77
+        for sess in (a, b):
+            await srv._dispatch(sess.writer, sess, MsgType.TOKEN_SHOP_LIST, struct.pack('<B', 0))
+            await srv._dispatch(sess.writer, sess, MsgType.MENTOR_SHOP_LIST, b'')
+            await srv._dispatch(sess.writer, sess, MsgType.CHAR_LIST_REQ, b'')
+        assert a.writer.writes[0] == b.writer.writes[0] and a.writer.writes[0][6:8] == bytes([0, len(TOKEN_SHOP_DUNGEON)])
+        assert a.writer.writes[2] == b.writer.writes[2] and a.writer.writes[2][6] == len(CHARACTER_TEMPLATES)
+        shops = [w.writes[1][6:] for w in (a.writer, b.writer)]
+        assert [struct.unpack('<I', s[:4])[0] for s in shops] == [0, 77] and shops[0][4:] == shops[1][4:]
+        assert (srv.response_cache.hits, srv.response_cache.misses) == (3, 3)
+
+        # 테이블이 바뀌어도 invalidate 전까지는 캐시된 응답
+        item = TOKEN_SHOP_DUNGEON[0]
+        old_price = item["price"]
+        try:
+            item["price"] = old_price + 1
+            await srv._dispatch(a.writer, a, MsgType.TOKEN_SHOP_LIST, struct.pack('<B', 0))
+            assert a.writer.writes[-1] == b.writer.writes[0]
+            srv.response_cache.invalidate(MsgType.TOKEN_SHOP)
+            await srv._dispatch(a.writer, a, MsgType.TOKEN_SHOP_LIST, struct.pack('<B', 0))
+            assert struct.unpack('<I', a.writer.writes[-1][10:14])[0] == old_price + 1
+        finally:
+            item["price"] = old_price
+
+        # 없는 상점/id는 캐시에 안 남음
+        before = len(srv.response_cache)
+        for npc_id in range(1000, 1050):
+            await srv._dispatch(a.writer, a, MsgType.SHOP_OPEN, struct.pack('<I', npc_id))
+        await srv._dispatch(a.writer, a, MsgType.TOKEN_SHOP_LIST, struct.pack('<B', 9))
+        assert len(srv.response_cache) == before
+
+        await srv._dispatch(a.writer, a, MsgType.STATS, b'')
+        fields = dict(kv.split('=', 1) for kv in a.writer.writes[-1][6:].decode('utf-8').split('|'))
+        assert fields['resp_cache_hits'] == '4' and fields['resp_cache_misses'] == '4', fields
+
+    await test("RESPONSE_CACHE: 정적 테이블 응답 캐시", test_response_cache())
+
+    # ━━━ Test: DATA_TABLES — data/ 테이블 로드 + 인덱스 + ADMIN_RELOAD 핫리로드 ━━━
+    async def test_data_tables():
+        """data/ 파일을 테이블로 읽고 인덱스 생성, 파일 수정 후 ADMIN_RELOAD → 게임 상수 교체 + 행 수 보고."""
+        import json
+        import shutil
+        import tempfile
+        import tcp_bridge
+        from tcp_bridge import PlayerSession, DATA_DIR
+
+        def admin(srv, sess, msg_type, body):
+            return srv._dispatch(sess.writer, sess, msg_type, struct.pack('<B', len(body)) + body)
+
+        tmp = tempfile.mkdtemp()
+        data_dir = os.path.join(tmp, "data")
+        shutil.copytree(DATA_DIR, data_dir)
+        try:
+            srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", data_dir=data_dir)
+            spawns = srv.data.get("monster_spawns")
+            assert srv.data.version == 1 and len(spawns) > 0 and set(spawns.indexes) >= {"id", "zone_id"}
+            assert sum(len(rows) for rows in spawns.index("zone_id").values()) == len(spawns)
+            assert spawns.find("id", 1)["name"] == "Goblin" and isinstance(spawns.rows[0]["hp"], int)
+            assert tcp_bridge.ZONE_BOUNDS[1]["max_z"] == 1000 and 10 in tcp_bridge.ZONE_BOUNDS, "파일에 없는 존은 기본값"
+            assert tcp_bridge.MOVEMENT["max_violations"] == 5
+
+            with open(os.path.join(data_dir, "movement_rules.json"), encoding='utf-8') as f:
+                rules = json.load(f)
+            rules["max_violations"] = 7
+            with open(os.path.join(data_dir, "movement_rules.json"), 'w', encoding='utf-8') as f:
+                json.dump(rules, f)
+            with open(os.path.join(data_dir, "zone_bounds.csv"), 'a', encoding='utf-8') as f:
+                f.write("4,0.0,0.0,4000.0,4000.0\n")
+
+            a = PlayerSession(writer=FakeWriter(writes=True), logged_in=True, in_game=True)
+            cached = srv.response_cache.packet((MsgType.EVENT_LIST,), lambda: b'\x00')
+            await admin(srv, a, MsgType.ADMIN_RELOAD, b'')
+            resp = a.writer.writes[-1][6:]
+            result, version, reload_count, name_len = struct.unpack_from('<BIIB', resp, 0)
+            assert (result, version, reload_count, name_len) == (1, 2, 1, 0)
+            reload_us, table_count = struct.unpack_from('<IB', resp, 10)
+            off, counts = 15, {}
+            for _ in range(table_count):
+                n = resp[off]
+                counts[resp[off + 1:off + 1 + n].decode()] = struct.unpack_from('<I', resp, off + 1 + n)[0]
+                off += 1 + n + 4
+            assert off == len(resp) and counts["zone_bounds"] == 4 and counts["monster_spawns"] == len(spawns), counts
+            assert tcp_bridge.MOVEMENT["max_violations"] == 7 and tcp_bridge.ZONE_BOUNDS[4]["max_x"] == 4000.0
+            assert srv.data.get("monster_spawns") is not spawns, "리로드는 새 테이블 객체로 교체"
+            assert len(srv.response_cache) == 0 and cached, "리로드 시 응답 캐시 비움"
+
+            # 단일 테이블 + 실패(없는 이름/깨진 파일)는 기존 테이블 유지
+            await admin(srv, a, MsgType.ADMIN_RELOAD, b'monster_ai')
+            resp = a.writer.writes[-1][6:]
+            assert resp[0] == 1 and resp[10:20] == b'monster_ai' and resp[24] == 1, "테이블 하나만"
+            assert srv.data.get("monster_spawns") is not spawns and srv.data.version == 3
+            before = srv.data.tables
+            await admin(srv, a, MsgType.ADMIN_RELOAD, b'no_such_table')
+            assert a.writer.writes[-1][6] == 0
+            with open(os.path.join(data_dir, "monster_ai.json"), 'w', encoding='utf-8') as f:
+                f.write("{broken")
+            await admin(srv, a, MsgType.ADMIN_RELOAD, b'monster_ai')
+            assert a.writer.writes[-1][6] == 0 and srv.data.tables is before and srv.data.version == 3
+            assert srv.data.reload_count == 2
+
+            # ADMIN_GET_CONFIG는 현재 테이블 값
+            key = b'max_violations'
+            await srv._dispatch(a.writer, a, MsgType.ADMIN_GET_CONFIG,
+                                struct.pack('<B', 14) + b'movement_rules' + struct.pack('<B', len(key)) + key)
+            assert a.writer.writes[-1][6:] == struct.pack('<BH', 1, 1) + b'7'
+        finally:
+            BridgeServer(port=0, verbose=False)  # 모듈 상수를 원래 data/ 값으로 되돌림
+            shutil.rmtree(tmp, ignore_errors=True)
+        assert tcp_bridge.MOVEMENT["max_violations"] == 5 and 4 not in tcp_bridge.ZONE_BOUNDS
+
+    await test("DATA_TABLES: data/ 테이블 로드 + 핫리로드", test_data_tables())
+
+    # ━━━ Test: STATIC_INDEX — 정적 테이블 O(1) 조회 인덱스 ━━━
+    async def test_static_index():
+        """StaticIndex 조회가 테이블 선형 검색과 같은 행을 주고, 리로드 때 다시 만들어지는지."""
+        from tcp_bridge import (PlayerSession, CHARACTER_TEMPLATES, SHOPS, DAILY_QUEST_POOL,
+                                TITLE_LIST_DATA, TRIPOD_TABLE)
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        idx = srv.index
+        for tmpl in CHARACTER_TEMPLATES:
+            assert idx.get("character_template", tmpl["id"]) is tmpl
+        npc_id, shop = next(iter(SHOPS.items()))
+        item = shop["items"][-1]
+        assert idx.get("shop_item", (npc_id, item["item_id"])) is item
+        assert idx.get("shop_item", (npc_id, 999999)) is None
+        dq = DAILY_QUEST_POOL[-1]
+        assert idx.get("daily_quest", dq["dq_id"]) is dq
+
+        # 주문서 item_id <-> (skill, tier, option) 왕복
+        skill_id = sorted(TRIPOD_TABLE)[1]
+        tier = min(TRIPOD_TABLE[skill_id])
+        item_id = srv._generate_scroll_item_id(skill_id, tier, 0)
+        assert item_id >= 9000
+        assert srv._resolve_scroll(item_id) == (skill_id, tier, 0, TRIPOD_TABLE[skill_id][tier][0]["id"])
+        assert srv._resolve_scroll(8999) is None and srv._resolve_scroll(item_id + 9) is None
+
+        # 칭호: 조건별 오름차순, 레벨만큼만 해금
+        levels = idx.group("titles_by_condition", "level")
+        assert [t["condition_value"] for t in levels] == sorted(t["condition_value"] for t in levels)
+        sess = PlayerSession(writer=FakeWriter(), logged_in=True, in_game=True)
+        unlocked = set(srv._check_title_conditions(sess))
+        expected = {t["title_id"] for t in TITLE_LIST_DATA
+                    if t["condition_type"] == "level" and t["condition_value"] <= 1}
+        assert {t for t in unlocked if t in {x["title_id"] for x in levels}} == expected
+
+        # 현상금 게시판은 하루 한 번 생성
+        board, by_id = srv._daily_bounty_board()
+        again, _ = srv._daily_bounty_board()
+        assert again is board and set(by_id) == {b["bounty_id"] for b in board}
+
+        # 리로드: 인덱스/게시판 재구성
+        before = idx._unique
+        await srv._dispatch(sess.writer, sess, MsgType.ADMIN_RELOAD, b'\x00')
+        assert idx._unique is not before and idx.get("daily_quest", dq["dq_id"]) is dq
+        assert srv._daily_bounty_board()[0] is not board
+
+    await test("STATIC_INDEX: 정적 테이블 O(1) 조회", test_static_index())
+
+    # ━━━ Test: MULTICAST — 한 번 인코딩한 패킷을 수신자 전원에게 ━━━
+    async def test_multicast():
+        """zone/전체/파티/길드/레이드 브로드캐스트가 같은 bytes 객체 하나를 모든 transport에 쓰는지."""
+        from tcp_bridge import PlayerSession, build_packet
+
+        class KeepWriter:
+            def __init__(self, closing=False):
+                self.writes = []
+                self.closing = closing
+            def write(self, data):
+                self.writes.append(data)
+            def is_closing(self):
+                return self.closing
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        players = []
+        for i in range(6):
+            s = PlayerSession(writer=KeepWriter(closing=(i == 5)), logged_in=True, in_game=True)
+            s.entity_id = 20_000_000 + i
+            s.zone_id = 1 if i < 4 else 2
+            srv.sessions[s.entity_id] = s
+            srv._aoi_update(s)
+            players.append(s)
+        a, b, c, d, e, closed = players
+
+        payload = struct.pack('<QB', a.entity_id, 7)
+        srv._broadcast_to_zone(1, a.entity_id, MsgType.CHAT_MESSAGE, payload)
+        got = [p.writer.writes[-1] for p in (b, c, d)]
+        assert not a.writer.writes and not e.writer.writes
+        assert got[0] == build_packet(MsgType.CHAT_MESSAGE, payload)
+        assert got[0] is got[1] is got[2], "헤더는 한 번만 붙이고 같은 객체를 공유"
+
+        srv._broadcast_to_all(MsgType.PVP_BOUNTY_NOTIFY, b'\x01')
+        assert len(e.writer.writes) == 1 and e.writer.writes[0] is a.writer.writes[-1]
+        assert not closed.writer.writes, "닫힌 transport는 건너뜀"
+        assert srv._multicast([a, b, closed], MsgType.ECHO, b'x', exclude=b.entity_id) == 1
+
+        # 파티 채팅: 멤버 entity_id 목록 -> 접속 중인 세션만
+        srv.parties[77] = {"leader": a.entity_id, "members": [a.entity_id, e.entity_id, 999]}
+        a.party_id = 77
+        msg = b'hi'
+        await srv._dispatch(a.writer, a, MsgType.CHAT_SEND, struct.pack('<BB', 1, len(msg)) + msg)
+        assert a.writer.writes[-1] is e.writer.writes[-1]
+        assert struct.unpack_from('<H', a.writer.writes[-1], 4)[0] == MsgType.CHAT_MESSAGE
+
+        # 길드 정보 갱신은 _send_guild_info와 같은 바이트
+        guild = {"id": 5, "name": "Multi", "master_id": a.entity_id, "members": [a.entity_id, c.entity_id],
+                 "level": 3}
+        srv.guilds[5] = guild
+        a.guild_id = c.guild_id = 5
+        srv._multicast_guild_info(guild)
+        shared = a.writer.writes[-1]
+        assert c.writer.writes[-1] is shared
+        srv._send_guild_info(a)
+        assert a.writer.writes[-1] == shared
+
+        # 레이드 인스턴스 (세션 목록)
+        before = len(d.writer.writes)
+        srv._multicast([b, d], MsgType.RAID_WIPE, struct.pack('<IB', 1, 2))
+        assert len(d.writer.writes) == before + 1 and b.writer.writes[-1] is d.writer.writes[-1]
+
+    await test("MULTICAST: 한 번 인코딩 + 같은 bytes 전송", test_multicast())
+
+    async def test_zone_shards():
+        """샤드 두 개(같은 프로세스, socketpair 링크): 캐릭터 선택/존 이동 핸드오프 + 경계 고스트."""
+        import socket
+        from tcp_bridge import ShardLink, ghost_zone_for
+
+        assert ghost_zone_for(1, 350.0, 100.0) == 2 and ghost_zone_for(1, 100.0, 100.0) == 0
+        assert ghost_zone_for(2, 100.0, 900.0) == 1 and ghost_zone_for(3, 10.0, 10.0) == 0
+
+        link0, link1 = socket.socketpair()
+        shards = [BridgeServer(port=0, verbose=False, flush_policy="immediate", shard=ShardLink(i, 2, {1 - i: sock}))
+                  for i, sock in enumerate((link0, link1))]
+        srv0, srv1 = shards
+        assert srv0.shard.owns(1) and srv1.shard.owns(2) and srv0.shard.owns(100), "인스턴스 존은 로컬"
+        listeners = []
+        for srv in shards:
+            srv.log = lambda *a, **k: None
+            srv.shard.start(srv._on_shard_packet)
+            listeners.append(await srv.listen('127.0.0.1', 0))
+        port0, port1 = (l.sockets[0].getsockname()[1] for l in listeners)
+
+        async def enter(client, port, name):
+            await client.connect('127.0.0.1', port)
+            await client.send(MsgType.LOGIN, bytes([len(name)]) + name.encode() + b'\x02pw')
+            await client.recv_expect(MsgType.LOGIN_RESULT)
+            await client.send(MsgType.CHAR_SELECT, struct.pack('<I', 1))
+            _, p = await client.recv_expect(MsgType.ENTER_GAME)
+            return struct.unpack('<BQIfff', p)
+
+        try:
+            # 존 1은 샤드 0 소유: 샤드 1로 접속해도 캐릭터 선택에서 샤드 0으로 넘어간다
+            a = TestClient()
+            result, eid, zone, *_ = await enter(a, port1, "shard_a")
+            assert result == 0 and zone == 1 and eid >= 1000 + 10_000_000, "샤드 1 id 구간"
+            assert eid in srv0.sessions and eid not in srv1.sessions
+            assert srv1.shard_stats["handoffs_out"] == 1 and srv0.shard_stats["handoffs_in"] == 1
+            moved = srv0.sessions[eid]
+            moved.gold = 4321
+            moved.buffs.append({"buff_id": 9, "expires": time.time() + 60})
+
+            # 존 2 입장 + 같은 write에 담긴 ECHO/POS_QUERY: 남은 바이트까지 샤드 1이 이어서 처리
+            # (ECHO가 read(4096)보다 길어 뒷부분은 StreamReader 버퍼에 남아 있다)
+            big = bytes(range(256)) * 24
+            a.writer.write(build_packet(MsgType.ZONE_ENTER, struct.pack('<I', 2)) + build_packet(MsgType.ECHO, big)
+                           + build_packet(MsgType.POS_QUERY))
+            _, p = await a.recv_expect(MsgType.ZONE_INFO)
+            assert struct.unpack('<I', p)[0] == 2
+            _, p = await a.recv_expect(MsgType.ECHO)
+            assert p == big
+            _, p = await a.recv_expect(MsgType.MOVE_BROADCAST)
+            assert struct.unpack('<Q', p[:8])[0] == eid
+            s1 = srv1.sessions[eid]
+            assert eid not in srv0.sessions and s1.zone_id == 2 and s1.gold == 4321
+            assert srv1.timers.get("buff", (eid, 9)) is not None, "버프 만료 타이머 다시 걸림"
+            assert eid in srv1.player_grids[2] and eid not in srv0.player_grids[1]
+
+            # 존 1 플레이어 b는 샤드 0에 그대로 — a가 존 2 경계 근처로 오면 고스트로 보인다
+            b = TestClient()
+            result, b_eid, *_ = await enter(b, port0, "shard_b")
+            assert result == 0 and b_eid in srv0.sessions
+            await a.send(MsgType.MOVE, struct.pack('<fff', 120.0, 0.0, 120.0))
+            await asyncio.sleep(0.05)
+            srv1._sync_ghosts(0.1)
+            _, p = await b.recv_expect(MsgType.APPEAR)
+            assert struct.unpack('<Q', p[:8])[0] == eid
+            await b.send(MsgType.GHOST_QUERY)
+            _, p = await b.recv_expect(MsgType.GHOST_INFO)
+            assert struct.unpack('<I', p)[0] == 1 and s1.ghost_zone == 1
+
+            # 끊기면 다음 고스트 틱에 인접 존 고스트도 지운다
+            a.close()
+            await asyncio.sleep(0.1)
+            srv1._sync_ghosts(0.1)
+            _, p = await b.recv_expect(MsgType.DISAPPEAR)
+            assert struct.unpack('<Q', p)[0] == eid and srv0.ghost_count() == 0
+            b.close()
+        finally:
+            for listener in listeners:
+                listener.close()
+            for srv in shards:
+                srv.shard.close()
+
+        # 고스트가 셀을 넘으면 플레이어처럼: 들어온 시야 APPEAR, 나간 시야 DISAPPEAR, 양쪽 다면 MOVE
+        from tcp_bridge import PlayerSession, Position
+
+        class RecordingWriter:
+            def __init__(self):
+                self.data = bytearray()
+            def write(self, data):
+                self.data += data
+            def is_closing(self):
+                return False
+
+        def drain(sess):
+            framer = PacketFramer()
+            framer.feed(bytes(sess.writer.data))
+            sess.writer.data.clear()
+            return [(mt, bytes(pl)[:8]) for mt, pl in framer.packets()]
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", ghosts=True)
+        viewers = []
+        for i, x in enumerate((100.0, 900.0, 1600.0)):  # 셀 (0,0) / (1,0) / (3,0)
+            v = PlayerSession(writer=RecordingWriter(), logged_in=True, in_game=True)
+            v.entity_id, v.zone_id, v.pos = 30_000_000 + i, 1, Position(x, 0.0, 100.0)
+            srv.sessions[v.entity_id] = v
+            srv._aoi_update(v)
+            viewers.append(v)
+        left, mid, right = viewers
+        ghost = struct.pack('<Q', 77)
+        srv._apply_ghosts([(77, 1, 2, 600.0, 0.0, 100.0)])     # 셀 (1,0): 시야 x 0~2
+        assert [drain(v) for v in viewers] == [[(MsgType.APPEAR, ghost)], [(MsgType.APPEAR, ghost)], []]
+        srv._apply_ghosts([(77, 1, 2, 1100.0, 0.0, 100.0)])    # 셀 (2,0): 시야 x 1~3
+        assert drain(left) == [(MsgType.DISAPPEAR, ghost)]
+        assert drain(mid) == [(MsgType.MOVE_BROADCAST, ghost)]
+        assert drain(right) == [(MsgType.APPEAR, ghost)]
+        srv._apply_ghosts([(77, 1, 2, 1200.0, 0.0, 100.0)])    # 같은 셀
+        assert [drain(v) for v in viewers] == [[], [(MsgType.MOVE_BROADCAST, ghost)], [(MsgType.MOVE_BROADCAST, ghost)]]
+        srv._apply_ghosts([(77, 1, 0, 0.0, 0.0, 0.0)])
+        assert [drain(v) for v in viewers] == [[], [(MsgType.DISAPPEAR, ghost)], [(MsgType.DISAPPEAR, ghost)]]
+        assert srv.ghost_count() == 0
+
+    await test("ZONE_SHARDS: 세션 핸드오프 + 경계 고스트", test_zone_shards())
+
+    # ━━━ Test: GATE_ROUTING — 게이트 필드 등록/하트비트 + 부하 기반 라우팅 ━━━
+    async def test_gate_routing():
+        """필드 둘이 게이트에 등록 → 한가한 필드로 라우팅, 부하 확장 반영, 하트비트 끊긴 필드 제외."""
+        from tcp_bridge import GateServer, GateStatus, HEARTBEAT_LOAD
+        now = [1000.0]
+        gate = GateServer(port=0, clock=lambda: now[0])
+        gate.log = lambda *a, **k: None
+        listener = await gate.listen('127.0.0.1', 0)
+        gate_port = listener.sockets[0].getsockname()[1]
+        fields, tasks = [], []
+        for port in (17001, 17002):
+            srv = BridgeServer(port=port, verbose=False, gate=('127.0.0.1', gate_port))
+            srv.log = lambda *a, **k: None
+            srv._running = True
+            fields.append(srv)
+            tasks.append(asyncio.ensure_future(srv._gate_loop()))
+
+        async def route(client):
+            await client.send(MsgType.GATE_ROUTE_REQ)
+            _, p = await client.recv_expect(MsgType.GATE_ROUTE_RESP)
+            return Schema.GATE_ROUTE_RESP.decode(p) if p[0] == 0 else None
+
+        client = TestClient()
+        try:
+            for _ in range(50):
+                if gate.stats["heartbeats"] >= 2:
+                    break
+                await asyncio.sleep(0.02)
+            assert [f.port for f in gate.fields] == [17001, 17002] and all(s.gate_stats["registered"] for s in fields)
+
+            # 빈 필드 둘: 예측 ccu 덕분에 번갈아 배정
+            await client.connect('127.0.0.1', gate_port)
+            picked = [(await route(client)).port for _ in range(4)]
+            assert sorted(picked) == [17001, 17001, 17002, 17002], picked
+            r = await route(client)
+            assert r.ip == '127.0.0.1' and r.port in (17001, 17002)
+
+            # 부하 확장: 17001이 틱을 절반 놓치면 세션이 조금 더 많은 17002로
+            gate.heartbeat(0, ccu=10, max_ccu=200, ticks=60, tick_overruns=30, out_bytes=0)
+            gate.heartbeat(1, ccu=20, max_ccu=200, ticks=60, tick_overruns=0, out_bytes=0)
+            assert (await route(client)).port == 17002
+            # C++ 필드처럼 확장 없는 10바이트 하트비트도 받는다 (overrun 0으로)
+            gate.heartbeat(1, ccu=20, max_ccu=200)
+            hb = Schema.FIELD_HEARTBEAT.encode(17001, 5, 200)
+            link = next(t for t, i in gate._links.items() if i == 0)
+            gate.handle(link, MsgType.FIELD_HEARTBEAT, hb)
+            assert gate.fields[0].ccu == 5 and gate.fields[0].overrun_ratio == 0.0
+            assert (await route(client)).port == 17001
+            gate.handle(link, MsgType.FIELD_HEARTBEAT, hb + HEARTBEAT_LOAD.encode(30, 0, 4 * 1024 * 1024))
+            assert (await route(client)).port == 17002, "송신 대기 4MB = 정원 100%만큼 부하"
+
+            # 하트비트가 타임아웃보다 오래 없으면 라우팅에서 빠지고, 다음 하트비트에 복귀
+            now[0] += gate.heartbeat_timeout + 1
+            gate.heartbeat(1, ccu=20, max_ccu=200)
+            assert gate.evict_stale() == 1 and gate.fields[0].status == GateStatus.TIMEOUT
+            assert [(await route(client)).port for _ in range(3)] == [17002] * 3
+            gate.heartbeat(0, ccu=0, max_ccu=200)
+            assert gate.fields[0].status == GateStatus.ALIVE and (await route(client)).port == 17001
+
+            # 정원이 찬 필드는 제외, 전부 안 되면 result=1
+            gate.heartbeat(1, ccu=200, max_ccu=200)
+            assert gate.fields[1].status == GateStatus.FULL and (await route(client)).port == 17001
+            now[0] += gate.heartbeat_timeout + 1
+            assert await route(client) is None and gate.stats["route_fails"] == 1
+
+            await client.send(MsgType.GATE_SERVER_LIST)
+            _, p = await client.recv_expect(MsgType.GATE_SERVER_LIST_RESP)
+            assert [(e.port, e.status) for e in Schema.GATE_SERVER_LIST_RESP.decode(p).servers] == \
+                [(17001, GateStatus.ALIVE), (17002, GateStatus.FULL)]
+
+            # 필드 프로세스가 죽어 등록 연결이 끊기면 하트비트를 기다리지 않고 바로 뺀다
+            tasks[0].cancel()
+            await asyncio.sleep(0.1)
+            assert gate.fields[0].status == GateStatus.TIMEOUT and link not in gate._links
+
+            # 필드가 보내는 하트비트: C++ 배치 10바이트 + 부하 확장
+            payload = fields[1]._gate_heartbeat()[PACKET_HEADER_SIZE:]
+            hb, off = Schema.FIELD_HEARTBEAT.decode_from(payload)
+            assert (hb.port, hb.ccu, hb.max_ccu) == (17002, 0, fields[1].max_ccu)
+            assert HEARTBEAT_LOAD.decode_from(payload, off)[1] == len(payload)
+            client.close()
+        finally:
+            for task in tasks:
+                task.cancel()
+            listener.close()
+
+    await test("GATE_ROUTING: 필드 등록/하트비트 + 부하 기반 라우팅", test_gate_routing())
+
+    async def test_message_bus():
+        """프로세스 안 버스(핸들러 즉시/큐 묶음+우선순위+넘치면 낮은 우선순위부터, CRITICAL은 안 버림) + 버스 서비스로 브릿지 둘 연결."""
+        from tcp_bridge import BusPriority, BusServer, MessageBus
+
+        bus = MessageBus(queue_limit=3)
+        seen, batches = [], []
+        bus.on("t", lambda topic, data, origin: seen.append((topic, bytes(data), origin)))
+        q = bus.attach("q", deliver=batches.append)
+        bus.subscribe(q, "t")
+        assert bus.publish("none", b"x") == 0
+        assert bus.publish("t", b"a", BusPriority.LOW, origin=7) == 2 and seen == [("t", b"a", 7)]
+        assert not batches, "큐 구독자는 루프 한 바퀴 뒤에"
+        await asyncio.sleep(0)
+        assert len(batches) == 1
+        for i, prio in enumerate((BusPriority.LOW, BusPriority.HIGH, BusPriority.NORMAL, BusPriority.CRITICAL)):
+            bus.publish("t", bytes([i]), prio)
+        assert len(batches) == 1 and len(seen) == 5
+        await asyncio.sleep(0)
+        assert [m.data for m in batches[1]] == [b"\x03", b"\x01", b"\x02"], "우선순위 순, 넘치면 가장 낮은 것(0) 버림"
+        assert q.dropped == 1 and bus.report()["hot"][0] == ("t", 5, 10, 1)
+        for data, prio in ((b"L1", BusPriority.LOW), (b"N", BusPriority.NORMAL), (b"L2", BusPriority.LOW),
+                           (b"H", BusPriority.HIGH),      # L1 버림 (낮은 것 중 오래된 것)
+                           (b"L3", BusPriority.LOW),      # 같은 우선순위면 오래된 L2
+                           (b"C1", BusPriority.CRITICAL), (b"C2", BusPriority.CRITICAL), (b"C3", BusPriority.CRITICAL),
+                           (b"C4", BusPriority.CRITICAL),  # 전부 CRITICAL — 버리지 않고 상한을 넘긴다
+                           (b"N2", BusPriority.NORMAL)):   # 새 것이 제일 낮음 — 새 것을 버린다
+            bus.publish("t", data, prio)
+        await asyncio.sleep(0)
+        assert [m.data for m in batches[2]] == [b"C1", b"C2", b"C3", b"C4"] and q.dropped == 7
+        assert bus.publish("t", b"z", sender=q) == 1, "보낸 구독자에게는 되돌려 주지 않는다"
+        bus.detach(q)
+        assert bus.publish("t", b"z") == 1
+
+        # 버스 서비스 + 브릿지 둘: 귓속말/전체 공지/우편이 프로세스를 넘어간다
+        bus_srv = BusServer(port=0)
+        bus_srv.log = lambda *a, **k: None
+        bus_listener = await bus_srv.listen('127.0.0.1', 0)
+        bus_addr = ('127.0.0.1', bus_listener.sockets[0].getsockname()[1])
+        fields, listeners, tasks = [], [], []
+        for _ in range(2):
+            srv = BridgeServer(port=0, verbose=False, flush_policy="immediate", bus=bus_addr)
+            srv.log = lambda *a, **k: None
+            srv._running = True
+            fields.append(srv)
+            listeners.append(await srv.listen('127.0.0.1', 0))
+            tasks.append(asyncio.ensure_future(srv._bus_loop()))
+        srv_a, srv_b = fields
+
+        async def wait_for(cond):
+            for _ in range(100):
+                if cond():
+                    return
+                await asyncio.sleep(0.02)
+            assert cond()
+
+        async def enter(listener, char_id):
+            c = TestClient()
+            await c.connect('127.0.0.1', listener.sockets[0].getsockname()[1])
+            await c.send(MsgType.LOGIN, b'\x03bus\x02pw')
+            await c.recv_expect(MsgType.LOGIN_RESULT)
+            await c.send(MsgType.CHAR_SELECT, struct.pack('<I', char_id))
+            await c.recv_expect(MsgType.ENTER_GAME)
+            return c
+
+        try:
+            await wait_for(lambda: srv_a.bus_server_id and srv_b.bus_server_id)
+            a = await enter(listeners[0], 1)   # Warrior_01 @ A
+            b = await enter(listeners[1], 2)   # Mage_01 @ B
+            await wait_for(lambda: "Mage_01" in srv_a.remote_players and "Warrior_01" in srv_b.remote_players)
+            assert srv_a.remote_players["Mage_01"][1] == srv_b.bus_server_id
+
+            await a.send(MsgType.WHISPER_SEND, b'\x07Mage_01\x02hi')
+            _, p = await a.recv_expect(MsgType.WHISPER_RESULT)
+            assert p[:2] == b'\x00\x01', "발신자: SENT"
+            _, p = await b.recv_expect(MsgType.WHISPER_RESULT)
+            assert p[:2] == b'\x00\x00' and p[2:34].rstrip(b'\x00') == b"Warrior_01" and p[35:] == b"hi"
+
+            srv_b._announce(MsgType.PVP_BOUNTY_NOTIFY, b"bounty")
+            for c in (a, b):
+                _, p = await c.recv_expect(MsgType.PVP_BOUNTY_NOTIFY)
+                assert p == b"bounty"
+
+            b_account = srv_b._find_session_by_name("Mage_01").account_id
+            await a.send(MsgType.MAIL_SEND, b'\x07Mage_01\x02yo' + struct.pack('<H', 4) + b'body'
+                         + struct.pack('<IIH', 0, 0, 0))
+            _, p = await a.recv_expect(MsgType.MAIL_DELETE_RESULT)
+            assert p[0] == 0
+            await wait_for(lambda: srv_b.mails.get(b_account))
+            mail = srv_b.mails[b_account][0]
+            assert mail["sender_name"] == "Warrior_01" and mail["body"] == "body"
+            warrior = srv_a._find_session_by_name("Warrior_01")
+            assert not srv_a.mails.get(warrior.account_id)
+
+            # 버스 링크가 없으면 보내지 않고 환불 (받을 프로세스에 닿지 않음)
+            link, srv_a._bus_link = srv_a._bus_link, None
+            gold = warrior.gold
+            await a.send(MsgType.MAIL_SEND, b'\x07Mage_01\x02yo' + struct.pack('<H', 4) + b'body'
+                         + struct.pack('<IIH', 10, 0, 0))
+            _, p = await a.recv_expect(MsgType.MAIL_DELETE_RESULT)
+            assert p[0] == 1 and warrior.gold == gold and len(srv_b.mails[b_account]) == 1
+            srv_a._bus_link = link
+
+            await a.send(MsgType.STATS)
+            _, p = await a.recv_expect(MsgType.STATS)
+            st = dict(kv.split('=', 1) for kv in p.decode().split('|') if '=' in kv)
+            assert st["bus_server_id"] == str(srv_a.bus_server_id) and st["bus_remote_players"] == "1"
+            b.close()
+            await wait_for(lambda: "Mage_01" not in srv_a.remote_players)
+
+            # 버스 링크가 끊긴 브릿지의 접속자는 다른 쪽 목록에서 빠진다 (bus.left)
+            tasks[0].cancel()
+            await wait_for(lambda: not srv_b.remote_players)
+            a.close()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for listener in listeners + [bus_listener]:
+                listener.close()
+
+    await test("MESSAGE_BUS: 토픽 pub/sub + 브릿지 간 귓속말/공지/우편", test_message_bus())
+
+    async def test_zone_channels():
+        """정원 초과 시 새 채널(+몬스터), 채널 간 시야/존 채팅 분리, CHANNEL_JOIN 전환/거절, 빈 채널 닫기, max_players."""
+        from tcp_bridge import CHANNEL_LOAD, PlayerSession, Position, channel_space
+
+        class RecordingWriter:
+            def __init__(self):
+                self.data = bytearray()
+            def write(self, data):
+                self.data += data
+            def is_closing(self):
+                return False
+
+        def drain(sess):
+            framer = PacketFramer()
+            framer.feed(bytes(sess.writer.data))
+            sess.writer.data.clear()
+            return [(t, bytes(p)) for t, p in framer.packets()]
+
+        srv = BridgeServer(port=0, verbose=False, flush_policy="immediate")
+        srv.log = lambda *a, **k: None
+        srv.channel_capacity = 2
+        srv.max_channels = 3
+        srv._spawn_monsters()
+        base_monsters = len(srv.zone_monsters.get(1, ()))
+        players = []
+        for i in range(6):
+            sess = PlayerSession(writer=RecordingWriter(), logged_in=True, in_game=True)
+            sess.entity_id = 20_000_000 + i
+            sess.char_name = f"Ch_{i}"
+            sess.zone_id = 1
+            sess.pos = Position(100.0, 0.0, 100.0)
+            srv.sessions[sess.entity_id] = sess
+            srv._aoi_update(sess)
+            players.append(sess)
+        # 2명씩 채널 1~3, 채널 2/3은 존 1 몬스터를 한 벌씩
+        assert [s.channel_id for s in players] == [1, 1, 2, 2, 3, 3]
+        assert players[0].space == 1 and players[2].space == channel_space(1, 2)
+        assert srv.zone_channels[1] == {2, 3} and srv.channel_stats["opened"] == 2
+        assert len(srv.zone_monsters[channel_space(1, 2)]) == base_monsters
+        assert all(srv.monsters[mid]["channel"] == 3 for mid in srv.zone_monsters[channel_space(1, 3)])
+        assert srv.check_zone_index() == []
+
+        # 상한이면 가장 한가한 채널에 정원 초과로
+        extra = PlayerSession(writer=RecordingWriter(), logged_in=True, in_game=True)
+        extra.entity_id, extra.zone_id, extra.pos = 20_000_100, 1, Position(0.0, 0.0, 0.0)
+        srv.sessions[extra.entity_id] = extra
+        srv._aoi_update(extra)
+        assert extra.channel_id == 1 and srv.channel_stats["overflow"] == 1
+        srv._aoi_remove(extra)
+        del srv.sessions[extra.entity_id]
+
+        # 같은 자리라도 채널이 다르면 안 보인다
+        near = {eid for _, eid in srv._query_radius(players[0].space, 100.0, 100.0, 50.0, monsters=False)}
+        assert near == {players[0].entity_id, players[1].entity_id}
+        for s in players:
+            drain(s)
+
+        # 존 채팅은 같은 채널만, 존 공지는 전 채널
+        await srv._on_chat_send(players[2], b'\x00\x02hi')
+        assert [bool(drain(s)) for s in players] == [False, False, True, True, False, False]
+        srv._broadcast_to_zone(1, 0, MsgType.ZONE_INFO, b'\x01\x00\x00\x00')
+        assert all(drain(s) for s in players)
+
+        # 꽉 찬 채널로는 거절 (지금 채널 그대로 응답)
+        await srv._on_channel_join(players[0], struct.pack('<i', 2))
+        (t, p), = drain(players[0])
+        assert t == MsgType.CHANNEL_INFO and struct.unpack('<i', p[:4])[0] == 1
+        load, off = CHANNEL_LOAD.decode_from(p, 4)
+        assert off == len(p) and (load.zone_id, load.capacity) == (1, 2)
+        assert [(c.channel_id, c.players) for c in load.channels] == [(1, 2), (2, 2), (3, 2)]
+        assert srv.channel_stats["refused"] == 1
+
+        # 채널 3 -> 1 (자리 생김): 옛 채널과 서로 DISAPPEAR, 새 채널과 서로 APPEAR
+        srv._aoi_remove(players[1])
+        del srv.sessions[players[1].entity_id]
+        drain(players[0])
+        drain(players[5])
+        await srv._on_channel_join(players[4], struct.pack('<i', 1))
+        assert players[4].channel_id == 1 and players[4].space == 1
+        got = drain(players[4])
+        assert (MsgType.DISAPPEAR, struct.pack('<Q', players[5].entity_id)) in got
+        assert any(t == MsgType.APPEAR and p[:8] == struct.pack('<Q', players[0].entity_id) for t, p in got)
+        assert got[-1][0] == MsgType.CHANNEL_INFO and struct.unpack('<i', got[-1][1][:4])[0] == 1
+        assert (MsgType.DISAPPEAR, struct.pack('<Q', players[4].entity_id)) in drain(players[5])
+        assert any(t == MsgType.APPEAR and p[:8] == struct.pack('<Q', players[4].entity_id)
+                   for t, p in drain(players[0]))
+        assert srv.channel_stats["switches"] == 1 and srv.check_zone_index() == []
+
+        # 빈 채널은 CHANNEL_COLLAPSE_DELAY 뒤 닫힌다 (그 사이 다시 차면 취소)
+        space3 = channel_space(1, 3)
+        srv._aoi_remove(players[5])
+        assert srv.timers.get("channel", space3) is not None
+        srv._aoi_update(players[5])
+        assert srv.timers.get("channel", space3) is None
+        srv._aoi_remove(players[5])
+        del srv.sessions[players[5].entity_id]
+        srv._collapse_channel(1, 3)
+        assert srv.zone_channels[1] == {2} and space3 not in srv.zone_monsters
+        assert not any(m["space"] == space3 for m in srv.monsters.values())
+        assert srv.check_zone_index() == []
+
+        # max_players: 캐릭터 선택에서 ENTER_GAME FAIL
+        srv.max_ccu = len(srv.sessions)
+        c = TestClient()
+        listener = await srv.listen('127.0.0.1', 0)
+        try:
+            await c.connect('127.0.0.1', listener.sockets[0].getsockname()[1])
+            await c.send(MsgType.LOGIN, b'\x03chn\x02pw')
+            await c.recv_expect(MsgType.LOGIN_RESULT)
+            await c.send(MsgType.CHAR_SELECT, struct.pack('<I', 1))
+            _, p = await c.recv_expect(MsgType.ENTER_GAME)
+            assert p[0] == 1 and srv.channel_stats["server_full"] == 1
+            c.close()
+        finally:
+            listener.close()
+
+    await test("ZONE_CHANNEL: 정원 기반 채널 분할/전환/닫기 + max_players", test_zone_channels())
+
     # ━━━ 결과 ━━━
     print(f"\n{'='*50}")
     print(f"  TCP Bridge Test Results: {passed}/{total} PASSED")
@@ -8,7 +8,24 @@ Bot AI 프로필:
   Explorer (40%)       : 넓게 이동, 가끔 존 이동
   Homebody (30%)       : 좁은 영역 배회
   Boundary Walker (30%): 경계선 근처 이동 (Ghost 시스템 테스트)
+
+--bridge: C++ 서버 대신 Python TCP Bridge(Servers/BridgeServer/tcp_bridge.py)를 띄운다.
+Gate도 tcp_bridge.py --role gate로 띄우고, 필드 두 개가 --gate로 등록해 부하를 보고하면
+봇은 C++ 모드처럼 GATE_ROUTE_REQ로 배정받는다 (보고서에 Gate STATS). Boundary Walker가 AOI 셀 경계를 왔다갔다 하므로
+--view-radius 0 (존 전체) 과 --view-radius 200 결과의 프로필별 수신 바이트,
+서버 STATS의 aoi_bytes_saved로 AOI가 아낀 대역폭을 비교할 수 있다.
+
+--shards N: bridge 하나를 --shards N (존별 워커 프로세스)으로 띄운다. 봇 절반은 존 2로
+들어가고 Explorer가 존 1/2를 오가므로 샤드 핸드오프, Boundary Walker로 경계 고스트가 돈다.
+샤드별 STATS(handoff/ghost/dispatched)를 보고서에 찍는다.
+
+사용법:
+  python stress_test.py                                   # C++ Gate + Field
+  python stress_test.py --bridge --bots 100 --view-radius 0
+  python stress_test.py --bridge --bots 100 --view-radius 200
+  python stress_test.py --bridge --shards 2 --bots 200
 """
+import argparse
 import subprocess
 import socket
 import struct
@@ -29,6 +46,13 @@ MOVE_INTERVAL = 0.3        # 이동 간격 (초)
 BUILD_DIR = Path(__file__).parent / "build"
 FIELD_EXE = BUILD_DIR / "FieldServer.exe"
 GATE_EXE = BUILD_DIR / "GateServer.exe"
+BRIDGE_PY = Path(__file__).parent / "Servers" / "BridgeServer" / "tcp_bridge.py"
+
+BRIDGE_MODE = False        # --bridge
+SHARDS = 0                 # --shards (bridge 모드: 한 프로세스 그룹이 존을 나눠 맡음)
+VIEW_RADIUS = 500.0        # --view-radius (bridge 모드)
+BOUNDARY_LINE = 300.0      # Boundary Walker가 오가는 x 좌표 (bridge 모드: AOI 셀 경계)
+BOUNDARY_MAX_STEP = 100.0  # 한 번에 이동하는 최대 거리 (서버 속도 검증 통과용)
 
 HOST = '127.0.0.1'
 GATE_PORT = 8888
@@ -126,6 +150,10 @@ class Metrics:
         self.appear_recv = 0
         self.disappear_recv = 0
         self.move_bcast_recv = 0
+        # 프로필별 수신량 (AOI 대역폭 비교용)
+        self.recv_bytes_by_profile = defaultdict(int)
+        self.recv_pkts_by_profile = defaultdict(int)
+        self.bcast_by_profile = defaultdict(int)
         # 응답 시간
         self.login_times = []
         self.route_times = []
@@ -151,6 +179,13 @@ class Metrics:
         with self.lock:
             self.profile_counts[name] += 1
 
+    def add_recv(self, profile, msg_type, nbytes):
+        with self.lock:
+            self.recv_bytes_by_profile[profile] += nbytes
+            self.recv_pkts_by_profile[profile] += 1
+            if msg_type == MSG_MOVE_BROADCAST:
+                self.bcast_by_profile[profile] += 1
+
     def add_error(self, msg):
         with self.lock:
             if len(self.errors) < 50:
@@ -202,10 +237,16 @@ class BotAI:
             return self.x, self.y, self.z, None
 
         elif self.profile == "boundary":
-            # 경계선(300) 근처를 왔다갔다 → Ghost 시스템 스트레스
-            target = 300.0 + random.uniform(-80, 80)
-            self.x = max(10, min(600, target))
-            self.y = max(10, min(600, 300.0 + random.uniform(-80, 80)))
+            # 경계선(BOUNDARY_LINE) 근처를 왔다갔다 → Ghost / AOI 셀 전환 스트레스
+            tx = BOUNDARY_LINE + random.uniform(-80, 80)
+            ty = 300.0 + random.uniform(-80, 80)
+            dx, dy = tx - self.x, ty - self.y
+            dist = (dx * dx + dy * dy) ** 0.5
+            if dist > BOUNDARY_MAX_STEP:  # 멀리서 시작했으면 경계까지 걸어간다
+                tx = self.x + dx / dist * BOUNDARY_MAX_STEP
+                ty = self.y + dy / dist * BOUNDARY_MAX_STEP
+            self.x = max(10, min(BOUNDARY_LINE + 300, tx))
+            self.y = max(10, min(600, ty))
             return self.x, self.y, self.z, None
 
         return self.x, self.y, self.z, None
@@ -219,24 +260,27 @@ def bot_worker(bot_id):
     game_port = None
 
     try:
-        # ── 1단계: Gate 접속 + 라우팅 ──
+        # ── 1단계: Gate 접속 + 라우팅 (샤드 모드는 포트 하나에 직접 접속) ──
         t0 = time.time()
-        gs = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        gs.settimeout(5)
-        gs.connect((HOST, GATE_PORT))
-        time.sleep(0.1)
-        drain(gs)
-
-        gs.sendall(build_packet(MSG_GATE_ROUTE_REQ))
-        mt, pl = try_recv(gs, 3)
-        gs.close()
-
-        if mt != MSG_GATE_ROUTE_RESP or not pl or pl[0] != 0:
-            M.inc('gate_fail')
-            M.add_error(f"Bot {bot_id}: gate routing failed")
-            return
-
-        game_port = struct.unpack('<H', pl[1:3])[0]
+        if SHARDS:
+            game_port = FIELD_PORTS[bot_id % len(FIELD_PORTS)]
+        else:
+            gs = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            gs.settimeout(5)
+            gs.connect((HOST, GATE_PORT))
+            time.sleep(0.1)
+            drain(gs)
+
+            gs.sendall(build_packet(MSG_GATE_ROUTE_REQ))
+            mt, pl = try_recv(gs, 3)
+            gs.close()
+
+            if mt != MSG_GATE_ROUTE_RESP or not pl or pl[0] != 0:
+                M.inc('gate_fail')
+                M.add_error(f"Bot {bot_id}: gate routing failed")
+                return
+
+            game_port = struct.unpack('<H', pl[1:3])[0]
         M.inc('gate_ok')
         M.inc_dist(game_port)
         M.append('route_times', time.time() - t0)
@@ -280,6 +324,8 @@ def bot_worker(bot_id):
         zone_id = struct.unpack('<i', pl[9:13])[0]
         px = struct.unpack('<f', pl[13:17])[0]
         py = struct.unpack('<f', pl[17:21])[0]
+        if BRIDGE_MODE:  # bridge는 x/z가 평면 좌표
+            py = struct.unpack('<f', pl[21:25])[0]
 
         # ── 4단계: 채널 입장 ──
         channel = random.choice([1, 2, 3])
@@ -297,6 +343,14 @@ def bot_worker(bot_id):
         else:
             profile = "boundary"
 
+        if SHARDS and bot_id % 2:
+            # 샤드 모드: 절반은 존 2에서 시작 (존 2를 맡은 샤드로 핸드오프)
+            zone_id = 2
+            sock.sendall(build_zone_enter_packet(zone_id))
+            time.sleep(0.2)
+            drain(sock)
+            M.inc('zone_changes')
+
         M.inc_profile(profile)
         ai = BotAI(profile, zone_id, px, py)
 
@@ -313,7 +367,7 @@ def bot_worker(bot_id):
                 M.inc('zone_changes')
 
             # 이동
-            sock.sendall(build_move_packet(x, y, z))
+            sock.sendall(build_move_packet(x, z, y) if BRIDGE_MODE else build_move_packet(x, y, z))
             move_count += 1
             M.inc('moves_sent')
 
@@ -322,6 +376,7 @@ def bot_worker(bot_id):
                 mt, pl = try_recv(sock, 0.05)
                 if mt is None:
                     break
+                M.add_recv(profile, mt, HEADER_SIZE + len(pl))
                 if mt == MSG_APPEAR:
                     M.inc('appear_recv')
                 elif mt == MSG_DISAPPEAR:
@@ -345,17 +400,57 @@ def bot_worker(bot_id):
 
 # ━━━ 서버 관리 ━━━
 
+NEW_PROCESS_GROUP = getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)
+
 def start_field(port):
+    if BRIDGE_MODE:
+        cmd = [sys.executable, str(BRIDGE_PY), '--port', str(port), '--view-radius', str(VIEW_RADIUS)]
+        if SHARDS:
+            cmd += ['--shards', str(SHARDS)]
+        else:
+            cmd += ['--gate', str(GATE_PORT)]
+    else:
+        cmd = [str(FIELD_EXE), str(port)]
     return subprocess.Popen(
-        [str(FIELD_EXE), str(port)],
-        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        creationflags=NEW_PROCESS_GROUP)
 
 def start_gate(ports):
+    if BRIDGE_MODE:
+        cmd = [sys.executable, str(BRIDGE_PY), '--role', 'gate', '--port', str(GATE_PORT)]
+    else:
+        cmd = [str(GATE_EXE)] + [str(p) for p in ports]
     return subprocess.Popen(
-        [str(GATE_EXE)] + [str(p) for p in ports],
+        cmd,
         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        creationflags=NEW_PROCESS_GROUP)
+
+def query_server_stats(port):
+    """STATS 응답 (k=v|k=v...) → dict. 실패 시 빈 dict"""
+    try:
+        s = socket.create_connection((HOST, port), timeout=3)
+        s.sendall(build_packet(MSG_STATS))
+        deadline = time.time() + 3
+        while time.time() < deadline:
+            mt, pl = try_recv(s, 1.0)
+            if mt == MSG_STATS:
+                s.close()
+                return dict(kv.split('=', 1) for kv in pl.decode('utf-8', 'replace').split('|') if '=' in kv)
+        s.close()
+    except OSError:
+        pass
+    return {}
+
+def query_shard_stats(port, shards, attempts=30):
+    """샤드별 STATS. 접속마다 아무 샤드나 받으므로 모든 샤드를 볼 때까지 여러 번 묻는다"""
+    found = {}
+    for _ in range(attempts):
+        st = query_server_stats(port)
+        if 'shard' in st:
+            found[int(st['shard'])] = st
+        if len(found) >= shards:
+            break
+    return found
 
 def stop(proc):
     if proc and proc.poll() is None:
@@ -393,26 +488,63 @@ def monitor_thread():
 # ━━━ 메인 ━━━
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Autonomous bot stress test")
+    parser.add_argument('--bridge', action='store_true',
+                        help='Python TCP Bridge 필드 서버 사용 (Gate 없이 직접 접속)')
+    parser.add_argument('--bots', type=int, default=NUM_BOTS)
+    parser.add_argument('--lifetime', type=float, default=BOT_LIFETIME)
+    parser.add_argument('--view-radius', type=float, default=VIEW_RADIUS,
+                        help='bridge 모드 AOI 시야 반경 (0 = 존 전체)')
+    parser.add_argument('--shards', type=int, default=SHARDS,
+                        help='bridge 하나를 N개 존 샤드 프로세스로 (--bridge 포함, 0 = 끔)')
+    args = parser.parse_args()
+    NUM_BOTS = args.bots
+    BOT_LIFETIME = args.lifetime
+    SHARDS = args.shards
+    BRIDGE_MODE = args.bridge or SHARDS > 0
+    VIEW_RADIUS = args.view_radius
+    if SHARDS:
+        FIELD_PORTS = FIELD_PORTS[:1]   # 포트 하나를 모든 샤드가 공유
+    if BRIDGE_MODE:
+        # 셀 경계(= 시야 반경의 배수)를 오가게 한다
+        BOUNDARY_LINE = VIEW_RADIUS if VIEW_RADIUS > 0 else 500.0
+
     print("=" * 65)
     print("  STRESS TEST - Autonomous Bot Load Test")
     print(f"  {NUM_BOTS} bots / {len(FIELD_PORTS)} game servers / {BOT_LIFETIME}s lifetime")
+    if BRIDGE_MODE:
+        print(f"  Python TCP Bridge / AOI view radius: {VIEW_RADIUS:g}"
+              + (" (whole zone)" if not VIEW_RADIUS else ""))
+    if SHARDS:
+        print(f"  Zone shards: {SHARDS} processes on port {FIELD_PORTS[0]}")
     print("=" * 65)
     print()
 
     # 서버 기동
     print("[1/4] Starting servers...")
-    fields = [start_field(p) for p in FIELD_PORTS]
-    time.sleep(3.0)
-    gate = start_gate(FIELD_PORTS)
-    time.sleep(2.0)
+    if BRIDGE_MODE:
+        # Python 필드는 기동하면서 게이트에 등록하므로 게이트부터
+        gate = None if SHARDS else start_gate(FIELD_PORTS)
+        fields = [start_field(p) for p in FIELD_PORTS]
+        time.sleep(3.0)
+    else:
+        fields = [start_field(p) for p in FIELD_PORTS]
+        time.sleep(3.0)
+        gate = start_gate(FIELD_PORTS)
+        time.sleep(2.0)
 
-    all_alive = all(f.poll() is None for f in fields) and gate.poll() is None
+    all_alive = all(f.poll() is None for f in fields) and (gate is None or gate.poll() is None)
     if not all_alive:
         print("  FAIL: Server startup failed")
         for f in fields: stop(f)
         stop(gate)
         sys.exit(1)
-    print(f"  OK: Gate(8888) + Field({FIELD_PORTS[0]}) + Field({FIELD_PORTS[1]})")
+    if SHARDS:
+        print(f"  OK: Bridge({FIELD_PORTS[0]}, {SHARDS} shards)")
+    elif BRIDGE_MODE:
+        print(f"  OK: Gate({GATE_PORT}, Python) + Bridge({FIELD_PORTS[0]}) + Bridge({FIELD_PORTS[1]})")
+    else:
+        print(f"  OK: Gate(8888) + Field({FIELD_PORTS[0]}) + Field({FIELD_PORTS[1]})")
     print()
 
     # 봇 투입
@@ -442,9 +574,14 @@ if __name__ == "__main__":
     stop_monitor.set()
     time.sleep(0.5)
 
+    server_stats = {p: query_server_stats(p) for p in FIELD_PORTS} if BRIDGE_MODE and not SHARDS else {}
+    shard_stats = query_shard_stats(FIELD_PORTS[0], SHARDS) if SHARDS else {}
+    gate_stats = query_server_stats(GATE_PORT) if BRIDGE_MODE and not SHARDS else {}
+
     # 서버 종료
     print("[4/4] Stopping servers...")
-    stop(gate)
+    if gate:
+        stop(gate)
     for f in fields: stop(f)
     print()
 
@@ -505,6 +642,43 @@ if __name__ == "__main__":
     print(f"  MOVE_BROADCAST received: {M.move_bcast_recv:,}")
     print()
 
+    # 프로필별 수신량 — view radius 바꿔 두 번 돌려 비교
+    print("--- Bandwidth per Profile (received by bots) ---")
+    print(f"  {'profile':15s} {'bots':>5s} {'KB total':>10s} {'KB/bot':>8s} {'pkts/bot':>9s} {'bcast/bot':>10s}")
+    for name in ["explorer", "homebody", "boundary"]:
+        cnt = M.profile_counts.get(name, 0) or 1
+        kb = M.recv_bytes_by_profile[name] / 1024
+        print(f"  {name:15s} {M.profile_counts.get(name, 0):5d} {kb:10.1f} {kb / cnt:8.1f} "
+              f"{M.recv_pkts_by_profile[name] / cnt:9.1f} {M.bcast_by_profile[name] / cnt:10.1f}")
+    for port, st in server_stats.items():
+        if st:
+            print(f"  server {port}: aoi_radius={st.get('aoi_radius')} sent={st.get('aoi_sent')} "
+                  f"skipped={st.get('aoi_skipped')} bytes_saved={st.get('aoi_bytes_saved')} "
+                  f"appear={st.get('aoi_appear')} disappear={st.get('aoi_disappear')}")
+    print()
+
+    if SHARDS:
+        # 샤드별 부하 — dispatched가 고르게 나뉘어야 코어 수만큼 처리량이 는다
+        print("--- Zone Shards ---")
+        print(f"  {'shard':>5s} {'dispatched':>11s} {'out_packets':>12s} {'handoff out':>12s} "
+              f"{'handoff in':>11s} {'failed':>7s} {'ghost upd':>10s}")
+        for idx in range(SHARDS):
+            st = shard_stats.get(idx)
+            if not st:
+                print(f"  {idx:>5d}  (no STATS reply)")
+                continue
+            print(f"  {idx:>5d} {st.get('dispatched'):>11s} {st.get('out_packets'):>12s} "
+                  f"{st.get('handoffs_out'):>12s} {st.get('handoffs_in'):>11s} "
+                  f"{st.get('handoffs_failed'):>7s} {st.get('ghost_updates'):>10s}")
+        print()
+
+    if gate_stats:
+        print("--- Gate (Python) ---")
+        print(f"  routes={gate_stats.get('routes')} fails={gate_stats.get('route_fails')} "
+              f"heartbeats={gate_stats.get('heartbeats')} evictions={gate_stats.get('evictions')} "
+              f"per field={gate_stats.get('field_routes')}")
+        print()
+
     # 응답 시간
     print("--- Response Times ---")
     if M.route_times: